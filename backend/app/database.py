@@ -3,10 +3,21 @@ Centralized database client management.
 
 This module provides singleton Supabase client instances to avoid
 creating multiple connections throughout the application.
+
+Two flavours are available:
+- get_supabase_service(): synchronous client for background jobs and scripts
+- get_supabase_async(): non-blocking client for async route handlers and services
+
+The sync client blocks the event loop on every .execute(), so code that runs
+inside `async def` handlers on the request path should use the async client.
 """
+import asyncio
 import os
+import threading
+import weakref
 from functools import lru_cache
-from supabase import create_client, Client
+from supabase import create_client, Client, acreate_client, AsyncClient
+from supabase.lib.client_options import AsyncClientOptions
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -77,6 +88,79 @@ def get_user_client(user_token: str) -> Client:
     return client
 
 
+# ==========================================
+# Async client (non-blocking)
+# ==========================================
+
+# PostgREST request timeout for the async client (seconds)
+ASYNC_DB_TIMEOUT = int(os.getenv("SUPABASE_ASYNC_TIMEOUT", "20"))
+
+# One client (and creation lock) per event loop: the httpx connection pool
+# is bound to the loop it was created on, and Inngest steps or scripts may
+# run on loops other than the server's
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncClient]" = weakref.WeakKeyDictionary()
+_async_locks: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Lock]" = weakref.WeakKeyDictionary()
+_async_registry_lock = threading.Lock()
+
+
+async def get_supabase_async() -> AsyncClient:
+    """
+    Get the async Supabase service client (bypasses RLS).
+    
+    The client is created once per event loop and shared by all requests
+    on that loop. Its PostgREST session is a single pooled httpx.AsyncClient
+    with HTTP/2 enabled, so concurrent queries are multiplexed over
+    keep-alive connections instead of blocking the event loop.
+    
+    Usage:
+        db = await get_supabase_async()
+        result = await db.table("prospects").select("id").eq("id", pid).execute()
+    
+    Returns:
+        AsyncClient with service role permissions
+    """
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is not None:
+        return client
+    
+    with _async_registry_lock:
+        lock = _async_locks.get(loop)
+        if lock is None:
+            lock = _async_locks[loop] = asyncio.Lock()
+    
+    async with lock:
+        client = _async_clients.get(loop)
+        if client is None:
+            config = get_config()
+            client = await acreate_client(
+                config.supabase_url,
+                config.service_key,
+                options=AsyncClientOptions(postgrest_client_timeout=ASYNC_DB_TIMEOUT),
+            )
+            with _async_registry_lock:
+                _async_clients[loop] = client
+    return client
+
+
+async def close_supabase_async() -> None:
+    """
+    Close the pooled async client connections of the running event loop.
+    
+    Called from the application shutdown hook. Clients of other loops are
+    dropped with their loop.
+    """
+    loop = asyncio.get_running_loop()
+    with _async_registry_lock:
+        client = _async_clients.pop(loop, None)
+    if client is None:
+        return
+    try:
+        await client.postgrest.aclose()
+    except Exception:
+        pass
+
+
 # Convenience exports
 def get_supabase_url() -> str:
     """Get the Supabase URL."""
@@ -3,15 +3,69 @@ from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from typing import Tuple, Optional, List
 from dataclasses import dataclass
 from datetime import datetime
+import asyncio
+import logging
+import time
 import jwt
 import os
 from dotenv import load_dotenv
 
+from app.utils.cache import TTLCache, MISSING
+
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 security = HTTPBearer()
 
 
+# ============================================================
+# Auth Resolution Cache
+# ============================================================
+# Every authenticated request resolves user -> organization (and admin
+# routes user -> admin role). These rarely change, so they are cached
+# per worker with a short TTL. Routers that change membership or admin
+# rows call invalidate_auth_cache() so changes apply immediately on the
+# worker that made them; other workers pick them up within the TTL.
+
+AUTH_CACHE_TTL_SECONDS = int(os.getenv("AUTH_CACHE_TTL_SECONDS", "60"))
+AUTH_CACHE_MAX_ENTRIES = int(os.getenv("AUTH_CACHE_MAX_ENTRIES", "10000"))
+
+# Minimum interval between last_admin_login_at writes per admin
+ADMIN_LOGIN_WRITE_INTERVAL_SECONDS = int(os.getenv("ADMIN_LOGIN_WRITE_INTERVAL_SECONDS", "300"))
+
+# user_id -> organization_id (only positive results are cached)
+_org_cache: TTLCache = TTLCache(maxsize=AUTH_CACHE_MAX_ENTRIES, ttl_seconds=AUTH_CACHE_TTL_SECONDS)
+
+# user_id -> admin_users row ({id, role, is_active}) or None for non-admins
+_admin_cache: TTLCache = TTLCache(maxsize=AUTH_CACHE_MAX_ENTRIES, ttl_seconds=AUTH_CACHE_TTL_SECONDS)
+
+# admin_id -> monotonic time of the last last_admin_login_at write
+_admin_login_written_at: dict = {}
+
+# Keep references to fire-and-forget tasks so they are not garbage collected
+_background_tasks: set = set()
+
+
+def invalidate_auth_cache(user_id: str) -> None:
+    """
+    Drop cached organization and admin resolution for a user.
+    
+    Call this after inserting/deleting organization_members rows or
+    changing admin_users for the user.
+    """
+    _org_cache.invalidate(user_id)
+    _admin_cache.invalidate(user_id)
+
+
+def get_auth_cache_stats() -> dict:
+    """Cache statistics (used by admin health/debug endpoints)."""
+    return {
+        "organizations": _org_cache.stats(),
+        "admins": _admin_cache.stats(),
+    }
+
+
 # ============================================================
 # Admin Types
 # ============================================================
@@ -52,6 +106,11 @@ def _get_supabase():
         _supabase_service = get_supabase_service()
     return _supabase_service
 
+async def _get_supabase_async():
+    """Lazy load the non-blocking supabase client (for async dependencies)."""
+    from app.database import get_supabase_async
+    return await get_supabase_async()
+
 def get_auth_token(credentials: HTTPAuthorizationCredentials = Depends(security)) -> str:
     """
     Returns the raw JWT token from the Authorization header.
@@ -113,8 +172,12 @@ async def get_user_org(current_user: dict = Depends(get_current_user)) -> Tuple[
             detail="Invalid user token"
         )
     
-    supabase = _get_supabase()
-    org_result = supabase.table("organization_members").select("organization_id").eq("user_id", user_id).limit(1).execute()
+    organization_id = _org_cache.get(user_id)
+    if organization_id is not MISSING:
+        return user_id, organization_id
+    
+    supabase = await _get_supabase_async()
+    org_result = await supabase.table("organization_members").select("organization_id").eq("user_id", user_id).limit(1).execute()
     
     if not org_result.data:
         raise HTTPException(
@@ -122,7 +185,9 @@ async def get_user_org(current_user: dict = Depends(get_current_user)) -> Tuple[
             detail="User has no organization"
         )
     
-    return user_id, org_result.data[0]["organization_id"]
+    organization_id = org_result.data[0]["organization_id"]
+    _org_cache.set(user_id, organization_id)
+    return user_id, organization_id
 
 
 def get_organization_id(user_id: str) -> str:
@@ -132,6 +197,10 @@ def get_organization_id(user_id: str) -> str:
     Use this in background tasks where you already have the user_id.
     For route handlers, prefer get_user_org() dependency.
     """
+    organization_id = _org_cache.get(user_id)
+    if organization_id is not MISSING:
+        return organization_id
+    
     supabase = _get_supabase()
     response = supabase.table("organization_members").select("organization_id").eq("user_id", user_id).limit(1).execute()
     
@@ -141,13 +210,75 @@ def get_organization_id(user_id: str) -> str:
             detail="User not in any organization"
         )
     
-    return response.data[0]["organization_id"]
+    organization_id = response.data[0]["organization_id"]
+    _org_cache.set(user_id, organization_id)
+    return organization_id
 
 
 # ============================================================
 # Admin Dependencies
 # ============================================================
 
+async def _resolve_admin(user_id: str) -> Optional[dict]:
+    """
+    Get the active admin_users row for a user (cached).
+    
+    Returns:
+        Dict with id, role, is_active - or None if user is not an active admin
+    """
+    cached = _admin_cache.get(user_id)
+    if cached is not MISSING:
+        return cached
+    
+    supabase = await _get_supabase_async()
+    try:
+        result = await supabase.table("admin_users") \
+            .select("id, role, is_active") \
+            .eq("user_id", user_id) \
+            .eq("is_active", True) \
+            .maybe_single() \
+            .execute()
+    except Exception as e:
+        # Don't cache lookup failures
+        logger.warning(f"Admin lookup failed for {user_id[:8]}: {e}")
+        return None
+    
+    admin_data = result.data if result and result.data else None
+    _admin_cache.set(user_id, admin_data)
+    return admin_data
+
+
+def _touch_admin_login(admin_id: str) -> None:
+    """
+    Record admin activity in last_admin_login_at.
+    
+    Writes are throttled to one per ADMIN_LOGIN_WRITE_INTERVAL_SECONDS per
+    admin, so a burst of admin requests coalesces into a single UPDATE. The
+    write runs as a background task and never delays the request.
+    """
+    now = time.monotonic()
+    last = _admin_login_written_at.get(admin_id)
+    if last is not None and now - last < ADMIN_LOGIN_WRITE_INTERVAL_SECONDS:
+        return
+    _admin_login_written_at[admin_id] = now
+    
+    async def _write():
+        try:
+            supabase = await _get_supabase_async()
+            await supabase.table("admin_users") \
+                .update({"last_admin_login_at": datetime.utcnow().isoformat()}) \
+                .eq("id", admin_id) \
+                .execute()
+        except Exception as e:
+            # Allow a retry on the next request
+            _admin_login_written_at.pop(admin_id, None)
+            logger.warning(f"Failed to update last_admin_login_at: {e}")
+    
+    task = asyncio.create_task(_write())
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+
+
 async def get_admin_user(
     current_user: dict = Depends(get_current_user),
     request: Request = None
@@ -165,32 +296,17 @@ async def get_admin_user(
             detail="Invalid user token"
         )
     
-    supabase = _get_supabase()
-    
     # Check if user is an admin
-    try:
-        result = supabase.table("admin_users") \
-            .select("id, role, is_active") \
-            .eq("user_id", user_id) \
-            .eq("is_active", True) \
-            .maybe_single() \
-            .execute()
-    except Exception:
-        result = None
+    admin_data = await _resolve_admin(user_id)
     
-    if not result or not result.data:
+    if not admin_data:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Admin access required"
         )
     
-    admin_data = result.data
-    
-    # Update last_admin_login_at
-    supabase.table("admin_users") \
-        .update({"last_admin_login_at": datetime.utcnow().isoformat()}) \
-        .eq("id", admin_data["id"]) \
-        .execute()
+    # Update last_admin_login_at (throttled, off the request path)
+    _touch_admin_login(admin_data["id"])
     
     # Get user email for context
     email = current_user.get("email")
@@ -250,22 +366,15 @@ async def get_optional_admin(
         if not user_id:
             return None
         
-        supabase = _get_supabase()
-        result = supabase.table("admin_users") \
-            .select("id, role, is_active") \
-            .eq("user_id", user_id) \
-            .eq("is_active", True) \
-            .maybe_single() \
-            .execute()
-        
-        if not result.data:
+        admin_data = await _resolve_admin(user_id)
+        if not admin_data:
             return None
         
         return AdminContext(
             user_id=user_id,
-            admin_id=result.data["id"],
-            role=result.data["role"],
-            is_active=result.data["is_active"],
+            admin_id=admin_data["id"],
+            role=admin_data["role"],
+            is_active=admin_data["is_active"],
             email=payload.get("email")
         )
     except Exception:
@@ -283,14 +392,14 @@ async def get_subscription_features(org_id: str) -> dict:
     Returns:
         Dict with feature flags (e.g., {"ai_notetaker": true, "crm_integration": false})
     """
-    supabase = _get_supabase()
+    supabase = await _get_supabase_async()
     
     # Get subscription with plan features
-    result = supabase.table("organization_subscriptions").select(
+    result = await supabase.table("organization_subscriptions").select(
         "plan_id, subscription_plans(features)"
     ).eq("organization_id", org_id).maybe_single().execute()
     
-    if not result.data:
+    if not result or not result.data:
         # No subscription = free plan defaults
         return {
             "flow_limit": 2,
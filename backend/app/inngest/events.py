@@ -131,6 +131,9 @@ class Events:
     FOLLOWUP_COMPLETED = "dealmotion/followup.completed"
     FOLLOWUP_FAILED = "dealmotion/followup.failed"
     
+    # Mobile App Recordings
+    MOBILE_RECORDING_UPLOADED = "dealmotion/mobile.recording.uploaded"
+    
     # AI Notetaker
     AI_NOTETAKER_RECORDING_COMPLETE = "dealmotion/ai-notetaker.recording.complete"
     AI_NOTETAKER_EMAIL_RECEIVED = "dealmotion/ai-notetaker.email.received"
@@ -160,6 +163,7 @@ class Events:
     # Calendar Integration
     CALENDAR_SYNC_REQUESTED = "dealmotion/calendar.sync.requested"
     CALENDAR_SYNC_COMPLETED = "dealmotion/calendar.sync.completed"
+    CALENDAR_AUTO_RECORD_REQUESTED = "dealmotion/calendar.auto_record.requested"
     
     # Fireflies Integration
     FIREFLIES_SYNC_REQUESTED = "dealmotion/fireflies.sync.requested"
@@ -11,9 +11,10 @@ from .contacts import analyze_contact_fn
 from .followup_actions import generate_followup_action_fn
 from .knowledge_base import process_knowledge_file_fn
 from .calendar import sync_all_calendars_fn, sync_calendar_connection_fn
-from .calendar_post_sync import process_calendar_post_sync_fn
+from .calendar_post_sync import process_calendar_post_sync_fn, process_calendar_auto_record_fn
 from .fireflies import sync_all_fireflies_fn, sync_fireflies_user_fn
 from .ai_notetaker import process_ai_notetaker_recording_fn
+from .mobile_recordings import process_mobile_recording_fn
 from .email_invite import process_email_invite_fn
 from .autopilot_detection import (
     detect_calendar_opportunities_fn,
@@ -29,6 +30,9 @@ from .autopilot_detection import (
 from .autopilot_execution import execute_proposal_fn
 from .prospecting import process_prospecting_discovery_fn
 from .credit_reset import credit_reset_daily_fn
+from .cost_rollups import refresh_cost_rollups_fn
+from .admin_health import admin_health_probe_fn
+from .prospect_counters import reconcile_prospect_counters_fn
 from .magic_onboarding import magic_onboard_sales_fn, magic_onboard_company_fn
 from .profile_finalize import profile_finalize_fn
 from .gdpr import (
@@ -67,9 +71,11 @@ all_functions = [
     sync_all_calendars_fn,
     sync_calendar_connection_fn,
     process_calendar_post_sync_fn,
+    process_calendar_auto_record_fn,
     sync_all_fireflies_fn,
     sync_fireflies_user_fn,
     process_ai_notetaker_recording_fn,
+    process_mobile_recording_fn,
     process_email_invite_fn,
     # Autopilot functions
     detect_calendar_opportunities_fn,
@@ -86,6 +92,11 @@ all_functions = [
     process_prospecting_discovery_fn,
     # Credit management
     credit_reset_daily_fn,
+    # Admin cost analytics
+    refresh_cost_rollups_fn,
+    admin_health_probe_fn,
+    # Prospect counters
+    reconcile_prospect_counters_fn,
     # Magic Onboarding
     magic_onboard_sales_fn,
     magic_onboard_company_fn,
@@ -123,9 +134,11 @@ __all__ = [
     "sync_all_calendars_fn",
     "sync_calendar_connection_fn",
     "process_calendar_post_sync_fn",
+    "process_calendar_auto_record_fn",
     "sync_all_fireflies_fn",
     "sync_fireflies_user_fn",
     "process_ai_notetaker_recording_fn",
+    "process_mobile_recording_fn",
     "process_email_invite_fn",
     # Autopilot functions
     "detect_calendar_opportunities_fn",
@@ -142,6 +155,9 @@ __all__ = [
     "process_prospecting_discovery_fn",
     # Credit management
     "credit_reset_daily_fn",
+    "refresh_cost_rollups_fn",
+    "admin_health_probe_fn",
+    "reconcile_prospect_counters_fn",
     # Magic Onboarding
     "magic_onboard_sales_fn",
     "magic_onboard_company_fn",
@@ -0,0 +1,44 @@
+"""
+Admin Health Probe Cron Job
+
+Runs one round of service health checks for the whole deployment (see
+app.services.health_prober) and logs it to admin_service_health_logs, so
+external services are probed once per interval rather than once per
+worker.
+
+Schedule: Every 10 minutes
+"""
+
+import logging
+from inngest import TriggerCron, Concurrency
+from app.inngest.client import inngest_client
+
+logger = logging.getLogger(__name__)
+
+
+async def run_health_probe() -> dict:
+    """Probe all services; returns status counts (results stay in the prober)."""
+    # Imported here: the checks live in the admin router
+    from app.routers.admin.health import health_prober
+    
+    results = await health_prober.probe()
+    
+    counts = {}
+    for result in results:
+        counts[result.status] = counts.get(result.status, 0) + 1
+    return {"services": len(results), "by_status": counts}
+
+
+@inngest_client.create_function(
+    fn_id="admin-health-probe",
+    trigger=TriggerCron(cron="*/10 * * * *"),  # Every 10 minutes
+    retries=0,
+    concurrency=[Concurrency(limit=1)],
+)
+async def admin_health_probe_fn(ctx, step):
+    """Scheduled service health probe for the admin health page."""
+    summary = await step.run("probe-services", run_health_probe)
+    
+    logger.info(f"Health probe: {summary['services']} services {summary['by_status']}")
+    
+    return summary
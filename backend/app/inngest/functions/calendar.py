@@ -4,26 +4,40 @@ Calendar Sync Inngest Functions.
 Handles automated calendar synchronization and cleanup.
 
 Functions:
-- sync_all_calendars: Cron job to sync all active calendar connections
+- sync_all_calendars: Cron job that fans out one sync event per active connection
 - sync_single_calendar: Event-triggered sync for a specific connection
 - cleanup_old_meetings: Daily job to remove old calendar meetings
+
+Concurrency:
+- At most CALENDAR_SYNC_CONCURRENCY connections sync at once, and at most
+  CALENDAR_SYNC_PROVIDER_CONCURRENCY per provider (Google/Microsoft).
+- Provider API requests are additionally paced by the per-provider token
+  buckets in calendar_sync.
+- Auto-record scheduling is handed to calendar-auto-record, which runs one
+  at a time per user, so connections of the same user syncing concurrently
+  cannot schedule duplicate bots.
 """
 
+import os
+import asyncio
 import logging
 from datetime import datetime, timedelta
 import inngest
-from inngest import TriggerEvent, TriggerCron
+from inngest import TriggerEvent, TriggerCron, Concurrency
 
 from app.inngest.client import inngest_client
 from app.database import get_supabase_service
 from app.services.calendar_sync import CalendarSyncService
-from app.services.auto_record_matcher import process_calendar_for_auto_record
 
 logger = logging.getLogger(__name__)
 
 # Database client
 supabase = get_supabase_service()
 
+# Connection syncs running at once (all providers / per provider)
+CALENDAR_SYNC_CONCURRENCY = int(os.getenv("CALENDAR_SYNC_CONCURRENCY", "20"))
+CALENDAR_SYNC_PROVIDER_CONCURRENCY = int(os.getenv("CALENDAR_SYNC_PROVIDER_CONCURRENCY", "10"))
+
 
 @inngest_client.create_function(
     fn_id="sync-all-calendars",
@@ -34,7 +48,10 @@ async def sync_all_calendars_fn(ctx, step):
     """
     Scheduled job to sync all active calendar connections.
     
-    Runs every 15 minutes to keep calendar data fresh.
+    Runs every 15 minutes to keep calendar data fresh. Only schedules the
+    work: one dealmotion/calendar.sync.requested event is sent per
+    connection, and sync-calendar-connection runs them with bounded
+    concurrency (including prospect matching + auto-record per connection).
     """
     logger.info("Starting scheduled calendar sync for all connections")
     
@@ -47,76 +64,32 @@ async def sync_all_calendars_fn(ctx, step):
     
     logger.info(f"Found {len(connections)} active connections to sync")
     
-    # Step 2: Sync each connection
-    results = []
-    for conn in connections:
-        try:
-            result = await step.run(
-                f"sync-connection-{conn['id'][:8]}",
-                sync_connection,
-                conn["id"]
+    # Step 2: Fan out one sync event per connection
+    await step.send_event(
+        "fan-out-connection-syncs",
+        [
+            inngest.Event(
+                name="dealmotion/calendar.sync.requested",
+                data={
+                    "connection_id": conn["id"],
+                    "provider": conn["provider"],
+                    "user_id": conn.get("user_id"),
+                    "organization_id": conn.get("organization_id"),
+                    "source": "scheduled",
+                }
             )
-            results.append({
-                "connection_id": conn["id"],
-                "provider": conn["provider"],
-                "user_id": conn.get("user_id"),
-                "organization_id": conn.get("organization_id"),
-                "success": True,
-                **result
-            })
-        except Exception as e:
-            logger.error(f"Failed to sync connection {conn['id']}: {e}")
-            results.append({
-                "connection_id": conn["id"],
-                "provider": conn["provider"],
-                "success": False,
-                "error": str(e)
-            })
-    
-    # Step 3: Post-process for each unique user (prospect matching + auto-record)
-    # Group by user to avoid duplicate processing
-    from app.inngest.functions.calendar_post_sync import run_prospect_matching
+            for conn in connections
+        ]
+    )
     
-    processed_users = set()
-    for r in results:
-        if not r.get("success"):
-            continue
-        user_id = r.get("user_id")
-        org_id = r.get("organization_id")
-        if not user_id or not org_id:
-            continue
-        if user_id in processed_users:
-            continue
-        processed_users.add(user_id)
-        
-        try:
-            # Run prospect matching
-            match_result = await step.run(
-                f"prospect-match-{user_id[:8]}",
-                run_prospect_matching,
-                user_id, org_id
-            )
-            logger.info(f"User {user_id[:8]}: {match_result.get('auto_linked', 0)} prospects auto-linked")
-            
-            # Run auto-record processing
-            auto_result = await step.run(
-                f"auto-record-{user_id[:8]}",
-                process_calendar_for_auto_record,
-                user_id, org_id
-            )
-            logger.info(f"User {user_id[:8]}: {auto_result.get('scheduled', 0)} recordings scheduled")
-        except Exception as e:
-            logger.error(f"Post-processing failed for user {user_id[:8]}: {e}")
-    
-    # Summary
-    successful = sum(1 for r in results if r["success"])
-    logger.info(f"Calendar sync complete: {successful}/{len(results)} successful, {len(processed_users)} users post-processed")
+    by_provider = {}
+    for conn in connections:
+        by_provider[conn["provider"]] = by_provider.get(conn["provider"], 0) + 1
+    logger.info(f"Scheduled calendar sync for {len(connections)} connections: {by_provider}")
     
     return {
-        "synced": len(results),
-        "successful": successful,
-        "users_processed": len(processed_users),
-        "results": results
+        "scheduled": len(connections),
+        "by_provider": by_provider
     }
 
 
@@ -124,12 +97,17 @@ async def sync_all_calendars_fn(ctx, step):
     fn_id="sync-calendar-connection",
     trigger=TriggerEvent(event="dealmotion/calendar.sync.requested"),
     retries=2,
+    concurrency=[
+        Concurrency(limit=CALENDAR_SYNC_CONCURRENCY),
+        Concurrency(limit=CALENDAR_SYNC_PROVIDER_CONCURRENCY, key="event.data.provider"),
+    ],
 )
 async def sync_calendar_connection_fn(ctx, step):
     """
     Sync a specific calendar connection.
     
     Triggered when:
+    - The scheduled sync fans out (every 15 minutes)
     - A new calendar connection is created
     - User manually requests a sync
     - Calendar needs re-authentication
@@ -160,7 +138,10 @@ async def sync_calendar_connection_fn(ctx, step):
     
     if user_id and organization_id:
         # Import here to avoid circular imports
-        from app.inngest.functions.calendar_post_sync import run_prospect_matching
+        from app.inngest.functions.calendar_post_sync import (
+            run_prospect_matching,
+            request_auto_record_processing,
+        )
         
         prospect_result = await step.run(
             "prospect-matching",
@@ -169,13 +150,9 @@ async def sync_calendar_connection_fn(ctx, step):
         )
         logger.info(f"Prospect matching: {prospect_result.get('auto_linked', 0)} auto-linked")
         
-        # Step 4: Process auto-record for this user's calendar (if enabled)
-        auto_record_result = await step.run(
-            "process-auto-record",
-            process_calendar_for_auto_record,
-            user_id, organization_id
-        )
-        logger.info(f"Auto-record processed: {auto_record_result.get('scheduled', 0)} scheduled")
+        # Step 4: Request auto-record for this user's calendar (if enabled);
+        # serialized per user across connections by calendar-auto-record
+        await request_auto_record_processing(step, user_id, organization_id)
     
     return {
         "success": True,
@@ -221,17 +198,20 @@ def get_connection(connection_id: str) -> dict:
         return None
 
 
-def sync_connection(connection_id: str) -> dict:
+async def sync_connection(connection_id: str) -> dict:
     """Sync a calendar connection using the sync service."""
     try:
+        # The sync service is blocking - keep it off the event loop so
+        # concurrent syncs on this worker do not stall each other
         sync_service = CalendarSyncService()
-        result = sync_service.sync_connection(connection_id)
+        result = await asyncio.to_thread(sync_service.sync_connection, connection_id)
         
         return {
             "synced_meetings": result.synced_meetings,
             "new_meetings": result.new_meetings,
             "updated_meetings": result.updated_meetings,
             "deleted_meetings": result.deleted_meetings,
+            "incremental": result.incremental,
             "errors": result.errors if result.errors else []
         }
     except Exception as e:
@@ -5,17 +5,25 @@ Handles post-processing after calendar sync completes:
 1. ProspectMatcher - match meetings to prospects
 2. Auto-Record Processing - schedule AI Notetaker bots
 
+Auto-record runs in its own function (calendar-auto-record), limited to one
+run per user: it checks for existing scheduled_recordings before inserting,
+so two syncs of the same user (e.g. Google and Microsoft connections) running
+it at once would each schedule a bot for a shared meeting.
+
 This ensures:
 - Fast API response (sync doesn't wait for matching)
 - Reliable retries on failure
 - Proper ordering (matching completes before auto-record)
 - Scalability for many users
 
-Event: dealmotion/calendar.sync.completed
+Events:
+- dealmotion/calendar.sync.completed
+- dealmotion/calendar.auto_record.requested
 """
 
 import logging
-from inngest import TriggerEvent
+import inngest
+from inngest import TriggerEvent, Concurrency
 
 from app.inngest.client import inngest_client
 from app.database import get_supabase_service
@@ -103,6 +111,44 @@ async def run_auto_record_processing(user_id: str, organization_id: str) -> dict
     return result
 
 
+async def request_auto_record_processing(step, user_id: str, organization_id: str) -> None:
+    """Queue auto-record processing for a user (run by calendar-auto-record, one at a time per user)."""
+    await step.send_event(
+        "request-auto-record",
+        inngest.Event(
+            name="dealmotion/calendar.auto_record.requested",
+            data={"user_id": user_id, "organization_id": organization_id}
+        )
+    )
+
+
+@inngest_client.create_function(
+    fn_id="calendar-auto-record",
+    trigger=TriggerEvent(event="dealmotion/calendar.auto_record.requested"),
+    retries=3,
+    # One run per user at a time: scheduling is check-then-insert per meeting
+    concurrency=[
+        Concurrency(limit=1, key="event.data.user_id"),
+    ],
+)
+async def process_calendar_auto_record_fn(ctx, step):
+    """
+    Schedule AI Notetaker bots for a user's qualifying meetings.
+    
+    Requested after prospect matching by calendar-post-sync and
+    sync-calendar-connection.
+    """
+    event_data = ctx.event.data
+    user_id = event_data["user_id"]
+    organization_id = event_data["organization_id"]
+    
+    return await step.run(
+        "auto-record-processing",
+        run_auto_record_processing,
+        user_id, organization_id
+    )
+
+
 @inngest_client.create_function(
     fn_id="calendar-post-sync",
     trigger=TriggerEvent(event="dealmotion/calendar.sync.completed"),
@@ -114,7 +160,7 @@ async def process_calendar_post_sync_fn(ctx, step):
     
     Steps:
     1. Run ProspectMatcher to link meetings to prospects
-    2. Run auto-record processing to schedule AI Notetaker bots
+    2. Request auto-record processing to schedule AI Notetaker bots
     
     The order is important: matching must complete BEFORE auto-record
     so that scheduled recordings have the prospect_id.
@@ -143,16 +189,12 @@ async def process_calendar_post_sync_fn(ctx, step):
     else:
         logger.warning(f"[POST-SYNC] Skipping ProspectMatcher - no new/updated meetings (new={new_meetings}, updated={updated_meetings})")
     
-    # Step 2: Run auto-record processing (always, to catch any eligible meetings)
-    auto_record_result = await step.run(
-        "auto-record-processing",
-        run_auto_record_processing,
-        user_id, organization_id
-    )
+    # Step 2: Request auto-record processing (always, to catch any eligible meetings)
+    await request_auto_record_processing(step, user_id, organization_id)
     
     return {
         "user_id": user_id,
         "prospect_matching": match_result,
-        "auto_record": auto_record_result
+        "auto_record": "requested"
     }
 
@@ -24,6 +24,8 @@ from app.inngest.client import inngest_client
 from app.database import get_supabase_service
 from app.services.contact_analyzer import get_contact_analyzer
 from app.services.credit_service import get_credit_service
+from app.services.prospect_hub import invalidate_prospect_hub
+from app.services.action_generator import invalidate_prospect_action_contexts
 
 logger = logging.getLogger(__name__)
 
@@ -227,11 +229,15 @@ async def save_contact_analysis(
             "analysis_source": "linkedin" if linkedin_url else "role_based"
         }
         
-        supabase.table("prospect_contacts")\
+        result = supabase.table("prospect_contacts")\
             .update(update_data)\
             .eq("id", contact_id)\
             .execute()
         
+        if result.data:
+            invalidate_prospect_hub(result.data[0].get("prospect_id"))
+            invalidate_prospect_action_contexts(result.data[0].get("organization_id"), result.data[0].get("prospect_id"))
+        
         logger.info(f"Saved analysis for contact {contact_id}")
         return {"saved": True}
     except Exception as e:
@@ -0,0 +1,77 @@
+"""
+Cost Rollups Cron Job
+
+Keeps api_usage_rollups_hourly / api_usage_rollups_daily up to date for the
+admin cost analytics. Each run rolls up the api_usage_logs written since the
+stored watermark (see migration_api_usage_rollups.sql); after downtime or on
+the first run it catches up one day of logs per step.
+
+Schedule: Every 10 minutes
+"""
+
+import os
+import logging
+from inngest import TriggerCron, Concurrency
+from app.inngest.client import inngest_client
+from app.database import get_supabase_service
+
+logger = logging.getLogger(__name__)
+
+# Logs younger than this are left for the next run (created_at is the
+# inserting transaction's start time, so rows can appear slightly late)
+ROLLUP_LAG_MINUTES = int(os.getenv("COST_ROLLUP_LAG_MINUTES", "5"))
+
+# Max windows (of up to a day each) rolled up per run
+ROLLUP_MAX_STEPS = int(os.getenv("COST_ROLLUP_MAX_STEPS", "30"))
+
+
+def refresh_cost_rollups() -> dict:
+    """Roll up the next window of api_usage_logs and advance the watermark."""
+    supabase = get_supabase_service()
+    result = supabase.rpc("refresh_api_usage_rollups", {
+        "p_lag": f"{ROLLUP_LAG_MINUTES} minutes",
+        "p_max_window": "1 day",
+    }).execute()
+    
+    row = (result.data or [{}])[0]
+    return {
+        "window_start": row.get("window_start"),
+        "window_end": row.get("window_end"),
+        "logs_rolled_up": row.get("logs_rolled_up", 0),
+        "caught_up": row.get("caught_up", True),
+    }
+
+
+@inngest_client.create_function(
+    fn_id="cost-rollups-refresh",
+    trigger=TriggerCron(cron="*/10 * * * *"),  # Every 10 minutes
+    retries=2,
+    concurrency=[Concurrency(limit=1)],
+)
+async def refresh_cost_rollups_fn(ctx, step):
+    """
+    Scheduled job to roll up new API usage logs.
+    
+    Repeats the refresh step until the rollups are caught up (bounded by
+    ROLLUP_MAX_STEPS; the next run continues from the watermark).
+    """
+    logs_rolled_up = 0
+    window = {}
+    
+    for index in range(ROLLUP_MAX_STEPS):
+        window = await step.run(f"refresh-rollups-{index}", refresh_cost_rollups)
+        logs_rolled_up += window["logs_rolled_up"] or 0
+        if window["caught_up"]:
+            break
+    
+    logger.info(
+        f"Cost rollups refreshed up to {window.get('window_end')} "
+        f"({logs_rolled_up} logs, caught up: {window.get('caught_up')})"
+    )
+    
+    return {
+        "status": "ok",
+        "logs_rolled_up": logs_rolled_up,
+        "watermark": window.get("window_end"),
+        "caught_up": window.get("caught_up"),
+    }
@@ -22,7 +22,11 @@ from inngest import NonRetriableError, TriggerEvent, Throttle
 
 from app.inngest.client import inngest_client
 from app.database import get_supabase_service
+from app.services.coach_rules import invalidate_coach_context
+from app.services.action_generator import invalidate_action_context
+from app.services.prospect_hub import invalidate_prospect_hubs
 from app.services.transcription_service import get_transcription_service
+from app.inngest.functions.mobile_recordings import update_mobile_recording_status
 from app.services.followup_generator import get_followup_generator
 from app.services.prospect_context_service import get_prospect_context_service
 from app.services.api_usage_service import get_api_usage_service
@@ -38,10 +42,36 @@ supabase = get_supabase_service()
 # Function 1: Process Audio Upload (Transcribe + Summarize)
 # =============================================================================
 
+async def on_followup_audio_failure(ctx, step):
+    """
+    Runs once process_followup_audio_fn has exhausted its retries.
+    
+    Marks the followup failed and, for mobile app uploads, the
+    mobile_recordings row, so neither stays in a processing state.
+    """
+    original_event = ctx.event.data.get("event") or {}
+    event_data = original_event.get("data") or {}
+    error = (ctx.event.data.get("error") or {}).get("message") or "Processing failed"
+    followup_id = event_data.get("followup_id")
+    mobile_recording_id = event_data.get("mobile_recording_id")
+    
+    logger.error(f"Followup audio processing failed for {followup_id}: {error}")
+    
+    if followup_id:
+        await step.run("mark-followup-failed", mark_transcription_failed, followup_id, error)
+    if mobile_recording_id:
+        await step.run(
+            "mark-mobile-recording-failed",
+            update_mobile_recording_status,
+            mobile_recording_id, "failed", error
+        )
+
+
 @inngest_client.create_function(
     fn_id="followup-process-audio",
     trigger=TriggerEvent(event="dealmotion/followup.audio.uploaded"),
     retries=2,
+    on_failure=on_followup_audio_failure,
     # Throttle: Max 5 audio followups per minute per user
     # Audio processing is heavy (Deepgram + Claude)
     throttle=Throttle(
@@ -56,7 +86,7 @@ async def process_followup_audio_fn(ctx, step):
     
     Steps:
     1. Update status to 'transcribing'
-    2. Download audio from storage and transcribe
+    2. Transcribe audio from storage (chunked + parallel for long recordings)
     3. Update status to 'summarizing'
     4. Get prospect context
     5. Generate summary with AI
@@ -67,23 +97,25 @@ async def process_followup_audio_fn(ctx, step):
     event_data = ctx.event.data
     followup_id = event_data["followup_id"]
     storage_path = event_data["storage_path"]  # Path in Supabase Storage
+    storage_bucket = event_data.get("storage_bucket", "followup-audio")
     filename = event_data["filename"]
     organization_id = event_data["organization_id"]
     user_id = event_data["user_id"]
     meeting_prep_id = event_data.get("meeting_prep_id")
     prospect_company = event_data.get("prospect_company")
     language = event_data.get("language", "en")
+    mobile_recording_id = event_data.get("mobile_recording_id")  # Set for mobile app uploads
     
     logger.info(f"Starting Inngest followup audio processing for {followup_id}")
     
     # Step 1: Update status to transcribing
     await step.run("update-status-transcribing", update_followup_status, followup_id, "transcribing")
     
-    # Step 2: Download audio from storage and transcribe
+    # Step 2: Transcribe audio from storage
     transcription_result = await step.run(
         "transcribe-audio",
         transcribe_audio_from_storage,
-        storage_path, filename, language
+        storage_path, filename, language, storage_bucket
     )
     
     # Log API usage and consume credits for transcription (Deepgram)
@@ -129,6 +161,12 @@ async def process_followup_audio_fn(ctx, step):
             mark_transcription_failed,
             followup_id, "Transcription returned empty text - audio may be too short, silent, or in unsupported format"
         )
+        if mobile_recording_id:
+            await step.run(
+                "mark-mobile-recording-failed",
+                update_mobile_recording_status,
+                mobile_recording_id, "failed", "Empty transcription"
+            )
         return {
             "followup_id": followup_id,
             "status": "failed",
@@ -217,6 +255,16 @@ async def process_followup_audio_fn(ctx, step):
         )
     )
     
+    if mobile_recording_id:
+        await step.run(
+            "mark-mobile-recording-completed",
+            update_mobile_recording_status,
+            mobile_recording_id, "completed"
+        )
+    
+    invalidate_coach_context(organization_id=organization_id)
+    invalidate_action_context(followup_id)
+    
     logger.info(f"Followup audio processing completed for {followup_id}")
     
     return {
@@ -349,6 +397,9 @@ async def process_followup_transcript_fn(ctx, step):
         )
     )
     
+    invalidate_coach_context(organization_id=organization_id)
+    invalidate_action_context(followup_id)
+    
     logger.info(f"Followup transcript processing completed for {followup_id}")
     
     return {
@@ -363,39 +414,45 @@ async def process_followup_transcript_fn(ctx, step):
 
 async def update_followup_status(followup_id: str, status: str) -> dict:
     """Update followup status in database."""
-    supabase.table("followups").update({
+    result = supabase.table("followups").update({
         "status": status
     }).eq("id", followup_id).execute()
+    invalidate_prospect_hubs(result.data)
     return {"updated": True, "status": status}
 
 
 async def mark_transcription_failed(followup_id: str, error_message: str) -> dict:
     """Mark followup as failed due to transcription error."""
-    supabase.table("followups").update({
+    result = supabase.table("followups").update({
         "status": "failed",
         "error_message": error_message
     }).eq("id", followup_id).execute()
+    invalidate_prospect_hubs(result.data)
     logger.error(f"Followup {followup_id} marked as failed: {error_message}")
     return {"updated": True, "status": "failed"}
 
 
-async def transcribe_audio_from_storage(storage_path: str, filename: str, language: str) -> dict:
-    """Download audio from Supabase Storage and transcribe."""
+async def transcribe_audio_from_storage(
+    storage_path: str,
+    filename: str,
+    language: str,
+    bucket: str = "followup-audio"
+) -> dict:
+    """Transcribe audio straight from Supabase Storage (streamed through ffmpeg, not downloaded)."""
     try:
-        # Download audio from storage
-        logger.info(f"Downloading audio from storage: {storage_path}")
-        response = supabase.storage.from_("followup-audio").download(storage_path)
-        audio_bytes = response
+        # Short-lived signed URL; ffmpeg reads the recording from storage itself
+        signed = supabase.storage.from_(bucket).create_signed_url(storage_path, 3600)
+        audio_url = (signed.get("signedURL") or signed.get("signedUrl")) if isinstance(signed, dict) else None
         
-        if not audio_bytes:
-            logger.error(f"Downloaded empty audio file from {storage_path}")
-            raise NonRetriableError(f"Empty audio file downloaded from storage")
+        if not audio_url:
+            logger.error(f"Could not create signed URL for {storage_path}")
+            raise NonRetriableError("Audio file not found in storage")
         
-        logger.info(f"Downloaded {len(audio_bytes)} bytes, starting transcription for {filename}")
+        logger.info(f"Starting transcription for {filename} from storage: {storage_path}")
         
         transcription_service = get_transcription_service()
-        result = await transcription_service.transcribe_audio_bytes(
-            audio_bytes,
+        result = await transcription_service.transcribe_audio_stream(
+            audio_url,
             filename,
             language=language
         )
@@ -550,16 +607,18 @@ async def save_followup_results(
             "full_summary_content": summary.get("full_content", "")
         }
         
-        supabase.table("followups").update(update_data).eq("id", followup_id).execute()
+        saved = supabase.table("followups").update(update_data).eq("id", followup_id).execute()
+        invalidate_prospect_hubs(saved.data)
         
         logger.info(f"Saved followup results for {followup_id}")
         return {"saved": True}
     except Exception as e:
         logger.error(f"Failed to save followup results: {e}")
         # Mark as failed
-        supabase.table("followups").update({
+        failed = supabase.table("followups").update({
             "status": "failed",
             "error_message": str(e)
         }).eq("id", followup_id).execute()
+        invalidate_prospect_hubs(failed.data)
         raise NonRetriableError(f"Failed to save results: {e}")
 
@@ -28,6 +28,7 @@ from inngest import NonRetriableError, TriggerEvent, Throttle
 
 from app.inngest.client import inngest_client
 from app.database import get_supabase_service
+from app.services.coach_rules import invalidate_coach_context
 from app.models.followup_actions import ActionType
 from app.services.api_usage_service import get_api_usage_service
 from app.services.credit_service import get_credit_service
@@ -160,6 +161,8 @@ async def generate_followup_action_fn(ctx, step):
         )
     )
     
+    invalidate_coach_context(organization_id=organization_id)
+    
     logger.info(f"Action generation completed: {action_type} (id={action_id})")
     
     return {
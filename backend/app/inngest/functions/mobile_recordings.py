@@ -0,0 +1,176 @@
+"""
+Mobile Recording Inngest Functions.
+
+Handles processing of recordings uploaded from the mobile app.
+
+Events:
+- dealmotion/mobile.recording.uploaded: Sent when an upload completes
+
+Flow:
+1. Create followup record for the recording (idempotent)
+2. Link it on the mobile recording and mark it 'processing'
+3. Trigger transcription pipeline (via FOLLOWUP_AUDIO_UPLOADED), which
+   reads the audio from the recordings bucket and reports back via
+   update_mobile_recording_status()
+"""
+
+import logging
+from datetime import datetime
+from typing import Optional
+from inngest import TriggerEvent
+
+from app.inngest.client import inngest_client
+from app.inngest.events import send_event, Events
+from app.inngest.functions.ai_notetaker import get_user_output_language
+from app.database import get_supabase_service
+
+logger = logging.getLogger(__name__)
+
+RECORDINGS_BUCKET = "recordings"
+
+
+# =============================================================================
+# Helper Functions
+# =============================================================================
+
+def create_followup_for_recording(recording_id: str) -> dict:
+    """Create (or return the existing) followup for a mobile recording."""
+    supabase = get_supabase_service()
+    
+    recording = supabase.table("mobile_recordings").select(
+        "id, organization_id, user_id, prospect_id, storage_path, original_filename, "
+        "file_size_bytes, followup_id"
+    ).eq("id", recording_id).limit(1).execute()
+    
+    if not recording.data:
+        raise Exception(f"Mobile recording {recording_id} not found")
+    
+    row = recording.data[0]
+    
+    # Fetch prospect company name for context
+    prospect_company = None
+    if row.get("prospect_id"):
+        prospect_result = supabase.table("prospects").select("company_name").eq("id", row["prospect_id"]).limit(1).execute()
+        if prospect_result.data:
+            prospect_company = prospect_result.data[0].get("company_name")
+    
+    followup_id = row.get("followup_id")
+    if not followup_id:
+        result = supabase.table("followups").insert({
+            "organization_id": row["organization_id"],
+            "user_id": row["user_id"],
+            "prospect_id": row.get("prospect_id"),
+            "prospect_company_name": prospect_company,
+            "meeting_subject": "Mobile Recording",
+            "status": "pending",
+            "audio_filename": row.get("original_filename"),
+            "audio_size_bytes": row.get("file_size_bytes"),
+        }).execute()
+        
+        if not result.data:
+            raise Exception("Failed to create followup record")
+        
+        followup_id = result.data[0]["id"]
+        logger.info(f"Created followup {followup_id} for mobile recording {recording_id}")
+    
+    supabase.table("mobile_recordings").update({
+        "status": "processing",
+        "followup_id": followup_id,
+        "error": None,
+    }).eq("id", recording_id).execute()
+    
+    return {
+        "followup_id": followup_id,
+        "organization_id": row["organization_id"],
+        "user_id": row["user_id"],
+        "storage_path": row["storage_path"],
+        "filename": row.get("original_filename") or "recording.m4a",
+        "prospect_company": prospect_company,
+    }
+
+
+def update_mobile_recording_status(recording_id: str, status: str, error: Optional[str] = None) -> dict:
+    """Mark a mobile recording completed/failed once its followup pipeline ends."""
+    supabase = get_supabase_service()
+    update_data = {"status": status, "error": error}
+    if status == "completed":
+        update_data["processed_at"] = datetime.utcnow().isoformat()
+    supabase.table("mobile_recordings").update(update_data).eq("id", recording_id).execute()
+    logger.info(f"Updated mobile recording {recording_id} status to: {status}")
+    return {"updated": True, "status": status}
+
+
+# =============================================================================
+# Main Inngest Function
+# =============================================================================
+
+@inngest_client.create_function(
+    fn_id="mobile-recording-process",
+    trigger=TriggerEvent(event="dealmotion/mobile.recording.uploaded"),
+    retries=3,
+)
+async def process_mobile_recording_fn(ctx, step):
+    """
+    Hand a completed mobile upload to the followup pipeline.
+    
+    Steps:
+    1. Create followup record and mark recording 'processing'
+    2. Get user's language preference
+    3. Trigger transcription pipeline
+    """
+    event_data = ctx.event.data
+    recording_id = event_data["recording_id"]
+    
+    logger.info(f"Starting mobile recording processing for {recording_id}")
+    
+    try:
+        # Step 1: Create followup record
+        followup = await step.run(
+            "create-followup",
+            create_followup_for_recording,
+            recording_id
+        )
+        
+        # Step 2: Get user's language preference
+        user_language = await step.run(
+            "get-user-language",
+            get_user_output_language,
+            followup["user_id"]
+        )
+        
+        # Step 3: Trigger transcription pipeline
+        await step.run(
+            "trigger-transcription",
+            send_event,
+            Events.FOLLOWUP_AUDIO_UPLOADED,
+            {
+                "followup_id": followup["followup_id"],
+                "storage_bucket": RECORDINGS_BUCKET,
+                "storage_path": followup["storage_path"],
+                "filename": followup["filename"],
+                "organization_id": followup["organization_id"],
+                "user_id": followup["user_id"],
+                "language": user_language,
+                "prospect_company": followup["prospect_company"],
+                "mobile_recording_id": recording_id,
+            }
+        )
+        
+        logger.info(f"Mobile recording {recording_id} -> followup {followup['followup_id']}")
+        
+        return {
+            "recording_id": recording_id,
+            "followup_id": followup["followup_id"],
+            "status": "processing"
+        }
+    
+    except Exception as e:
+        logger.error(f"Mobile recording processing failed for {recording_id}: {e}")
+        
+        await step.run(
+            "mark-failed",
+            update_mobile_recording_status,
+            recording_id, "failed", str(e)
+        )
+        
+        raise  # Re-raise for Inngest retry
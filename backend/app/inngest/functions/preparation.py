@@ -19,6 +19,9 @@ from inngest import NonRetriableError, TriggerEvent, Throttle
 
 from app.inngest.client import inngest_client
 from app.database import get_supabase_service
+from app.services.coach_rules import invalidate_coach_context
+from app.services.prospect_hub import invalidate_prospect_hubs
+from app.services.action_generator import invalidate_prospect_action_contexts
 from app.services.rag_service import rag_service
 from app.services.prep_generator import prep_generator
 
@@ -117,6 +120,8 @@ async def preparation_meeting_fn(ctx, step):
         )
     )
     
+    invalidate_coach_context(organization_id=organization_id)
+    
     logger.info(f"Preparation completed for {prospect_company} (id={prep_id})")
     
     return {
@@ -135,6 +140,7 @@ async def update_prep_status(prep_id: str, status: str) -> dict:
     result = supabase.table("meeting_preps").update({
         "status": status
     }).eq("id", prep_id).execute()
+    invalidate_prospect_hubs(result.data)
     return {"updated": True, "status": status}
 
 
@@ -213,7 +219,7 @@ async def generate_meeting_brief(
 async def save_prep_results(prep_id: str, result: dict) -> dict:
     """Save preparation results to database."""
     try:
-        supabase.table("meeting_preps").update({
+        saved = supabase.table("meeting_preps").update({
             "status": "completed",
             "brief_content": result.get("brief_content"),
             "talking_points": result.get("talking_points"),
@@ -222,15 +228,19 @@ async def save_prep_results(prep_id: str, result: dict) -> dict:
             "rag_sources": result.get("rag_sources"),
             "completed_at": datetime.utcnow().isoformat()
         }).eq("id", prep_id).execute()
+        invalidate_prospect_hubs(saved.data)
+        for row in saved.data or []:
+            invalidate_prospect_action_contexts(row.get("organization_id"), row.get("prospect_id"))
         
         logger.info(f"Saved prep results for {prep_id}")
         return {"saved": True}
     except Exception as e:
         logger.error(f"Failed to save prep results: {e}")
         # Mark as failed
-        supabase.table("meeting_preps").update({
+        failed = supabase.table("meeting_preps").update({
             "status": "failed",
             "error_message": str(e)
         }).eq("id", prep_id).execute()
+        invalidate_prospect_hubs(failed.data)
         raise NonRetriableError(f"Failed to save results: {e}")
 
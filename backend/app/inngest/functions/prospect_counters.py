@@ -0,0 +1,86 @@
+"""
+Prospect Counters Reconciliation Cron Job
+
+The prospect activity counters (prospects.research_count, prep_count,
+followup_count, contact_count) and prospect_status_counts are maintained by
+triggers (see migration_prospect_counters.sql). This job recomputes them
+from the source rows, a batch of organizations per step, and fixes any
+drift.
+
+Schedule: Every day at 03:30 UTC
+"""
+
+import os
+import logging
+from typing import Optional
+from inngest import TriggerCron, Concurrency
+from app.inngest.client import inngest_client
+from app.database import get_supabase_service
+
+logger = logging.getLogger(__name__)
+
+# Organizations reconciled per step
+RECONCILE_BATCH_SIZE = int(os.getenv("PROSPECT_COUNTERS_BATCH_SIZE", "200"))
+
+# Max steps per run (the next run starts from the beginning again)
+RECONCILE_MAX_STEPS = int(os.getenv("PROSPECT_COUNTERS_MAX_STEPS", "200"))
+
+
+def reconcile_prospect_counters(after_organization_id: Optional[str]) -> dict:
+    """Reconcile the counters of the next batch of organizations."""
+    supabase = get_supabase_service()
+    result = supabase.rpc("reconcile_prospect_counters", {
+        "p_after_organization_id": after_organization_id,
+        "p_max_organizations": RECONCILE_BATCH_SIZE,
+    }).execute()
+    
+    row = (result.data or [{}])[0]
+    return {
+        "last_organization_id": row.get("last_organization_id"),
+        "prospects_fixed": row.get("prospects_fixed", 0),
+        "status_counts_fixed": row.get("status_counts_fixed", 0),
+        "done": row.get("done", True),
+    }
+
+
+@inngest_client.create_function(
+    fn_id="prospect-counters-reconcile",
+    trigger=TriggerCron(cron="30 3 * * *"),  # Daily at 03:30 UTC
+    retries=2,
+    concurrency=[Concurrency(limit=1)],
+)
+async def reconcile_prospect_counters_fn(ctx, step):
+    """
+    Scheduled job to fix drift in the prospect counters.
+    
+    Walks all organizations in batches of RECONCILE_BATCH_SIZE (bounded by
+    RECONCILE_MAX_STEPS).
+    """
+    prospects_fixed = 0
+    status_counts_fixed = 0
+    batch = {"last_organization_id": None, "done": True}
+    
+    for index in range(RECONCILE_MAX_STEPS):
+        batch = await step.run(
+            f"reconcile-counters-{index}",
+            lambda after=batch["last_organization_id"]: reconcile_prospect_counters(after)
+        )
+        prospects_fixed += batch["prospects_fixed"] or 0
+        status_counts_fixed += batch["status_counts_fixed"] or 0
+        if batch["done"]:
+            break
+    
+    if prospects_fixed or status_counts_fixed:
+        logger.warning(
+            f"Prospect counters drifted: fixed {prospects_fixed} prospects "
+            f"and {status_counts_fixed} status counts"
+        )
+    else:
+        logger.info("Prospect counters reconciled, no drift")
+    
+    return {
+        "status": "ok",
+        "prospects_fixed": prospects_fixed,
+        "status_counts_fixed": status_counts_fixed,
+        "done": batch["done"],
+    }
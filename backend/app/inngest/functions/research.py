@@ -13,16 +13,25 @@ Events:
 
 Throttling:
 - Per-user: Max 5 researches per minute (heavy AI operation)
+
+Data collection steps that do not depend on each other (Gemini, KVK,
+website, enrichment) run as one parallel step group and are joined before
+the Claude analysis. Every timed step reports its start and duration, and
+the totals are stored in research_data["timings"].
 """
 
+import time
 import logging
 from datetime import timedelta
-from typing import Optional
+from typing import Optional, Dict, Tuple, Any
 import inngest
 from inngest import NonRetriableError, TriggerEvent, Throttle
 
 from app.inngest.client import inngest_client
 from app.database import get_supabase_service
+from app.services.coach_rules import invalidate_coach_context
+from app.services.prospect_hub import invalidate_prospect_hubs
+from app.services.action_generator import invalidate_prospect_action_contexts
 from app.services.gemini_researcher import GeminiResearcher
 from app.services.claude_researcher import ClaudeResearcher
 from app.services.kvk_api import KVKApi
@@ -80,12 +89,14 @@ async def research_company_fn(ctx, step):
     Architecture (Cost-Optimized):
     1. Update status to 'researching'
     2. Get seller context
-    3. Gemini: Comprehensive web search (PRIMARY - does all searching)
-    4. KVK lookup (if Dutch company)
-    5. Website scraping (if URL provided)
-    6. Claude: Analyze data and generate report (NO web search)
-    7. Save to database
-    8. Emit completion event
+    3. Data collection (parallel):
+       - Gemini: Comprehensive web search (PRIMARY - does all searching)
+       - KVK lookup (if Dutch company)
+       - Website scraping (if URL provided)
+       - Research enrichment (if enricher available)
+    4. Claude: Analyze data and generate report (NO web search)
+    5. Save to database (with per-step timings)
+    6. Emit completion event
     
     Cost: ~$0.15-0.20 per research (was ~$0.50-1.00)
     """
@@ -105,7 +116,7 @@ async def research_company_fn(ctx, step):
     logger.info(f"Starting Gemini-first research for {company_name} (id={research_id})")
     
     # Step 1: Update status to researching
-    await step.run("update-status-researching", update_research_status, research_id, "researching")
+    status = await step.run("update-status-researching", update_research_status, research_id, "researching")
     
     # Step 2: Get seller context (for personalized research)
     seller_context = await step.run("get-seller-context", get_seller_context, organization_id, user_id)
@@ -116,54 +127,59 @@ async def research_company_fn(ctx, step):
         if custom_intel:
             seller_context["custom_intel"] = custom_intel
     
-    # Step 3: Gemini comprehensive research (PRIMARY - does all web searching)
-    gemini_result = await step.run(
-        "gemini-comprehensive-research",
-        run_gemini_research,
-        company_name, country, city, linkedin_url, seller_context, language
-    )
-    
-    # Step 4: KVK lookup (conditional - only for Dutch companies)
-    kvk_result = None
+    # Step 3: Data collection - independent sources run in parallel
+    collection_steps = {
+        # Gemini comprehensive research (PRIMARY - does all web searching)
+        "gemini-comprehensive-research": (
+            run_gemini_research,
+            company_name, country, city, linkedin_url, seller_context, language
+        ),
+    }
+    # KVK lookup (conditional - only for Dutch companies)
     if kvk_api.is_dutch_company(country):
-        kvk_result = await step.run("kvk-lookup", run_kvk_lookup, company_name, city)
-    
-    # Step 5: Website content extraction (conditional - if URL provided)
-    website_result = None
+        collection_steps["kvk-lookup"] = (run_kvk_lookup, company_name, city)
+    # Website content extraction (conditional - if URL provided)
     if website_url:
-        website_result = await step.run("website-scrape", run_website_scrape, website_url, company_name)
-    
-    # Step 5b: Research enrichment (executives, funding) - runs if enricher is available
-    enrichment_result = None
+        collection_steps["website-scrape"] = (run_website_scrape, website_url, company_name)
+    # Research enrichment (executives, funding) - runs if enricher is available
     if research_enricher.is_available:
-        enrichment_result = await step.run(
-            "research-enrichment",
+        collection_steps["research-enrichment"] = (
             run_research_enrichment,
             company_name, website_url, linkedin_url, country
         )
     
-    # Step 6: Claude analysis (NO web search - just analyzes Gemini data + enrichment)
-    brief_content = await step.run(
+    results, timings = await run_parallel_steps(ctx, step, collection_steps)
+    gemini_result = results["gemini-comprehensive-research"]
+    kvk_result = results.get("kvk-lookup")
+    website_result = results.get("website-scrape")
+    enrichment_result = results.get("research-enrichment")
+    
+    # Step 4: Claude analysis (NO web search - just analyzes Gemini data + enrichment)
+    analysis = await step.run(
         "claude-analysis",
+        run_timed,
         run_claude_analysis,
         company_name, country, city, gemini_result, kvk_result, website_result, enrichment_result, seller_context, language
     )
+    brief_content = analysis["result"]
+    timings["claude-analysis"] = analysis["timing"]
     
-    # Step 7: Save results to database
+    # Step 5: Save results to database
     await step.run(
         "save-results",
         save_research_results,
-        research_id, gemini_result, kvk_result, website_result, brief_content
+        research_id, gemini_result, kvk_result, website_result, brief_content,
+        summarize_timings(timings, status.get("started_at"))
     )
     
-    # Step 7b: Get prospect_id for Autopilot detection
+    # Step 5b: Get prospect_id for Autopilot detection
     prospect_id = await step.run(
         "get-prospect-id",
         get_research_prospect_id,
         research_id
     )
     
-    # Step 8: Emit completion event (with prospect_id for Autopilot)
+    # Step 6: Emit completion event (with prospect_id for Autopilot)
     await step.send_event(
         "emit-completion",
         inngest.Event(
@@ -179,6 +195,9 @@ async def research_company_fn(ctx, step):
         )
     )
     
+    invalidate_coach_context(organization_id=organization_id)
+    invalidate_prospect_action_contexts(organization_id, prospect_id)
+    
     logger.info(f"Gemini-first research completed for {company_name} (id={research_id})")
     
     return {
@@ -197,7 +216,85 @@ async def update_research_status(research_id: str, status: str) -> dict:
     result = supabase.table("research_briefs").update({
         "status": status
     }).eq("id", research_id).execute()
-    return {"updated": True, "status": status}
+    invalidate_prospect_hubs(result.data)
+    # started_at is memoized with the step, so it is stable across replays
+    return {"updated": True, "status": status, "started_at": time.time()}
+
+
+async def run_timed(handler, *args) -> dict:
+    """
+    Run a step handler and report how long it took.
+    
+    Timing is measured inside the step so it is memoized with the output;
+    measuring around step.run() would be wrong on replays.
+    
+    Returns:
+        {"result": <handler output>, "timing": {"started_at", "duration_ms"}}
+    """
+    started_at = time.time()
+    result = await handler(*args)
+    return {
+        "result": result,
+        "timing": {
+            "started_at": started_at,
+            "duration_ms": int((time.time() - started_at) * 1000),
+        },
+    }
+
+
+async def run_parallel_steps(
+    ctx,
+    step,
+    steps: Dict[str, Tuple[Any, ...]]
+) -> Tuple[Dict[str, Any], Dict[str, dict]]:
+    """
+    Run independent steps as one parallel group and join their results.
+    
+    Args:
+        steps: Step id -> (handler, *args)
+    
+    Returns:
+        (step id -> handler output, step id -> timing)
+    """
+    step_ids = list(steps)
+    outputs = await ctx.group.parallel(tuple(
+        (lambda step_id=step_id: step.run(step_id, run_timed, *steps[step_id]))
+        for step_id in step_ids
+    ))
+    
+    results = {}
+    timings = {}
+    for step_id, output in zip(step_ids, outputs):
+        results[step_id] = output["result"]
+        timings[step_id] = output["timing"]
+    return results, timings
+
+
+def summarize_timings(timings: Dict[str, dict], started_at: Optional[float] = None) -> dict:
+    """
+    Summarize per-step timings for storage in research_data.
+    
+    Args:
+        timings: Step id -> {"started_at", "duration_ms"}
+        started_at: When the research run started (epoch seconds)
+    
+    Returns:
+        Per-step durations, the step total (what a sequential run would take),
+        and the wall-clock time from start to the last finished step
+    """
+    steps = {step_id: t["duration_ms"] for step_id, t in timings.items()}
+    finished_at = max(
+        (t["started_at"] + t["duration_ms"] / 1000 for t in timings.values()),
+        default=None
+    )
+    first_started = min((t["started_at"] for t in timings.values()), default=None)
+    origin = started_at or first_started
+    
+    return {
+        "steps_ms": steps,
+        "step_total_ms": sum(steps.values()),
+        "wall_clock_ms": int((finished_at - origin) * 1000) if finished_at and origin else None,
+    }
 
 
 async def get_research_prospect_id(research_id: str) -> Optional[str]:
@@ -505,7 +602,8 @@ async def save_research_results(
     gemini_result: dict,
     kvk_result: Optional[dict],
     website_result: Optional[dict],
-    brief_content: str
+    brief_content: str,
+    timings: Optional[dict] = None
 ) -> dict:
     """Save all research results to database."""
     
@@ -544,17 +642,24 @@ async def save_research_results(
         "sources": sources,
         "success_count": success_count,
         "total_sources": len(sources),
-        "architecture": "gemini-first"  # Track which architecture was used
+        "architecture": "gemini-first",  # Track which architecture was used
+        "timings": timings
     }
     
-    supabase.table("research_briefs").update({
+    result = supabase.table("research_briefs").update({
         "status": "completed",
         "research_data": research_data,
         "brief_content": brief_content,
         "completed_at": "now()"
     }).eq("id", research_id).execute()
+    invalidate_prospect_hubs(result.data)
     
     logger.info(f"Saved research results: {success_count}/{len(sources)} sources successful")
+    if timings:
+        logger.info(
+            f"Research timings: wall={timings.get('wall_clock_ms')}ms, "
+            f"steps={timings.get('step_total_ms')}ms, per-step={timings.get('steps_ms')}"
+        )
     
     return {"saved": True, "sources_count": len(sources), "success_count": success_count}
 
@@ -580,21 +685,22 @@ async def research_company_v2_fn(ctx, step):
     Architecture (V2 - Hybrid):
     1. Update status to 'researching'
     2. Get seller context
-    3. Gemini Research: 31 parallel searches (PRIMARY - intelligence layer)
-       - Company info, executives, news, market intelligence
-       - Gemini understands context and filters irrelevant data
-    4. Smart Exa Enrichment (AFTER Gemini):
+    3. Data collection (parallel):
+       - Gemini Research: 31 parallel searches (PRIMARY - intelligence layer)
+         - Company info, executives, news, market intelligence
+         - Gemini understands context and filters irrelevant data
+       - KVK lookup (if Dutch company)
+       - Website scraping (if URL provided)
+    4. Smart Exa Enrichment (AFTER Gemini - uses its output):
        - Parse executive names from Gemini output
        - Find verified LinkedIn URLs for each executive
        - Get funding data from Crunchbase/PitchBook
        - Get employee reviews from Glassdoor
        - Get product reviews from G2/Capterra
        - Find similar companies (competitors)
-    5. KVK lookup (if Dutch company)
-    6. Website scraping (if URL provided)
-    7. Claude: Analyze Gemini data + Exa enrichment
-    8. Save to database
-    9. Emit completion event
+    5. Claude: Analyze Gemini data + Exa enrichment
+    6. Save to database (with per-step timings)
+    7. Emit completion event
     
     Benefits over V1:
     - Verified LinkedIn URLs via Exa's 1B+ profile index
@@ -621,7 +727,7 @@ async def research_company_v2_fn(ctx, step):
     logger.info(f"[V2] Starting Hybrid research (Gemini + Exa) for {company_name} (id={research_id})")
     
     # Step 1: Update status to researching
-    await step.run(
+    status = await step.run(
         "update-status-researching",
         update_research_status,
         research_id, "researching"
@@ -641,62 +747,64 @@ async def research_company_v2_fn(ctx, step):
         if custom_intel:
             seller_context["custom_intel"] = custom_intel
     
-    # Step 3: Gemini Research (PRIMARY - intelligence layer)
-    gemini_result = await step.run(
-        "gemini-research",
-        run_gemini_research,
-        company_name, country, city, linkedin_url, seller_context, language
-    )
+    # Step 3: Data collection - independent sources run in parallel
+    collection_steps = {
+        # Gemini Research (PRIMARY - intelligence layer)
+        "gemini-research": (
+            run_gemini_research,
+            company_name, country, city, linkedin_url, seller_context, language
+        ),
+    }
+    # KVK lookup (if Dutch company)
+    if country and country.lower() in ["netherlands", "nederland", "nl", "the netherlands"]:
+        collection_steps["kvk-lookup"] = (run_kvk_lookup, company_name, city)
+    # Website content extraction (if URL provided)
+    if website_url:
+        collection_steps["website-scrape"] = (run_website_scrape, website_url, company_name)
+    
+    results, timings = await run_parallel_steps(ctx, step, collection_steps)
+    gemini_result = results["gemini-research"]
+    kvk_result = results.get("kvk-lookup")
+    website_result = results.get("website-scrape")
     
     # Step 4: Smart Exa Enrichment (uses Gemini output as input)
     exa_enrichment_result = None
     if gemini_result.get("success") and research_enricher.is_available:
-        exa_enrichment_result = await step.run(
+        enrichment = await step.run(
             "exa-smart-enrichment",
+            run_timed,
             run_smart_exa_enrichment,
             company_name, gemini_result.get("data", ""), website_url, country
         )
+        exa_enrichment_result = enrichment["result"]
+        timings["exa-smart-enrichment"] = enrichment["timing"]
     
-    # Step 5: KVK lookup (if Dutch company)
-    kvk_result = None
-    if country and country.lower() in ["netherlands", "nederland", "nl", "the netherlands"]:
-        kvk_result = await step.run(
-            "kvk-lookup",
-            run_kvk_lookup,
-            company_name, city
-        )
-    
-    # Step 6: Website content extraction (if URL provided)
-    website_result = None
-    if website_url:
-        website_result = await step.run(
-            "website-scrape",
-            run_website_scrape,
-            website_url, company_name
-        )
-    
-    # Step 7: Claude analysis (Gemini data + Exa enrichment)
-    brief_content = await step.run(
+    # Step 5: Claude analysis (Gemini data + Exa enrichment)
+    analysis = await step.run(
         "claude-analysis",
+        run_timed,
         run_claude_analysis,
         company_name, country, city, gemini_result, kvk_result, website_result, exa_enrichment_result, seller_context, language
     )
+    brief_content = analysis["result"]
+    timings["claude-analysis"] = analysis["timing"]
     
-    # Step 8: Save results to database
+    # Step 6: Save results to database
     await step.run(
         "save-results",
         save_research_results_v2_hybrid,
-        research_id, gemini_result, exa_enrichment_result, kvk_result, brief_content
+        research_id, gemini_result, exa_enrichment_result, kvk_result, brief_content,
+        summarize_timings(timings, status.get("started_at"))
     )
     
-    # Step 9: Get prospect_id for Autopilot detection
+    # Step 6b: Get prospect_id for Autopilot detection
     prospect_id = await step.run(
         "get-prospect-id",
         get_research_prospect_id,
         research_id
     )
     
-    # Step 10: Emit completion event
+    # Step 7: Emit completion event
     await step.send_event(
         "emit-completion",
         inngest.Event(
@@ -713,6 +821,9 @@ async def research_company_v2_fn(ctx, step):
         )
     )
     
+    invalidate_coach_context(organization_id=organization_id)
+    invalidate_prospect_action_contexts(organization_id, prospect_id)
+    
     logger.info(f"[V2] Hybrid research completed for {company_name}")
     
     return {
@@ -850,7 +961,8 @@ async def save_research_results_v2_hybrid(
     gemini_result: dict,
     exa_enrichment_result: Optional[dict],
     kvk_result: Optional[dict],
-    brief_content: str
+    brief_content: str,
+    timings: Optional[dict] = None
 ) -> dict:
     """Save V2 Hybrid research results to database."""
     sources = {
@@ -891,17 +1003,24 @@ async def save_research_results_v2_hybrid(
         "sources": sources,
         "success_count": success_count,
         "total_sources": len(sources),
-        "architecture": "gemini-exa-hybrid"
+        "architecture": "gemini-exa-hybrid",
+        "timings": timings
     }
     
-    supabase.table("research_briefs").update({
+    result = supabase.table("research_briefs").update({
         "status": "completed",
         "research_data": research_data,
         "brief_content": brief_content,
         "completed_at": "now()"
     }).eq("id", research_id).execute()
+    invalidate_prospect_hubs(result.data)
     
     logger.info(f"[V2] Saved hybrid research results: {success_count}/{len(sources)} sources successful")
+    if timings:
+        logger.info(
+            f"[V2] Research timings: wall={timings.get('wall_clock_ms')}ms, "
+            f"steps={timings.get('step_total_ms')}ms, per-step={timings.get('steps_ms')}"
+        )
     
     return {"saved": True, "sources_count": len(sources), "success_count": success_count}
 
@@ -926,8 +1045,7 @@ async def run_claude_synthesis(
     This prevents the "lost in the middle" effect from nested templates.
     """
     from datetime import datetime
-    from anthropic import AsyncAnthropic
-    import os
+    from app.services.llm_gateway import get_claude, anthropic_configured
     
     exa_markdown = exa_result.get("markdown", "")
     
@@ -1389,18 +1507,16 @@ Generate the report in this EXACT structure:
 
     try:
         # Direct Claude API call - NO nested prompts!
-        api_key = os.getenv("ANTHROPIC_API_KEY")
-        if not api_key:
+        if not anthropic_configured():
             raise ValueError("ANTHROPIC_API_KEY not set")
         
-        client = AsyncAnthropic(api_key=api_key)
-        
         logger.info(f"[V2] Starting Claude synthesis for {company_name} (direct API call)")
         
-        response = await client.messages.create(
+        response = await get_claude("research_synthesis").messages.create(
             model="claude-sonnet-4-20250514",
             max_tokens=12000,  # Increased from 8192 for longer reports
             temperature=0.2,
+            organization_id=(seller_context or {}).get("organization_id"),
             messages=[{
                 "role": "user",
                 "content": synthesis_prompt
@@ -1473,12 +1589,13 @@ async def save_research_results_v2(
         "exa_stats": exa_stats
     }
     
-    supabase.table("research_briefs").update({
+    result = supabase.table("research_briefs").update({
         "status": "completed",
         "research_data": research_data,
         "brief_content": brief_content,
         "completed_at": "now()"
     }).eq("id", research_id).execute()
+    invalidate_prospect_hubs(result.data)
     
     logger.info(f"[V2] Saved research results: architecture={architecture}")
     
@@ -119,6 +119,10 @@ class BehaviorEventCreate(BaseModel):
     page_context: Optional[str] = None
 
 
+class BehaviorEventBatchCreate(BaseModel):
+    events: List[BehaviorEventCreate] = Field(..., min_length=1, max_length=100)
+
+
 class BehaviorEvent(BaseModel):
     id: str
     user_id: str
@@ -81,6 +81,12 @@ class FollowupActionCreate(BaseModel):
     regenerate: bool = False  # If true, replace existing action of same type
 
 
+class FollowupActionBatchCreate(BaseModel):
+    """Request model for generating several actions at once"""
+    action_types: List[ActionType] = Field(..., min_length=1)
+    regenerate: bool = False  # If true, replace existing actions of these types
+
+
 class FollowupActionUpdate(BaseModel):
     """Request model for updating an action"""
     content: Optional[str] = None
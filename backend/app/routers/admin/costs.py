@@ -5,6 +5,10 @@ Admin Costs Router
 API cost tracking and analytics based on api_usage_logs.
 Provides detailed cost breakdowns by service, action, and time period.
 
+All endpoints read the hourly/daily rollups of api_usage_logs
+(get_api_cost_rollup), which the cost-rollups-refresh Inngest job keeps
+up to date; see migration_api_usage_rollups.sql.
+
 Tracks:
 - Anthropic (Claude) - token costs
 - Deepgram - transcription minutes
@@ -17,7 +21,7 @@ Tracks:
 
 from fastapi import APIRouter, Depends, Query
 from typing import Optional, List, Dict, Any
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from decimal import Decimal
 import logging
 
@@ -194,22 +198,12 @@ async def get_cost_summary(
     comparison_end = period_start
     
     # Current period
-    current_result = supabase.table("api_usage_logs") \
-        .select("estimated_cost_cents") \
-        .gte("created_at", period_start.isoformat()) \
-        .lte("created_at", period_end.isoformat()) \
-        .execute()
-    
-    current_total = sum(r.get("estimated_cost_cents", 0) or 0 for r in (current_result.data or []))
+    current_rows = _get_rollup(supabase, period_start, period_end)
+    current_total = sum(r["cost_cents"] for r in current_rows)
     
     # Comparison period
-    comparison_result = supabase.table("api_usage_logs") \
-        .select("estimated_cost_cents") \
-        .gte("created_at", comparison_start.isoformat()) \
-        .lt("created_at", comparison_end.isoformat()) \
-        .execute()
-    
-    comparison_total = sum(r.get("estimated_cost_cents", 0) or 0 for r in (comparison_result.data or []))
+    comparison_rows = _get_rollup(supabase, comparison_start, comparison_end)
+    comparison_total = sum(r["cost_cents"] for r in comparison_rows)
     
     # Calculate change
     if comparison_total > 0:
@@ -245,47 +239,25 @@ async def get_costs_by_service(
     now = datetime.utcnow()
     period_start = now - timedelta(days=days)
     
-    result = supabase.table("api_usage_logs") \
-        .select("api_provider, estimated_cost_cents, input_tokens, output_tokens, duration_seconds, request_count") \
-        .gte("created_at", period_start.isoformat()) \
-        .execute()
-    
-    # Aggregate by provider
-    by_provider: Dict[str, Dict] = {}
-    total_cost = 0
-    
-    for row in (result.data or []):
-        provider = row.get("api_provider", "unknown")
-        cost = row.get("estimated_cost_cents", 0) or 0
-        
-        if provider not in by_provider:
-            by_provider[provider] = {
-                "cost_cents": 0,
-                "request_count": 0,
-                "tokens": 0,
-                "duration_seconds": 0
-            }
-        
-        by_provider[provider]["cost_cents"] += cost
-        by_provider[provider]["request_count"] += row.get("request_count", 1) or 1
-        by_provider[provider]["tokens"] += (row.get("input_tokens", 0) or 0) + (row.get("output_tokens", 0) or 0)
-        by_provider[provider]["duration_seconds"] += row.get("duration_seconds", 0) or 0
-        total_cost += cost
+    rows = _get_rollup(supabase, period_start, now, group_by="provider")
+    total_cost = sum(r["cost_cents"] for r in rows)
     
-    # Build response
+    # Build response (rows are sorted by cost)
     services = []
-    for provider, data in sorted(by_provider.items(), key=lambda x: x[1]["cost_cents"], reverse=True):
-        pct = (data["cost_cents"] / total_cost * 100) if total_cost > 0 else 0
+    for row in rows:
+        provider = row.get("api_provider") or "unknown"
+        pct = (row["cost_cents"] / total_cost * 100) if total_cost > 0 else 0
+        tokens = row["input_tokens"] + row["output_tokens"]
         
         service = ServiceCost(
             service_name=provider,
             display_name=SERVICE_DISPLAY_NAMES.get(provider, provider.title()),
-            cost_cents=data["cost_cents"],
-            cost_formatted=_format_cents(data["cost_cents"]),
+            cost_cents=row["cost_cents"],
+            cost_formatted=_format_cents(row["cost_cents"]),
             percent_of_total=round(pct, 1),
-            request_count=data["request_count"],
-            tokens_used=data["tokens"] if data["tokens"] > 0 else None,
-            minutes_used=round(data["duration_seconds"] / 60, 2) if data["duration_seconds"] > 0 else None
+            request_count=row["request_count"],
+            tokens_used=tokens if tokens > 0 else None,
+            minutes_used=round(row["duration_seconds"] / 60, 2) if row["duration_seconds"] > 0 else None
         )
         services.append(service)
     
@@ -309,37 +281,22 @@ async def get_costs_by_action(
     now = datetime.utcnow()
     period_start = now - timedelta(days=days)
     
-    result = supabase.table("api_usage_logs") \
-        .select("api_service, estimated_cost_cents") \
-        .gte("created_at", period_start.isoformat()) \
-        .execute()
-    
-    # Aggregate by action
-    by_action: Dict[str, Dict] = {}
-    total_cost = 0
-    
-    for row in (result.data or []):
-        action = row.get("api_service") or "other"
-        cost = row.get("estimated_cost_cents", 0) or 0
-        
-        if action not in by_action:
-            by_action[action] = {"cost_cents": 0, "count": 0}
-        
-        by_action[action]["cost_cents"] += cost
-        by_action[action]["count"] += 1
-        total_cost += cost
+    rows = _get_rollup(supabase, period_start, now, group_by="service")
+    total_cost = sum(r["cost_cents"] for r in rows)
     
-    # Build response
+    # Build response (rows are sorted by cost)
     actions = []
-    for action, data in sorted(by_action.items(), key=lambda x: x[1]["cost_cents"], reverse=True):
-        avg_cost = data["cost_cents"] / data["count"] if data["count"] > 0 else 0
+    for row in rows:
+        action = row.get("api_service") or "other"
+        count = row["log_count"]
+        avg_cost = row["cost_cents"] / count if count > 0 else 0
         
         actions.append(ActionCost(
             action_name=action,
             display_name=ACTION_DISPLAY_NAMES.get(action, action.replace("_", " ").title()),
-            cost_cents=data["cost_cents"],
-            cost_formatted=_format_cents(data["cost_cents"]),
-            count=data["count"],
+            cost_cents=row["cost_cents"],
+            cost_formatted=_format_cents(row["cost_cents"]),
+            count=count,
             avg_cost_cents=round(avg_cost, 2)
         ))
     
@@ -361,37 +318,21 @@ async def get_cost_trend(
     now = datetime.utcnow()
     period_start = now - timedelta(days=days)
     
-    result = supabase.table("api_usage_logs") \
-        .select("created_at, estimated_cost_cents, request_count") \
-        .gte("created_at", period_start.isoformat()) \
-        .order("created_at") \
-        .execute()
-    
-    # Group by date
-    daily_data: Dict[str, Dict] = {}
-    total_cost = 0
-    
-    for row in (result.data or []):
-        date = row["created_at"][:10]  # YYYY-MM-DD
-        cost = row.get("estimated_cost_cents", 0) or 0
-        
-        if date not in daily_data:
-            daily_data[date] = {"cost_cents": 0, "request_count": 0}
-        
-        daily_data[date]["cost_cents"] += cost
-        daily_data[date]["request_count"] += row.get("request_count", 1) or 1
-        total_cost += cost
+    rows = _get_rollup(supabase, period_start, now, group_by="day")
+    rows.sort(key=lambda r: r["day"])
     
     # Build response
-    data = []
-    for date in sorted(daily_data.keys()):
-        data.append(DailyCost(
-            date=date,
-            cost_cents=daily_data[date]["cost_cents"],
-            request_count=daily_data[date]["request_count"]
-        ))
+    data = [
+        DailyCost(
+            date=row["day"],
+            cost_cents=row["cost_cents"],
+            request_count=row["request_count"]
+        )
+        for row in rows
+    ]
+    total_cost = sum(r["cost_cents"] for r in rows)
     
-    avg_daily = total_cost // len(daily_data) if daily_data else 0
+    avg_daily = total_cost // len(rows) if rows else 0
     
     return CostTrend(
         data=data,
@@ -413,49 +354,30 @@ async def get_cost_trend_by_service(
     now = datetime.utcnow()
     period_start = now - timedelta(days=days)
     
-    result = supabase.table("api_usage_logs") \
-        .select("created_at, api_provider, estimated_cost_cents, request_count") \
-        .gte("created_at", period_start.isoformat()) \
-        .order("created_at") \
-        .execute()
-    
-    # Group by service and date
-    by_service: Dict[str, Dict[str, Dict]] = {}
+    rows = _get_rollup(supabase, period_start, now, group_by="day_provider")
     
-    for row in (result.data or []):
-        provider = row.get("api_provider", "unknown")
-        date = row["created_at"][:10]
-        cost = row.get("estimated_cost_cents", 0) or 0
-        
-        if provider not in by_service:
-            by_service[provider] = {}
-        
-        if date not in by_service[provider]:
-            by_service[provider][date] = {"cost_cents": 0, "request_count": 0}
-        
-        by_service[provider][date]["cost_cents"] += cost
-        by_service[provider][date]["request_count"] += row.get("request_count", 1) or 1
+    # Group by service
+    by_service: Dict[str, List[Dict]] = {}
+    for row in rows:
+        by_service.setdefault(row.get("api_provider") or "unknown", []).append(row)
     
     # Build response
     services = []
-    for provider in sorted(by_service.keys()):
-        daily_costs = []
-        total_cost = 0
-        
-        for date in sorted(by_service[provider].keys()):
-            data = by_service[provider][date]
-            daily_costs.append(DailyCost(
-                date=date,
-                cost_cents=data["cost_cents"],
-                request_count=data["request_count"]
-            ))
-            total_cost += data["cost_cents"]
+    for provider, provider_rows in by_service.items():
+        provider_rows.sort(key=lambda r: r["day"])
         
         services.append(ServiceDailyCost(
             service_name=provider,
             display_name=SERVICE_DISPLAY_NAMES.get(provider, provider.title()),
-            daily_costs=daily_costs,
-            total_cost_cents=total_cost
+            daily_costs=[
+                DailyCost(
+                    date=row["day"],
+                    cost_cents=row["cost_cents"],
+                    request_count=row["request_count"]
+                )
+                for row in provider_rows
+            ],
+            total_cost_cents=sum(r["cost_cents"] for r in provider_rows)
         ))
     
     # Sort by total cost
@@ -480,32 +402,12 @@ async def get_top_users_by_cost(
     now = datetime.utcnow()
     period_start = now - timedelta(days=days)
     
-    # Get usage grouped by user
-    result = supabase.table("api_usage_logs") \
-        .select("user_id, estimated_cost_cents, request_count") \
-        .gte("created_at", period_start.isoformat()) \
-        .not_.is_("user_id", "null") \
-        .execute()
-    
-    # Aggregate by user
-    by_user: Dict[str, Dict] = {}
-    
-    for row in (result.data or []):
-        user_id = row.get("user_id")
-        if not user_id:
-            continue
-        
-        if user_id not in by_user:
-            by_user[user_id] = {"cost_cents": 0, "request_count": 0}
-        
-        by_user[user_id]["cost_cents"] += row.get("estimated_cost_cents", 0) or 0
-        by_user[user_id]["request_count"] += row.get("request_count", 1) or 1
-    
-    # Sort and limit
-    sorted_users = sorted(by_user.items(), key=lambda x: x[1]["cost_cents"], reverse=True)[:limit]
+    # Top users by cost (sorted and limited in the database)
+    rows = _get_rollup(supabase, period_start, now, group_by="user", limit=limit)
+    total_users = rows[0]["group_count"] if rows else 0
     
     # Get user details
-    user_ids = [u[0] for u in sorted_users]
+    user_ids = [r["user_id"] for r in rows]
     users_result = supabase.table("users") \
         .select("id, email") \
         .in_("id", user_ids) \
@@ -526,19 +428,20 @@ async def get_top_users_by_cost(
     
     # Build response
     users = []
-    for user_id, data in sorted_users:
+    for row in rows:
+        user_id = row["user_id"]
         users.append(TopUser(
             user_id=user_id,
             email=user_emails.get(user_id),
             organization_name=user_orgs.get(user_id),
-            cost_cents=data["cost_cents"],
-            cost_formatted=_format_cents(data["cost_cents"]),
-            request_count=data["request_count"]
+            cost_cents=row["cost_cents"],
+            cost_formatted=_format_cents(row["cost_cents"]),
+            request_count=row["request_count"]
         ))
     
     return CostsByUser(
         users=users,
-        total_users=len(by_user)
+        total_users=total_users
     )
 
 
@@ -561,12 +464,8 @@ async def get_cost_projection(
     days_remaining = days_in_month - days_elapsed
     
     # Get current month costs
-    result = supabase.table("api_usage_logs") \
-        .select("estimated_cost_cents") \
-        .gte("created_at", month_start.isoformat()) \
-        .execute()
-    
-    current_cost = sum(r.get("estimated_cost_cents", 0) or 0 for r in (result.data or []))
+    rows = _get_rollup(supabase, month_start, now)
+    current_cost = sum(r["cost_cents"] for r in rows)
     
     # Calculate projection
     daily_avg = current_cost / days_elapsed if days_elapsed > 0 else 0
@@ -594,22 +493,12 @@ async def get_service_cost_detail(
     now = datetime.utcnow()
     period_start = now - timedelta(days=days)
     
-    result = supabase.table("api_usage_logs") \
-        .select("estimated_cost_cents, input_tokens, output_tokens, duration_seconds, request_count") \
-        .eq("api_provider", service_name) \
-        .gte("created_at", period_start.isoformat()) \
-        .execute()
-    
-    total_cost = 0
-    total_tokens = 0
-    total_duration = 0
-    total_requests = 0
+    rows = _get_rollup(supabase, period_start, now, provider=service_name)
     
-    for row in (result.data or []):
-        total_cost += row.get("estimated_cost_cents", 0) or 0
-        total_tokens += (row.get("input_tokens", 0) or 0) + (row.get("output_tokens", 0) or 0)
-        total_duration += row.get("duration_seconds", 0) or 0
-        total_requests += row.get("request_count", 1) or 1
+    total_cost = sum(r["cost_cents"] for r in rows)
+    total_tokens = sum(r["input_tokens"] + r["output_tokens"] for r in rows)
+    total_duration = sum(r["duration_seconds"] for r in rows)
+    total_requests = sum(r["request_count"] for r in rows)
     
     return ServiceCost(
         service_name=service_name,
@@ -627,6 +516,33 @@ async def get_service_cost_detail(
 # Helper Functions
 # ============================================================
 
+def _get_rollup(
+    supabase,
+    period_start: datetime,
+    period_end: datetime,
+    group_by: str = "none",
+    provider: Optional[str] = None,
+    limit: Optional[int] = None
+) -> List[Dict[str, Any]]:
+    """
+    Grouped API usage totals for a period (UTC, hour precision).
+    
+    Reads the pre-aggregated rollups (see migration_api_usage_rollups.sql),
+    so the cost is independent of the number of logs. Rows are sorted by
+    cost, highest first.
+    
+    group_by: none, day, provider, service, day_provider, user
+    """
+    result = supabase.rpc("get_api_cost_rollup", {
+        "p_from": period_start.replace(tzinfo=timezone.utc).isoformat(),
+        "p_to": period_end.replace(tzinfo=timezone.utc).isoformat(),
+        "p_group_by": group_by,
+        "p_provider": provider,
+        "p_limit": limit,
+    }).execute()
+    return result.data or []
+
+
 def _format_cents(cents: int) -> str:
     """Format cents as currency string (EUR)."""
     euros = cents / 100
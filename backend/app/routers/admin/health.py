@@ -3,7 +3,12 @@ Admin Health Router
 ===================
 
 Comprehensive health monitoring for all external services.
-Provides real-time status, historical trends, and job statistics.
+Provides current status, historical trends, and job statistics.
+
+Service checks run in the background (health_prober, one round per
+admin-health-probe cron run); /overview returns the latest snapshot. Checks
+use requests that are not billed (model lists, or requests the provider
+rejects as invalid after authenticating them).
 
 Services monitored:
 - Supabase (Database & Auth)
@@ -30,6 +35,8 @@ import logging
 
 from app.deps import get_admin_user, AdminContext
 from app.database import get_supabase_service
+from app.services.llm_gateway import get_llm_metrics
+from app.services.health_prober import HealthProber, HEALTH_PROBE_INTERVAL_SECONDS
 from .models import CamelModel
 
 router = APIRouter(prefix="/health", tags=["admin-health"])
@@ -94,6 +101,48 @@ class JobHealthResponse(CamelModel):
     total_failed_24h: int
 
 
+class LLMServiceMetrics(CamelModel):
+    """LLM call metrics for one provider/service/model (this process)."""
+    provider: str
+    service: str
+    model: str
+    calls: int
+    errors: int
+    input_tokens: int
+    output_tokens: int
+    cache_read_tokens: int
+    cache_write_tokens: int
+    p50_ms: float
+    p95_ms: float
+    avg_queue_ms: float
+
+
+class LLMLimitStats(CamelModel):
+    """Concurrency limiter usage."""
+    limit: int
+    in_use: int
+    waiting: int
+
+
+class LLMGatewayMetrics(CamelModel):
+    """LLM gateway metrics and concurrency limits."""
+    services: List[LLMServiceMetrics]
+    limits: Dict[str, LLMLimitStats]
+    org_limit: int
+    busy_organizations: int
+
+
+class ServiceLatency(CamelModel):
+    """Rolling response time histogram for a service."""
+    service_name: str
+    display_name: str
+    samples: int
+    p50_ms: Optional[int] = None
+    p95_ms: Optional[int] = None
+    max_ms: Optional[int] = None
+    buckets: Dict[str, int]  # le_<ms> / gt_max -> number of checks
+
+
 class HealthTrendPoint(CamelModel):
     """Single point in health trend data."""
     date: str  # YYYY-MM-DD
@@ -158,60 +207,21 @@ SERVICE_CONFIG = {
 
 @router.get("/overview", response_model=HealthOverview)
 async def get_health_overview(
+    refresh: bool = Query(False, description="Run the checks now instead of returning the cached snapshot"),
     admin: AdminContext = Depends(get_admin_user)
 ):
     """
-    Get real-time health status of all external services.
+    Get health status of all external services.
     
-    Performs actual API calls to verify connectivity.
-    Results are logged to admin_service_health_logs for trending.
+    Returns the snapshot of the background prober (see
+    app.services.health_prober), which performs actual API calls to verify
+    connectivity and logs them to admin_service_health_logs for trending.
     """
-    now = datetime.utcnow()
-    supabase = get_supabase_service()
-    
-    # Run all health checks in parallel
-    checks = await asyncio.gather(
-        _check_supabase_health(),
-        _check_anthropic_health(),
-        _check_stripe_health(),
-        _check_inngest_health(),
-        _check_deepgram_health(),
-        _check_recall_health(),
-        _check_pinecone_health(),
-        _check_voyage_health(),
-        _check_exa_health(),
-        _check_google_health(),
-        _check_sendgrid_health(),
-        return_exceptions=True
-    )
-    
-    services = []
-    logs_to_write = []
-    
-    for check in checks:
-        if isinstance(check, Exception):
-            # Handle unexpected errors
-            logger.error(f"Health check error: {check}")
-            continue
-        if check:
-            services.append(check)
-            logs_to_write.append({
-                "p_service_name": check.name,
-                "p_status": check.status,
-                "p_response_time_ms": check.response_time_ms,
-                "p_error_message": check.error_message
-            })
-    
-    # Write logs in background (non-blocking)
-    async def write_logs_async():
-        for log_data in logs_to_write:
-            try:
-                supabase.rpc("log_service_health", log_data).execute()
-            except Exception as e:
-                logger.warning(f"Failed to log health check: {e}")
-    
-    # Fire and forget - don't wait for logging to complete
-    asyncio.create_task(write_logs_async())
+    if refresh:
+        services = await health_prober.probe()
+    else:
+        # Stale if the background loop is not running (probed on demand then)
+        services = await health_prober.get_results(max_age_seconds=HEALTH_PROBE_INTERVAL_SECONDS * 2)
     
     # Calculate overall status
     statuses = [s.status for s in services]
@@ -233,10 +243,31 @@ async def get_health_overview(
         degraded_count=sum(1 for s in statuses if s == "degraded"),
         down_count=sum(1 for s in statuses if s == "down"),
         services=services,
-        last_updated=now
+        last_updated=health_prober.checked_at or datetime.utcnow()
     )
 
 
+@router.get("/latency", response_model=List[ServiceLatency])
+async def get_service_latency(
+    admin: AdminContext = Depends(get_admin_user)
+):
+    """
+    Get the rolling response time histogram per service (recent probes of
+    this instance).
+    """
+    latency = health_prober.latency()
+    
+    return [
+        ServiceLatency(
+            service_name=service_name,
+            display_name=config["display_name"],
+            **latency[service_name]
+        )
+        for service_name, config in SERVICE_CONFIG.items()
+        if service_name in latency
+    ]
+
+
 @router.get("/uptime", response_model=List[ServiceUptime])
 async def get_service_uptime(
     admin: AdminContext = Depends(get_admin_user)
@@ -494,11 +525,25 @@ async def get_job_health(
     )
 
 
+@router.get("/llm", response_model=LLMGatewayMetrics)
+async def get_llm_metrics_endpoint(
+    admin: AdminContext = Depends(get_admin_user)
+):
+    """
+    LLM gateway metrics for this worker process since startup.
+    
+    Per provider/service/model: calls, errors, tokens (including prompt
+    cache reads/writes), p50/p95 latency and average queueing time, plus
+    current use of the global concurrency limits.
+    """
+    return LLMGatewayMetrics(**get_llm_metrics())
+
+
 # ============================================================
 # Health Check Implementations
 # ============================================================
 
-async def _check_supabase_health() -> ServiceStatus:
+async def _check_supabase_health(client: httpx.AsyncClient) -> ServiceStatus:
     """Check Supabase database connectivity."""
     config = SERVICE_CONFIG["supabase"]
     now = datetime.utcnow()
@@ -506,7 +551,7 @@ async def _check_supabase_health() -> ServiceStatus:
     
     try:
         supabase = get_supabase_service()
-        result = supabase.table("users").select("id").limit(1).execute()
+        await asyncio.to_thread(supabase.table("users").select("id").limit(1).execute)
         
         elapsed = int((datetime.utcnow() - start).total_seconds() * 1000)
         
@@ -530,8 +575,8 @@ async def _check_supabase_health() -> ServiceStatus:
         )
 
 
-async def _check_anthropic_health() -> ServiceStatus:
-    """Check Anthropic API connectivity with minimal token usage."""
+async def _check_anthropic_health(client: httpx.AsyncClient) -> ServiceStatus:
+    """Check Anthropic API connectivity (model list - no tokens used)."""
     config = SERVICE_CONFIG["anthropic"]
     now = datetime.utcnow()
     start = datetime.utcnow()
@@ -548,54 +593,49 @@ async def _check_anthropic_health() -> ServiceStatus:
         )
     
     try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            # Use a minimal request to check connectivity
-            response = await client.post(
-                "https://api.anthropic.com/v1/messages",
-                headers={
-                    "x-api-key": api_key,
-                    "anthropic-version": "2023-06-01",
-                    "Content-Type": "application/json"
-                },
-                json={
-                    "model": "claude-3-haiku-20240307",
-                    "max_tokens": 1,
-                    "messages": [{"role": "user", "content": "hi"}]
-                }
+        # Listing models is authenticated but not billed
+        response = await client.get(
+            "https://api.anthropic.com/v1/models",
+            headers={
+                "x-api-key": api_key,
+                "anthropic-version": "2023-06-01"
+            },
+            params={"limit": 1},
+            timeout=10.0
+        )
+        
+        elapsed = int((datetime.utcnow() - start).total_seconds() * 1000)
+        
+        if response.status_code == 200:
+            return ServiceStatus(
+                name="anthropic",
+                display_name=config["display_name"],
+                status="healthy",
+                response_time_ms=elapsed,
+                last_check=now,
+                details=f"Claude API responding in {elapsed}ms",
+                is_critical=config["is_critical"]
+            )
+        elif response.status_code == 529:
+            return ServiceStatus(
+                name="anthropic",
+                display_name=config["display_name"],
+                status="degraded",
+                response_time_ms=elapsed,
+                last_check=now,
+                details="Anthropic API overloaded",
+                is_critical=config["is_critical"]
+            )
+        else:
+            return ServiceStatus(
+                name="anthropic",
+                display_name=config["display_name"],
+                status="degraded",
+                response_time_ms=elapsed,
+                last_check=now,
+                error_message=f"HTTP {response.status_code}",
+                is_critical=config["is_critical"]
             )
-            
-            elapsed = int((datetime.utcnow() - start).total_seconds() * 1000)
-            
-            if response.status_code == 200:
-                return ServiceStatus(
-                    name="anthropic",
-                    display_name=config["display_name"],
-                    status="healthy",
-                    response_time_ms=elapsed,
-                    last_check=now,
-                    details=f"Claude API responding in {elapsed}ms",
-                    is_critical=config["is_critical"]
-                )
-            elif response.status_code == 529:
-                return ServiceStatus(
-                    name="anthropic",
-                    display_name=config["display_name"],
-                    status="degraded",
-                    response_time_ms=elapsed,
-                    last_check=now,
-                    details="Anthropic API overloaded",
-                    is_critical=config["is_critical"]
-                )
-            else:
-                return ServiceStatus(
-                    name="anthropic",
-                    display_name=config["display_name"],
-                    status="degraded",
-                    response_time_ms=elapsed,
-                    last_check=now,
-                    error_message=f"HTTP {response.status_code}",
-                    is_critical=config["is_critical"]
-                )
     except httpx.TimeoutException:
         return ServiceStatus(
             name="anthropic",
@@ -616,7 +656,7 @@ async def _check_anthropic_health() -> ServiceStatus:
         )
 
 
-async def _check_stripe_health() -> ServiceStatus:
+async def _check_stripe_health(client: httpx.AsyncClient) -> ServiceStatus:
     """Check Stripe API connectivity."""
     config = SERVICE_CONFIG["stripe"]
     now = datetime.utcnow()
@@ -638,7 +678,7 @@ async def _check_stripe_health() -> ServiceStatus:
         stripe.api_key = stripe_key
         
         # Quick balance check (read-only, no cost)
-        stripe.Balance.retrieve()
+        await asyncio.to_thread(stripe.Balance.retrieve)
         
         elapsed = int((datetime.utcnow() - start).total_seconds() * 1000)
         
@@ -662,8 +702,8 @@ async def _check_stripe_health() -> ServiceStatus:
         )
 
 
-async def _check_inngest_health() -> ServiceStatus:
-    """Check Inngest service connectivity."""
+async def _check_inngest_health(client: httpx.AsyncClient) -> ServiceStatus:
+    """Check Inngest service connectivity (empty event batch - nothing is triggered)."""
     config = SERVICE_CONFIG["inngest"]
     now = datetime.utcnow()
     start = datetime.utcnow()
@@ -680,37 +720,36 @@ async def _check_inngest_health() -> ServiceStatus:
         )
     
     try:
-        async with httpx.AsyncClient(timeout=5.0) as client:
-            response = await client.post(
-                f"https://inn.gs/e/{inngest_key}",
-                json={
-                    "name": "admin/health-check",
-                    "data": {"timestamp": now.isoformat()}
-                }
+        # The event key is validated, but an empty batch stores no events
+        response = await client.post(
+            f"https://inn.gs/e/{inngest_key}",
+            json=[],
+            timeout=5.0
+        )
+        
+        elapsed = int((datetime.utcnow() - start).total_seconds() * 1000)
+        
+        # 400 = key accepted, empty batch rejected (an unknown key is 401)
+        if response.status_code in [200, 201, 202, 400]:
+            return ServiceStatus(
+                name="inngest",
+                display_name=config["display_name"],
+                status="healthy",
+                response_time_ms=elapsed,
+                last_check=now,
+                details=f"Inngest responding in {elapsed}ms",
+                is_critical=config["is_critical"]
+            )
+        else:
+            return ServiceStatus(
+                name="inngest",
+                display_name=config["display_name"],
+                status="degraded",
+                response_time_ms=elapsed,
+                last_check=now,
+                error_message=f"HTTP {response.status_code}",
+                is_critical=config["is_critical"]
             )
-            
-            elapsed = int((datetime.utcnow() - start).total_seconds() * 1000)
-            
-            if response.status_code in [200, 201, 202]:
-                return ServiceStatus(
-                    name="inngest",
-                    display_name=config["display_name"],
-                    status="healthy",
-                    response_time_ms=elapsed,
-                    last_check=now,
-                    details=f"Inngest responding in {elapsed}ms",
-                    is_critical=config["is_critical"]
-                )
-            else:
-                return ServiceStatus(
-                    name="inngest",
-                    display_name=config["display_name"],
-                    status="degraded",
-                    response_time_ms=elapsed,
-                    last_check=now,
-                    error_message=f"HTTP {response.status_code}",
-                    is_critical=config["is_critical"]
-                )
     except Exception as e:
         return ServiceStatus(
             name="inngest",
@@ -722,7 +761,7 @@ async def _check_inngest_health() -> ServiceStatus:
         )
 
 
-async def _check_deepgram_health() -> ServiceStatus:
+async def _check_deepgram_health(client: httpx.AsyncClient) -> ServiceStatus:
     """Check Deepgram API connectivity."""
     config = SERVICE_CONFIG["deepgram"]
     now = datetime.utcnow()
@@ -740,35 +779,35 @@ async def _check_deepgram_health() -> ServiceStatus:
         )
     
     try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            # Check projects endpoint (no cost)
-            response = await client.get(
-                "https://api.deepgram.com/v1/projects",
-                headers={"Authorization": f"Token {api_key}"}
+        # Check projects endpoint (no cost)
+        response = await client.get(
+            "https://api.deepgram.com/v1/projects",
+            headers={"Authorization": f"Token {api_key}"},
+            timeout=10.0
+        )
+        
+        elapsed = int((datetime.utcnow() - start).total_seconds() * 1000)
+        
+        if response.status_code == 200:
+            return ServiceStatus(
+                name="deepgram",
+                display_name=config["display_name"],
+                status="healthy",
+                response_time_ms=elapsed,
+                last_check=now,
+                details=f"Deepgram API responding in {elapsed}ms",
+                is_critical=config["is_critical"]
+            )
+        else:
+            return ServiceStatus(
+                name="deepgram",
+                display_name=config["display_name"],
+                status="degraded",
+                response_time_ms=elapsed,
+                last_check=now,
+                error_message=f"HTTP {response.status_code}",
+                is_critical=config["is_critical"]
             )
-            
-            elapsed = int((datetime.utcnow() - start).total_seconds() * 1000)
-            
-            if response.status_code == 200:
-                return ServiceStatus(
-                    name="deepgram",
-                    display_name=config["display_name"],
-                    status="healthy",
-                    response_time_ms=elapsed,
-                    last_check=now,
-                    details=f"Deepgram API responding in {elapsed}ms",
-                    is_critical=config["is_critical"]
-                )
-            else:
-                return ServiceStatus(
-                    name="deepgram",
-                    display_name=config["display_name"],
-                    status="degraded",
-                    response_time_ms=elapsed,
-                    last_check=now,
-                    error_message=f"HTTP {response.status_code}",
-                    is_critical=config["is_critical"]
-                )
     except Exception as e:
         return ServiceStatus(
             name="deepgram",
@@ -780,7 +819,7 @@ async def _check_deepgram_health() -> ServiceStatus:
         )
 
 
-async def _check_recall_health() -> ServiceStatus:
+async def _check_recall_health(client: httpx.AsyncClient) -> ServiceStatus:
     """Check Recall.ai API connectivity."""
     config = SERVICE_CONFIG["recall"]
     now = datetime.utcnow()
@@ -801,35 +840,35 @@ async def _check_recall_health() -> ServiceStatus:
     base_url = f"https://{recall_region}.recall.ai/api/v1"
     
     try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            response = await client.get(
-                f"{base_url}/bot",
-                headers={"Authorization": f"Token {api_key}"},
-                params={"limit": 1}
+        response = await client.get(
+            f"{base_url}/bot",
+            headers={"Authorization": f"Token {api_key}"},
+            params={"limit": 1},
+            timeout=10.0
+        )
+        
+        elapsed = int((datetime.utcnow() - start).total_seconds() * 1000)
+        
+        if response.status_code == 200:
+            return ServiceStatus(
+                name="recall",
+                display_name=config["display_name"],
+                status="healthy",
+                response_time_ms=elapsed,
+                last_check=now,
+                details=f"Recall.ai responding in {elapsed}ms",
+                is_critical=config["is_critical"]
+            )
+        else:
+            return ServiceStatus(
+                name="recall",
+                display_name=config["display_name"],
+                status="degraded",
+                response_time_ms=elapsed,
+                last_check=now,
+                error_message=f"HTTP {response.status_code}",
+                is_critical=config["is_critical"]
             )
-            
-            elapsed = int((datetime.utcnow() - start).total_seconds() * 1000)
-            
-            if response.status_code == 200:
-                return ServiceStatus(
-                    name="recall",
-                    display_name=config["display_name"],
-                    status="healthy",
-                    response_time_ms=elapsed,
-                    last_check=now,
-                    details=f"Recall.ai responding in {elapsed}ms",
-                    is_critical=config["is_critical"]
-                )
-            else:
-                return ServiceStatus(
-                    name="recall",
-                    display_name=config["display_name"],
-                    status="degraded",
-                    response_time_ms=elapsed,
-                    last_check=now,
-                    error_message=f"HTTP {response.status_code}",
-                    is_critical=config["is_critical"]
-                )
     except Exception as e:
         return ServiceStatus(
             name="recall",
@@ -841,7 +880,7 @@ async def _check_recall_health() -> ServiceStatus:
         )
 
 
-async def _check_pinecone_health() -> ServiceStatus:
+async def _check_pinecone_health(client: httpx.AsyncClient) -> ServiceStatus:
     """Check Pinecone API connectivity."""
     config = SERVICE_CONFIG["pinecone"]
     now = datetime.utcnow()
@@ -863,7 +902,7 @@ async def _check_pinecone_health() -> ServiceStatus:
         pc = Pinecone(api_key=api_key)
         
         # List indexes (no cost)
-        indexes = pc.list_indexes()
+        indexes = await asyncio.to_thread(pc.list_indexes)
         
         elapsed = int((datetime.utcnow() - start).total_seconds() * 1000)
         
@@ -887,8 +926,8 @@ async def _check_pinecone_health() -> ServiceStatus:
         )
 
 
-async def _check_voyage_health() -> ServiceStatus:
-    """Check Voyage AI API connectivity."""
+async def _check_voyage_health(client: httpx.AsyncClient) -> ServiceStatus:
+    """Check Voyage AI API connectivity (rejected empty request - nothing is embedded)."""
     config = SERVICE_CONFIG["voyage"]
     now = datetime.utcnow()
     start = datetime.utcnow()
@@ -905,42 +944,42 @@ async def _check_voyage_health() -> ServiceStatus:
         )
     
     try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            # Minimal embedding request
-            response = await client.post(
-                "https://api.voyageai.com/v1/embeddings",
-                headers={
-                    "Authorization": f"Bearer {api_key}",
-                    "Content-Type": "application/json"
-                },
-                json={
-                    "model": "voyage-2",
-                    "input": ["test"]
-                }
+        # An empty input is authenticated, then rejected as invalid (not billed)
+        response = await client.post(
+            "https://api.voyageai.com/v1/embeddings",
+            headers={
+                "Authorization": f"Bearer {api_key}",
+                "Content-Type": "application/json"
+            },
+            json={
+                "model": "voyage-2",
+                "input": []
+            },
+            timeout=10.0
+        )
+        
+        elapsed = int((datetime.utcnow() - start).total_seconds() * 1000)
+        
+        if response.status_code in (200, 400, 422):
+            return ServiceStatus(
+                name="voyage",
+                display_name=config["display_name"],
+                status="healthy",
+                response_time_ms=elapsed,
+                last_check=now,
+                details=f"Voyage AI responding in {elapsed}ms",
+                is_critical=config["is_critical"]
+            )
+        else:
+            return ServiceStatus(
+                name="voyage",
+                display_name=config["display_name"],
+                status="degraded",
+                response_time_ms=elapsed,
+                last_check=now,
+                error_message=f"HTTP {response.status_code}",
+                is_critical=config["is_critical"]
             )
-            
-            elapsed = int((datetime.utcnow() - start).total_seconds() * 1000)
-            
-            if response.status_code == 200:
-                return ServiceStatus(
-                    name="voyage",
-                    display_name=config["display_name"],
-                    status="healthy",
-                    response_time_ms=elapsed,
-                    last_check=now,
-                    details=f"Voyage AI responding in {elapsed}ms",
-                    is_critical=config["is_critical"]
-                )
-            else:
-                return ServiceStatus(
-                    name="voyage",
-                    display_name=config["display_name"],
-                    status="degraded",
-                    response_time_ms=elapsed,
-                    last_check=now,
-                    error_message=f"HTTP {response.status_code}",
-                    is_critical=config["is_critical"]
-                )
     except Exception as e:
         return ServiceStatus(
             name="voyage",
@@ -952,8 +991,8 @@ async def _check_voyage_health() -> ServiceStatus:
         )
 
 
-async def _check_exa_health() -> ServiceStatus:
-    """Check Exa API connectivity."""
+async def _check_exa_health(client: httpx.AsyncClient) -> ServiceStatus:
+    """Check Exa API connectivity (rejected empty search - nothing is searched)."""
     config = SERVICE_CONFIG["exa"]
     now = datetime.utcnow()
     start = datetime.utcnow()
@@ -970,43 +1009,39 @@ async def _check_exa_health() -> ServiceStatus:
         )
     
     try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            # Minimal search (1 result)
-            response = await client.post(
-                "https://api.exa.ai/search",
-                headers={
-                    "x-api-key": api_key,
-                    "Content-Type": "application/json"
-                },
-                json={
-                    "query": "health check",
-                    "num_results": 1,
-                    "type": "keyword"
-                }
+        # A search without a query is authenticated, then rejected as invalid (not billed)
+        response = await client.post(
+            "https://api.exa.ai/search",
+            headers={
+                "x-api-key": api_key,
+                "Content-Type": "application/json"
+            },
+            json={},
+            timeout=10.0
+        )
+        
+        elapsed = int((datetime.utcnow() - start).total_seconds() * 1000)
+        
+        if response.status_code in (200, 400, 422):
+            return ServiceStatus(
+                name="exa",
+                display_name=config["display_name"],
+                status="healthy",
+                response_time_ms=elapsed,
+                last_check=now,
+                details=f"Exa API responding in {elapsed}ms",
+                is_critical=config["is_critical"]
+            )
+        else:
+            return ServiceStatus(
+                name="exa",
+                display_name=config["display_name"],
+                status="degraded",
+                response_time_ms=elapsed,
+                last_check=now,
+                error_message=f"HTTP {response.status_code}",
+                is_critical=config["is_critical"]
             )
-            
-            elapsed = int((datetime.utcnow() - start).total_seconds() * 1000)
-            
-            if response.status_code == 200:
-                return ServiceStatus(
-                    name="exa",
-                    display_name=config["display_name"],
-                    status="healthy",
-                    response_time_ms=elapsed,
-                    last_check=now,
-                    details=f"Exa API responding in {elapsed}ms",
-                    is_critical=config["is_critical"]
-                )
-            else:
-                return ServiceStatus(
-                    name="exa",
-                    display_name=config["display_name"],
-                    status="degraded",
-                    response_time_ms=elapsed,
-                    last_check=now,
-                    error_message=f"HTTP {response.status_code}",
-                    is_critical=config["is_critical"]
-                )
     except Exception as e:
         return ServiceStatus(
             name="exa",
@@ -1018,7 +1053,7 @@ async def _check_exa_health() -> ServiceStatus:
         )
 
 
-async def _check_google_health() -> ServiceStatus:
+async def _check_google_health(client: httpx.AsyncClient) -> ServiceStatus:
     """Check Google AI (Gemini) API connectivity."""
     config = SERVICE_CONFIG["google"]
     now = datetime.utcnow()
@@ -1036,34 +1071,34 @@ async def _check_google_health() -> ServiceStatus:
         )
     
     try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            # List models endpoint (no cost)
-            response = await client.get(
-                f"https://generativelanguage.googleapis.com/v1beta/models?key={api_key}"
+        # List models endpoint (no cost)
+        response = await client.get(
+            f"https://generativelanguage.googleapis.com/v1beta/models?key={api_key}",
+            timeout=10.0
+        )
+        
+        elapsed = int((datetime.utcnow() - start).total_seconds() * 1000)
+        
+        if response.status_code == 200:
+            return ServiceStatus(
+                name="google",
+                display_name=config["display_name"],
+                status="healthy",
+                response_time_ms=elapsed,
+                last_check=now,
+                details=f"Google AI responding in {elapsed}ms",
+                is_critical=config["is_critical"]
+            )
+        else:
+            return ServiceStatus(
+                name="google",
+                display_name=config["display_name"],
+                status="degraded",
+                response_time_ms=elapsed,
+                last_check=now,
+                error_message=f"HTTP {response.status_code}",
+                is_critical=config["is_critical"]
             )
-            
-            elapsed = int((datetime.utcnow() - start).total_seconds() * 1000)
-            
-            if response.status_code == 200:
-                return ServiceStatus(
-                    name="google",
-                    display_name=config["display_name"],
-                    status="healthy",
-                    response_time_ms=elapsed,
-                    last_check=now,
-                    details=f"Google AI responding in {elapsed}ms",
-                    is_critical=config["is_critical"]
-                )
-            else:
-                return ServiceStatus(
-                    name="google",
-                    display_name=config["display_name"],
-                    status="degraded",
-                    response_time_ms=elapsed,
-                    last_check=now,
-                    error_message=f"HTTP {response.status_code}",
-                    is_critical=config["is_critical"]
-                )
     except Exception as e:
         return ServiceStatus(
             name="google",
@@ -1075,7 +1110,7 @@ async def _check_google_health() -> ServiceStatus:
         )
 
 
-async def _check_sendgrid_health() -> ServiceStatus:
+async def _check_sendgrid_health(client: httpx.AsyncClient) -> ServiceStatus:
     """Check SendGrid API connectivity."""
     config = SERVICE_CONFIG["sendgrid"]
     now = datetime.utcnow()
@@ -1093,35 +1128,35 @@ async def _check_sendgrid_health() -> ServiceStatus:
         )
     
     try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            # Get user profile (no cost)
-            response = await client.get(
-                "https://api.sendgrid.com/v3/user/profile",
-                headers={"Authorization": f"Bearer {api_key}"}
+        # Get user profile (no cost)
+        response = await client.get(
+            "https://api.sendgrid.com/v3/user/profile",
+            headers={"Authorization": f"Bearer {api_key}"},
+            timeout=10.0
+        )
+        
+        elapsed = int((datetime.utcnow() - start).total_seconds() * 1000)
+        
+        if response.status_code == 200:
+            return ServiceStatus(
+                name="sendgrid",
+                display_name=config["display_name"],
+                status="healthy",
+                response_time_ms=elapsed,
+                last_check=now,
+                details=f"SendGrid responding in {elapsed}ms",
+                is_critical=config["is_critical"]
+            )
+        else:
+            return ServiceStatus(
+                name="sendgrid",
+                display_name=config["display_name"],
+                status="degraded",
+                response_time_ms=elapsed,
+                last_check=now,
+                error_message=f"HTTP {response.status_code}",
+                is_critical=config["is_critical"]
             )
-            
-            elapsed = int((datetime.utcnow() - start).total_seconds() * 1000)
-            
-            if response.status_code == 200:
-                return ServiceStatus(
-                    name="sendgrid",
-                    display_name=config["display_name"],
-                    status="healthy",
-                    response_time_ms=elapsed,
-                    last_check=now,
-                    details=f"SendGrid responding in {elapsed}ms",
-                    is_critical=config["is_critical"]
-                )
-            else:
-                return ServiceStatus(
-                    name="sendgrid",
-                    display_name=config["display_name"],
-                    status="degraded",
-                    response_time_ms=elapsed,
-                    last_check=now,
-                    error_message=f"HTTP {response.status_code}",
-                    is_critical=config["is_critical"]
-                )
     except Exception as e:
         return ServiceStatus(
             name="sendgrid",
@@ -1133,6 +1168,25 @@ async def _check_sendgrid_health() -> ServiceStatus:
         )
 
 
+# ============================================================
+# Background Prober
+# ============================================================
+
+health_prober = HealthProber(checks=[
+    _check_supabase_health,
+    _check_anthropic_health,
+    _check_stripe_health,
+    _check_inngest_health,
+    _check_deepgram_health,
+    _check_recall_health,
+    _check_pinecone_health,
+    _check_voyage_health,
+    _check_exa_health,
+    _check_google_health,
+    _check_sendgrid_health,
+])
+
+
 # ============================================================
 # Helper Functions
 # ============================================================
@@ -11,8 +11,9 @@ from typing import Optional, List, Any, Dict
 from uuid import UUID
 from datetime import datetime, timedelta
 
-from app.deps import get_admin_user, require_admin_role, AdminContext
+from app.deps import get_admin_user, require_admin_role, AdminContext, invalidate_auth_cache
 from app.database import get_supabase_service
+from app.services.prospect_autocomplete import get_prospect_autocomplete
 from .models import CamelModel
 from .utils import log_admin_action, calculate_health_score, get_health_status
 
@@ -1699,6 +1700,7 @@ async def delete_user(
         
         # 7. Delete prospects
         supabase.table("prospects").delete().eq("organization_id", org_id).execute()
+        get_prospect_autocomplete().invalidate(org_id)
         
         # 8. Delete credit packs
         supabase.table("flow_packs").delete().eq("organization_id", org_id).execute()
@@ -1721,6 +1723,7 @@ async def delete_user(
     
     # Finally, delete the user
     supabase.table("users").delete().eq("id", user_id).execute()
+    invalidate_auth_cache(user_id)
     
     return {
         "success": True, 
@@ -821,12 +821,9 @@ async def generate_meeting_email(
         
         # Try to use Gemini for email generation
         try:
-            from google import genai
-            import os
+            from app.services.llm_gateway import gemini_configured, gemini_generate
             
-            gemini_key = os.getenv("GOOGLE_AI_API_KEY") or os.getenv("GEMINI_API_KEY")
-            if gemini_key:
-                client = genai.Client(api_key=gemini_key)
+            if gemini_configured():
                 
                 # Build context for email
                 context_parts = [
@@ -868,7 +865,8 @@ SUBJECT: [email subject line]
 BODY:
 [email body text]"""
                 
-                response = client.models.generate_content(
+                response = await gemini_generate(
+                    "autopilot_email",
                     model="gemini-2.0-flash",
                     contents=prompt
                 )
@@ -238,6 +238,7 @@ async def google_auth_callback(
             "email": email,
             "sync_enabled": True,
             "needs_reauth": False,
+            "sync_cursor": None,  # (Re)connected account starts with a full sync
         }
         
         if existing.data and len(existing.data) > 0:
@@ -372,6 +373,7 @@ async def microsoft_auth_callback(
             "email": email,
             "sync_enabled": True,
             "needs_reauth": False,
+            "sync_cursor": None,  # (Re)connected account starts with a full sync
         }
         
         if existing.data and len(existing.data) > 0:
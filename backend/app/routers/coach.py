@@ -13,8 +13,9 @@ import uuid
 from slowapi import Limiter
 from slowapi.util import get_remote_address
 
-from app.deps import get_current_user
+from app.deps import get_current_user, get_user_org
 from app.database import get_supabase_service
+from app.services.coach_event_buffer import get_coach_event_buffer
 
 # Rate limiter
 limiter = Limiter(key_func=get_remote_address)
@@ -22,6 +23,7 @@ from app.models.coach import (
     CoachSettings,
     CoachSettingsUpdate,
     BehaviorEventCreate,
+    BehaviorEventBatchCreate,
     BehaviorEvent,
     Suggestion,
     SuggestionActionRequest,
@@ -540,42 +542,56 @@ async def record_event(
     event: BehaviorEventCreate,
     current_user: dict = Depends(get_current_user)
 ):
-    """Record a behavior event for pattern learning."""
-    supabase = get_supabase_service()
-    user_id = current_user["sub"]
+    """
+    Record a behavior event for pattern learning.
+    
+    Events are queued and written in bulk (see coach_event_buffer); prefer
+    POST /events/batch for sending several events at once.
+    """
+    event_ids = await _queue_events(current_user, [event])
     
+    # Silently skip if user has no organization (new users)
+    if event_ids is None:
+        return {"success": True, "event_id": None, "message": "Skipped - no organization"}
+    
+    return {"success": True, "event_id": event_ids[0]}
+
+
+@router.post("/events/batch")
+async def record_events_batch(
+    batch: BehaviorEventBatchCreate,
+    current_user: dict = Depends(get_current_user)
+):
+    """Record up to 100 behavior events in one request."""
+    event_ids = await _queue_events(current_user, batch.events)
+    
+    if event_ids is None:
+        return {"success": True, "accepted": 0, "event_ids": [], "message": "Skipped - no organization"}
+    
+    return {"success": True, "accepted": len(event_ids), "event_ids": event_ids}
+
+
+async def _queue_events(current_user: dict, events: List[BehaviorEventCreate]) -> Optional[List[str]]:
+    """Queue events for the user's organization (None if the user has none)."""
     try:
-        # Get organization ID
-        org_result = supabase.table("organization_members") \
-            .select("organization_id") \
-            .eq("user_id", user_id) \
-            .execute()
-        
-        # Silently skip if user has no organization (new users)
-        if not org_result.data:
-            return {"success": True, "event_id": None, "message": "Skipped - no organization"}
-        
-        event_data = {
-            "user_id": user_id,
-            "organization_id": org_result.data[0]["organization_id"],
-            "event_type": event.event_type.value,
-            "event_data": event.event_data,
-            "page_context": event.page_context,
-        }
-        
-        result = supabase.table("coach_behavior_events") \
-            .insert(event_data) \
-            .execute()
-        
-        if result.data:
-            return {"success": True, "event_id": result.data[0]["id"]}
-        
-        raise HTTPException(status_code=500, detail="Failed to record event")
-        
-    except HTTPException:
+        # Cached organization lookup
+        user_id, organization_id = await get_user_org(current_user)
+    except HTTPException as e:
+        if e.status_code == 403:
+            return None
         raise
+    
+    try:
+        return get_coach_event_buffer().add(user_id, organization_id, [
+            {
+                "event_type": event.event_type.value,
+                "event_data": event.event_data,
+                "page_context": event.page_context,
+            }
+            for event in events
+        ])
     except Exception as e:
-        logger.error(f"Error recording event: {e}")
+        logger.error(f"Error recording events: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -5,7 +5,7 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from pydantic import BaseModel, Field
 from typing import Optional, Dict, Any, List
 import uuid
-from app.deps import get_current_user
+from app.deps import get_current_user, invalidate_auth_cache
 from app.database import get_supabase_service
 from app.services.profile_service import ProfileService
 from app.services.company_interview_service import get_company_interview_service
@@ -350,6 +350,7 @@ async def complete_company_interview(
                     "organization_id": organization_id,
                     "role": "owner"
                 }).execute()
+                invalidate_auth_cache(user_id)
                 print(f"DEBUG: Created organization {organization_id} and added user {user_id}")
         
         # Check if company profile exists - upsert logic
@@ -14,7 +14,6 @@ Endpoints:
 
 import logging
 import asyncio
-import os
 from typing import Optional, List
 from datetime import datetime
 from uuid import uuid4
@@ -26,6 +25,10 @@ from app.deps import get_current_user
 from app.database import get_supabase_service
 from app.services.contact_analyzer import get_contact_analyzer
 from app.services.contact_search import get_contact_search_service, ContactMatch as ContactMatchModel
+from app.services.coach_rules import invalidate_coach_context
+from app.services.prospect_autocomplete import get_prospect_autocomplete
+from app.services.prospect_hub import invalidate_prospect_hub
+from app.services.action_generator import invalidate_prospect_action_contexts
 
 # Inngest integration
 from app.inngest.events import send_event, use_inngest_for, Events
@@ -322,16 +325,13 @@ async def _try_gemini_search(name: str, company_name: str, country: Optional[str
     import re
     
     try:
-        from google import genai
         from google.genai import types
+        from app.services.llm_gateway import gemini_configured, gemini_generate
         
-        api_key = os.getenv("GOOGLE_AI_API_KEY") or os.getenv("GOOGLE_API_KEY")
-        if not api_key:
+        if not gemini_configured():
             logger.warning("No API key for Gemini")
             return {"name": name, "found": False, "confidence": "low"}
         
-        client = genai.Client(api_key=api_key)
-        
         search_query = f"{name} {company_name} linkedin"
         
         prompt = f"""Search for: {search_query}
@@ -345,8 +345,8 @@ Or if not found:
 {{"found": false, "linkedin_url": null, "role": null, "confidence": "low"}}
 """
         
-        # Use client.aio for async to not block the event loop
-        response = await client.aio.models.generate_content(
+        response = await gemini_generate(
+            "contact_lookup",
             model="gemini-2.0-flash",
             contents=prompt,
             config=types.GenerateContentConfig(
@@ -442,11 +442,15 @@ def analyze_contact_background(
             "analysis_source": "linkedin" if linkedin_url else "role_based"
         }
         
-        supabase_service.table("prospect_contacts")\
+        result = supabase_service.table("prospect_contacts")\
             .update(update_data)\
             .eq("id", contact_id)\
             .execute()
         
+        if result.data:
+            invalidate_prospect_hub(result.data[0].get("prospect_id"))
+            invalidate_prospect_action_contexts(result.data[0].get("organization_id"), result.data[0].get("prospect_id"))
+        
         logger.info(f"Contact analysis completed for {contact_name}")
         
     except Exception as e:
@@ -783,6 +787,10 @@ async def add_contact_to_research(
             raise HTTPException(status_code=500, detail="Failed to create contact")
         
         created_contact = result.data[0]
+        invalidate_coach_context(organization_id=organization_id)
+        get_prospect_autocomplete().upsert_contact(organization_id, created_contact)
+        invalidate_prospect_hub(created_contact.get("prospect_id"))
+        invalidate_prospect_action_contexts(organization_id, created_contact.get("prospect_id"))
         
         # Start analysis via Inngest (if enabled) or BackgroundTasks (fallback)
         if use_inngest_for("contacts"):
@@ -1122,6 +1130,9 @@ async def update_contact(
         raise HTTPException(status_code=500, detail="Failed to update contact")
     
     c = result.data[0]
+    get_prospect_autocomplete().upsert_contact(organization_id, c)
+    invalidate_prospect_hub(c.get("prospect_id"))
+    invalidate_prospect_action_contexts(organization_id, c.get("prospect_id"))
     logger.info(f"Updated contact {contact_id}: {list(update_data.keys())}")
     
     return ContactResponse(
@@ -1156,7 +1167,7 @@ async def delete_contact(
     
     # Verify contact exists and belongs to org
     check = supabase_service.table("prospect_contacts")\
-        .select("id")\
+        .select("id, prospect_id")\
         .eq("id", contact_id)\
         .eq("organization_id", organization_id)\
         .execute()
@@ -1169,6 +1180,10 @@ async def delete_contact(
         .delete()\
         .eq("id", contact_id)\
         .execute()
+    invalidate_coach_context(organization_id=organization_id)
+    get_prospect_autocomplete().remove_contact(organization_id, contact_id)
+    invalidate_prospect_hub(check.data[0].get("prospect_id"))
+    invalidate_prospect_action_contexts(organization_id, check.data[0].get("prospect_id"))
     
     return {"message": "Contact deleted"}
 
@@ -1231,6 +1246,7 @@ async def reanalyze_contact(
         })\
         .eq("id", contact_id)\
         .execute()
+    invalidate_prospect_hub(contact.get("prospect_id"))
     
     # Start analysis via Inngest (if enabled) or BackgroundTasks (fallback)
     if use_inngest_for("contacts"):
@@ -7,6 +7,7 @@ IMPORTANT: This is NOT a CRM replacement!
 """
 
 from fastapi import APIRouter, HTTPException, Depends
+import asyncio
 from typing import List, Optional
 from uuid import UUID
 from datetime import datetime
@@ -19,6 +20,10 @@ from ..models.deals import (
 )
 from ..database import get_supabase_service, get_user_client
 from ..deps import get_current_user, get_auth_token
+from ..services.prospect_hub import (
+    PROSPECT_COLUMNS, CONTACT_COLUMNS,
+    cached_hub, fetch_first, fetch_all, fetch_latest_research, invalidate_prospect_hub
+)
 
 router = APIRouter(prefix="/api/v1/deals", tags=["deals"])
 
@@ -137,6 +142,8 @@ async def create_deal(
     if not result.data:
         raise HTTPException(status_code=500, detail="Failed to create deal")
     
+    invalidate_prospect_hub(data["prospect_id"])
+    
     return Deal(**result.data[0])
 
 
@@ -166,6 +173,8 @@ async def update_deal(
     if not result.data:
         raise HTTPException(status_code=500, detail="Failed to update deal")
     
+    invalidate_prospect_hub(result.data[0].get("prospect_id"))
+    
     return Deal(**result.data[0])
 
 
@@ -180,13 +189,15 @@ async def delete_deal(
     user_id, org_id = await get_user_org(user, supabase)
     
     # Verify deal belongs to organization
-    existing = supabase.table("deals").select("id").eq("id", str(deal_id)).eq("organization_id", org_id).single().execute()
+    existing = supabase.table("deals").select("id, prospect_id").eq("id", str(deal_id)).eq("organization_id", org_id).single().execute()
     
     if not existing.data:
         raise HTTPException(status_code=404, detail="Deal not found")
     
     supabase.table("deals").delete().eq("id", str(deal_id)).execute()
     
+    invalidate_prospect_hub(existing.data.get("prospect_id"))
+    
     return None
 
 
@@ -208,6 +219,8 @@ async def archive_deal(
     if not result.data:
         raise HTTPException(status_code=404, detail="Deal not found")
     
+    invalidate_prospect_hub(result.data[0].get("prospect_id"))
+    
     return Deal(**result.data[0])
 
 
@@ -229,6 +242,8 @@ async def activate_deal(
     if not result.data:
         raise HTTPException(status_code=404, detail="Deal not found")
     
+    invalidate_prospect_hub(result.data[0].get("prospect_id"))
+    
     return Deal(**result.data[0])
 
 
@@ -411,6 +426,8 @@ async def create_meeting(
     if not result.data:
         raise HTTPException(status_code=500, detail="Failed to create meeting")
     
+    invalidate_prospect_hub(data["prospect_id"])
+    
     return Meeting(**result.data[0])
 
 
@@ -456,6 +473,8 @@ async def update_meeting(
     if not result.data:
         raise HTTPException(status_code=500, detail="Failed to update meeting")
     
+    invalidate_prospect_hub(result.data[0].get("prospect_id"))
+    
     return Meeting(**result.data[0])
 
 
@@ -470,13 +489,15 @@ async def delete_meeting(
     user_id, org_id = await get_user_org(user, supabase)
     
     # Verify meeting belongs to organization
-    existing = supabase.table("meetings").select("id").eq("id", str(meeting_id)).eq("organization_id", org_id).single().execute()
+    existing = supabase.table("meetings").select("id, prospect_id").eq("id", str(meeting_id)).eq("organization_id", org_id).single().execute()
     
     if not existing.data:
         raise HTTPException(status_code=404, detail="Meeting not found")
     
     supabase.table("meetings").delete().eq("id", str(meeting_id)).execute()
     
+    invalidate_prospect_hub(existing.data.get("prospect_id"))
+    
     return None
 
 
@@ -486,6 +507,15 @@ async def delete_meeting(
 
 hub_router = APIRouter(prefix="/api/v1/prospects", tags=["prospect-hub"])
 
+DEAL_SUMMARY_COLUMNS = (
+    "deal_id, prospect_id, organization_id, name, description, is_active, created_at, company_name, "
+    "meeting_count, prep_count, followup_count, crm_stage, crm_value_cents, crm_currency, crm_synced_at"
+)
+HUB_ACTIVITY_COLUMNS = (
+    "id, prospect_id, deal_id, meeting_id, organization_id, activity_type, activity_id, "
+    "title, description, icon, metadata, created_at, created_by"
+)
+
 
 @hub_router.get("/{prospect_id}/hub", response_model=ProspectHub)
 async def get_prospect_hub(
@@ -494,7 +524,7 @@ async def get_prospect_hub(
     user: dict = Depends(get_current_user),
     token: str = Depends(get_auth_token)
 ):
-    """Get full Prospect Hub data"""
+    """Get full Prospect Hub data (fetched concurrently, cached briefly per prospect)"""
     supabase = get_user_client(token)
     user_id, org_id = await get_user_org(user, supabase)
     
@@ -502,36 +532,47 @@ async def get_prospect_hub(
     if str(organization_id) != org_id:
         raise HTTPException(status_code=403, detail="Organization mismatch")
     
-    # Get prospect
-    prospect_result = supabase.table("prospects").select("*").eq("id", str(prospect_id)).eq("organization_id", org_id).single().execute()
+    hub = await cached_hub(
+        str(prospect_id), "deal_hub", org_id,
+        lambda: _load_prospect_hub(supabase, str(prospect_id), org_id)
+    )
     
-    if not prospect_result.data:
+    if hub is None:
         raise HTTPException(status_code=404, detail="Prospect not found")
     
-    prospect = prospect_result.data
-    
-    # Get latest research (any status - to show "in progress")
-    # First try completed research
-    completed_result = supabase.table("research_briefs").select("*").eq("prospect_id", str(prospect_id)).eq("status", "completed").order("completed_at", desc=True).limit(1).execute()
-    
-    if completed_result.data:
-        research = completed_result.data[0]
-    else:
-        # No completed, check for in-progress
-        in_progress_result = supabase.table("research_briefs").select("*").eq("prospect_id", str(prospect_id)).in_("status", ["pending", "researching"]).order("created_at", desc=True).limit(1).execute()
-        research = in_progress_result.data[0] if in_progress_result.data else None
-    
-    # Get contacts
-    contacts_result = supabase.table("prospect_contacts").select("*").eq("prospect_id", str(prospect_id)).order("is_primary", desc=True).execute()
-    
-    contacts = contacts_result.data
+    return hub
+
+
+async def _load_prospect_hub(supabase, prospect_id: str, org_id: str) -> Optional[ProspectHub]:
+    """Prospect, latest research, contacts, deals and activities in one concurrent round"""
+    prospect, research, contacts, deal_rows, activity_rows = await asyncio.gather(
+        fetch_first(
+            supabase.table("prospects").select(PROSPECT_COLUMNS)
+            .eq("id", prospect_id).eq("organization_id", org_id).limit(1)
+        ),
+        # Latest research (any status - to show "in progress")
+        fetch_latest_research(supabase, prospect_id, org_id),
+        fetch_all(
+            supabase.table("prospect_contacts").select(CONTACT_COLUMNS)
+            .eq("prospect_id", prospect_id).order("is_primary", desc=True)
+        ),
+        # Deals with stats (using view)
+        fetch_all(
+            supabase.table("deal_summary").select(DEAL_SUMMARY_COLUMNS)
+            .eq("prospect_id", prospect_id).order("is_active", desc=True).order("created_at", desc=True)
+        ),
+        fetch_all(
+            supabase.table("prospect_activities").select(HUB_ACTIVITY_COLUMNS)
+            .eq("prospect_id", prospect_id).order("created_at", desc=True).limit(20)
+        ),
+    )
     
-    # Get deals with stats (using view)
-    deals_result = supabase.table("deal_summary").select("*").eq("prospect_id", str(prospect_id)).order("is_active", desc=True).order("created_at", desc=True).execute()
+    if not prospect:
+        return None
     
     # Map view fields to model fields (view uses deal_id, model expects id)
     deals = []
-    for d in deals_result.data:
+    for d in deal_rows:
         # Rename deal_id to id for Pydantic model
         if "deal_id" in d and "id" not in d:
             d["id"] = d.pop("deal_id")
@@ -540,10 +581,7 @@ async def get_prospect_hub(
             d["updated_at"] = d.get("created_at")
         deals.append(DealWithStats(**d))
     
-    # Get recent activities
-    activities_result = supabase.table("prospect_activities").select("*").eq("prospect_id", str(prospect_id)).order("created_at", desc=True).limit(20).execute()
-    
-    activities = [Activity(**a) for a in activities_result.data]
+    activities = [Activity(**a) for a in activity_rows]
     
     # Build summary
     summary = ProspectHubSummary(
@@ -636,4 +674,6 @@ async def create_activity(
     if not result.data:
         raise HTTPException(status_code=500, detail="Failed to create activity")
     
+    invalidate_prospect_hub(str(prospect_id))
+    
     return Activity(**result.data[0])
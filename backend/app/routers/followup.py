@@ -17,6 +17,8 @@ from slowapi.util import get_remote_address
 from app.deps import get_current_user
 from app.database import get_supabase_service
 from app.utils.errors import handle_exception
+from app.utils.sse import sse_response, detach
+from app.i18n.config import DEFAULT_LANGUAGE
 
 # Rate limiter
 limiter = Limiter(key_func=get_remote_address)
@@ -25,6 +27,9 @@ from app.services.followup_generator import get_followup_generator
 from app.services.transcript_parser import get_transcript_parser
 from app.services.prospect_context_service import get_prospect_context_service
 from app.services.prospect_service import get_prospect_service
+from app.services.coach_rules import invalidate_coach_context
+from app.services.action_generator import invalidate_action_context
+from app.services.prospect_hub import invalidate_prospect_hub, invalidate_prospect_hubs
 
 # Inngest integration
 from app.inngest.events import send_event, use_inngest_for, Events
@@ -86,6 +91,11 @@ class UpdateFollowupRequest(BaseModel):
 
 class RegenerateEmailRequest(BaseModel):
     tone: str = "professional"
+    language: Optional[str] = None  # Used by the streaming endpoint
+
+
+class StreamSummaryRequest(BaseModel):
+    language: Optional[str] = None
 
 
 # Background task for processing (sync wrapper for BackgroundTasks)
@@ -243,16 +253,20 @@ async def _process_followup_async(
             "full_summary_content": summary.get("full_content", "")
         }
         
-        supabase.table("followups").update(update_data).eq("id", followup_id).execute()
+        response = supabase.table("followups").update(update_data).eq("id", followup_id).execute()
+        invalidate_coach_context(organization_id=organization_id)
+        invalidate_action_context(followup_id)
+        invalidate_prospect_hubs(response.data)
         
         logger.info(f"Successfully processed followup {followup_id}")
         
     except Exception as e:
         logger.error(f"Error processing followup {followup_id}: {e}")
-        supabase.table("followups").update({
+        response = supabase.table("followups").update({
             "status": "failed",
             "error_message": str(e)
         }).eq("id", followup_id).execute()
+        invalidate_prospect_hubs(response.data)
 
 
 def _get_content_type(filename: str) -> str:
@@ -383,6 +397,8 @@ async def upload_audio(
         
         followup = response.data[0]
         followup_id = followup["id"]
+        invalidate_prospect_hub(followup.get("prospect_id"))
+        invalidate_coach_context(organization_id=organization_id)
         
         # Update reverse link in calendar_meetings (SPEC-038)
         if calendar_meeting_id:
@@ -592,16 +608,20 @@ async def _process_transcript_async(
             "full_summary_content": summary.get("full_content", "")
         }
         
-        supabase.table("followups").update(update_data).eq("id", followup_id).execute()
+        response = supabase.table("followups").update(update_data).eq("id", followup_id).execute()
+        invalidate_coach_context(organization_id=organization_id)
+        invalidate_action_context(followup_id)
+        invalidate_prospect_hubs(response.data)
         
         logger.info(f"Successfully processed transcript followup {followup_id}")
         
     except Exception as e:
         logger.error(f"Error processing transcript followup {followup_id}: {e}")
-        supabase.table("followups").update({
+        response = supabase.table("followups").update({
             "status": "failed",
             "error_message": str(e)
         }).eq("id", followup_id).execute()
+        invalidate_prospect_hubs(response.data)
 
 
 @router.post("/upload-transcript", response_model=FollowupResponse, status_code=202)
@@ -730,6 +750,8 @@ async def upload_transcript(
         
         followup = response.data[0]
         followup_id = followup["id"]
+        invalidate_prospect_hub(followup.get("prospect_id"))
+        invalidate_coach_context(organization_id=organization_id)
         
         # Start processing via Inngest (if enabled) or BackgroundTasks (fallback)
         if use_inngest_for("followup"):
@@ -921,6 +943,8 @@ async def update_followup(
         
         if not response.data:
             raise HTTPException(status_code=404, detail="Follow-up not found")
+        invalidate_action_context(followup_id)
+        invalidate_prospect_hubs(response.data)
         
         return response.data[0]
         
@@ -973,6 +997,9 @@ async def delete_followup(
         ).eq(
             "organization_id", organization_id
         ).execute()
+        invalidate_coach_context(organization_id=organization_id)
+        invalidate_action_context(followup_id)
+        invalidate_prospect_hubs(response.data)
         
         return {"message": "Follow-up deleted"}
         
@@ -982,6 +1009,66 @@ async def delete_followup(
         raise handle_exception(e, "delete_followup", user_id=user_id, resource_id=followup_id)
 
 
+def _load_completed_followup(followup_id: str, user_id: str) -> tuple:
+    """Fetch a completed follow-up in the user's organization -> (followup, organization_id)"""
+    # Get organization
+    org_response = supabase.table("organization_members").select(
+        "organization_id"
+    ).eq("user_id", user_id).limit(1).execute()
+    
+    if not org_response.data:
+        raise HTTPException(status_code=404, detail="User not in any organization")
+    
+    organization_id = org_response.data[0]["organization_id"]
+    
+    # Get followup
+    followup_response = supabase.table("followups").select("*").eq(
+        "id", followup_id
+    ).eq(
+        "organization_id", organization_id
+    ).limit(1).execute()
+    
+    if not followup_response.data:
+        raise HTTPException(status_code=404, detail="Follow-up not found")
+    
+    followup = followup_response.data[0]
+    
+    if followup["status"] != "completed":
+        raise HTTPException(status_code=400, detail="Follow-up not yet completed")
+    
+    return followup, organization_id
+
+
+async def _get_regeneration_context(
+    followup: dict,
+    organization_id: str,
+    user_id: str,
+    max_kb_chunks: int = 3
+) -> Optional[Dict[str, Any]]:
+    """Full prospect context for regenerating follow-up content"""
+    try:
+        context_service = get_prospect_context_service()
+        return await context_service.get_full_prospect_context(
+            prospect_company=followup.get("prospect_company_name") or "Unknown",
+            organization_id=organization_id,
+            user_id=user_id,
+            meeting_prep_id=followup.get("meeting_prep_id"),
+            include_kb=True,
+            max_kb_chunks=max_kb_chunks
+        )
+    except Exception as e:
+        logger.warning(f"Could not get prospect context for regeneration: {e}")
+        return None
+
+
+def _summary_for_email(followup: dict) -> Dict[str, Any]:
+    return {
+        "executive_summary": followup.get("executive_summary", ""),
+        "key_points": followup.get("key_points", []),
+        "next_steps": followup.get("next_steps", [])
+    }
+
+
 @router.post("/{followup_id}/regenerate-email", response_model=Dict[str, Any])
 async def regenerate_email(
     followup_id: str,
@@ -992,59 +1079,17 @@ async def regenerate_email(
     try:
         user_id = current_user.get("sub") or current_user.get("id")
         
-        # Get organization
-        org_response = supabase.table("organization_members").select(
-            "organization_id"
-        ).eq("user_id", user_id).limit(1).execute()
-        
-        if not org_response.data:
-            raise HTTPException(status_code=404, detail="User not in any organization")
-        
-        organization_id = org_response.data[0]["organization_id"]
-        
-        # Get followup
-        followup_response = supabase.table("followups").select("*").eq(
-            "id", followup_id
-        ).eq(
-            "organization_id", organization_id
-        ).limit(1).execute()
-        
-        if not followup_response.data:
-            raise HTTPException(status_code=404, detail="Follow-up not found")
-        
-        followup = followup_response.data[0]
-        
-        if followup["status"] != "completed":
-            raise HTTPException(status_code=400, detail="Follow-up not yet completed")
+        followup, organization_id = _load_completed_followup(followup_id, user_id)
         
         # Get full prospect context for regeneration
-        prospect_context = None
         prospect_company = followup.get("prospect_company_name")
-        
-        try:
-            context_service = get_prospect_context_service()
-            prospect_context = await context_service.get_full_prospect_context(
-                prospect_company=prospect_company or "Unknown",
-                organization_id=organization_id,
-                user_id=user_id,
-                meeting_prep_id=followup.get("meeting_prep_id"),
-                include_kb=True,
-                max_kb_chunks=3
-            )
-        except Exception as e:
-            logger.warning(f"Could not get prospect context for email regen: {e}")
+        prospect_context = await _get_regeneration_context(followup, organization_id, user_id)
         
         # Regenerate email with full context
         followup_generator = get_followup_generator()
         
-        summary = {
-            "executive_summary": followup.get("executive_summary", ""),
-            "key_points": followup.get("key_points", []),
-            "next_steps": followup.get("next_steps", [])
-        }
-        
         email_draft = await followup_generator.generate_email_draft(
-            summary=summary,
+            summary=_summary_for_email(followup),
             action_items=followup.get("action_items", []),
             prospect_context=prospect_context,
             prospect_company=prospect_company,
@@ -1067,3 +1112,116 @@ async def regenerate_email(
     except Exception as e:
         raise handle_exception(e, "regenerate_email", user_id=user_id, resource_id=followup_id)
 
+
+@router.post("/{followup_id}/regenerate-email/stream")
+async def regenerate_email_stream(
+    followup_id: str,
+    request: RegenerateEmailRequest,
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Regenerate the email draft, streamed as Server-Sent Events
+    
+    Events: token (email text as it is written), done ({email_draft,
+    email_tone}, sent after saving), error. The draft is saved even if the
+    client disconnects before the end.
+    """
+    try:
+        user_id = current_user.get("sub") or current_user.get("id")
+        followup, organization_id = _load_completed_followup(followup_id, user_id)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise handle_exception(e, "regenerate_email_stream", user_id=user_id, resource_id=followup_id)
+    
+    async def events():
+        try:
+            prospect_context = await _get_regeneration_context(followup, organization_id, user_id)
+            
+            async for event in get_followup_generator().stream_email_draft(
+                summary=_summary_for_email(followup),
+                action_items=followup.get("action_items", []),
+                prospect_context=prospect_context,
+                language=request.language or DEFAULT_LANGUAGE,
+                prospect_company=followup.get("prospect_company_name"),
+                tone=request.tone,
+                organization_id=organization_id,
+                user_id=user_id,
+                metadata={"followup_id": followup_id}
+            ):
+                if event["event"] == "done":
+                    supabase.table("followups").update({
+                        "email_draft": event["data"]["email_draft"],
+                        "email_tone": request.tone
+                    }).eq("id", followup_id).execute()
+                    event["data"]["email_tone"] = request.tone
+                yield event
+                
+        except Exception as e:
+            logger.error(f"Error streaming email for followup {followup_id}: {e}")
+            yield {"event": "error", "data": {"message": "Failed to generate email"}}
+    
+    return sse_response(detach(events()))
+
+
+@router.post("/{followup_id}/summary/stream")
+async def regenerate_summary_stream(
+    followup_id: str,
+    request: StreamSummaryRequest,
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Regenerate the meeting summary from the stored transcription, streamed
+    as Server-Sent Events
+    
+    Events: token, section (each "## " section with its parsed field),
+    done (the structured summary, sent after saving), error. Action items
+    and the email draft are left as they are.
+    """
+    try:
+        user_id = current_user.get("sub") or current_user.get("id")
+        followup, organization_id = _load_completed_followup(followup_id, user_id)
+        
+        if not followup.get("transcription_text"):
+            raise HTTPException(status_code=400, detail="Follow-up has no transcription")
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise handle_exception(e, "regenerate_summary_stream", user_id=user_id, resource_id=followup_id)
+    
+    async def events():
+        try:
+            prospect_context = await _get_regeneration_context(
+                followup, organization_id, user_id, max_kb_chunks=5
+            )
+            
+            async for event in get_followup_generator().stream_summary(
+                transcription=followup["transcription_text"],
+                prospect_context=prospect_context,
+                language=request.language or DEFAULT_LANGUAGE,
+                prospect_company=followup.get("prospect_company_name"),
+                organization_id=organization_id,
+                user_id=user_id,
+                metadata={"followup_id": followup_id}
+            ):
+                if event["event"] == "done":
+                    summary = event["data"]
+                    supabase.table("followups").update({
+                        "meeting_gist": summary.get("meeting_gist", ""),
+                        "executive_summary": summary.get("executive_summary", ""),
+                        "key_points": summary.get("key_points", []),
+                        "concerns": summary.get("concerns", []),
+                        "decisions": summary.get("decisions", []),
+                        "next_steps": summary.get("next_steps", []),
+                        "commercial_signals": summary.get("commercial_signals", {}),
+                        "observations": summary.get("observations", {}),
+                        "full_summary_content": summary.get("full_content", "")
+                    }).eq("id", followup_id).execute()
+                    logger.info(f"Saved streamed summary for followup {followup_id}")
+                yield event
+                
+        except Exception as e:
+            logger.error(f"Error streaming summary for followup {followup_id}: {e}")
+            yield {"event": "error", "data": {"message": "Failed to generate summary"}}
+    
+    return sse_response(detach(events()))
@@ -5,17 +5,19 @@ Handles on-demand generation, CRUD operations, and action management.
 """
 
 from fastapi import APIRouter, HTTPException, Depends, BackgroundTasks
-from typing import Optional, List
+from typing import Optional, List, Dict
 from datetime import datetime
 import logging
 import uuid
 
 from app.deps import get_current_user
 from app.database import get_supabase_service
+from app.services.coach_rules import invalidate_coach_context
 from app.models.followup_actions import (
     ActionType,
     ACTION_TYPE_INFO,
     FollowupActionCreate,
+    FollowupActionBatchCreate,
     FollowupActionUpdate,
     FollowupActionResponse,
     FollowupActionsListResponse,
@@ -163,6 +165,7 @@ async def generate_action(
         
         if not insert_result.data:
             raise HTTPException(status_code=500, detail="Failed to create action")
+        invalidate_coach_context(organization_id=organization_id)
         
         # Trigger generation via Inngest (if enabled) or BackgroundTasks (fallback)
         use_inngest = use_inngest_for("followup_actions")
@@ -215,6 +218,121 @@ async def generate_action(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/{followup_id}/actions/batch", response_model=FollowupActionsListResponse)
+async def generate_actions(
+    followup_id: str,
+    request: FollowupActionBatchCreate,
+    background_tasks: BackgroundTasks,
+    locale: str = "en",
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Generate several actions for a follow-up at once.
+    
+    The actions are generated in one background task from a single shared
+    context snapshot, a few Claude calls at a time (ACTION_GENERATION_CONCURRENCY).
+    """
+    try:
+        user_id = current_user.get("sub")
+        supabase = get_supabase_service()
+        
+        # Keep request order, drop duplicates
+        action_types = list(dict.fromkeys(request.action_types))
+        type_values = [action_type.value for action_type in action_types]
+        
+        # Verify user owns this followup and get org_id
+        followup_result = supabase.table("followups").select("id, organization_id").eq("id", followup_id).eq("user_id", user_id).execute()
+        
+        if not followup_result.data:
+            raise HTTPException(status_code=404, detail="Follow-up not found")
+        
+        organization_id = followup_result.data[0]["organization_id"]
+        
+        # Check credits for all actions BEFORE generating
+        from app.services.credit_service import get_credit_service
+        credit_service = get_credit_service()
+        has_credits, credit_balance = await credit_service.check_credits(
+            organization_id=organization_id,
+            action="followup_action",
+            quantity=len(action_types)
+        )
+        if not has_credits:
+            raise HTTPException(
+                status_code=402,
+                detail={
+                    "error": "insufficient_credits",
+                    "message": "Not enough credits for these actions",
+                    "required": credit_balance.get("required_credits", 2 * len(action_types)),
+                    "available": credit_balance.get("total_credits_available", 0),
+                    "upgrade_url": "/pricing"
+                }
+            )
+        
+        # Check which of these action types already exist
+        existing = supabase.table("followup_actions").select("id, action_type").eq("followup_id", followup_id).in_("action_type", type_values).execute()
+        
+        if existing.data and not request.regenerate:
+            existing_types = sorted({row["action_type"] for row in existing.data})
+            raise HTTPException(
+                status_code=400,
+                detail=f"Actions of type {', '.join(existing_types)} already exist. Set regenerate=true to replace."
+            )
+        
+        # If regenerating, delete existing
+        if existing.data and request.regenerate:
+            supabase.table("followup_actions").delete().in_("id", [row["id"] for row in existing.data]).execute()
+        
+        # Get user's OUTPUT language preference (not app_language which is UI language)
+        settings_result = supabase.table("user_settings").select("output_language").eq("user_id", user_id).execute()
+        language = "en"
+        if settings_result.data:
+            language = settings_result.data[0].get("output_language", "en")
+        
+        # Create action records with "generating" state (single insert)
+        actions = {str(uuid.uuid4()): action_type for action_type in action_types}
+        insert_result = supabase.table("followup_actions").insert([
+            {
+                "id": action_id,
+                "followup_id": followup_id,
+                "organization_id": organization_id,
+                "user_id": user_id,
+                "action_type": action_type.value,
+                "content": None,  # Will be filled by background task
+                "metadata": {"status": "generating"},
+                "language": language,
+            }
+            for action_id, action_type in actions.items()
+        ]).execute()
+        
+        if not insert_result.data:
+            raise HTTPException(status_code=500, detail="Failed to create actions")
+        invalidate_coach_context(organization_id=organization_id)
+        
+        # Always in-process: the actions share one context snapshot
+        logger.info(f"Generating {len(actions)} actions for followup {followup_id}: {type_values}")
+        background_tasks.add_task(
+            generate_actions_content,
+            actions=actions,
+            followup_id=followup_id,
+            organization_id=organization_id,
+            user_id=user_id,
+            language=language,
+        )
+        
+        created = [
+            FollowupActionResponse.from_db(row, locale)
+            for row in insert_result.data
+        ]
+        
+        return FollowupActionsListResponse(actions=created, count=len(created))
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error generating actions: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.get("/{followup_id}/actions/{action_id}", response_model=FollowupActionResponse)
 async def get_action(
     followup_id: str,
@@ -297,13 +415,14 @@ async def delete_action(
         supabase = get_supabase_service()
         
         # Verify ownership
-        existing = supabase.table("followup_actions").select("id").eq("id", action_id).eq("followup_id", followup_id).eq("user_id", user_id).execute()
+        existing = supabase.table("followup_actions").select("id, organization_id").eq("id", action_id).eq("followup_id", followup_id).eq("user_id", user_id).execute()
         
         if not existing.data:
             raise HTTPException(status_code=404, detail="Action not found")
         
         # Delete
         supabase.table("followup_actions").delete().eq("id", action_id).execute()
+        invalidate_coach_context(organization_id=existing.data[0].get("organization_id"))
         
         return {"success": True, "message": "Action deleted"}
         
@@ -325,8 +444,6 @@ async def generate_action_content(
     try:
         # Import here to avoid circular imports
         from app.services.action_generator import ActionGeneratorService
-        from app.services.credit_service import get_credit_service
-        from app.services.api_usage_service import get_api_usage_service
         
         supabase = get_supabase_service()
         
@@ -345,55 +462,107 @@ async def generate_action_content(
             language=language,
         )
         
-        # Update action with generated content
-        supabase.table("followup_actions").update({
-            "content": content,
-            "metadata": metadata,
-        }).eq("id", action_id).execute()
-        
-        # Log API usage and consume credits (if org_id available)
-        if organization_id:
-            try:
-                credit_service = get_credit_service()
-                await credit_service.consume_credits(
-                    organization_id=organization_id,
-                    action="followup_action",
-                    user_id=user_id,
-                    metadata={"action_id": action_id, "action_type": action_type.value}
-                )
-            except Exception as credit_err:
-                logger.warning(f"Credit consumption failed: {credit_err}")
-            
-            # Log actual token usage from metadata
-            token_stats = metadata.get("token_stats", {})
-            if token_stats:
-                try:
-                    usage_service = get_api_usage_service()
-                    await usage_service.log_llm_usage(
-                        organization_id=organization_id,
-                        provider="anthropic",
-                        model="claude-sonnet-4-20250514",
-                        input_tokens=token_stats.get("input_tokens", 0),
-                        output_tokens=token_stats.get("output_tokens", 0),
-                        user_id=user_id,
-                        service=f"followup_action_{action_type.value}",
-                        credits_consumed=0,
-                        metadata={"action_id": action_id, "followup_id": followup_id}
-                    )
-                except Exception as usage_err:
-                    logger.warning(f"API usage logging failed: {usage_err}")
+        await _save_action_content(action_id, followup_id, action_type, organization_id, user_id, content, metadata)
         
         logger.info(f"Generated {action_type.value} for followup {followup_id}")
         
     except Exception as e:
         logger.error(f"Error generating action content: {e}")
-        
-        # Update action with error state
+        _mark_action_failed(action_id, e)
+
+
+async def generate_actions_content(
+    actions: Dict[str, ActionType],
+    followup_id: str,
+    organization_id: Optional[str],
+    user_id: str,
+    language: str,
+):
+    """Background task to generate several actions of one follow-up (shared context)"""
+    # Import here to avoid circular imports
+    from app.services.action_generator import ActionGeneratorService
+    
+    generator = ActionGeneratorService()
+    
+    # Actions are saved as soon as each one finishes
+    async for action_id, result, error in generator.generate_many(
+        actions,
+        followup_id=followup_id,
+        user_id=user_id,
+        language=language,
+    ):
+        action_type = actions[action_id]
+        try:
+            if error is not None:
+                raise error
+            content, metadata = result
+            await _save_action_content(action_id, followup_id, action_type, organization_id, user_id, content, metadata)
+            logger.info(f"Generated {action_type.value} for followup {followup_id}")
+        except Exception as e:
+            logger.error(f"Error generating action content: {e}")
+            _mark_action_failed(action_id, e)
+
+
+async def _save_action_content(
+    action_id: str,
+    followup_id: str,
+    action_type: ActionType,
+    organization_id: Optional[str],
+    user_id: str,
+    content: str,
+    metadata: dict,
+):
+    """Store generated content, consume credits and log token usage"""
+    from app.services.credit_service import get_credit_service
+    from app.services.api_usage_service import get_api_usage_service
+    
+    supabase = get_supabase_service()
+    
+    # Update action with generated content
+    supabase.table("followup_actions").update({
+        "content": content,
+        "metadata": metadata,
+    }).eq("id", action_id).execute()
+    
+    # Log API usage and consume credits (if org_id available)
+    if organization_id:
         try:
-            supabase = get_supabase_service()
-            supabase.table("followup_actions").update({
-                "metadata": {"status": "error", "error": str(e)},
-            }).eq("id", action_id).execute()
-        except:
-            pass
+            credit_service = get_credit_service()
+            await credit_service.consume_credits(
+                organization_id=organization_id,
+                action="followup_action",
+                user_id=user_id,
+                metadata={"action_id": action_id, "action_type": action_type.value}
+            )
+        except Exception as credit_err:
+            logger.warning(f"Credit consumption failed: {credit_err}")
+        
+        # Log actual token usage from metadata
+        token_stats = metadata.get("token_stats", {})
+        if token_stats:
+            try:
+                usage_service = get_api_usage_service()
+                await usage_service.log_llm_usage(
+                    organization_id=organization_id,
+                    provider="anthropic",
+                    model="claude-sonnet-4-20250514",
+                    input_tokens=token_stats.get("input_tokens", 0),
+                    output_tokens=token_stats.get("output_tokens", 0),
+                    user_id=user_id,
+                    service=f"followup_action_{action_type.value}",
+                    credits_consumed=0,
+                    metadata={"action_id": action_id, "followup_id": followup_id}
+                )
+            except Exception as usage_err:
+                logger.warning(f"API usage logging failed: {usage_err}")
+
 
+def _mark_action_failed(action_id: str, error: Exception):
+    """Update action with error state"""
+    try:
+        supabase = get_supabase_service()
+        supabase.table("followup_actions").update({
+            "metadata": {"status": "error", "error": str(error)},
+        }).eq("id", action_id).execute()
+    except:
+        pass
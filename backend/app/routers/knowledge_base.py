@@ -10,10 +10,8 @@ from fastapi import APIRouter, UploadFile, File, Depends, HTTPException, Backgro
 from fastapi.responses import JSONResponse
 from app.deps import get_current_user, get_auth_token
 from app.database import get_supabase_service, get_user_client
-from app.services.file_processor import FileProcessor
-from app.services.text_chunker import TextChunker
-from app.services.embeddings import EmbeddingsService
-from app.services.vector_store import VectorStore
+from app.services.knowledge_ingestion import KnowledgeIngestionPipeline
+from app.services.vector_store import get_vector_store
 
 # Inngest integration
 from app.inngest.events import send_event, use_inngest_for, Events
@@ -40,16 +38,14 @@ async def process_file_background(
     file_id: str,
     file_path: str,
     file_type: str,
-    organization_id: str
+    organization_id: str,
+    filename: str = None
 ):
     """
     Background task to process uploaded file.
-    1. Download from storage
-    2. Extract text
-    3. Chunk text
-    4. Generate embeddings
-    5. Store in Pinecone
-    6. Update database
+    1. Update status to processing
+    2. Stream-ingest (download, extract, chunk, embed, store in batches)
+    3. Update status to completed
     """
     try:
         # Update status to processing (use service client for background tasks)
@@ -57,67 +53,14 @@ async def process_file_background(
             "status": "processing"
         }).eq("id", file_id).execute()
         
-        # Download file from storage (use service client for background tasks)
-        file_data = supabase_service.storage.from_("knowledge-base-files").download(file_path)
-        
-        # Extract text
-        file_processor = FileProcessor()
-        import io
-        text = file_processor.extract_text(io.BytesIO(file_data), file_type)
-        
-        if not text or not text.strip():
-            raise ValueError("No text could be extracted from file")
-        
-        # Chunk text
-        chunker = TextChunker(chunk_size=500, chunk_overlap=50)
-        chunks = chunker.chunk_text(text)
-        
-        if not chunks:
-            raise ValueError("No chunks created from text")
-        
-        # Generate embeddings
-        embeddings_service = EmbeddingsService()
-        chunk_texts = [chunk["content"] for chunk in chunks]
-        embeddings = embeddings_service.generate_embeddings(chunk_texts, input_type="document")
-        
-        # Prepare vectors for Pinecone
-        vector_store = VectorStore()
-        vectors = []
-        chunk_records = []
-        
-        for i, (chunk, embedding) in enumerate(zip(chunks, embeddings)):
-            vector_id = f"{file_id}:{i}"
-            
-            vectors.append({
-                "id": vector_id,
-                "values": embedding,
-                "metadata": {
-                    "file_id": file_id,
-                    "chunk_index": i,
-                    "organization_id": organization_id,
-                    "content_preview": chunk["content"][:200]  # First 200 chars
-                }
-            })
-            
-            chunk_records.append({
-                "file_id": file_id,
-                "organization_id": organization_id,
-                "chunk_index": i,
-                "content": chunk["content"],
-                "token_count": chunk["token_count"],
-                "embedding_id": vector_id
-            })
-        
-        # Store vectors in Pinecone
-        vector_store.upsert_vectors(vectors)
-        
-        # Store chunks in database (use service client for background tasks)
-        supabase_service.table("knowledge_base_chunks").insert(chunk_records).execute()
+        manifest = await KnowledgeIngestionPipeline().ingest(
+            file_id, file_path, file_type, organization_id, filename
+        )
         
         # Update file status to completed (use service client for background tasks)
         supabase_service.table("knowledge_base_files").update({
             "status": "completed",
-            "chunk_count": len(chunks)
+            "chunk_count": manifest.chunk_count
         }).eq("id", file_id).execute()
         
     except Exception as e:
@@ -254,7 +197,8 @@ async def upload_file(
                     file_id,
                     storage_path,
                     file.content_type,
-                    organization_id
+                    organization_id,
+                    file.filename
                 )
         else:
             # Use BackgroundTasks (legacy/fallback)
@@ -263,7 +207,8 @@ async def upload_file(
                 file_id,
                 storage_path,
                 file.content_type,
-                organization_id
+                organization_id,
+                file.filename
             )
             logger.info(f"Knowledge base file {file_id} triggered via BackgroundTasks")
         
@@ -343,7 +288,7 @@ async def delete_file(
     
     try:
         # Delete from Pinecone
-        vector_store = VectorStore()
+        vector_store = get_vector_store()
         vector_store.delete_by_file(file_id)
         
         # Delete from storage (use service client)
@@ -19,6 +19,9 @@ import logging
 from app.deps import get_current_user
 from app.database import get_supabase_service
 from app.services.luna_service import LunaService
+from app.services.llm_gateway import get_claude, anthropic_configured
+from app.services.llm_streaming import StreamedMessage, stream_claude, token_event
+from app.utils.sse import sse_response, detach
 from app.models.luna import (
     MessagesResponse,
     MessageActionRequest,
@@ -41,6 +44,9 @@ router = APIRouter(prefix="/api/v1/luna", tags=["luna"])
 logger = logging.getLogger(__name__)
 
 
+OUTREACH_MODEL = "claude-sonnet-4-20250514"
+
+
 def get_luna_service():
     """Get Luna service instance."""
     return LunaService()
@@ -435,22 +441,15 @@ async def get_calendar_connection_status(
 # OUTREACH
 # =============================================================================
 
-@router.post("/outreach/generate")
-async def generate_outreach(
-    request: dict,
-    current_user: dict = Depends(get_current_user)
-):
+async def _prepare_outreach(request: dict, user_id: str) -> dict:
     """
-    Generate outreach message content using AI.
+    Validate an outreach request, check credits and build the prompt.
     
-    Args:
-        prospect_id: The prospect ID
-        contact_id: The contact ID
-        research_id: Optional research brief ID
-        channel: The outreach channel (linkedin_connect, linkedin_message, email, whatsapp)
-    """
-    user_id = current_user["sub"]
+    Shared by /outreach/generate and /outreach/generate/stream.
     
+    Returns:
+        dict with prompt, channel, org_id, prospect_id, contact_id
+    """
     prospect_id = request.get("prospectId")
     contact_id = request.get("contactId")
     research_id = request.get("researchId")
@@ -575,54 +574,40 @@ async def generate_outreach(
     except Exception as e:
         logger.warning(f"Could not load profile context for outreach: {e}")
     
-    # Generate content using LLM
-    try:
-        import os
-        from anthropic import Anthropic
-        
-        api_key = os.getenv("ANTHROPIC_API_KEY")
-        if not api_key:
-            raise HTTPException(
-                status_code=http_status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="ANTHROPIC_API_KEY not configured"
-            )
-        
-        client = Anthropic(api_key=api_key)
-        
-        # Get language instruction
-        from app.i18n.utils import get_language_instruction
-        language_instruction = get_language_instruction(language)
-        
-        # Build context
-        company_name = prospect.get("company_name", "the company")
-        contact_name = contact.get("name", "the contact")
-        contact_role = contact.get("role", "")
-        
-        # Extract key research insights (compact)
-        research_summary = ""
-        if research:
-            # Use executive summary, but limit to most relevant parts
-            exec_summary = research.get("executive_summary", "")
-            if exec_summary:
-                # For short messages (LinkedIn/WhatsApp), use less context
-                if channel in ["linkedin_connect", "linkedin_message", "whatsapp"]:
-                    research_summary = exec_summary[:300]  # Very compact for short messages
-                else:
-                    research_summary = exec_summary[:800]  # More context for emails
-        
-        # Build user input section if provided
-        user_input_section = ""
-        if user_input and user_input.strip():
-            user_input_section = f"\n\nAdditional instructions from user:\n{user_input.strip()}\n\nIncorporate these instructions into the message."
-        
-        # Build profile context section (only if available and for longer messages)
-        profile_section = ""
-        if profile_context and channel == "email":  # Only for emails to save tokens
-            profile_section = f"\n\nAbout you and your company:\n{profile_context[:400]}\n\nUse this to personalize the message and show relevant expertise."
-        
-        # Channel-specific prompts
-        channel_prompts = {
-            "linkedin_connect": f"""{language_instruction}
+    # Get language instruction
+    from app.i18n.utils import get_language_instruction
+    language_instruction = get_language_instruction(language)
+    
+    # Build context
+    company_name = prospect.get("company_name", "the company")
+    contact_name = contact.get("name", "the contact")
+    contact_role = contact.get("role", "")
+    
+    # Extract key research insights (compact)
+    research_summary = ""
+    if research:
+        # Use executive summary, but limit to most relevant parts
+        exec_summary = research.get("executive_summary", "")
+        if exec_summary:
+            # For short messages (LinkedIn/WhatsApp), use less context
+            if channel in ["linkedin_connect", "linkedin_message", "whatsapp"]:
+                research_summary = exec_summary[:300]  # Very compact for short messages
+            else:
+                research_summary = exec_summary[:800]  # More context for emails
+    
+    # Build user input section if provided
+    user_input_section = ""
+    if user_input and user_input.strip():
+        user_input_section = f"\n\nAdditional instructions from user:\n{user_input.strip()}\n\nIncorporate these instructions into the message."
+    
+    # Build profile context section (only if available and for longer messages)
+    profile_section = ""
+    if profile_context and channel == "email":  # Only for emails to save tokens
+        profile_section = f"\n\nAbout you and your company:\n{profile_context[:400]}\n\nUse this to personalize the message and show relevant expertise."
+    
+    # Channel-specific prompts
+    channel_prompts = {
+        "linkedin_connect": f"""{language_instruction}
 
 Write a short LinkedIn connection request note (max 300 characters) to {contact_name}, {contact_role} at {company_name}.
 Make it personal and professional. Don't be salesy. Reference something specific about the company or their role.
@@ -630,8 +615,8 @@ Make it personal and professional. Don't be salesy. Reference something specific
 Company research: {research_summary if research_summary else 'Not available'}{user_input_section}
 
 Return ONLY the connection note text.""",
-            
-            "linkedin_message": f"""{language_instruction}
+        
+        "linkedin_message": f"""{language_instruction}
 
 Write a LinkedIn message to {contact_name}, {contact_role} at {company_name}.
 Keep it concise (max 500 characters). Be conversational and value-focused. Include a soft call-to-action.
@@ -639,8 +624,8 @@ Keep it concise (max 500 characters). Be conversational and value-focused. Inclu
 Company research: {research_summary if research_summary else 'Not available'}{user_input_section}
 
 Return ONLY the message text.""",
-            
-            "email": f"""{language_instruction}
+        
+        "email": f"""{language_instruction}
 
 Write a cold outreach email to {contact_name}, {contact_role} at {company_name}.
 
@@ -655,8 +640,8 @@ Include:
 Return in format:
 SUBJECT: [subject line]
 BODY: [email body]""",
-            
-            "whatsapp": f"""{language_instruction}
+        
+        "whatsapp": f"""{language_instruction}
 
 Write a short WhatsApp message to {contact_name}, {contact_role} at {company_name}.
 Keep it very brief (max 200 characters). Be friendly but professional.
@@ -664,64 +649,142 @@ Keep it very brief (max 200 characters). Be friendly but professional.
 Company research: {research_summary if research_summary else 'Not available'}{user_input_section}
 
 Return ONLY the message text."""
-        }
+    }
+    
+    prompt = channel_prompts.get(channel, channel_prompts["email"])
+    
+    return {
+        "prompt": prompt,
+        "channel": channel,
+        "org_id": org_id,
+        "prospect_id": prospect_id,
+        "contact_id": contact_id,
+    }
+
+
+def _require_anthropic() -> None:
+    if not anthropic_configured():
+        raise HTTPException(
+            status_code=http_status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="ANTHROPIC_API_KEY not configured"
+        )
+
+
+def _parse_outreach(generated_text: str, channel: str) -> dict:
+    # Parse email format
+    result = {}
+    if channel == "email" and "SUBJECT:" in generated_text:
+        lines = generated_text.split("\n")
+        subject_line = ""
+        body_lines = []
+        in_body = False
         
-        prompt = channel_prompts.get(channel, channel_prompts["email"])
+        for line in lines:
+            if line.startswith("SUBJECT:"):
+                subject_line = line.replace("SUBJECT:", "").strip()
+            elif line.startswith("BODY:"):
+                in_body = True
+                body_content = line.replace("BODY:", "").strip()
+                if body_content:
+                    body_lines.append(body_content)
+            elif in_body:
+                body_lines.append(line)
         
-        response = client.messages.create(
-            model="claude-sonnet-4-20250514",
+        result = {
+            "subject": subject_line,
+            "body": "\n".join(body_lines).strip(),
+            "channel": channel
+        }
+    else:
+        result = {
+            "body": generated_text,
+            "channel": channel
+        }
+    return result
+
+
+async def _finish_outreach(
+    outreach: dict,
+    user_id: str,
+    input_tokens: int,
+    output_tokens: int,
+    streamed: bool = False
+) -> None:
+    """Consume credits and log Claude usage after a successful generation."""
+    from app.services.credit_service import get_credit_service
+    
+    # Consume credits after successful generation
+    try:
+        await get_credit_service().consume_credits(
+            organization_id=outreach["org_id"],
+            action="outreach_generate",
+            user_id=user_id,
+            metadata={
+                "prospect_id": outreach["prospect_id"],
+                "contact_id": outreach["contact_id"],
+                "channel": outreach["channel"]
+            }
+        )
+        logger.info(f"Consumed outreach generation credits for {outreach['contact_id']}")
+    except Exception as credit_err:
+        logger.warning(f"Failed to consume outreach generation credits: {credit_err}")
+        # Don't fail the request if credit logging fails - generation already succeeded
+    
+    try:
+        from app.services.api_usage_service import get_api_usage_service
+        metadata = {"prospect_id": outreach["prospect_id"], "channel": outreach["channel"]}
+        if streamed:
+            metadata["streamed"] = True
+        await get_api_usage_service().log_llm_usage(
+            organization_id=outreach["org_id"],
+            provider="anthropic",
+            model=OUTREACH_MODEL,
+            input_tokens=input_tokens,
+            output_tokens=output_tokens,
+            user_id=user_id,
+            service="outreach",
+            credits_consumed=0,  # Credits consumed above
+            metadata=metadata
+        )
+    except Exception as usage_err:
+        logger.warning(f"Failed to log outreach Claude usage: {usage_err}")
+
+
+@router.post("/outreach/generate")
+async def generate_outreach(
+    request: dict,
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Generate outreach message content using AI.
+    
+    Args:
+        prospect_id: The prospect ID
+        contact_id: The contact ID
+        research_id: Optional research brief ID
+        channel: The outreach channel (linkedin_connect, linkedin_message, email, whatsapp)
+    """
+    user_id = current_user["sub"]
+    
+    outreach = await _prepare_outreach(request, user_id)
+    
+    # Generate content using LLM
+    try:
+        _require_anthropic()
+        
+        response = await get_claude("outreach").messages.create(
+            model=OUTREACH_MODEL,
             max_tokens=500,
-            messages=[{"role": "user", "content": prompt}]
+            organization_id=outreach["org_id"],
+            messages=[{"role": "user", "content": outreach["prompt"]}]
         )
         
         generated_text = response.content[0].text.strip()
+        result = _parse_outreach(generated_text, outreach["channel"])
         
-        # Parse email format
-        result = {}
-        if channel == "email" and "SUBJECT:" in generated_text:
-            lines = generated_text.split("\n")
-            subject_line = ""
-            body_lines = []
-            in_body = False
-            
-            for line in lines:
-                if line.startswith("SUBJECT:"):
-                    subject_line = line.replace("SUBJECT:", "").strip()
-                elif line.startswith("BODY:"):
-                    in_body = True
-                    body_content = line.replace("BODY:", "").strip()
-                    if body_content:
-                        body_lines.append(body_content)
-                elif in_body:
-                    body_lines.append(line)
-            
-            result = {
-                "subject": subject_line,
-                "body": "\n".join(body_lines).strip(),
-                "channel": channel
-            }
-        else:
-            result = {
-                "body": generated_text,
-                "channel": channel
-            }
-        
-        # Consume credits after successful generation
-        try:
-            await credit_service.consume_credits(
-                organization_id=org_id,
-                action="outreach_generate",
-                user_id=user_id,
-                metadata={
-                    "prospect_id": prospect_id,
-                    "contact_id": contact_id,
-                    "channel": channel
-                }
-            )
-            logger.info(f"Consumed outreach generation credits for {contact_id}")
-        except Exception as credit_err:
-            logger.warning(f"Failed to consume outreach generation credits: {credit_err}")
-            # Don't fail the request if credit logging fails - generation already succeeded
+        await _finish_outreach(
+            outreach, user_id, response.usage.input_tokens, response.usage.output_tokens
+        )
         
         return result
         
@@ -736,6 +799,64 @@ Return ONLY the message text."""
         )
 
 
+@router.post("/outreach/generate/stream")
+async def generate_outreach_stream(
+    request: dict,
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Generate outreach message content, streamed as Server-Sent Events.
+    
+    Same request body as /outreach/generate. Events:
+    - token: message text as it is written
+    - section: {"key": "subject", ...} as soon as an email subject line is complete
+    - done: the parsed result (same shape as /outreach/generate), after
+      credits and usage have been recorded
+    - error: generation failed
+    """
+    user_id = current_user["sub"]
+    
+    outreach = await _prepare_outreach(request, user_id)
+    _require_anthropic()
+    
+    async def events():
+        try:
+            message = StreamedMessage()
+            written = ""
+            subject_sent = outreach["channel"] != "email"
+            
+            async for delta in stream_claude(
+                get_claude("outreach"), message,
+                organization_id=outreach["org_id"],
+                model=OUTREACH_MODEL,
+                max_tokens=500,
+                messages=[{"role": "user", "content": outreach["prompt"]}]
+            ):
+                yield token_event(delta)
+                
+                written += delta
+                if not subject_sent and "\n" in written.lstrip():
+                    first_line = written.lstrip().split("\n", 1)[0]
+                    if first_line.startswith("SUBJECT:"):
+                        yield {"event": "section", "data": {
+                            "key": "subject",
+                            "content": first_line.replace("SUBJECT:", "").strip()
+                        }}
+                    subject_sent = True
+            
+            result = _parse_outreach(message.text.strip(), outreach["channel"])
+            await _finish_outreach(
+                outreach, user_id, message.input_tokens, message.output_tokens, streamed=True
+            )
+            yield {"event": "done", "data": result}
+            
+        except Exception as e:
+            logger.error(f"Error streaming outreach: {e}")
+            yield {"event": "error", "data": {"message": "Failed to generate outreach content"}}
+    
+    return sse_response(detach(events()))
+
+
 @router.get("/outreach")
 async def get_outreach(
     contact_id: Optional[str] = Query(None, description="Filter by contact ID"),
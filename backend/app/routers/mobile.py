@@ -1,18 +1,48 @@
 """
 Mobile API endpoints for the DealMotion mobile recording app.
+
+Recordings are uploaded with a resumable, chunked protocol (in the spirit
+of tus):
+
+1. POST /recordings/uploads                      -> upload session (idempotent per local recording)
+2. PUT  /recordings/uploads/{id}/parts/{n}       -> raw part bytes, streamed to storage
+3. GET  /recordings/uploads/{id}                 -> resume point after a dropped connection
+4. POST /recordings/uploads/{id}/complete        -> creates the recording and queues processing
+
+Parts are passed straight through to Supabase Storage's resumable upload
+endpoint, so a worker never holds more than a network buffer per upload.
 """
-from datetime import datetime
+import logging
+from datetime import datetime, timedelta, timezone
 from typing import Optional, List
 from uuid import uuid4
 
-from fastapi import APIRouter, Depends, File, Form, UploadFile, HTTPException, BackgroundTasks
+from fastapi import APIRouter, Depends, File, Form, UploadFile, HTTPException, BackgroundTasks, Request
 from pydantic import BaseModel
 
 from app.deps import get_current_user, get_user_org
 from app.database import get_supabase_service
+from app.inngest.events import send_event, Events
+from app.services.resumable_storage import (
+    STORAGE_PART_SIZE,
+    UPLOAD_URL_TTL_HOURS,
+    OffsetMismatchError,
+    StorageUploadError,
+    append_part,
+    create_upload,
+    get_offset,
+    upload_file,
+)
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+RECORDINGS_BUCKET = "recordings"
+
+# Maximum recording size (500MB)
+MAX_RECORDING_SIZE = 500 * 1024 * 1024
+
 
 # ============================================================================
 # Models
@@ -53,6 +83,28 @@ class RecordingListResponse(BaseModel):
     total: int
 
 
+class UploadInitRequest(BaseModel):
+    """Start (or resume) a chunked recording upload"""
+    filename: str
+    content_type: Optional[str] = None
+    file_size_bytes: int
+    duration_seconds: int
+    local_recording_id: str
+    prospect_id: Optional[str] = None
+
+
+class UploadSessionResponse(BaseModel):
+    """State of a chunked upload; the client sends part `next_part` next"""
+    upload_id: str
+    recording_id: str
+    status: str  # uploading, completed
+    part_size: int
+    total_parts: int
+    received_bytes: int
+    next_part: int
+    expires_at: datetime
+
+
 # ============================================================================
 # Endpoints
 # ============================================================================
@@ -73,66 +125,412 @@ async def upload_recording(
     The recording will be stored and queued for processing (transcription + analysis).
     """
     user_id, organization_id = user_org
-    supabase = get_supabase_service()
     
     try:
         # Generate unique ID
         recording_id = str(uuid4())
         
-        # Read file content
-        file_content = await file.read()
-        file_size = len(file_content)
+        # Size of the spooled upload (validated before anything is sent to storage)
+        file_size = file.size
+        if file_size is None:
+            file.file.seek(0, 2)
+            file_size = file.file.tell()
+            file.file.seek(0)
         
         # Validate file size (max 500MB)
-        max_size = 500 * 1024 * 1024
-        if file_size > max_size:
+        if file_size > MAX_RECORDING_SIZE:
             raise HTTPException(
                 status_code=413,
                 detail=f"File too large. Maximum size is 500MB."
             )
         
-        # Upload to Supabase Storage
+        # Stream to Supabase Storage part by part (never the whole file in memory)
         storage_path = f"recordings/{organization_id}/{recording_id}/{file.filename}"
         
-        storage_result = supabase.storage.from_("recordings").upload(
-            storage_path,
-            file_content,
-            {"content-type": file.content_type or "audio/mp4"}
-        )
-        
-        if hasattr(storage_result, 'error') and storage_result.error:
+        try:
+            await upload_file(
+                RECORDINGS_BUCKET,
+                storage_path,
+                file,
+                file_size,
+                file.content_type or "audio/mp4"
+            )
+        except StorageUploadError as e:
             raise HTTPException(
                 status_code=500,
-                detail=f"Failed to upload file: {storage_result.error}"
+                detail=f"Failed to upload file: {e}"
             )
         
-        # Create record in database
-        recording_data = {
-            "id": recording_id,
+        _create_recording(
+            recording_id=recording_id,
+            organization_id=organization_id,
+            user_id=user_id,
+            prospect_id=prospect_id,
+            storage_path=storage_path,
+            filename=file.filename,
+            file_size=file_size,
+            duration_seconds=duration_seconds,
+            local_recording_id=local_recording_id,
+        )
+        
+        await _queue_processing(recording_id, organization_id, user_id)
+        
+        return RecordingUploadResponse(
+            success=True,
+            recording_id=recording_id,
+            message="Recording uploaded successfully. Processing will begin shortly."
+        )
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Upload failed: {str(e)}"
+        )
+
+
+# ============================================================================
+# Resumable Upload
+# ============================================================================
+
+def _create_recording(
+    recording_id: str,
+    organization_id: str,
+    user_id: str,
+    prospect_id: Optional[str],
+    storage_path: str,
+    filename: Optional[str],
+    file_size: int,
+    duration_seconds: int,
+    local_recording_id: str,
+) -> None:
+    """Insert the mobile_recordings row for an uploaded file."""
+    supabase = get_supabase_service()
+    
+    recording_data = {
+        "id": recording_id,
+        "organization_id": organization_id,
+        "user_id": user_id,
+        "prospect_id": prospect_id,
+        "storage_path": storage_path,
+        "original_filename": filename,
+        "file_size_bytes": file_size,
+        "duration_seconds": duration_seconds,
+        "local_recording_id": local_recording_id,
+        "status": "pending",
+        "source": "mobile_app",
+        "created_at": datetime.utcnow().isoformat(),
+    }
+    
+    # Insert into mobile_recordings table
+    result = supabase.table("mobile_recordings").insert(recording_data).execute()
+    
+    if not result.data:
+        raise HTTPException(
+            status_code=500,
+            detail="Failed to create recording record"
+        )
+
+
+async def _queue_processing(recording_id: str, organization_id: str, user_id: str) -> None:
+    """Trigger transcription + analysis via Inngest."""
+    sent = await send_event(
+        Events.MOBILE_RECORDING_UPLOADED,
+        {
+            "recording_id": recording_id,
             "organization_id": organization_id,
             "user_id": user_id,
-            "prospect_id": prospect_id,
-            "storage_path": storage_path,
-            "original_filename": file.filename,
-            "file_size_bytes": file_size,
-            "duration_seconds": duration_seconds,
-            "local_recording_id": local_recording_id,
-            "status": "pending",
-            "source": "mobile_app",
-            "created_at": datetime.utcnow().isoformat(),
         }
+    )
+    if not sent:
+        logger.warning(f"Processing event not sent for mobile recording {recording_id}; it stays pending")
+
+
+def _get_upload(upload_id: str, organization_id: str, user_id: str) -> dict:
+    supabase = get_supabase_service()
+    result = supabase.table("mobile_recording_uploads").select("*").eq(
+        "id", upload_id
+    ).eq(
+        "organization_id", organization_id
+    ).eq(
+        "user_id", user_id
+    ).limit(1).execute()
+    
+    if not result.data:
+        raise HTTPException(status_code=404, detail="Upload not found")
+    return result.data[0]
+
+
+def _is_expired(upload: dict) -> bool:
+    expires_at = datetime.fromisoformat(upload["expires_at"].replace("Z", "+00:00"))
+    if expires_at.tzinfo is None:
+        expires_at = expires_at.replace(tzinfo=timezone.utc)
+    return expires_at <= datetime.now(timezone.utc)
+
+
+def _session_response(upload: dict) -> UploadSessionResponse:
+    part_size = upload["part_size"]
+    total_size = upload["file_size_bytes"]
+    received = upload["received_bytes"]
+    total_parts = max(1, -(-total_size // part_size))
+    return UploadSessionResponse(
+        upload_id=upload["id"],
+        recording_id=upload["recording_id"],
+        status=upload["status"],
+        part_size=part_size,
+        total_parts=total_parts,
+        received_bytes=received,
+        next_part=total_parts if received >= total_size else received // part_size,
+        expires_at=upload["expires_at"],
+    )
+
+
+def _record_progress(upload: dict, received: int) -> dict:
+    """Store the acknowledged offset (never moves backwards)."""
+    if received > upload["received_bytes"]:
+        supabase = get_supabase_service()
+        supabase.table("mobile_recording_uploads").update({
+            "received_bytes": received
+        }).eq(
+            "id", upload["id"]
+        ).lt(
+            "received_bytes", received
+        ).execute()
+        upload = {**upload, "received_bytes": received}
+    return upload
+
+
+async def _sync_progress(upload: dict) -> dict:
+    """Re-read the offset from storage (source of truth after a dropped connection)."""
+    received = await get_offset(upload["upload_url"])
+    if received is None:
+        raise HTTPException(status_code=410, detail="Upload expired, start a new upload")
+    return _record_progress(upload, received)
+
+
+@router.post("/recordings/uploads", response_model=UploadSessionResponse)
+async def init_upload(
+    body: UploadInitRequest,
+    user_org: tuple = Depends(get_user_org),
+):
+    """
+    Start a chunked recording upload.
+    
+    Idempotent per local_recording_id: calling it again for a recording whose
+    upload was interrupted returns the existing session with the part to
+    resume from.
+    """
+    user_id, organization_id = user_org
+    supabase = get_supabase_service()
+    
+    if body.file_size_bytes <= 0:
+        raise HTTPException(status_code=400, detail="file_size_bytes must be positive")
+    if body.file_size_bytes > MAX_RECORDING_SIZE:
+        raise HTTPException(status_code=413, detail="File too large. Maximum size is 500MB.")
+    
+    try:
+        existing = supabase.table("mobile_recording_uploads").select("*").eq(
+            "organization_id", organization_id
+        ).eq(
+            "local_recording_id", body.local_recording_id
+        ).limit(1).execute()
         
-        # Insert into mobile_recordings table
-        result = supabase.table("mobile_recordings").insert(recording_data).execute()
+        if existing.data:
+            upload = existing.data[0]
+            if upload["user_id"] != user_id:
+                raise HTTPException(status_code=409, detail="Recording is being uploaded by another user")
+            if upload["status"] == "completed":
+                return _session_response(upload)
+            if upload["file_size_bytes"] == body.file_size_bytes and not _is_expired(upload):
+                offset = await get_offset(upload["upload_url"])
+                if offset is not None:
+                    return _session_response(_record_progress(upload, offset))
+            # Expired or a different file: start over
+            supabase.table("mobile_recording_uploads").delete().eq("id", upload["id"]).execute()
+        
+        recording_id = str(uuid4())
+        storage_path = f"recordings/{organization_id}/{recording_id}/{body.filename}"
+        
+        upload_url = await create_upload(
+            RECORDINGS_BUCKET,
+            storage_path,
+            body.file_size_bytes,
+            body.content_type or "audio/mp4"
+        )
+        
+        result = supabase.table("mobile_recording_uploads").insert({
+            "organization_id": organization_id,
+            "user_id": user_id,
+            "recording_id": recording_id,
+            "local_recording_id": body.local_recording_id,
+            "prospect_id": body.prospect_id,
+            "storage_path": storage_path,
+            "original_filename": body.filename,
+            "content_type": body.content_type,
+            "file_size_bytes": body.file_size_bytes,
+            "duration_seconds": body.duration_seconds,
+            "part_size": STORAGE_PART_SIZE,
+            "upload_url": upload_url,
+            "expires_at": (datetime.utcnow() + timedelta(hours=UPLOAD_URL_TTL_HOURS)).isoformat(),
+        }).execute()
         
         if not result.data:
+            raise HTTPException(status_code=500, detail="Failed to create upload session")
+        
+        logger.info(f"Started upload {result.data[0]['id']} for recording {recording_id} ({body.file_size_bytes} bytes)")
+        return _session_response(result.data[0])
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Failed to start upload: {e}")
+        raise HTTPException(status_code=500, detail=f"Failed to start upload: {str(e)}")
+
+
+@router.get("/recordings/uploads/{upload_id}", response_model=UploadSessionResponse)
+async def get_upload(
+    upload_id: str,
+    user_org: tuple = Depends(get_user_org),
+):
+    """
+    Get upload progress. Used to resume: send part `next_part` next.
+    """
+    user_id, organization_id = user_org
+    upload = _get_upload(upload_id, organization_id, user_id)
+    
+    if upload["status"] == "completed":
+        return _session_response(upload)
+    
+    try:
+        return _session_response(await _sync_progress(upload))
+    except StorageUploadError as e:
+        raise HTTPException(status_code=502, detail=f"Storage unavailable: {e}")
+
+
+@router.put("/recordings/uploads/{upload_id}/parts/{part_number}", response_model=UploadSessionResponse)
+async def upload_part(
+    upload_id: str,
+    part_number: int,
+    request: Request,
+    user_org: tuple = Depends(get_user_org),
+):
+    """
+    Upload one part (raw bytes, application/octet-stream).
+    
+    Parts are numbered from 0 and must be `part_size` bytes except the last.
+    The body is streamed straight to storage. Re-sending an acknowledged
+    part is a no-op; a part ahead of `next_part` is rejected with 409.
+    """
+    user_id, organization_id = user_org
+    upload = _get_upload(upload_id, organization_id, user_id)
+    
+    if upload["status"] == "completed":
+        return _session_response(upload)
+    if _is_expired(upload):
+        raise HTTPException(status_code=410, detail="Upload expired, start a new upload")
+    
+    part_size = upload["part_size"]
+    total_size = upload["file_size_bytes"]
+    offset = part_number * part_size
+    if part_number < 0 or offset >= total_size:
+        raise HTTPException(status_code=400, detail="Invalid part number")
+    
+    expected_length = min(part_size, total_size - offset)
+    content_length = request.headers.get("content-length")
+    if content_length is None or int(content_length) != expected_length:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Part {part_number} must be exactly {expected_length} bytes"
+        )
+    
+    try:
+        # Already acknowledged (e.g. the response was lost): nothing to do
+        if offset + expected_length <= upload["received_bytes"]:
+            return _session_response(upload)
+        
+        if offset != upload["received_bytes"]:
+            # Our stored offset may lag behind storage; check before rejecting
+            upload = await _sync_progress(upload)
+            if offset + expected_length <= upload["received_bytes"]:
+                return _session_response(upload)
+            if offset != upload["received_bytes"]:
+                raise HTTPException(
+                    status_code=409,
+                    detail=f"Expected part {upload['received_bytes'] // part_size}"
+                )
+        
+        received = await append_part(upload["upload_url"], offset, request.stream(), expected_length)
+        return _session_response(_record_progress(upload, received))
+        
+    except OffsetMismatchError:
+        upload = await _sync_progress(upload)
+        raise HTTPException(
+            status_code=409,
+            detail=f"Expected part {upload['received_bytes'] // part_size}"
+        )
+    except StorageUploadError as e:
+        if e.status_code in (404, 410):
+            raise HTTPException(status_code=410, detail="Upload expired, start a new upload")
+        logger.error(f"Part {part_number} of upload {upload_id} failed: {e}")
+        raise HTTPException(status_code=502, detail=f"Storage upload failed: {e}")
+
+
+@router.post("/recordings/uploads/{upload_id}/complete", response_model=RecordingUploadResponse)
+async def complete_upload(
+    upload_id: str,
+    user_org: tuple = Depends(get_user_org),
+):
+    """
+    Finish an upload: creates the recording and queues it for processing
+    (transcription + analysis). Safe to retry.
+    """
+    user_id, organization_id = user_org
+    supabase = get_supabase_service()
+    upload = _get_upload(upload_id, organization_id, user_id)
+    recording_id = upload["recording_id"]
+    
+    if upload["status"] == "completed":
+        return RecordingUploadResponse(
+            success=True,
+            recording_id=recording_id,
+            message="Recording already uploaded."
+        )
+    
+    try:
+        upload = await _sync_progress(upload)
+        if upload["received_bytes"] < upload["file_size_bytes"]:
             raise HTTPException(
-                status_code=500,
-                detail="Failed to create recording record"
+                status_code=409,
+                detail=f"Upload incomplete: {upload['received_bytes']} of {upload['file_size_bytes']} bytes received"
             )
         
-        # TODO: Trigger processing via Inngest
-        # background_tasks.add_task(trigger_recording_processing, recording_id)
+        existing = supabase.table("mobile_recordings").select("id").eq("id", recording_id).limit(1).execute()
+        if not existing.data:
+            _create_recording(
+                recording_id=recording_id,
+                organization_id=organization_id,
+                user_id=user_id,
+                prospect_id=upload.get("prospect_id"),
+                storage_path=upload["storage_path"],
+                filename=upload.get("original_filename"),
+                file_size=upload["file_size_bytes"],
+                duration_seconds=upload.get("duration_seconds") or 0,
+                local_recording_id=upload["local_recording_id"],
+            )
+        
+        # Only the request that flips the status queues processing
+        completed = supabase.table("mobile_recording_uploads").update({
+            "status": "completed",
+            "completed_at": datetime.utcnow().isoformat()
+        }).eq(
+            "id", upload_id
+        ).eq(
+            "status", "uploading"
+        ).execute()
+        
+        if completed.data:
+            await _queue_processing(recording_id, organization_id, user_id)
         
         return RecordingUploadResponse(
             success=True,
@@ -143,10 +541,8 @@ async def upload_recording(
     except HTTPException:
         raise
     except Exception as e:
-        raise HTTPException(
-            status_code=500,
-            detail=f"Upload failed: {str(e)}"
-        )
+        logger.error(f"Failed to complete upload {upload_id}: {e}")
+        raise HTTPException(status_code=500, detail=f"Upload failed: {str(e)}")
 
 
 @router.get("/recordings", response_model=RecordingListResponse)
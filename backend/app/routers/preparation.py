@@ -6,7 +6,7 @@ API endpoints for meeting preparation management.
 
 from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, Request
 from pydantic import BaseModel, Field
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from datetime import datetime
 import logging
 from slowapi import Limiter
@@ -14,12 +14,16 @@ from slowapi.util import get_remote_address
 from app.deps import get_current_user
 from app.database import get_supabase_service
 from app.utils.errors import handle_exception
+from app.utils.sse import sse_response, detach
 
 # Rate limiter
 limiter = Limiter(key_func=get_remote_address)
 from app.services.rag_service import rag_service
 from app.services.prep_generator import prep_generator
 from app.services.prospect_service import get_prospect_service
+from app.services.coach_rules import invalidate_coach_context
+from app.services.prospect_hub import invalidate_prospect_hub, invalidate_prospect_hubs
+from app.services.action_generator import invalidate_prospect_action_contexts
 from app.services.credit_service import get_credit_service
 from app.services.api_usage_service import get_api_usage_service
 
@@ -66,6 +70,62 @@ class PrepListResponse(BaseModel):
 supabase = get_supabase_service()
 
 
+async def _build_prep_context(
+    prospect_company: str,
+    meeting_type: str,
+    organization_id: str,
+    user_id: str,
+    custom_notes: Optional[str],
+    contact_ids: Optional[List[str]] = None,
+    prospect_id: Optional[str] = None,
+    selected_followup_ids: Optional[List[str]] = None
+) -> dict:
+    """RAG context plus selected contact persons for the brief prompt"""
+    # Build context using RAG (now includes profile context and meeting history)
+    context = await rag_service.build_context_for_ai(
+        prospect_company=prospect_company,
+        meeting_type=meeting_type,
+        organization_id=organization_id,
+        user_id=user_id,
+        custom_notes=custom_notes,
+        prospect_id=prospect_id,
+        selected_followup_ids=selected_followup_ids
+    )
+    
+    # Fetch contact persons if specified
+    contacts_data = []
+    if contact_ids:
+        logger.info(f"Fetching {len(contact_ids)} contacts for prep")
+        contacts_response = supabase.table("prospect_contacts")\
+            .select("*")\
+            .in_("id", contact_ids)\
+            .eq("organization_id", organization_id)\
+            .execute()
+        
+        if contacts_response.data:
+            contacts_data = contacts_response.data
+            logger.info(f"Found {len(contacts_data)} contacts with analysis")
+    
+    # Add contacts to context
+    context["contacts"] = contacts_data
+    context["has_contacts"] = len(contacts_data) > 0
+    return context
+
+
+def _save_prep_result(prep_id: str, result: dict) -> None:
+    """Store a generated brief and mark the prep completed"""
+    response = supabase.table("meeting_preps").update({
+        "status": "completed",
+        "brief_content": result["brief_content"],
+        "talking_points": result["talking_points"],
+        "questions": result["questions"],
+        "strategy": result["strategy"],
+        "rag_sources": result["rag_sources"],
+        "completed_at": datetime.utcnow().isoformat()
+    }).eq("id", prep_id).execute()
+    invalidate_prospect_hubs(response.data)
+
+
 def generate_prep_background(
     prep_id: str,
     prospect_company: str,
@@ -91,35 +151,11 @@ def generate_prep_background(
             
             logger.info(f"Starting prep generation for {prep_id}")
             
-            # Build context using RAG (now includes profile context and meeting history)
-            context = await rag_service.build_context_for_ai(
-                prospect_company=prospect_company,
-                meeting_type=meeting_type,
-                organization_id=organization_id,
-                user_id=user_id,
-                custom_notes=custom_notes,
-                prospect_id=prospect_id,
-                selected_followup_ids=selected_followup_ids
+            context = await _build_prep_context(
+                prospect_company, meeting_type, organization_id, user_id,
+                custom_notes, contact_ids, prospect_id, selected_followup_ids
             )
             
-            # Fetch contact persons if specified
-            contacts_data = []
-            if contact_ids:
-                logger.info(f"Fetching {len(contact_ids)} contacts for prep")
-                contacts_response = supabase.table("prospect_contacts")\
-                    .select("*")\
-                    .in_("id", contact_ids)\
-                    .eq("organization_id", organization_id)\
-                    .execute()
-                
-                if contacts_response.data:
-                    contacts_data = contacts_response.data
-                    logger.info(f"Found {len(contacts_data)} contacts with analysis")
-            
-            # Add contacts to context
-            context["contacts"] = contacts_data
-            context["has_contacts"] = len(contacts_data) > 0
-            
             # Generate brief with AI
             result = await prep_generator.generate_meeting_brief(context, language=language)
             
@@ -128,15 +164,7 @@ def generate_prep_background(
             # which returns the actual token usage from the API response
             
             # Update database with results
-            supabase.table("meeting_preps").update({
-                "status": "completed",
-                "brief_content": result["brief_content"],
-                "talking_points": result["talking_points"],
-                "questions": result["questions"],
-                "strategy": result["strategy"],
-                "rag_sources": result["rag_sources"],
-                "completed_at": datetime.utcnow().isoformat()
-            }).eq("id", prep_id).execute()
+            _save_prep_result(prep_id, result)
             
             logger.info(f"Successfully completed prep generation for {prep_id}")
             
@@ -144,15 +172,130 @@ def generate_prep_background(
             logger.error(f"Error generating prep {prep_id}: {e}")
             
             # Update status to failed
-            supabase.table("meeting_preps").update({
+            response = supabase.table("meeting_preps").update({
                 "status": "failed",
                 "error_message": str(e)
             }).eq("id", prep_id).execute()
+            invalidate_prospect_hubs(response.data)
     
     # Run the async function in a new event loop (like research does)
     asyncio.run(_generate())
 
 
+async def _create_prep(body: PrepStartRequest, user_id: str) -> Tuple[dict, str, Optional[str]]:
+    """
+    Validate credits and create the pending meeting_preps record
+    
+    Shared by /start (background generation) and /start/stream (SSE).
+    
+    Returns:
+        (prep row, organization_id, prospect_id)
+    """
+    # Get user's organization
+    org_response = supabase.table("organization_members").select(
+        "organization_id"
+    ).eq("user_id", user_id).limit(1).execute()
+    
+    if not org_response.data:
+        raise HTTPException(status_code=404, detail="User not in any organization")
+    
+    organization_id = org_response.data[0]["organization_id"]
+    
+    # Check credits BEFORE starting (v4: credit-based system replaces usage limits)
+    credit_service = get_credit_service()
+    has_credits, credit_balance = await credit_service.check_credits(
+        organization_id=organization_id,
+        action="preparation"
+    )
+    if not has_credits:
+        raise HTTPException(
+            status_code=402,
+            detail={
+                "error": "insufficient_credits",
+                "message": "Not enough credits for meeting preparation",
+                "required": credit_balance.get("required_credits", 2),
+                "available": credit_balance.get("total_credits_available", 0),
+                "upgrade_url": "/pricing"
+            }
+        )
+    
+    # Get or create prospect (NEW!)
+    prospect_service = get_prospect_service()
+    prospect_id = prospect_service.get_or_create_prospect(
+        organization_id=organization_id,
+        company_name=body.prospect_company_name
+    )
+    
+    # Check if research brief exists (now also by prospect_id)
+    research_response = supabase.table("research_briefs").select("id").eq(
+        "organization_id", organization_id
+    ).eq(
+        "status", "completed"
+    )
+    
+    # Try to find by prospect_id first, then fallback to company name
+    if prospect_id:
+        research_response = research_response.eq("prospect_id", prospect_id)
+    else:
+        research_response = research_response.ilike(
+            "company_name", f"%{body.prospect_company_name}%"
+        )
+    
+    research_response = research_response.limit(1).execute()
+    research_brief_id = research_response.data[0]["id"] if research_response.data else None
+    
+    # Create prep record with prospect_id, deal_id, contact_ids and selected_followup_ids
+    prep_data = {
+        "organization_id": organization_id,
+        "user_id": user_id,
+        "prospect_id": prospect_id,  # Link to prospect!
+        "deal_id": body.deal_id,  # Link to deal (optional)
+        "prospect_company_name": body.prospect_company_name,
+        "meeting_type": body.meeting_type,
+        "custom_notes": body.custom_notes,
+        "status": "pending",
+        "research_brief_id": research_brief_id,
+        "contact_ids": body.contact_ids or [],  # Store linked contacts
+        "selected_followup_ids": body.selected_followup_ids or []  # Store selected meeting history
+    }
+    
+    response = supabase.table("meeting_preps").insert(prep_data).execute()
+    
+    if not response.data:
+        raise HTTPException(status_code=500, detail="Failed to create prep")
+    
+    prep = response.data[0]
+    prep_id = prep["id"]
+    invalidate_prospect_hub(prep.get("prospect_id"))
+    
+    # Link back to calendar meeting if provided (SPEC-038)
+    if body.calendar_meeting_id:
+        try:
+            supabase.table("calendar_meetings").update({
+                "preparation_id": prep_id
+            }).eq("id", body.calendar_meeting_id).eq(
+                "organization_id", organization_id
+            ).execute()
+            logger.info(f"Linked prep {prep_id} to calendar meeting {body.calendar_meeting_id}")
+        except Exception as e:
+            logger.warning(f"Failed to link prep to calendar meeting: {e}")
+    
+    return prep, organization_id, prospect_id
+
+
+async def _consume_prep_credits(organization_id: str, user_id: str, prep_id: str, prospect_company: str) -> None:
+    try:
+        credit_service = get_credit_service()
+        await credit_service.consume_credits(
+            organization_id=organization_id,
+            action="preparation",
+            user_id=user_id,
+            metadata={"prep_id": prep_id, "prospect_company": prospect_company}
+        )
+    except Exception as credit_err:
+        logger.warning(f"Credit consumption failed: {credit_err}")
+
+
 @router.post("/start", response_model=dict, status_code=202)
 @limiter.limit("10/minute")
 async def start_prep(
@@ -173,94 +316,9 @@ async def start_prep(
         if not user_id:
             raise HTTPException(status_code=401, detail="Could not get user ID from token")
         
-        # Get user's organization
-        org_response = supabase.table("organization_members").select(
-            "organization_id"
-        ).eq("user_id", user_id).limit(1).execute()
-        
-        if not org_response.data:
-            raise HTTPException(status_code=404, detail="User not in any organization")
-        
-        organization_id = org_response.data[0]["organization_id"]
-        
-        # Check credits BEFORE starting (v4: credit-based system replaces usage limits)
-        credit_service = get_credit_service()
-        has_credits, credit_balance = await credit_service.check_credits(
-            organization_id=organization_id,
-            action="preparation"
-        )
-        if not has_credits:
-            raise HTTPException(
-                status_code=402,
-                detail={
-                    "error": "insufficient_credits",
-                    "message": "Not enough credits for meeting preparation",
-                    "required": credit_balance.get("required_credits", 2),
-                    "available": credit_balance.get("total_credits_available", 0),
-                    "upgrade_url": "/pricing"
-                }
-            )
-        
-        # Get or create prospect (NEW!)
-        prospect_service = get_prospect_service()
-        prospect_id = prospect_service.get_or_create_prospect(
-            organization_id=organization_id,
-            company_name=body.prospect_company_name
-        )
-        
-        # Check if research brief exists (now also by prospect_id)
-        research_response = supabase.table("research_briefs").select("id").eq(
-            "organization_id", organization_id
-        ).eq(
-            "status", "completed"
-        )
-        
-        # Try to find by prospect_id first, then fallback to company name
-        if prospect_id:
-            research_response = research_response.eq("prospect_id", prospect_id)
-        else:
-            research_response = research_response.ilike(
-                "company_name", f"%{body.prospect_company_name}%"
-            )
-        
-        research_response = research_response.limit(1).execute()
-        research_brief_id = research_response.data[0]["id"] if research_response.data else None
-        
-        # Create prep record with prospect_id, deal_id, contact_ids and selected_followup_ids
-        prep_data = {
-            "organization_id": organization_id,
-            "user_id": user_id,
-            "prospect_id": prospect_id,  # Link to prospect!
-            "deal_id": body.deal_id,  # Link to deal (optional)
-            "prospect_company_name": body.prospect_company_name,
-            "meeting_type": body.meeting_type,
-            "custom_notes": body.custom_notes,
-            "status": "pending",
-            "research_brief_id": research_brief_id,
-            "contact_ids": body.contact_ids or [],  # Store linked contacts
-            "selected_followup_ids": body.selected_followup_ids or []  # Store selected meeting history
-        }
-        
-        response = supabase.table("meeting_preps").insert(prep_data).execute()
-        
-        if not response.data:
-            raise HTTPException(status_code=500, detail="Failed to create prep")
-        
-        prep = response.data[0]
+        prep, organization_id, prospect_id = await _create_prep(body, user_id)
         prep_id = prep["id"]
         
-        # Link back to calendar meeting if provided (SPEC-038)
-        if body.calendar_meeting_id:
-            try:
-                supabase.table("calendar_meetings").update({
-                    "preparation_id": prep_id
-                }).eq("id", body.calendar_meeting_id).eq(
-                    "organization_id", organization_id
-                ).execute()
-                logger.info(f"Linked prep {prep_id} to calendar meeting {body.calendar_meeting_id}")
-            except Exception as e:
-                logger.warning(f"Failed to link prep to calendar meeting: {e}")
-        
         # Start processing via Inngest (if enabled) or BackgroundTasks (fallback)
         if use_inngest_for("preparation"):
             # Use Inngest for durable execution and observability
@@ -317,16 +375,7 @@ async def start_prep(
             logger.info(f"Prep {prep_id} triggered via BackgroundTasks")
         
         # Consume credits (v4: credit-based system)
-        try:
-            credit_service = get_credit_service()
-            await credit_service.consume_credits(
-                organization_id=organization_id,
-                action="preparation",
-                user_id=user_id,
-                metadata={"prep_id": prep_id, "prospect_company": body.prospect_company_name}
-            )
-        except Exception as credit_err:
-            logger.warning(f"Credit consumption failed: {credit_err}")
+        await _consume_prep_credits(organization_id, user_id, prep_id, body.prospect_company_name)
         
         contact_count = len(body.contact_ids) if body.contact_ids else 0
         logger.info(f"Created prep {prep_id} for {body.prospect_company_name} (prospect: {prospect_id}, contacts: {contact_count})")
@@ -346,6 +395,82 @@ async def start_prep(
         raise handle_exception(e, "start_prep", user_id=user_id)
 
 
+@router.post("/start/stream")
+@limiter.limit("10/minute")
+async def start_prep_stream(
+    request: Request,  # Required for rate limiting (must be named 'request')
+    body: PrepStartRequest,
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Start a new meeting prep and stream the brief as Server-Sent Events
+    
+    Events:
+    - prep: the created prep record (same fields as /start)
+    - token: brief text as Claude writes it
+    - section: a completed "## " section; talking points, questions and
+      strategy sections include their parsed data
+    - done: final structured brief, sent after it has been saved
+    - error: generation failed (prep is marked failed)
+    
+    Generation runs detached from the connection: if the client goes away
+    the brief is still completed and saved, and can be fetched via GET /{prep_id}.
+    Rate limited to 10 requests per minute.
+    """
+    try:
+        user_id = current_user.get("sub") or current_user.get("id")
+        if not user_id:
+            raise HTTPException(status_code=401, detail="Could not get user ID from token")
+        
+        prep, organization_id, prospect_id = await _create_prep(body, user_id)
+        prep_id = prep["id"]
+        
+        await _consume_prep_credits(organization_id, user_id, prep_id, body.prospect_company_name)
+        logger.info(f"Created streaming prep {prep_id} for {body.prospect_company_name} (prospect: {prospect_id})")
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise handle_exception(e, "start_prep_stream", user_id=user_id)
+    
+    async def events():
+        yield {"event": "prep", "data": {
+            "id": prep_id,
+            "prospect_id": prospect_id,
+            "prospect_company_name": body.prospect_company_name,
+            "meeting_type": body.meeting_type,
+            "status": "generating",
+            "created_at": prep["created_at"]
+        }}
+        try:
+            supabase.table("meeting_preps").update({
+                "status": "generating"
+            }).eq("id", prep_id).execute()
+            
+            context = await _build_prep_context(
+                body.prospect_company_name, body.meeting_type, organization_id, user_id,
+                body.custom_notes, body.contact_ids, prospect_id, body.selected_followup_ids
+            )
+            
+            async for event in prep_generator.stream_meeting_brief(context, language=body.language or "en"):
+                if event["event"] == "done":
+                    _save_prep_result(prep_id, event["data"])
+                    logger.info(f"Successfully completed streamed prep {prep_id}")
+                    event["data"] = {"id": prep_id, "status": "completed", **event["data"]}
+                yield event
+                
+        except Exception as e:
+            logger.error(f"Error streaming prep {prep_id}: {e}")
+            response = supabase.table("meeting_preps").update({
+                "status": "failed",
+                "error_message": str(e)
+            }).eq("id", prep_id).execute()
+            invalidate_prospect_hubs(response.data)
+            yield {"event": "error", "data": {"id": prep_id, "message": "Failed to generate preparation"}}
+    
+    return sse_response(detach(events()))
+
+
 @router.get("/briefs", response_model=PrepListResponse)
 async def list_preps(
     meeting_type: Optional[str] = None,
@@ -511,6 +636,8 @@ async def update_prep(
         if not response.data:
             raise HTTPException(status_code=404, detail="Prep not found")
         
+        invalidate_prospect_hubs(response.data)
+        
         return response.data[0]
         
     except HTTPException:
@@ -630,6 +757,9 @@ async def delete_prep(
         
         if not response.data:
             raise HTTPException(status_code=404, detail="Prep not found")
+        invalidate_coach_context(organization_id=organization_id)
+        invalidate_prospect_hubs(response.data)
+        invalidate_prospect_action_contexts(organization_id, response.data[0].get("prospect_id"))
         
         return None
         
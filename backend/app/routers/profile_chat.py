@@ -19,6 +19,7 @@ from pydantic import BaseModel, Field
 from app.deps import get_current_user
 from app.database import get_supabase_service
 from app.services.profile_chat_service import get_profile_chat_service, ChatMessage
+from app.services.coach_rules import invalidate_coach_context
 from app.inngest.events import send_event, Events
 
 logger = logging.getLogger(__name__)
@@ -416,6 +417,7 @@ async def complete_session(
                 if save_result.data:
                     profile_id = save_result.data[0]["id"]
                     logger.info(f"[PROFILE_CHAT] Saved profile with ID: {profile_id}")
+                    invalidate_coach_context(user_id=user_id)
                     
                     # Trigger Inngest for async narrative generation
                     event_sent = await send_event(
@@ -464,6 +466,7 @@ async def complete_session(
             
             if save_result.data:
                 profile_id = save_result.data[0]["id"]
+                invalidate_coach_context(organization_id=str(org_id))
     
     # Update session as completed
     supabase.table("profile_chat_sessions").update({
@@ -2,17 +2,27 @@
 Prospects Router - API endpoints for prospect management
 
 Now uses the dedicated prospects table for proper data management.
+
+The list is keyset-paginated on (sort column, id) and reads the activity
+counters stored on prospects; totals and /stats come from
+prospect_status_counts. Both are maintained by triggers, see
+migration_prospect_counters.sql.
 """
 
 from fastapi import APIRouter, HTTPException, Depends, Query
 from pydantic import BaseModel, Field
 from typing import List, Dict, Any, Optional
 from datetime import datetime
+import asyncio
+import base64
+import json
 import logging
 
 from app.deps import get_current_user
 from app.database import get_supabase_service
 from app.services.prospect_service import get_prospect_service
+from app.services.prospect_autocomplete import get_prospect_autocomplete
+from app.services.prospect_hub import get_prospect_hub as get_prospect_hub_data, invalidate_prospect_hub
 
 logger = logging.getLogger(__name__)
 
@@ -82,6 +92,8 @@ class ProspectResponse(BaseModel):
 class ProspectListResponse(BaseModel):
     prospects: List[Dict[str, Any]]
     total: int
+    next_cursor: Optional[str] = None  # Pass as ?cursor= for the next page
+    has_more: bool = False
 
 
 class ProspectStatsResponse(BaseModel):
@@ -126,6 +138,13 @@ def get_organization_id(current_user: dict) -> str:
     return org_response.data[0]["organization_id"]
 
 
+def _read_status_counts(organization_id: str) -> Dict[str, int]:
+    result = supabase.table("prospect_status_counts").select(
+        "status, prospect_count"
+    ).eq("organization_id", organization_id).gt("prospect_count", 0).execute()
+    return {row["status"]: row["prospect_count"] for row in result.data or []}
+
+
 @router.get("/stats", response_model=ProspectStatsResponse)
 async def get_prospect_stats(
     current_user: dict = Depends(get_current_user)
@@ -138,19 +157,11 @@ async def get_prospect_stats(
     try:
         organization_id = get_organization_id(current_user)
         
-        # Get all prospects with just status field
-        response = supabase.table("prospects").select(
-            "status"
-        ).eq("organization_id", organization_id).execute()
-        
-        # Count by status
-        by_status: Dict[str, int] = {}
-        for p in response.data or []:
-            status = p.get("status", "new")
-            by_status[status] = by_status.get(status, 0) + 1
+        # Maintained per-status counts (one row per status)
+        by_status = _read_status_counts(organization_id)
         
         return {
-            "total": len(response.data or []),
+            "total": sum(by_status.values()),
             "by_status": by_status
         }
         
@@ -161,14 +172,77 @@ async def get_prospect_stats(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def _encode_cursor(position: list) -> str:
+    payload = json.dumps(position, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str, sort_by: str) -> list:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        position = json.loads(base64.urlsafe_b64decode(padded))
+        if not isinstance(position, list) or len(position) != 3 or position[0] != sort_by:
+            raise ValueError("cursor does not match sort")
+        return position[1:]
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def _quote(value: str) -> str:
+    """Quote a value for a PostgREST filter (names can contain , ( ) and quotes)."""
+    escaped = str(value).replace("\\", "\\\\").replace('"', '\\"')
+    return f'"{escaped}"'
+
+
+def _list_page(
+    organization_id: str,
+    status: Optional[str],
+    search: Optional[str],
+    sort_by: str,
+    descending: bool,
+    position: Optional[list],
+    limit: int,
+    offset: int,
+    count_search: bool,
+):
+    """One page of prospects (limit + 1 rows, to detect a next page)."""
+    query = supabase.table("prospects").select(
+        "*",
+        count="exact" if count_search else None
+    ).eq("organization_id", organization_id)
+    
+    if status:
+        query = query.eq("status", status)
+    
+    if search:
+        query = query.ilike("company_name", f"%{search}%")
+    
+    if position:
+        sort_key, row_id = position
+        op = "lt" if descending else "gt"
+        query = query.or_(
+            f"{sort_by}.{op}.{_quote(sort_key)},and({sort_by}.eq.{_quote(sort_key)},id.{op}.{row_id})"
+        )
+    
+    query = query.order(sort_by, desc=descending).order("id", desc=descending)
+    if offset:
+        # Legacy offset pagination
+        query = query.range(offset, offset + limit)
+    else:
+        query = query.limit(limit + 1)
+    
+    return query.execute()
+
+
 @router.get("", response_model=ProspectListResponse)
 async def list_prospects(
     status: Optional[str] = None,
     search: Optional[str] = None,
     sort_by: str = Query(default="last_activity_at", pattern="^(last_activity_at|company_name|created_at|status)$"),
     sort_order: str = Query(default="desc", pattern="^(asc|desc)$"),
-    limit: int = Query(default=50, le=100),
-    offset: int = 0,
+    limit: int = Query(default=50, ge=1, le=100),
+    offset: int = Query(default=0, ge=0, description="Deprecated: use cursor"),
+    cursor: Optional[str] = Query(default=None, description="next_cursor from the previous page"),
     current_user: dict = Depends(get_current_user)
 ):
     """
@@ -180,46 +254,48 @@ async def list_prospects(
         sort_by: Sort field (last_activity_at, company_name, created_at, status)
         sort_order: Sort order (asc, desc)
         limit: Max results (default 50, max 100)
-        offset: Pagination offset
+        offset: Deprecated pagination offset (ignored when cursor is given)
+        cursor: Keyset cursor (next_cursor of the previous page)
     """
     try:
         organization_id = get_organization_id(current_user)
         
-        # Build query - also get contact count
-        query = supabase.table("prospects").select(
-            "*, research_briefs(id), meeting_preps(id), followups(id), prospect_contacts(id)",
-            count="exact"
-        ).eq("organization_id", organization_id)
+        position = _decode_cursor(cursor, sort_by) if cursor else None
+        if cursor:
+            offset = 0
         
-        if status:
-            query = query.eq("status", status)
+        search = search if search and len(search) >= 2 else None
         
-        if search and len(search) >= 2:
-            query = query.ilike("company_name", f"%{search}%")
-        
-        # Apply sorting
-        query = query.order(sort_by, desc=(sort_order == "desc")).range(offset, offset + limit - 1)
+        # Totals come from the maintained status counts; only a name search
+        # needs an exact count of its own
+        page_task = asyncio.to_thread(
+            _list_page, organization_id, status, search, sort_by, sort_order == "desc",
+            position, limit, offset, search is not None
+        )
+        if search:
+            response = await page_task
+            total = response.count or 0
+        else:
+            response, by_status = await asyncio.gather(
+                page_task,
+                asyncio.to_thread(_read_status_counts, organization_id),
+            )
+            total = by_status.get(status, 0) if status else sum(by_status.values())
         
-        response = query.execute()
+        rows = response.data or []
+        has_more = len(rows) > limit
+        prospects = rows[:limit]
         
-        # Transform data to include activity counts
-        prospects = []
-        for p in response.data or []:
-            prospect = {**p}
-            prospect["research_count"] = len(p.get("research_briefs", []) or [])
-            prospect["prep_count"] = len(p.get("meeting_preps", []) or [])
-            prospect["followup_count"] = len(p.get("followups", []) or [])
-            prospect["contact_count"] = len(p.get("prospect_contacts", []) or [])
-            # Remove nested arrays
-            prospect.pop("research_briefs", None)
-            prospect.pop("meeting_preps", None)
-            prospect.pop("followups", None)
-            prospect.pop("prospect_contacts", None)
-            prospects.append(prospect)
+        next_cursor = None
+        if has_more:
+            last = prospects[-1]
+            next_cursor = _encode_cursor([sort_by, last[sort_by], last["id"]])
         
         return {
             "prospects": prospects,
-            "total": response.count if hasattr(response, 'count') and response.count else len(prospects)
+            "total": total,
+            "next_cursor": next_cursor,
+            "has_more": has_more,
         }
         
     except HTTPException:
@@ -232,11 +308,14 @@ async def list_prospects(
 @router.get("/search", response_model=List[Dict[str, Any]])
 async def search_prospects(
     q: str,
-    limit: int = 10,
+    limit: int = Query(default=10, ge=1, le=50),
     current_user: dict = Depends(get_current_user)
 ):
     """
-    Search prospects by name (for autocomplete).
+    Search prospects by name, domain or contact name (for autocomplete).
+    
+    Typo-tolerant and ranked (prefix matches first); each result includes
+    matched_on ("name", "domain", "contact"), matched_text and score.
     
     Args:
         q: Search query (min 2 characters)
@@ -248,18 +327,7 @@ async def search_prospects(
     try:
         organization_id = get_organization_id(current_user)
         
-        # Search by normalized name
-        response = supabase.table("prospects").select(
-            "id, company_name, status, industry, last_activity_at"
-        ).eq(
-            "organization_id", organization_id
-        ).ilike(
-            "company_name", f"%{q}%"
-        ).order(
-            "last_activity_at", desc=True
-        ).limit(limit).execute()
-        
-        return response.data or []
+        return await get_prospect_autocomplete().search(organization_id, q, limit)
         
     except Exception as e:
         logger.error(f"Error searching prospects: {e}")
@@ -319,6 +387,7 @@ async def create_prospect(
         if not response.data:
             raise HTTPException(status_code=500, detail="Failed to create prospect")
         
+        get_prospect_autocomplete().upsert_prospect(organization_id, response.data[0])
         logger.info(f"Created prospect: {request.company_name}")
         
         return response.data[0]
@@ -377,151 +446,18 @@ async def get_prospect_hub(
     """
     Get complete prospect hub data for the Prospect Hub page.
     Returns prospect, research, contacts, stats, and recent activities.
+    
+    Fetched concurrently and cached briefly per prospect (see prospect_hub).
     """
     try:
         organization_id = get_organization_id(current_user)
         
-        # Get prospect basic info
-        prospect_response = supabase.table("prospects").select("*").eq(
-            "id", prospect_id
-        ).eq(
-            "organization_id", organization_id
-        ).limit(1).execute()
+        hub = await get_prospect_hub_data(prospect_id, organization_id)
         
-        if not prospect_response.data:
+        if hub is None:
             raise HTTPException(status_code=404, detail="Prospect not found")
         
-        prospect = prospect_response.data[0]
-        
-        # Get latest research for this prospect (any status - to show "in progress")
-        # First try to get completed research
-        completed_research = supabase.table("research_briefs").select(
-            "id, company_name, brief_content, status, created_at, completed_at"
-        ).eq(
-            "prospect_id", prospect_id
-        ).eq(
-            "status", "completed"
-        ).order(
-            "completed_at", desc=True
-        ).limit(1).execute()
-        
-        if completed_research.data:
-            research = completed_research.data[0]
-        else:
-            # No completed research, check for pending/researching
-            in_progress_research = supabase.table("research_briefs").select(
-                "id, company_name, brief_content, status, created_at, completed_at"
-            ).eq(
-                "prospect_id", prospect_id
-            ).in_(
-                "status", ["pending", "researching"]
-            ).order(
-                "created_at", desc=True
-            ).limit(1).execute()
-            
-            research = in_progress_research.data[0] if in_progress_research.data else None
-        
-        # Get contacts for this prospect (include analysis fields for status display)
-        contacts_response = supabase.table("prospect_contacts").select(
-            "id, name, role, email, linkedin_url, communication_style, decision_authority, is_primary, "
-            "profile_brief, opening_suggestions, questions_to_ask, topics_to_avoid, analyzed_at"
-        ).eq(
-            "prospect_id", prospect_id
-        ).order(
-            "is_primary", desc=True
-        ).order(
-            "created_at", desc=True
-        ).execute()
-        
-        contacts = contacts_response.data or []
-        
-        # Get deals for this prospect
-        deals_response = supabase.table("deals").select(
-            "id, name, is_active, created_at"
-        ).eq(
-            "prospect_id", prospect_id
-        ).eq(
-            "is_active", True
-        ).execute()
-        
-        deals = deals_response.data or []
-        
-        # Get preps and followups linked to this prospect (with contact_ids for display)
-        preps_response = supabase.table("meeting_preps").select(
-            "id, prospect_company_name, meeting_type, status, created_at, completed_at, contact_ids"
-        ).eq(
-            "prospect_id", prospect_id
-        ).order(
-            "created_at", desc=True
-        ).execute()
-        
-        followups_response = supabase.table("followups").select(
-            "id, prospect_company_name, meeting_subject, status, created_at, completed_at, contact_ids"
-        ).eq(
-            "prospect_id", prospect_id
-        ).order(
-            "created_at", desc=True
-        ).execute()
-        
-        # Build contact name lookup from already fetched contacts
-        contact_name_map = {c["id"]: c["name"] for c in contacts}
-        
-        # Enrich preps with contact names
-        preparations = []
-        for p in preps_response.data or []:
-            prep = {**p}
-            contact_ids = p.get("contact_ids") or []
-            prep["contact_names"] = [contact_name_map.get(cid, "") for cid in contact_ids if contact_name_map.get(cid)]
-            preparations.append(prep)
-        
-        # Enrich followups with contact names  
-        followups = []
-        for f in followups_response.data or []:
-            fu = {**f}
-            contact_ids = f.get("contact_ids") or []
-            fu["contact_names"] = [contact_name_map.get(cid, "") for cid in contact_ids if contact_name_map.get(cid)]
-            followups.append(fu)
-        
-        # Filter for completed counts in stats
-        completed_preps = [p for p in preparations if p.get("status") == "completed"]
-        completed_followups = [f for f in followups if f.get("status") == "completed"]
-        
-        # Get recent activities
-        activities_response = supabase.table("prospect_activities").select(
-            "id, activity_type, title, description, created_at"
-        ).eq(
-            "prospect_id", prospect_id
-        ).order(
-            "created_at", desc=True
-        ).limit(10).execute()
-        
-        recent_activities = activities_response.data or []
-        
-        # Build stats
-        stats = {
-            "prospect_id": prospect_id,
-            "company_name": prospect.get("company_name"),
-            "status": prospect.get("status"),
-            "research_count": 1 if research else 0,
-            "contact_count": len(contacts),
-            "active_deal_count": len(deals),
-            "meeting_count": 0,  # Not tracking meetings separately for now
-            "prep_count": len(completed_preps),
-            "followup_count": len(completed_followups),
-            "created_at": prospect.get("created_at"),
-            "last_activity_at": prospect.get("last_activity_at")
-        }
-        
-        return {
-            "prospect": prospect,
-            "research": research,
-            "contacts": contacts,
-            "deals": deals,
-            "preparations": preparations,
-            "followups": followups,
-            "recent_activities": recent_activities,
-            "stats": stats
-        }
+        return hub
         
     except HTTPException:
         raise
@@ -565,6 +501,8 @@ async def update_prospect(
         if not response.data:
             raise HTTPException(status_code=404, detail="Prospect not found")
         
+        get_prospect_autocomplete().upsert_prospect(organization_id, response.data[0])
+        invalidate_prospect_hub(prospect_id)
         logger.info(f"Updated prospect {prospect_id}")
         
         return response.data[0]
@@ -599,6 +537,8 @@ async def delete_prospect(
         if not response.data:
             raise HTTPException(status_code=404, detail="Prospect not found")
         
+        get_prospect_autocomplete().remove_prospect(organization_id, prospect_id)
+        invalidate_prospect_hub(prospect_id)
         logger.info(f"Deleted prospect {prospect_id}")
         
         return None
@@ -719,6 +659,8 @@ async def update_prospect_status(
         if not response.data:
             raise HTTPException(status_code=404, detail="Prospect not found")
         
+        get_prospect_autocomplete().upsert_prospect(organization_id, response.data[0])
+        invalidate_prospect_hub(prospect_id)
         logger.info(f"Updated prospect {prospect_id} status to {request.status}")
         
         return response.data[0]
@@ -800,6 +742,7 @@ async def mark_meeting_planned(
         }
         
         supabase.table("prospect_activities").insert(activity_data).execute()
+        invalidate_prospect_hub(prospect_id)
         
         logger.info(f"Marked meeting planned for prospect {prospect_id}")
         
@@ -1039,6 +982,8 @@ async def add_prospect_contact(
         if not response.data:
             raise HTTPException(status_code=500, detail="Failed to create contact")
         
+        get_prospect_autocomplete().upsert_contact(organization_id, response.data[0])
+        invalidate_prospect_hub(prospect_id)
         logger.info(f"Added contact {request.name} to prospect {prospect_id}")
         
         return response.data[0]
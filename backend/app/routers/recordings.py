@@ -3,11 +3,18 @@ Recordings Router - Unified view of all meeting recordings
 Combines data from: mobile_recordings, external_recordings, followups (with audio)
 
 This is a READ-ONLY endpoint that aggregates recordings from multiple sources.
+The list is cursor-paginated: each source is read with keyset pagination and
+the pages are merged with a heap, so a page costs O(limit) rows per source
+regardless of history size. Counts come from trigger-maintained counters.
 """
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, HTTPException, Query
 from pydantic import BaseModel
 from typing import Optional, List, Tuple
-from datetime import datetime
+from datetime import datetime, timezone
+import asyncio
+import base64
+import heapq
+import json
 import logging
 
 from app.deps import get_current_user, get_user_org
@@ -57,6 +64,8 @@ class RecordingsListResponse(BaseModel):
     recordings: List[UnifiedRecording]
     total: int
     sources: dict  # Count per source
+    next_cursor: Optional[str] = None  # Pass as ?cursor= for the next page
+    has_more: bool = False
 
 
 class RecordingsStatsResponse(BaseModel):
@@ -201,6 +210,226 @@ def map_followup_recording(row: dict) -> UnifiedRecording:
     )
 
 
+# ==========================================
+# Feed Pagination
+# ==========================================
+
+# Feed source -> (table, sort key column). Every source is read newest
+# first with keyset pagination on (sort key, id); see
+# migration_recordings_feed.sql for the indexes, the feed_at columns and the
+# web_upload_recordings view (followups with audio, minus AI Notetaker ones).
+FEED_SOURCES = {
+    "mobile": ("mobile_recordings", "created_at"),
+    "external": ("external_recordings", "recording_date"),
+    "web_upload": ("web_upload_recordings", "feed_at"),
+    "ai_notetaker": ("scheduled_recordings", "feed_at"),
+}
+
+FEED_COLUMNS = {
+    "mobile": (
+        "id, organization_id, user_id, prospect_id, storage_path, original_filename, "
+        "file_size_bytes, duration_seconds, local_recording_id, source, status, error, "
+        "followup_id, created_at, updated_at, processed_at"
+    ),
+    "external": (
+        "id, organization_id, user_id, provider, external_id, title, recording_date, "
+        "duration_seconds, participants, audio_url, transcript_url, "
+        "matched_meeting_id, matched_prospect_id, match_confidence, import_status, "
+        "imported_followup_id, import_error, created_at, updated_at"
+    ),
+    "web_upload": (
+        "id, organization_id, user_id, prospect_id, prospect_company_name, "
+        "meeting_subject, meeting_date, audio_url, audio_filename, audio_size_bytes, "
+        "audio_duration_seconds, status, error_message, created_at, completed_at, feed_at"
+    ),
+    "ai_notetaker": (
+        "id, organization_id, user_id, recall_bot_id, meeting_url, meeting_title, "
+        "meeting_platform, scheduled_time, status, prospect_id, followup_id, "
+        "recording_url, duration_seconds, participants, error_message, source, "
+        "created_at, updated_at, completed_at, feed_at"
+    ),
+}
+
+EXTERNAL_PROVIDERS = ("fireflies", "teams", "zoom")
+
+# Unified status filter -> (status column, raw values) per source
+STATUS_FILTERS = {
+    "mobile": ("status", {
+        "pending": ["pending"],
+        "processing": ["processing"],
+        "completed": ["completed"],
+        "failed": ["failed"],
+    }),
+    "external": ("import_status", {
+        "pending": ["pending"],
+        "completed": ["imported", "skipped"],
+        "failed": ["failed"],
+    }),
+    "web_upload": ("status", {
+        "pending": ["uploading"],
+        "processing": ["transcribing", "summarizing"],
+        "completed": ["completed"],
+        "failed": ["failed"],
+    }),
+    "ai_notetaker": ("status", {
+        "pending": ["scheduled"],
+        "processing": ["joining", "waiting_room", "recording", "processing"],
+        "completed": ["complete"],
+        "failed": ["error", "cancelled"],
+    }),
+}
+
+# Cursor value for a source that has no more rows
+CURSOR_DONE = 0
+
+
+def _feed_sources(source: Optional[str]) -> List[str]:
+    """Feed sources matching the `source` filter."""
+    if source is None:
+        return list(FEED_SOURCES)
+    if source == "mobile":
+        return ["mobile"]
+    if source in EXTERNAL_PROVIDERS:
+        return ["external"]
+    if source in ("web_upload", "ai_notetaker"):
+        return [source]
+    return []
+
+
+def _encode_cursor(positions: dict) -> str:
+    payload = json.dumps(positions, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> dict:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        positions = json.loads(base64.urlsafe_b64decode(padded))
+        if not isinstance(positions, dict) or not set(positions) <= set(FEED_SOURCES):
+            raise ValueError("unknown source")
+        return positions
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def _sort_value(value: Optional[str]) -> datetime:
+    if not value:
+        return datetime.min.replace(tzinfo=timezone.utc)
+    parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def _filtered_query(key: str, columns: str, org_id: str, provider: Optional[str],
+                    status: Optional[str], prospect_id: Optional[str], count: Optional[str] = None):
+    """Base query for one source with the list filters applied (None = no rows can match)."""
+    table, _ = FEED_SOURCES[key]
+    query = supabase.table(table).select(columns, count=count).eq("organization_id", org_id)
+    
+    if key == "external" and provider:
+        query = query.eq("provider", provider)
+    if prospect_id:
+        query = query.eq("matched_prospect_id" if key == "external" else "prospect_id", prospect_id)
+    if status:
+        status_column, values = STATUS_FILTERS[key]
+        if status not in values:
+            return None
+        query = query.in_(status_column, values[status])
+    return query
+
+
+def _fetch_source_page(
+    key: str,
+    org_id: str,
+    position: Optional[list],
+    count: int,
+    provider: Optional[str],
+    status: Optional[str],
+    prospect_id: Optional[str],
+) -> Tuple[List[dict], bool]:
+    """
+    Next `count` rows of one source after `position` ([sort key, id]).
+    
+    Returns (rows, exhausted).
+    """
+    _, sort_column = FEED_SOURCES[key]
+    
+    query = _filtered_query(key, FEED_COLUMNS[key], org_id, provider, status, prospect_id)
+    if query is None:
+        return [], True
+    
+    if position:
+        sort_key, row_id = position
+        query = query.or_(
+            f'{sort_column}.lt."{sort_key}",and({sort_column}.eq."{sort_key}",id.lt.{row_id})'
+        )
+    
+    rows = query.order(sort_column, desc=True).order("id", desc=True).limit(count).execute().data or []
+    return rows, len(rows) < count
+
+
+def _read_counters(org_id: str) -> List[dict]:
+    result = supabase.table("recording_feed_counters").select(
+        "source, status, count"
+    ).eq("organization_id", org_id).execute()
+    return result.data or []
+
+
+def _feed_totals(
+    org_id: str,
+    sources: List[str],
+    provider: Optional[str],
+    status: Optional[str],
+    prospect_id: Optional[str],
+) -> Tuple[int, dict]:
+    """Total and per-source counts for the current filters."""
+    sources_count = {name: 0 for name in ("mobile", *EXTERNAL_PROVIDERS, "web_upload", "ai_notetaker")}
+    
+    if not prospect_id:
+        # Counter sources are "mobile", provider names, "web_upload", "ai_notetaker"
+        for row in _read_counters(org_id):
+            name = row["source"]
+            feed_key = name if name in ("mobile", "web_upload", "ai_notetaker") else "external"
+            if feed_key not in sources or (provider and name != provider):
+                continue
+            if status and row["status"] != status:
+                continue
+            sources_count[name] = sources_count.get(name, 0) + row["count"]
+        return sum(sources_count.values()), sources_count
+    
+    # Per-prospect sets are small: count them directly
+    for key in sources:
+        if key == "external":
+            query = _filtered_query(key, "provider", org_id, provider, status, prospect_id)
+            if query is None:
+                continue
+            for r in query.limit(1000).execute().data or []:
+                sources_count[r["provider"]] = sources_count.get(r["provider"], 0) + 1
+        else:
+            query = _filtered_query(key, "id", org_id, provider, status, prospect_id, count="exact")
+            if query is None:
+                continue
+            sources_count[key] = query.limit(1).execute().count or 0
+    
+    return sum(sources_count.values()), sources_count
+
+
+def _prospect_names(page_rows: List[Tuple[str, dict]]) -> dict:
+    """Company names for the prospects on one page."""
+    prospect_ids = {
+        row.get("matched_prospect_id" if key == "external" else "prospect_id")
+        for key, row in page_rows
+        if key != "web_upload"
+    } - {None}
+    
+    if not prospect_ids:
+        return {}
+    
+    prospects_result = supabase.table("prospects").select(
+        "id, company_name"
+    ).in_("id", list(prospect_ids)).execute()
+    return {p["id"]: p["company_name"] for p in prospects_result.data or []}
+
+
 # ==========================================
 # Endpoints
 # ==========================================
@@ -211,189 +440,94 @@ async def list_recordings(
     status: Optional[str] = Query(None, description="Filter by status: pending, processing, completed, failed"),
     prospect_id: Optional[str] = Query(None, description="Filter by prospect"),
     limit: int = Query(50, ge=1, le=100),
-    offset: int = Query(0, ge=0),
+    offset: int = Query(0, ge=0, le=1000, description="Deprecated: use cursor"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
     user: dict = Depends(get_current_user),
     user_org: Tuple[str, str] = Depends(get_user_org),
 ):
     """
-    Get unified list of all recordings from all sources.
-    Combines mobile_recordings, external_recordings, and followups with audio.
+    Get unified list of all recordings from all sources, newest first.
+    Combines mobile_recordings, external_recordings, followups with audio
+    and scheduled_recordings (AI Notetaker).
+    
+    Each source is read with keyset pagination (only the rows needed for
+    this page), the sources are merged with a heap, and next_cursor encodes
+    where every source left off.
     """
     user_id, org_id = user_org
     
     if not user_id or not org_id:
         return RecordingsListResponse(recordings=[], total=0, sources={})
     
-    all_recordings: List[UnifiedRecording] = []
-    sources_count = {
-        "mobile": 0,
-        "fireflies": 0,
-        "teams": 0,
-        "zoom": 0,
-        "web_upload": 0,
-        "ai_notetaker": 0,
-    }
+    positions = _decode_cursor(cursor) if cursor else {}
+    if cursor:
+        offset = 0
+    
+    sources = _feed_sources(source)
+    provider = source if source in EXTERNAL_PROVIDERS else None
     
     try:
-        # Collect all prospect IDs first, then batch fetch names
-        prospect_ids = set()
-        
-        # 1. Fetch mobile recordings
-        if source is None or source == "mobile":
-            mobile_query = supabase.table("mobile_recordings").select(
-                "id, organization_id, user_id, prospect_id, storage_path, original_filename, "
-                "file_size_bytes, duration_seconds, local_recording_id, source, status, error, "
-                "followup_id, created_at, updated_at, processed_at"
-            ).eq("organization_id", org_id).order("created_at", desc=True)
-            
-            if status:
-                mobile_query = mobile_query.eq("status", status)
-            if prospect_id:
-                mobile_query = mobile_query.eq("prospect_id", prospect_id)
-            
-            mobile_result = mobile_query.execute()
-            
-            for row in mobile_result.data or []:
-                if row.get("prospect_id"):
-                    prospect_ids.add(row["prospect_id"])
-        
-        # 2. Fetch external recordings (Fireflies, Teams, Zoom)
-        if source is None or source in ["fireflies", "teams", "zoom"]:
-            external_query = supabase.table("external_recordings").select(
-                "id, organization_id, user_id, provider, external_id, title, recording_date, "
-                "duration_seconds, participants, audio_url, transcript_url, transcript_text, "
-                "matched_meeting_id, matched_prospect_id, match_confidence, import_status, "
-                "imported_followup_id, import_error, created_at, updated_at"
-            ).eq("organization_id", org_id).order("created_at", desc=True)
-            
-            if source in ["fireflies", "teams", "zoom"]:
-                external_query = external_query.eq("provider", source)
-            if prospect_id:
-                external_query = external_query.eq("matched_prospect_id", prospect_id)
-            
-            external_result = external_query.execute()
-            
-            for row in external_result.data or []:
-                if row.get("matched_prospect_id"):
-                    prospect_ids.add(row["matched_prospect_id"])
-        
-        # 3. Fetch followups with audio (web uploads)
-        # Exclude followups that are linked from scheduled_recordings (AI Notetaker)
-        # to avoid duplicates - those are shown as ai_notetaker source
-        ai_notetaker_followup_ids = set()
-        if source is None or source == "web_upload":
-            # First get all followup_ids from scheduled_recordings to exclude
-            sr_result = supabase.table("scheduled_recordings").select(
-                "followup_id"
-            ).eq("organization_id", org_id).not_.is_("followup_id", "null").execute()
-            ai_notetaker_followup_ids = {r["followup_id"] for r in sr_result.data or [] if r.get("followup_id")}
-            
-            followup_query = supabase.table("followups").select(
-                "id, organization_id, user_id, prospect_id, prospect_company_name, "
-                "meeting_subject, meeting_date, audio_url, audio_filename, audio_size_bytes, "
-                "audio_duration_seconds, status, error_message, created_at, completed_at"
-            ).eq("organization_id", org_id).not_.is_("audio_url", "null").order("created_at", desc=True)
-            
-            if prospect_id:
-                followup_query = followup_query.eq("prospect_id", prospect_id)
-            
-            # Filter by status if provided
-            if status == "pending":
-                followup_query = followup_query.eq("status", "uploading")
-            elif status == "processing":
-                followup_query = followup_query.in_("status", ["transcribing", "summarizing"])
-            elif status == "completed":
-                followup_query = followup_query.eq("status", "completed")
-            elif status == "failed":
-                followup_query = followup_query.eq("status", "failed")
-            
-            followup_result = followup_query.execute()
-            
-            for row in followup_result.data or []:
-                if row.get("prospect_id"):
-                    prospect_ids.add(row["prospect_id"])
-        
-        # 4. Fetch scheduled recordings (AI Notetaker)
-        if source is None or source == "ai_notetaker":
-            scheduled_query = supabase.table("scheduled_recordings").select(
-                "id, organization_id, user_id, recall_bot_id, meeting_url, meeting_title, "
-                "meeting_platform, scheduled_time, status, prospect_id, followup_id, "
-                "recording_url, duration_seconds, participants, error_message, source, "
-                "created_at, updated_at, completed_at"
-            ).eq("organization_id", org_id).order("created_at", desc=True)
-            
-            if prospect_id:
-                scheduled_query = scheduled_query.eq("prospect_id", prospect_id)
-            
-            # Filter by status if provided
-            if status == "pending":
-                scheduled_query = scheduled_query.eq("status", "scheduled")
-            elif status == "processing":
-                scheduled_query = scheduled_query.in_("status", ["joining", "waiting_room", "recording", "processing"])
-            elif status == "completed":
-                scheduled_query = scheduled_query.eq("status", "complete")
-            elif status == "failed":
-                scheduled_query = scheduled_query.in_("status", ["error", "cancelled"])
-            
-            scheduled_result = scheduled_query.execute()
-            
-            for row in scheduled_result.data or []:
-                if row.get("prospect_id"):
-                    prospect_ids.add(row["prospect_id"])
-        
-        # Batch fetch prospect names
-        prospect_map = {}
-        if prospect_ids:
-            prospects_result = supabase.table("prospects").select(
-                "id, company_name"
-            ).in_("id", list(prospect_ids)).execute()
-            
-            prospect_map = {p["id"]: p["company_name"] for p in prospects_result.data or []}
-        
-        # Now map all recordings
-        if source is None or source == "mobile":
-            for row in mobile_result.data or []:
-                rec = map_mobile_recording(row, prospect_map)
-                all_recordings.append(rec)
-                sources_count["mobile"] += 1
-        
-        if source is None or source in ["fireflies", "teams", "zoom"]:
-            for row in external_result.data or []:
-                rec = map_external_recording(row, prospect_map)
-                all_recordings.append(rec)
-                sources_count[rec.source] = sources_count.get(rec.source, 0) + 1
-        
-        if source is None or source == "web_upload":
-            for row in followup_result.data or []:
-                # Skip followups that are linked from AI Notetaker (avoid duplicates)
-                if row["id"] in ai_notetaker_followup_ids:
-                    continue
-                rec = map_followup_recording(row)
-                all_recordings.append(rec)
-                sources_count["web_upload"] += 1
-        
-        if source is None or source == "ai_notetaker":
-            for row in scheduled_result.data or []:
-                rec = map_scheduled_recording(row, prospect_map)
-                all_recordings.append(rec)
-                sources_count["ai_notetaker"] += 1
-        
-        # Sort all by recorded_at (or created_at as fallback) descending - newest first
-        all_recordings.sort(
-            key=lambda r: r.recorded_at or r.created_at, 
-            reverse=True
+        # Sources finished on an earlier page are skipped
+        active = [key for key in sources if positions.get(key) != CURSOR_DONE]
+        
+        *pages, (total, sources_count) = await asyncio.gather(
+            *(
+                asyncio.to_thread(
+                    _fetch_source_page, key, org_id, positions.get(key), offset + limit,
+                    provider, status, prospect_id
+                )
+                for key in active
+            ),
+            asyncio.to_thread(_feed_totals, org_id, sources, provider, status, prospect_id),
         )
         
-        # Apply pagination
-        total = len(all_recordings)
-        paginated = all_recordings[offset:offset + limit]
+        streams = [
+            [(_sort_value(row[FEED_SOURCES[key][1]]), row["id"], key, row) for row in rows]
+            for key, (rows, _) in zip(active, pages)
+        ]
+        merged = heapq.merge(*streams, key=lambda item: (item[0], item[1]), reverse=True)
+        
+        consumed: List[Tuple[str, dict]] = []
+        for index, (_, _, key, row) in enumerate(merged):
+            if index >= offset + limit:
+                break
+            consumed.append((key, row))
+        
+        # Advance each source past the rows taken from it
+        next_positions = dict(positions)
+        taken = {key: 0 for key in active}
+        for key, row in consumed:
+            next_positions[key] = [row[FEED_SOURCES[key][1]], row["id"]]
+            taken[key] += 1
+        
+        for key, (rows, exhausted) in zip(active, pages):
+            if exhausted and taken[key] == len(rows):
+                next_positions[key] = CURSOR_DONE
+        
+        has_more = any(next_positions.get(key) != CURSOR_DONE for key in sources)
+        
+        page_rows = consumed[offset:]
+        prospect_map = _prospect_names(page_rows)
+        
+        recordings = []
+        for key, row in page_rows:
+            if key == "mobile":
+                recordings.append(map_mobile_recording(row, prospect_map))
+            elif key == "external":
+                recordings.append(map_external_recording(row, prospect_map))
+            elif key == "web_upload":
+                recordings.append(map_followup_recording(row))
+            else:
+                recordings.append(map_scheduled_recording(row, prospect_map))
         
         return RecordingsListResponse(
-            recordings=paginated,
+            recordings=recordings,
             total=total,
             sources=sources_count,
+            next_cursor=_encode_cursor(next_positions) if has_more else None,
+            has_more=has_more,
         )
-        
+    
     except Exception as e:
         logger.error(f"Error fetching recordings: {e}")
         return RecordingsListResponse(recordings=[], total=0, sources={})
@@ -406,134 +540,46 @@ async def get_recordings_stats(
 ):
     """
     Get statistics about recordings across all sources.
+    
+    Served from recording_feed_counters, which triggers keep up to date
+    (see migration_recordings_feed.sql).
     """
     user_id, org_id = user_org
     
+    empty = RecordingsStatsResponse(
+        total_recordings=0,
+        pending_count=0,
+        processing_count=0,
+        completed_count=0,
+        failed_count=0,
+        by_source={},
+    )
+    
     if not user_id or not org_id:
-        return RecordingsStatsResponse(
-            total_recordings=0,
-            pending_count=0,
-            processing_count=0,
-            completed_count=0,
-            failed_count=0,
-            by_source={},
-        )
+        return empty
     
     try:
-        stats = {
-            "total": 0,
-            "pending": 0,
-            "processing": 0,
-            "completed": 0,
-            "failed": 0,
-            "by_source": {},
-        }
-        
-        # Mobile recordings stats
-        mobile_result = supabase.table("mobile_recordings").select(
-            "status", count="exact"
-        ).eq("organization_id", org_id).execute()
-        
-        mobile_count = len(mobile_result.data or [])
-        stats["by_source"]["mobile"] = mobile_count
-        stats["total"] += mobile_count
-        
-        for row in mobile_result.data or []:
-            s = row.get("status", "pending")
-            if s == "pending":
-                stats["pending"] += 1
-            elif s == "processing":
-                stats["processing"] += 1
-            elif s == "completed":
-                stats["completed"] += 1
-            elif s == "failed":
-                stats["failed"] += 1
-        
-        # External recordings stats
-        external_result = supabase.table("external_recordings").select(
-            "provider, import_status"
-        ).eq("organization_id", org_id).execute()
-        
-        for row in external_result.data or []:
-            provider = row.get("provider", "external")
-            stats["by_source"][provider] = stats["by_source"].get(provider, 0) + 1
-            stats["total"] += 1
-            
-            import_status = row.get("import_status", "pending")
-            if import_status == "pending":
-                stats["pending"] += 1
-            elif import_status == "imported":
-                stats["completed"] += 1
-            elif import_status == "failed":
-                stats["failed"] += 1
-        
-        # Followups with audio stats
-        # Exclude followups linked from AI Notetaker to avoid double counting
-        sr_ids_result = supabase.table("scheduled_recordings").select(
-            "followup_id"
-        ).eq("organization_id", org_id).not_.is_("followup_id", "null").execute()
-        ai_notetaker_followup_ids = {r["followup_id"] for r in sr_ids_result.data or [] if r.get("followup_id")}
+        counters = await asyncio.to_thread(_read_counters, org_id)
         
-        followup_result = supabase.table("followups").select(
-            "id, status"
-        ).eq("organization_id", org_id).not_.is_("audio_url", "null").execute()
-        
-        # Filter out AI Notetaker followups
-        web_followups = [r for r in (followup_result.data or []) if r["id"] not in ai_notetaker_followup_ids]
-        web_count = len(web_followups)
-        stats["by_source"]["web_upload"] = web_count
-        stats["total"] += web_count
-        
-        for row in web_followups:
-            s = row.get("status", "completed")
-            if s == "uploading":
-                stats["pending"] += 1
-            elif s in ["transcribing", "summarizing"]:
-                stats["processing"] += 1
-            elif s == "completed":
-                stats["completed"] += 1
-            elif s == "failed":
-                stats["failed"] += 1
-        
-        # Scheduled recordings (AI Notetaker) stats
-        scheduled_result = supabase.table("scheduled_recordings").select(
-            "status"
-        ).eq("organization_id", org_id).execute()
-        
-        ai_count = len(scheduled_result.data or [])
-        stats["by_source"]["ai_notetaker"] = ai_count
-        stats["total"] += ai_count
-        
-        for row in scheduled_result.data or []:
-            s = row.get("status", "scheduled")
-            if s == "scheduled":
-                stats["pending"] += 1
-            elif s in ["joining", "waiting_room", "recording", "processing"]:
-                stats["processing"] += 1
-            elif s == "complete":
-                stats["completed"] += 1
-            elif s in ["error", "cancelled"]:
-                stats["failed"] += 1
+        by_source = {"mobile": 0, "web_upload": 0, "ai_notetaker": 0}
+        by_status = {"pending": 0, "processing": 0, "completed": 0, "failed": 0}
+        for row in counters:
+            by_source[row["source"]] = by_source.get(row["source"], 0) + row["count"]
+            if row["status"] in by_status:
+                by_status[row["status"]] += row["count"]
         
         return RecordingsStatsResponse(
-            total_recordings=stats["total"],
-            pending_count=stats["pending"],
-            processing_count=stats["processing"],
-            completed_count=stats["completed"],
-            failed_count=stats["failed"],
-            by_source=stats["by_source"],
+            total_recordings=sum(by_source.values()),
+            pending_count=by_status["pending"],
+            processing_count=by_status["processing"],
+            completed_count=by_status["completed"],
+            failed_count=by_status["failed"],
+            by_source=by_source,
         )
-        
+    
     except Exception as e:
         logger.error(f"Error fetching recordings stats: {e}")
-        return RecordingsStatsResponse(
-            total_recordings=0,
-            pending_count=0,
-            processing_count=0,
-            completed_count=0,
-            failed_count=0,
-            by_source={},
-        )
+        return empty
 
 
 # ==========================================
@@ -590,7 +636,7 @@ async def get_recording_transcript(
             participants=row.get("participants") or [],
             provider=row.get("provider", "unknown")
         )
-        
+    
     except Exception as e:
         logger.error(f"Error fetching transcript for {recording_id}: {e}")
         return TranscriptResponse(
@@ -655,7 +701,7 @@ async def update_recording_transcript(
                 success=False,
                 message="Failed to update transcript"
             )
-        
+    
     except Exception as e:
         logger.error(f"Error updating transcript for {recording_id}: {e}")
         return TranscriptUpdateResponse(
@@ -734,7 +780,7 @@ async def delete_recording(
                 success=False,
                 message="Failed to delete recording"
             )
-        
+    
     except Exception as e:
         logger.error(f"Error deleting recording {recording_id} from {source_table}: {e}")
         return DeleteRecordingResponse(
@@ -19,6 +19,9 @@ from app.utils.errors import handle_exception
 limiter = Limiter(key_func=get_remote_address)
 from app.database import get_supabase_service, get_user_client
 from app.services.prospect_service import get_prospect_service
+from app.services.coach_rules import invalidate_coach_context
+from app.services.prospect_hub import invalidate_prospect_hub, invalidate_prospect_hubs
+from app.services.action_generator import invalidate_prospect_action_contexts
 from app.services.company_lookup import get_company_lookup
 from app.services.credit_service import get_credit_service
 from app.inngest.events import send_event, Events, use_inngest_for, get_research_event, get_research_architecture
@@ -117,9 +120,10 @@ def process_research_background(
             logger.debug(f"Will scrape website: {website_url}")
         
         # Update status to researching
-        supabase_service.table("research_briefs").update({
+        result = supabase_service.table("research_briefs").update({
             "status": "researching"
         }).eq("id", research_id).execute()
+        invalidate_prospect_hubs(result.data)
         
         logger.debug("Status updated to researching")
         
@@ -196,13 +200,14 @@ def process_research_background(
         pdf_url = None
         
         # Update research status to completed
-        supabase_service.table("research_briefs").update({
+        result = supabase_service.table("research_briefs").update({
             "status": "completed",
             "research_data": research_data,
             "brief_content": brief_content,
             "pdf_url": pdf_url,
             "completed_at": "now()"
         }).eq("id", research_id).execute()
+        invalidate_prospect_hubs(result.data)
         
         logger.info(f"Research {research_id} completed successfully")
         
@@ -210,10 +215,11 @@ def process_research_background(
         logger.error(f"Research failed: {type(e).__name__}: {str(e)}", exc_info=True)
         
         # Update status to failed
-        supabase_service.table("research_briefs").update({
+        result = supabase_service.table("research_briefs").update({
             "status": "failed",
             "error_message": str(e)
         }).eq("id", research_id).execute()
+        invalidate_prospect_hubs(result.data)
 
 
 @router.post("/start", response_model=ResearchResponse)
@@ -303,6 +309,7 @@ async def start_research(
             db_record["custom_notes"] = body.custom_intel
         
         result = supabase_service.table("research_briefs").insert(db_record).execute()
+        invalidate_prospect_hub(prospect_id)
         
         # Update prospect with additional info if provided
         if prospect_id and (body.company_linkedin_url or body.company_website_url or body.country or body.city):
@@ -492,6 +499,9 @@ async def delete_research(
         # Delete research sources (will cascade)
         # Delete research brief (RLS ensures user can only delete their org's research)
         supabase_service.table("research_briefs").delete().eq("id", research_id).execute()
+        invalidate_coach_context(organization_id=research.get("organization_id"))
+        invalidate_prospect_hub(research.get("prospect_id"))
+        invalidate_prospect_action_contexts(research.get("organization_id"), research.get("prospect_id"))
         
         return Response(status_code=204)
         
@@ -573,6 +583,8 @@ async def update_research_brief(
         if not update_response.data:
             raise HTTPException(status_code=500, detail="Failed to update brief")
         
+        invalidate_prospect_hubs(update_response.data)
+        
         return {
             "id": research_id,
             "brief_content": request.brief_content,
@@ -2,26 +2,123 @@
 Action Generator Service
 
 Generates content for follow-up actions using Claude AI with full context.
+
+Context snapshot:
+- All action types for a follow-up are generated from the same context
+  (follow-up, sales/company profile, research, preparation, contacts, deal).
+  It is gathered once with column-projected queries that run in parallel
+  and cached per (follow-up, user) for ACTION_CONTEXT_CACHE_TTL_SECONDS.
+- Concurrent generations for the same follow-up share one in-flight build.
+- Follow-up writes call invalidate_action_context(); research, preparation
+  and contact writes call invalidate_prospect_action_contexts().
+
+generate_many() generates several action types for one follow-up with at
+most ACTION_GENERATION_CONCURRENCY Claude calls at once.
 """
 
 import os
+import asyncio
 import logging
-from typing import Tuple, Dict, Any, Optional
-from anthropic import AsyncAnthropic  # Use async client!
+from typing import Tuple, Dict, Any, Optional, List, AsyncIterator, Awaitable
+from app.services.llm_gateway import get_claude
 
 from app.database import get_supabase_service
 from app.models.followup_actions import ActionType
 from app.i18n.utils import get_language_instruction
+from app.services.prospect_autocomplete import get_prospect_autocomplete
+from app.utils.cache import TTLCache, MISSING
 
 logger = logging.getLogger(__name__)
 
+# Context snapshots are reused by every action generated for a follow-up
+ACTION_CONTEXT_CACHE_TTL_SECONDS = int(os.getenv("ACTION_CONTEXT_CACHE_TTL_SECONDS", "900"))
+ACTION_CONTEXT_CACHE_MAX_ENTRIES = int(os.getenv("ACTION_CONTEXT_CACHE_MAX_ENTRIES", "200"))
+
+# Max Claude calls running at once in generate_many()
+ACTION_GENERATION_CONCURRENCY = int(os.getenv("ACTION_GENERATION_CONCURRENCY", "3"))
+
+# Commercial Analysis and Sales Coaching need more tokens due to comprehensive output
+# Customer Report increased to handle longer, more detailed reports for 60+ min meetings
+ACTION_MAX_TOKENS = {
+    ActionType.COMMERCIAL_ANALYSIS: 6000,
+    ActionType.SALES_COACHING: 5000,
+    ActionType.ACTION_ITEMS: 5000,
+    ActionType.CUSTOMER_REPORT: 6000,  # Increased for comprehensive extraction
+    ActionType.INTERNAL_REPORT: 3500,
+    ActionType.SHARE_EMAIL: 2000,  # Increased for 3 subject lines + personalization notes
+}
+DEFAULT_MAX_TOKENS = 4000
+
+# Columns read by the prompts (transcripts are large, so never select *)
+FOLLOWUP_COLUMNS = (
+    "organization_id, prospect_id, deal_id, prospect_company_name, meeting_date, "
+    "meeting_subject, executive_summary, transcription_text"
+)
+SALES_PROFILE_COLUMNS = (
+    "full_name, role, experience_years, communication_style, sales_methodology, "
+    "style_guide, strengths"
+)
+COMPANY_PROFILE_COLUMNS = "company_name, industry, products, core_value_props"
+CONTACT_COLUMNS = "name, role, decision_authority, communication_style, probable_drivers, profile_brief"
+
+_context_cache: TTLCache = TTLCache(
+    maxsize=ACTION_CONTEXT_CACHE_MAX_ENTRIES,
+    ttl_seconds=ACTION_CONTEXT_CACHE_TTL_SECONDS
+)
+_context_builds: Dict[Tuple[str, str], asyncio.Future] = {}
+
+
+def invalidate_action_context(followup_id: str) -> None:
+    """Drop cached context snapshots for a follow-up (call after writes)."""
+    _context_cache.invalidate_where(lambda key: key[0] == followup_id)
+
+
+def invalidate_prospect_action_contexts(organization_id: Optional[str], prospect_id: Optional[str]) -> None:
+    """
+    Drop cached snapshots that may include a prospect's research, preparation
+    or contacts (call after those complete or change). Never raises.
+    
+    That is every snapshot of the organization whose follow-up or research
+    belongs to the prospect, plus follow-ups without a prospect link, whose
+    research and preparation are found by company name.
+    """
+    if not organization_id and not prospect_id:
+        return
+    
+    def uses_prospect(key, context) -> bool:
+        followup = context.get("followup") or {}
+        if organization_id and followup.get("organization_id") != organization_id:
+            return False
+        linked_prospect_id = followup.get("prospect_id")
+        research_prospect_id = (context.get("research_brief") or {}).get("prospect_id")
+        return linked_prospect_id is None or prospect_id in (linked_prospect_id, research_prospect_id)
+    
+    try:
+        _context_cache.invalidate_items_where(uses_prospect)
+    except Exception as e:
+        logger.warning(f"Failed to invalidate action contexts for prospect {prospect_id}: {e}")
+
+
+async def _fetch_first(query) -> Optional[Dict[str, Any]]:
+    result = await asyncio.to_thread(query.execute)
+    return result.data[0] if result.data else None
+
+
+async def _fetch_all(query) -> List[Dict[str, Any]]:
+    result = await asyncio.to_thread(query.execute)
+    return result.data or []
+
+
+async def _skip(value: Any = None) -> Any:
+    return value
+
 
 class ActionGeneratorService:
     """Service for generating follow-up action content using AI"""
     
     def __init__(self):
-        # Use AsyncAnthropic to prevent blocking the event loop
-        self.client = AsyncAnthropic(api_key=os.getenv("ANTHROPIC_API_KEY"))
+        # Shared pooled client from the LLM gateway (async, non-blocking)
+        self.client = get_claude("followup_actions")
         self.model = "claude-sonnet-4-20250514"
     
     async def generate(
@@ -37,27 +134,21 @@ class ActionGeneratorService:
         
         Returns: (content, metadata)
         """
-        # Gather all context
+        # Gather all context (cached snapshot, shared by all action types)
         context = await self._gather_context(followup_id, user_id)
         
         # Get the appropriate prompt
         prompt = self._build_prompt(action_type, context, language)
         
         # Determine max_tokens based on action type
-        # Commercial Analysis and Sales Coaching need more tokens due to comprehensive output
-        # Customer Report increased to handle longer, more detailed reports for 60+ min meetings
-        max_tokens_map = {
-            ActionType.COMMERCIAL_ANALYSIS: 6000,
-            ActionType.SALES_COACHING: 5000,
-            ActionType.ACTION_ITEMS: 5000,
-            ActionType.CUSTOMER_REPORT: 6000,  # Increased for comprehensive extraction
-            ActionType.INTERNAL_REPORT: 3500,
-            ActionType.SHARE_EMAIL: 2000,  # Increased for 3 subject lines + personalization notes
-        }
-        max_tokens = max_tokens_map.get(action_type, 4000)
+        max_tokens = ACTION_MAX_TOKENS.get(action_type, DEFAULT_MAX_TOKENS)
         
         # Generate content
-        content, token_stats = await self._generate_with_claude(prompt, max_tokens=max_tokens)
+        content, token_stats = await self._generate_with_claude(
+            prompt,
+            max_tokens=max_tokens,
+            organization_id=context.get("followup", {}).get("organization_id")
+        )
         
         # Build metadata with token stats for usage tracking
         metadata = self._build_metadata(action_type, content, context)
@@ -65,125 +156,182 @@ class ActionGeneratorService:
         
         return content, metadata
     
+    async def generate_many(
+        self,
+        actions: Dict[str, ActionType],
+        followup_id: str,
+        user_id: str,
+        language: str,
+        max_concurrency: int = ACTION_GENERATION_CONCURRENCY,
+    ) -> AsyncIterator[Tuple[str, Optional[Tuple[str, Dict[str, Any]]], Optional[Exception]]]:
+        """
+        Generate content for several actions ({action_id: action_type}) of
+        one follow-up, at most max_concurrency at a time.
+        
+        Yields (action_id, (content, metadata), None) or (action_id, None, error)
+        as each action finishes.
+        """
+        semaphore = asyncio.Semaphore(max(1, max_concurrency))
+        
+        async def run(action_id: str, action_type: ActionType):
+            async with semaphore:
+                try:
+                    result = await self.generate(action_id, followup_id, action_type, user_id, language)
+                    return action_id, result, None
+                except Exception as e:
+                    return action_id, None, e
+        
+        tasks = [asyncio.ensure_future(run(action_id, action_type)) for action_id, action_type in actions.items()]
+        try:
+            for finished in asyncio.as_completed(tasks):
+                yield await finished
+        finally:
+            for task in tasks:
+                task.cancel()
+    
     async def _gather_context(self, followup_id: str, user_id: str) -> Dict[str, Any]:
-        """Gather all relevant context for generation"""
+        """Gather all relevant context for generation (cached snapshot)"""
+        key = (followup_id, user_id)
+        context = _context_cache.get(key)
+        if context is not MISSING:
+            return context
+        
+        # Single-flight: concurrent generations wait for the same build
+        build = _context_builds.get(key)
+        if build is None:
+            build = asyncio.ensure_future(self._build_context(followup_id, user_id))
+            _context_builds[key] = build
+            build.add_done_callback(lambda _: _context_builds.pop(key, None))
+        # Shielded so one cancelled generation does not abort the shared build
+        return await asyncio.shield(build)
+    
+    async def _build_context(self, followup_id: str, user_id: str) -> Dict[str, Any]:
+        """Load the context snapshot: three rounds of parallel, projected queries"""
         supabase = get_supabase_service()
         context = {}
         
         try:
-            # Get followup data
-            followup_result = supabase.table("followups").select("*").eq("id", followup_id).execute()
-            if followup_result.data:
-                context["followup"] = followup_result.data[0]
+            # Round 1: followup and sales profile
+            followup, sales_profile = await asyncio.gather(
+                _fetch_first(supabase.table("followups").select(FOLLOWUP_COLUMNS).eq("id", followup_id).limit(1)),
+                _fetch_first(supabase.table("sales_profiles").select(SALES_PROFILE_COLUMNS).eq("user_id", user_id).limit(1)),
+            )
+            if followup:
+                context["followup"] = followup
+            if sales_profile:
+                context["sales_profile"] = sales_profile
+                logger.debug("Found sales_profile")
             
             # Get organization_id and prospect_id from followup
             org_id = context.get("followup", {}).get("organization_id")
             prospect_id = context.get("followup", {}).get("prospect_id")
             company_name = context.get("followup", {}).get("prospect_company_name")
+            deal_id = context.get("followup", {}).get("deal_id")
             
             logger.info(f"Gathering context for followup {followup_id}: org={org_id}, prospect={prospect_id}, company={company_name}")
             
-            # Get sales profile
-            sales_result = supabase.table("sales_profiles").select("*").eq("user_id", user_id).execute()
-            if sales_result.data:
-                context["sales_profile"] = sales_result.data[0]
-                logger.debug("Found sales_profile")
-            
-            # Get company profile
-            if org_id:
-                company_result = supabase.table("company_profiles").select("*").eq("organization_id", org_id).execute()
-                if company_result.data:
-                    context["company_profile"] = company_result.data[0]
-                    logger.debug("Found company_profile")
-            
-            # Try to find research brief - first by prospect_id (most reliable), then by company name
-            if org_id:
-                research_result = None
-                
-                # Method 1: Direct prospect_id match (most reliable)
-                if prospect_id:
-                    research_result = supabase.table("research_briefs").select("*").eq("organization_id", org_id).eq("prospect_id", prospect_id).eq("status", "completed").order("created_at", desc=True).limit(1).execute()
-                    if research_result.data:
-                        logger.info(f"Found research_brief via prospect_id: {prospect_id}")
-                
-                # Method 2: Exact company name match
-                if not research_result or not research_result.data:
-                    if company_name:
-                        research_result = supabase.table("research_briefs").select("*").eq("organization_id", org_id).ilike("company_name", company_name).eq("status", "completed").order("created_at", desc=True).limit(1).execute()
-                        if research_result.data:
-                            logger.info(f"Found research_brief via exact company name: {company_name}")
-                
-                # Method 3: Fuzzy company name match (contains)
-                if not research_result or not research_result.data:
-                    if company_name:
-                        # Try partial match - search for company name containing the search term
-                        search_term = company_name.split()[0] if company_name else ""  # Use first word
-                        if search_term and len(search_term) >= 3:
-                            research_result = supabase.table("research_briefs").select("*").eq("organization_id", org_id).ilike("company_name", f"%{search_term}%").eq("status", "completed").order("created_at", desc=True).limit(1).execute()
-                            if research_result.data:
-                                logger.info(f"Found research_brief via fuzzy match on: {search_term}")
-                
-                if research_result and research_result.data:
-                    context["research_brief"] = research_result.data[0]
-                    
-                    # Get contacts via prospect_id from research_brief
-                    research_prospect_id = research_result.data[0].get("prospect_id")
-                    if research_prospect_id:
-                        contacts_result = supabase.table("prospect_contacts").select("*").eq("prospect_id", research_prospect_id).execute()
-                        if contacts_result.data:
-                            context["contacts"] = contacts_result.data
-                            logger.info(f"Found {len(contacts_result.data)} contacts")
-                else:
-                    logger.warning(f"No research_brief found for company: {company_name}")
-            
-            # Try to find preparation brief - same multi-method approach
-            if org_id:
-                prep_result = None
-                
-                # Method 1: Direct prospect_id match
-                if prospect_id:
-                    prep_result = supabase.table("meeting_preps").select("*").eq("organization_id", org_id).eq("prospect_id", prospect_id).eq("status", "completed").order("created_at", desc=True).limit(1).execute()
-                    if prep_result.data:
-                        logger.info(f"Found preparation via prospect_id: {prospect_id}")
-                
-                # Method 2: Exact company name match
-                if not prep_result or not prep_result.data:
-                    if company_name:
-                        prep_result = supabase.table("meeting_preps").select("*").eq("organization_id", org_id).ilike("prospect_company_name", company_name).eq("status", "completed").order("created_at", desc=True).limit(1).execute()
-                        if prep_result.data:
-                            logger.info(f"Found preparation via exact company name: {company_name}")
-                
-                # Method 3: Fuzzy company name match
-                if not prep_result or not prep_result.data:
-                    if company_name:
-                        search_term = company_name.split()[0] if company_name else ""
-                        if search_term and len(search_term) >= 3:
-                            prep_result = supabase.table("meeting_preps").select("*").eq("organization_id", org_id).ilike("prospect_company_name", f"%{search_term}%").eq("status", "completed").order("created_at", desc=True).limit(1).execute()
-                            if prep_result.data:
-                                logger.info(f"Found preparation via fuzzy match on: {search_term}")
-                
-                if prep_result and prep_result.data:
-                    context["preparation"] = prep_result.data[0]
-                else:
-                    logger.warning(f"No preparation found for company: {company_name}")
+            # Round 2: company profile, deal, and which research/preparation to use
+            # (the fuzzy prospect match is shared by both lookups)
+            fuzzy_match = asyncio.ensure_future(self._match_prospect(org_id, company_name)) if org_id and company_name else None
+            company_profile, deal, research_ref, prep_ref = await asyncio.gather(
+                _fetch_first(supabase.table("company_profiles").select(COMPANY_PROFILE_COLUMNS).eq("organization_id", org_id).limit(1)) if org_id else _skip(),
+                _fetch_first(supabase.table("deals").select("name").eq("id", deal_id).limit(1)) if deal_id else _skip(),
+                self._find_latest_completed("research_briefs", "company_name", org_id, prospect_id, company_name, fuzzy_match, "research_brief") if org_id else _skip(),
+                self._find_latest_completed("meeting_preps", "prospect_company_name", org_id, prospect_id, company_name, fuzzy_match, "preparation") if org_id else _skip(),
+            )
+            if company_profile:
+                context["company_profile"] = company_profile
+                logger.debug("Found company_profile")
+            if deal:
+                context["deal"] = deal
+                logger.debug("Found deal")
+            if org_id and not research_ref:
+                logger.warning(f"No research_brief found for company: {company_name}")
+            if org_id and not prep_ref:
+                logger.warning(f"No preparation found for company: {company_name}")
             
-            # Get deal if linked
-            deal_id = context.get("followup", {}).get("deal_id")
-            if deal_id:
-                deal_result = supabase.table("deals").select("*").eq("id", deal_id).execute()
-                if deal_result.data:
-                    context["deal"] = deal_result.data[0]
-                    logger.debug("Found deal")
+            # Round 3: brief contents and contacts (via prospect_id from research_brief)
+            research_prospect_id = research_ref.get("prospect_id") if research_ref else None
+            research_brief, preparation, contacts = await asyncio.gather(
+                _fetch_first(supabase.table("research_briefs").select("prospect_id, brief_content").eq("id", research_ref["id"])) if research_ref else _skip(),
+                _fetch_first(supabase.table("meeting_preps").select("brief_content").eq("id", prep_ref["id"])) if prep_ref else _skip(),
+                _fetch_all(supabase.table("prospect_contacts").select(CONTACT_COLUMNS).eq("prospect_id", research_prospect_id)) if research_prospect_id else _skip([]),
+            )
+            if research_brief:
+                context["research_brief"] = research_brief
+            if contacts:
+                context["contacts"] = contacts
+                logger.info(f"Found {len(contacts)} contacts")
+            if preparation:
+                context["preparation"] = preparation
             
             # Log final context summary
             context_found = [k for k in ["sales_profile", "company_profile", "research_brief", "contacts", "preparation", "deal"] if k in context]
             logger.info(f"Context gathered for followup {followup_id}: {context_found}")
-            
+        
         except Exception as e:
             logger.error(f"Error gathering context: {e}")
+            # Partial context: use it for this generation but don't cache it
+            return context
         
+        if "followup" in context:
+            _context_cache.set((followup_id, user_id), context)
         return context
     
+    async def _match_prospect(self, org_id: str, company_name: str) -> Optional[Dict[str, Any]]:
+        """Prospect the company name most likely refers to (typo-tolerant)"""
+        try:
+            return await get_prospect_autocomplete().best_match(org_id, company_name)
+        except Exception as e:
+            logger.warning(f"Prospect match failed for {company_name}: {e}")
+            return None
+    
+    async def _find_latest_completed(
+        self,
+        table: str,
+        company_column: str,
+        org_id: str,
+        prospect_id: Optional[str],
+        company_name: Optional[str],
+        fuzzy_match: Optional[Awaitable[Optional[Dict[str, Any]]]],
+        label: str,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Find the newest completed row ({id, prospect_id}) for the prospect -
+        first by prospect_id (most reliable), then by exact company name, then
+        via the prospect the company name fuzzily matches (autocomplete index).
+        The lookups run in parallel; the most reliable match wins.
+        """
+        supabase = get_supabase_service()
+        
+        def latest():
+            return supabase.table(table).select("id, prospect_id").eq(
+                "organization_id", org_id
+            ).eq("status", "completed").order("created_at", desc=True).limit(1)
+        
+        async def by_matched_prospect():
+            match = await fuzzy_match if fuzzy_match else None
+            if not match or match["id"] == prospect_id:
+                return None, match
+            return await _fetch_first(latest().eq("prospect_id", match["id"])), match
+        
+        by_prospect, by_name, (by_fuzzy, match) = await asyncio.gather(
+            _fetch_first(latest().eq("prospect_id", prospect_id)) if prospect_id else _skip(),
+            _fetch_first(latest().ilike(company_column, company_name)) if company_name else _skip(),
+            by_matched_prospect(),
+        )
+        
+        if by_prospect:
+            logger.info(f"Found {label} via prospect_id: {prospect_id}")
+            return by_prospect
+        if by_name:
+            logger.info(f"Found {label} via exact company name: {company_name}")
+            return by_name
+        if by_fuzzy:
+            logger.info(f"Found {label} via fuzzy match on: {match['company_name']}")
+            return by_fuzzy
+        return None
+    
     def _build_prompt(self, action_type: ActionType, context: Dict[str, Any], language: str) -> str:
         """Build the prompt for the specific action type"""
         
@@ -2015,17 +2163,22 @@ RULES:
 
 Generate the complete internal report now:"""
     
-    async def _generate_with_claude(self, prompt: str, max_tokens: int = 4000) -> Tuple[str, Dict[str, int]]:
+    async def _generate_with_claude(
+        self,
+        prompt: str,
+        max_tokens: int = 4000,
+        organization_id: Optional[str] = None
+    ) -> Tuple[str, Dict[str, int]]:
         """Call Claude API to generate content (async to not block event loop)
         
         Returns:
             Tuple of (content, token_stats) where token_stats has input_tokens and output_tokens
         """
         try:
-            # Use await with AsyncAnthropic - this is non-blocking!
             response = await self.client.messages.create(
                 model=self.model,
                 max_tokens=max_tokens,
+                organization_id=organization_id,
                 messages=[
                     {"role": "user", "content": prompt}
                 ]
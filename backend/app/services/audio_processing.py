@@ -0,0 +1,309 @@
+"""
+Audio Processing - non-blocking ffmpeg pipeline for transcription
+
+Recordings are transcoded once to 16 kHz mono mp3 (speech band-pass) with
+asyncio subprocesses, so the event loop is never blocked on ffmpeg. The
+same decode runs ffmpeg's silencedetect filter; the detected silences are
+used to pick chunk boundaries so long calls can be transcribed as several
+concurrent requests instead of one big one.
+
+- transcode(): async context manager. The input is either bytes (piped to
+  ffmpeg's stdin) or a URL that ffmpeg reads itself, so a recording in
+  storage is never held in memory as a whole. Yields a TranscodedAudio
+  (mp3 path in a temp dir, duration, silences); the temp dir is removed on
+  exit.
+- plan_chunks(): chunk boundaries on the longest silence near every N
+  seconds (hard cut if there is no silence nearby)
+- cut_chunk(): stream-copies one time range out of the transcoded file
+"""
+
+import os
+import re
+import math
+import shutil
+import asyncio
+import logging
+import tempfile
+from collections import deque
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import AsyncIterator, List, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+# Upper bound for a single ffmpeg run (full transcode of a long recording)
+FFMPEG_TIMEOUT_SECONDS = float(os.getenv("FFMPEG_TIMEOUT_SECONDS", "900"))
+
+# silencedetect settings: anything quieter than this for at least this long
+SILENCE_NOISE = os.getenv("TRANSCRIPTION_SILENCE_NOISE", "-35dB")
+SILENCE_MIN_SECONDS = float(os.getenv("TRANSCRIPTION_SILENCE_MIN_SECONDS", "0.6"))
+
+# Containers whose index may sit at the end of the file; ffmpeg needs to
+# seek in those, so they are written to a temp file instead of piped
+_SEEKABLE_INPUT_EXTENSIONS = {"mp4", "m4a", "mov", "3gp", "aac"}
+
+_PIPE_BLOCK_SIZE = 256 * 1024
+
+_DURATION_RE = re.compile(r"Duration:\s*(\d+):(\d+):(\d+(?:\.\d+)?)")
+_TIME_RE = re.compile(r"time=\s*(\d+):(\d+):(\d+(?:\.\d+)?)")
+_SILENCE_START_RE = re.compile(r"silence_start:\s*(-?\d+(?:\.\d+)?)")
+_SILENCE_END_RE = re.compile(r"silence_end:\s*(\d+(?:\.\d+)?)")
+
+
+class AudioProcessingError(Exception):
+    """ffmpeg could not process the input."""
+
+
+class FFmpegNotFoundError(AudioProcessingError):
+    """ffmpeg is not installed."""
+
+
+@dataclass
+class TranscodedAudio:
+    """Result of transcode(): speech-optimized mp3 plus silence map."""
+    path: str
+    duration: float
+    silences: List[Tuple[float, float]] = field(default_factory=list)
+
+    @property
+    def size_bytes(self) -> int:
+        return os.path.getsize(self.path)
+
+
+def _seconds(match: re.Match) -> float:
+    hours, minutes, seconds = match.groups()
+    return int(hours) * 3600 + int(minutes) * 60 + float(seconds)
+
+
+class _FFmpegLog:
+    """Incremental parser for ffmpeg's stderr (duration, progress, silences)."""
+
+    def __init__(self):
+        self.input_duration = 0.0
+        self.output_time = 0.0
+        self.silences: List[Tuple[float, float]] = []
+        self._silence_start: Optional[float] = None
+        self.tail: deque = deque(maxlen=20)
+
+    def feed(self, line: str) -> None:
+        if not line.strip():
+            return
+        self.tail.append(line)
+
+        match = _DURATION_RE.search(line)
+        if match:
+            self.input_duration = _seconds(match)
+        match = _TIME_RE.search(line)
+        if match:
+            self.output_time = _seconds(match)
+        match = _SILENCE_START_RE.search(line)
+        if match:
+            self._silence_start = max(0.0, float(match.group(1)))
+        match = _SILENCE_END_RE.search(line)
+        if match and self._silence_start is not None:
+            self.silences.append((self._silence_start, float(match.group(1))))
+            self._silence_start = None
+
+    @property
+    def duration(self) -> float:
+        # Browser webm recordings have no duration header; the encoder's
+        # final progress time is exact for the output either way
+        return self.output_time or self.input_duration
+
+    def finish(self) -> None:
+        """Close a silence that runs until the end of the recording."""
+        if self._silence_start is not None:
+            self.silences.append((self._silence_start, self.duration))
+            self._silence_start = None
+
+    def error_message(self) -> str:
+        return " | ".join(self.tail)[-1000:]
+
+
+async def _run_ffmpeg(
+    args: List[str],
+    input_data: Optional[bytes] = None,
+    timeout: float = FFMPEG_TIMEOUT_SECONDS
+) -> _FFmpegLog:
+    """
+    Run ffmpeg without blocking the event loop.
+
+    Input bytes are written to stdin in blocks while stderr is parsed
+    concurrently (ffmpeg stalls if either pipe fills up).
+    """
+    try:
+        proc = await asyncio.create_subprocess_exec(
+            "ffmpeg", "-hide_banner", "-y", *args,
+            stdin=asyncio.subprocess.PIPE if input_data is not None else asyncio.subprocess.DEVNULL,
+            stdout=asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.PIPE,
+        )
+    except FileNotFoundError:
+        raise FFmpegNotFoundError("ffmpeg not found")
+
+    log = _FFmpegLog()
+
+    async def feed_stdin():
+        view = memoryview(input_data)
+        try:
+            for offset in range(0, len(view), _PIPE_BLOCK_SIZE):
+                proc.stdin.write(view[offset:offset + _PIPE_BLOCK_SIZE])
+                await proc.stdin.drain()
+        except (BrokenPipeError, ConnectionResetError):
+            # ffmpeg gave up on the input; the exit code reports why
+            pass
+        finally:
+            proc.stdin.close()
+
+    async def read_stderr():
+        buffer = b""
+        while True:
+            block = await proc.stderr.read(4096)
+            if not block:
+                break
+            buffer += block
+            # Progress lines end in \r, log lines in \n
+            *lines, buffer = re.split(rb"[\r\n]", buffer)
+            for line in lines:
+                log.feed(line.decode(errors="replace"))
+        if buffer:
+            log.feed(buffer.decode(errors="replace"))
+
+    tasks = [read_stderr(), proc.wait()]
+    if input_data is not None:
+        tasks.append(feed_stdin())
+
+    try:
+        await asyncio.wait_for(asyncio.gather(*tasks), timeout=timeout)
+    except asyncio.TimeoutError:
+        raise AudioProcessingError(f"ffmpeg timed out after {timeout:.0f}s")
+    finally:
+        if proc.returncode is None:
+            proc.kill()
+            await proc.wait()
+
+    if proc.returncode != 0:
+        raise AudioProcessingError(f"ffmpeg exited with {proc.returncode}: {log.error_message()}")
+
+    log.finish()
+    return log
+
+
+@asynccontextmanager
+async def transcode(
+    source: Union[bytes, str],
+    filename: str = "audio.webm"
+) -> AsyncIterator[TranscodedAudio]:
+    """
+    Transcode a recording to speech-optimized mp3 and detect silences.
+
+    Args:
+        source: Raw audio bytes, or an http(s) URL (e.g. a signed storage URL)
+        filename: Original filename (used to pick pipe vs. temp file input)
+    """
+    workdir = tempfile.mkdtemp(prefix="transcode-")
+    try:
+        output_path = os.path.join(workdir, "audio.mp3")
+        input_data = None
+
+        if isinstance(source, str):
+            input_args = ["-reconnect", "1", "-reconnect_streamed", "1", "-reconnect_delay_max", "5", "-i", source]
+        else:
+            ext = filename.lower().rsplit(".", 1)[-1] if "." in filename else ""
+            if ext in _SEEKABLE_INPUT_EXTENSIONS:
+                input_path = os.path.join(workdir, f"input.{ext}")
+                await asyncio.to_thread(_write_file, input_path, source)
+                input_args = ["-i", input_path]
+            else:
+                input_data = source
+                input_args = ["-i", "pipe:0"]
+
+        log = await _run_ffmpeg(
+            [
+                *input_args,
+                "-vn",
+                "-af", (
+                    "highpass=f=200,lowpass=f=3000,"  # Focus on voice frequencies
+                    f"silencedetect=noise={SILENCE_NOISE}:d={SILENCE_MIN_SECONDS}"
+                ),
+                "-acodec", "libmp3lame",
+                "-ab", "192k",
+                "-ar", "16000",  # 16kHz - optimal for speech recognition
+                "-ac", "1",      # Mono channel
+                output_path,
+            ],
+            input_data=input_data,
+        )
+
+        audio = TranscodedAudio(path=output_path, duration=log.duration, silences=log.silences)
+        logger.info(
+            f"Transcoded {filename} to mp3 ({audio.size_bytes} bytes, {audio.duration:.0f}s, "
+            f"{len(audio.silences)} silences)"
+        )
+        yield audio
+    finally:
+        await asyncio.to_thread(shutil.rmtree, workdir, True)
+
+
+def plan_chunks(
+    duration: float,
+    silences: List[Tuple[float, float]],
+    chunk_seconds: float,
+    search_seconds: float = 60.0
+) -> List[Tuple[float, float]]:
+    """
+    Split [0, duration] into equal-ish (start, end) ranges of at most about
+    chunk_seconds.
+
+    Each cut goes in the middle of the longest silence within
+    search_seconds of the ideal cut point (nearest wins among similar
+    lengths), so chunks end between sentences; without a nearby silence the
+    cut is made at the ideal point.
+    """
+    if duration <= chunk_seconds or chunk_seconds <= 0:
+        return [(0.0, duration)]
+
+    count = math.ceil(duration / chunk_seconds)
+    length = duration / count
+
+    cuts = []
+    previous = 0.0
+    for index in range(1, count):
+        target = index * length
+        best = None
+        for start, end in silences:
+            middle = (start + end) / 2
+            if abs(middle - target) > search_seconds or middle - previous < length / 2:
+                continue
+            key = (round(end - start, 1), -abs(middle - target))
+            if best is None or key > best[0]:
+                best = (key, middle)
+        cut = best[1] if best else target
+        cuts.append(cut)
+        previous = cut
+
+    bounds = [0.0, *cuts, duration]
+    return list(zip(bounds[:-1], bounds[1:]))
+
+
+async def cut_chunk(audio: TranscodedAudio, start: float, end: float, name: str) -> str:
+    """Stream-copy [start, end) of the transcoded audio to a new mp3 file."""
+    path = os.path.join(os.path.dirname(audio.path), f"{name}.mp3")
+    await _run_ffmpeg([
+        "-ss", f"{start:.3f}",
+        "-i", audio.path,
+        "-t", f"{end - start:.3f}",
+        "-c", "copy",
+        path,
+    ])
+    return path
+
+
+def _write_file(path: str, data: bytes) -> None:
+    with open(path, "wb") as f:
+        f.write(data)
+
+
+def read_file(path: str) -> bytes:
+    with open(path, "rb") as f:
+        return f.read()
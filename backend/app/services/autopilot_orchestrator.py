@@ -9,9 +9,10 @@ Core service for the Autopilot feature:
 - Manage settings and outcomes
 """
 
+import asyncio
 import logging
 from datetime import datetime, timedelta
-from typing import Optional, List, Dict, Any, Tuple
+from typing import Optional, List, Dict, Any, Set, Tuple
 from uuid import UUID
 
 from app.database import get_supabase_service
@@ -35,9 +36,25 @@ from app.models.autopilot import (
     SuggestedAction,
     LUNA_TEMPLATES,
 )
+from app.services.coach_rules import invalidate_coach_context
 
 logger = logging.getLogger(__name__)
 
+# Proposal flow step -> (table, completed rows only) whose row for the
+# proposal's prospect means the action was already done
+FLOW_STEP_COMPLETION_CHECKS: Dict[str, Tuple[str, bool]] = {
+    "add_contacts": ("prospect_contacts", False),
+    "create_prep": ("meeting_preps", True),
+    "start_research": ("research_briefs", True),
+    "meeting_analysis": ("followups", True),
+}
+
+# Max prospect ids per in_ filter (keeps request URLs short)
+_IN_CHUNK_SIZE = 200
+# Rows per request; matches PostgREST's max-rows cap, which a chunk can
+# exceed since a prospect may have many contacts, preps or briefs
+_PAGE_SIZE = 1000
+
 
 class AutopilotOrchestrator:
     """
@@ -85,15 +102,21 @@ class AutopilotOrchestrator:
                 query = query.eq("status", status)
             
             result = query.execute()
+            proposals = [AutopilotProposal(**row) for row in (result.data or [])]
+            
+            # Find proposals whose action was already completed (bulk lookups)
+            completed_ids = await self._find_completed_proposals([
+                proposal for proposal in proposals
+                if proposal.status in ["proposed", "accepted", "executing"]
+            ])
             
             # Validate and filter proposals
             valid_proposals = []
             proposals_to_expire = []
             proposals_to_timeout = []
+            now = datetime.now()
             
-            for row in (result.data or []):
-                proposal = AutopilotProposal(**row)
-                
+            for proposal in proposals:
                 # Check for stuck "executing" proposals (> 10 minutes)
                 if proposal.status in ["accepted", "executing"]:
                     if proposal.execution_started_at:
@@ -101,11 +124,10 @@ class AutopilotOrchestrator:
                             started = datetime.fromisoformat(
                                 str(proposal.execution_started_at).replace("Z", "+00:00")
                             ).replace(tzinfo=None)
-                            minutes_executing = (datetime.now() - started).total_seconds() / 60
+                            minutes_executing = (now - started).total_seconds() / 60
                             if minutes_executing > 10:
                                 # Check if action was completed outside autopilot
-                                is_valid = await self._validate_proposal_still_valid(proposal)
-                                if not is_valid:
+                                if proposal.id in completed_ids:
                                     # Action was completed, mark as completed
                                     proposals_to_expire.append(proposal.id)
                                 else:
@@ -117,41 +139,38 @@ class AutopilotOrchestrator:
                 
                 # Only validate active proposals
                 if proposal.status in ["proposed", "accepted", "executing"]:
-                    is_valid = await self._validate_proposal_still_valid(proposal)
-                    if is_valid:
-                        valid_proposals.append(proposal)
-                    else:
+                    if proposal.id in completed_ids:
                         proposals_to_expire.append(proposal.id)
+                    else:
+                        valid_proposals.append(proposal)
                 else:
                     valid_proposals.append(proposal)
             
             # Auto-expire invalid proposals (sync to ensure counts are correct)
             expired_count = 0
             if proposals_to_expire:
-                for proposal_id in proposals_to_expire:
-                    try:
-                        self.supabase.table("autopilot_proposals").update({
-                            "status": "completed",
-                            "execution_completed_at": datetime.now().isoformat(),
-                            "execution_result": {"auto_completed": True, "reason": "Action completed outside Autopilot"}
-                        }).eq("id", proposal_id).execute()
-                        logger.info(f"Auto-completed proposal {proposal_id} - action already done")
-                        expired_count += 1
-                    except Exception as e:
-                        logger.warning(f"Failed to auto-complete proposal {proposal_id}: {e}")
+                try:
+                    self.supabase.table("autopilot_proposals").update({
+                        "status": "completed",
+                        "execution_completed_at": now.isoformat(),
+                        "execution_result": {"auto_completed": True, "reason": "Action completed outside Autopilot"}
+                    }).in_("id", proposals_to_expire).execute()
+                    logger.info(f"Auto-completed proposals {proposals_to_expire} - action already done")
+                    expired_count = len(proposals_to_expire)
+                except Exception as e:
+                    logger.warning(f"Failed to auto-complete proposals {proposals_to_expire}: {e}")
             
             # Mark timed-out proposals as failed
             if proposals_to_timeout:
-                for proposal_id in proposals_to_timeout:
-                    try:
-                        self.supabase.table("autopilot_proposals").update({
-                            "status": "failed",
-                            "execution_completed_at": datetime.now().isoformat(),
-                            "execution_error": "Execution timed out after 10 minutes"
-                        }).eq("id", proposal_id).execute()
-                        logger.info(f"Timed out proposal {proposal_id}")
-                    except Exception as e:
-                        logger.warning(f"Failed to timeout proposal {proposal_id}: {e}")
+                try:
+                    self.supabase.table("autopilot_proposals").update({
+                        "status": "failed",
+                        "execution_completed_at": now.isoformat(),
+                        "execution_error": "Execution timed out after 10 minutes"
+                    }).in_("id", proposals_to_timeout).execute()
+                    logger.info(f"Timed out proposals {proposals_to_timeout}")
+                except Exception as e:
+                    logger.warning(f"Failed to timeout proposals {proposals_to_timeout}: {e}")
             
             # Get fresh counts AFTER expiring (ensures accuracy)
             counts = await self._get_proposal_counts(user_id)
@@ -166,74 +185,69 @@ class AutopilotOrchestrator:
             logger.error(f"Error getting proposals for user {user_id}: {e}")
             raise
     
-    async def _validate_proposal_still_valid(self, proposal: AutopilotProposal) -> bool:
+    async def _find_completed_proposals(self, proposals: List[AutopilotProposal]) -> Set[str]:
         """
-        Check if a proposal is still valid (action not yet completed).
+        Find proposals whose action was already completed (outside Autopilot).
+        
+        Collects the prospects per flow step and checks each step (steps run
+        concurrently) in chunked, paged queries, so the row cap can't drop
+        completed prospects.
         
-        Returns True if the proposal should still be shown to user.
+        Returns the ids of proposals that should no longer be shown.
         """
-        try:
+        prospect_ids_by_step: Dict[str, Set[str]] = {}
+        for proposal in proposals:
             context = proposal.context_data or {}
             flow_step = context.get("flow_step")
             prospect_id = context.get("prospect_id")
-            research_id = context.get("research_id")
-            
-            if not flow_step:
-                return True  # Unknown flow step, keep it
-            
-            # Check based on flow_step
-            if flow_step == "add_contacts":
-                # Check if prospect now has contacts
-                if prospect_id:
-                    contacts_result = self.supabase.table("prospect_contacts") \
-                        .select("id") \
-                        .eq("prospect_id", prospect_id) \
-                        .limit(1) \
-                        .execute()
-                    if contacts_result.data and len(contacts_result.data) > 0:
-                        return False  # Contacts already added
-            
-            elif flow_step == "create_prep":
-                # Check if prospect now has a prep
-                if prospect_id:
-                    prep_result = self.supabase.table("meeting_preps") \
-                        .select("id") \
-                        .eq("prospect_id", prospect_id) \
-                        .eq("status", "completed") \
-                        .limit(1) \
-                        .execute()
-                    if prep_result.data and len(prep_result.data) > 0:
-                        return False  # Prep already created
-            
-            elif flow_step == "start_research":
-                # Check if prospect now has research
-                if prospect_id:
-                    research_result = self.supabase.table("research_briefs") \
-                        .select("id") \
-                        .eq("prospect_id", prospect_id) \
-                        .eq("status", "completed") \
-                        .limit(1) \
-                        .execute()
-                    if research_result.data and len(research_result.data) > 0:
-                        return False  # Research already done
-            
-            elif flow_step == "meeting_analysis":
-                # Check if there's a followup now
-                if prospect_id:
-                    followup_result = self.supabase.table("followups") \
-                        .select("id") \
-                        .eq("prospect_id", prospect_id) \
-                        .eq("status", "completed") \
-                        .limit(1) \
+            # Unknown flow step or no prospect: keep it
+            if flow_step in FLOW_STEP_COMPLETION_CHECKS and prospect_id:
+                prospect_ids_by_step.setdefault(flow_step, set()).add(prospect_id)
+        
+        if not prospect_ids_by_step:
+            return set()
+        
+        steps = list(prospect_ids_by_step)
+        done_by_step = dict(zip(steps, await asyncio.gather(*(
+            asyncio.to_thread(self._prospects_with_completed_step, step, prospect_ids_by_step[step])
+            for step in steps
+        ))))
+        
+        completed_ids = set()
+        for proposal in proposals:
+            context = proposal.context_data or {}
+            if context.get("prospect_id") in done_by_step.get(context.get("flow_step"), set()):
+                completed_ids.add(proposal.id)
+        return completed_ids
+    
+    def _prospects_with_completed_step(self, flow_step: str, prospect_ids: Set[str]) -> Set[str]:
+        """Subset of prospect_ids for which the flow step's action is done."""
+        table, completed_only = FLOW_STEP_COMPLETION_CHECKS[flow_step]
+        pending = list(prospect_ids)
+        done: Set[str] = set()
+        try:
+            for start in range(0, len(pending), _IN_CHUNK_SIZE):
+                chunk = pending[start:start + _IN_CHUNK_SIZE]
+                offset = 0
+                while True:
+                    query = self.supabase.table(table) \
+                        .select("prospect_id") \
+                        .in_("prospect_id", chunk)
+                    if completed_only:
+                        query = query.eq("status", "completed")
+                    result = query \
+                        .order("id") \
+                        .range(offset, offset + _PAGE_SIZE - 1) \
                         .execute()
-                    if followup_result.data and len(followup_result.data) > 0:
-                        return False  # Meeting analysis already done
-            
-            return True  # Proposal is still valid
-            
+                    data = result.data or []
+                    done.update(row["prospect_id"] for row in data)
+                    if len(data) < _PAGE_SIZE:
+                        break
+                    offset += _PAGE_SIZE
+            return done
         except Exception as e:
-            logger.warning(f"Error validating proposal {proposal.id}: {e}")
-            return True  # On error, keep the proposal
+            logger.warning(f"Error validating {flow_step} proposals: {e}")
+            return set()  # On error, keep the proposals
     
     async def get_proposal(
         self,
@@ -604,6 +618,7 @@ class AutopilotOrchestrator:
                 .update(update_data) \
                 .eq("user_id", user_id) \
                 .execute()
+            invalidate_coach_context(user_id=user_id)
             
             if result.data:
                 return AutopilotSettings(**result.data[0])
@@ -632,6 +647,7 @@ class AutopilotOrchestrator:
             result = self.supabase.table("autopilot_settings") \
                 .insert(data) \
                 .execute()
+            invalidate_coach_context(user_id=user_id)
             
             if result.data:
                 return AutopilotSettings(**result.data[0])
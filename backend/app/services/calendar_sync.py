@@ -1,12 +1,24 @@
 """
 Calendar Sync Service - Fetches and syncs calendar events
 SPEC-038: Meetings & Calendar Integration
+
+Events of a connection are written with bulk upserts keyed on
+(calendar_connection_id, external_event_id); existing rows are loaded once
+per sync to tell new from updated meetings and to find cancelled ones.
+Provider API calls are paced by per-provider token buckets, shared by all
+syncs running in this process.
+
+Syncs are incremental: the Google nextSyncToken / Microsoft Graph delta
+link is stored on the connection (sync_cursor) and the next run only
+fetches changed or deleted events. A full sync of the window runs when
+there is no cursor, when the provider rejects it (expired), and once per
+CALENDAR_FULL_RESYNC_HOURS so the window keeps moving forward.
 """
 import os
 import base64
 import logging
 from datetime import datetime, timedelta, timezone
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
 from dataclasses import dataclass
 import asyncio
 
@@ -16,8 +28,9 @@ from googleapiclient.errors import HttpError
 
 from app.database import get_supabase_service
 # ProspectMatcher is now called via Inngest after sync completes
-from app.services.microsoft_calendar import microsoft_calendar_service
+from app.services.microsoft_calendar import microsoft_calendar_service, DeltaLinkExpired
 from app.services.encryption import encrypt_token, decrypt_token
+from app.utils.rate_limit import TokenBucket
 
 logger = logging.getLogger(__name__)
 
@@ -26,6 +39,33 @@ GOOGLE_CLIENT_ID = os.getenv("GOOGLE_CLIENT_ID")
 GOOGLE_CLIENT_SECRET = os.getenv("GOOGLE_CLIENT_SECRET")
 SYNC_DAYS_AHEAD = 14  # Sync meetings for the next 14 days
 
+# Rows per bulk upsert/update on calendar_meetings
+MEETING_UPSERT_BATCH_SIZE = 500
+
+# Re-anchor the sync window with a full sync at least this often
+FULL_RESYNC_INTERVAL = timedelta(hours=int(os.getenv("CALENDAR_FULL_RESYNC_HOURS", "24")))
+
+# Provider API pacing (requests/second, burst) - shared by all syncs in this process
+PROVIDER_RATE_LIMITS = {
+    "google": (
+        float(os.getenv("GOOGLE_CALENDAR_RATE_PER_SECOND", "8")),
+        float(os.getenv("GOOGLE_CALENDAR_RATE_BURST", "20")),
+    ),
+    "microsoft": (
+        float(os.getenv("MICROSOFT_GRAPH_RATE_PER_SECOND", "4")),
+        float(os.getenv("MICROSOFT_GRAPH_RATE_BURST", "10")),
+    ),
+}
+_provider_buckets: Dict[str, TokenBucket] = {
+    provider: TokenBucket(rate=rate, capacity=burst)
+    for provider, (rate, burst) in PROVIDER_RATE_LIMITS.items()
+}
+
+
+def get_provider_bucket(provider: str) -> TokenBucket:
+    """Token bucket pacing API calls to a calendar provider."""
+    return _provider_buckets[provider]
+
 
 @dataclass
 class SyncResult:
@@ -35,12 +75,30 @@ class SyncResult:
     updated_meetings: int = 0
     deleted_meetings: int = 0
     errors: List[str] = None
+    incremental: bool = False
     
     def __post_init__(self):
         if self.errors is None:
             self.errors = []
 
 
+class SyncTokenExpired(Exception):
+    """Google rejected the stored sync token (410 Gone); a full sync is needed."""
+
+
+def _sync_window() -> Tuple[datetime, datetime]:
+    """From the beginning of yesterday (to catch recent meetings) through SYNC_DAYS_AHEAD."""
+    now = datetime.now(timezone.utc)
+    from_date = (now - timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
+    return from_date, now + timedelta(days=SYNC_DAYS_AHEAD)
+
+
+def _parse_time(value: str) -> datetime:
+    """Parse an ISO timestamp (assumes UTC when no offset is given)."""
+    parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
 @dataclass
 class CalendarEvent:
     """Parsed calendar event from Google."""
@@ -243,42 +301,67 @@ class CalendarSyncService:
             logger.error(f"Failed to parse event {event.get('id')}: {e}")
             return None
     
-    def _fetch_google_events(self, credentials: Credentials) -> List[Dict]:
-        """Fetch upcoming events from Google Calendar."""
+    def _fetch_google_events(
+        self,
+        credentials: Credentials,
+        sync_token: Optional[str] = None
+    ) -> Tuple[List[Dict], Optional[str]]:
+        """
+        Fetch events from Google Calendar.
+        
+        Without sync_token all events in the sync window are returned; with
+        sync_token only events changed since then (deleted ones have status
+        "cancelled").
+        
+        Returns:
+            (events, nextSyncToken)
+        
+        Raises:
+            SyncTokenExpired: If Google rejects sync_token
+        """
         try:
             service = build("calendar", "v3", credentials=credentials)
             
-            # Fetch events from yesterday (to catch recent meetings) through SYNC_DAYS_AHEAD
-            now = datetime.now(timezone.utc)
-            # Start from beginning of yesterday to include recent meetings
-            from_date = (now - timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
-            time_min = from_date.strftime("%Y-%m-%dT%H:%M:%SZ")
-            time_max = (now + timedelta(days=SYNC_DAYS_AHEAD)).strftime("%Y-%m-%dT%H:%M:%SZ")
+            if sync_token:
+                # timeMin/timeMax/orderBy are not allowed together with syncToken
+                params = {"syncToken": sync_token}
+            else:
+                from_date, to_date = _sync_window()
+                params = {
+                    "timeMin": from_date.strftime("%Y-%m-%dT%H:%M:%SZ"),
+                    "timeMax": to_date.strftime("%Y-%m-%dT%H:%M:%SZ"),
+                }
             
             events = []
             page_token = None
+            next_sync_token = None
             
+            bucket = get_provider_bucket("google")
             while True:
+                bucket.acquire()
                 result = service.events().list(
                     calendarId="primary",
-                    timeMin=time_min,
-                    timeMax=time_max,
                     maxResults=250,
                     singleEvents=True,  # Expand recurring events
-                    orderBy="startTime",
                     pageToken=page_token,
+                    **params,
                 ).execute()
                 
                 events.extend(result.get("items", []))
                 page_token = result.get("nextPageToken")
                 
                 if not page_token:
+                    # Only the last page carries the sync token
+                    next_sync_token = result.get("nextSyncToken")
                     break
             
-            logger.info(f"Fetched {len(events)} events from Google Calendar")
-            return events
+            kind = "incremental" if sync_token else "full"
+            logger.info(f"Fetched {len(events)} events from Google Calendar ({kind})")
+            return events, next_sync_token
             
         except HttpError as e:
+            if sync_token and e.resp.status == 410:
+                raise SyncTokenExpired(str(e))
             logger.error(f"Google Calendar API error: {e}")
             if e.resp.status == 401:
                 raise ValueError("Token expired or revoked")
@@ -287,88 +370,183 @@ class CalendarSyncService:
             logger.error(f"Failed to fetch Google events: {e}")
             raise
     
-    def _upsert_meeting(
+    def _meeting_row(
         self, 
         event: CalendarEvent, 
         connection_id: str, 
         organization_id: str,
         user_id: str
-    ) -> str:
-        """Insert or update a calendar meeting. Returns 'new', 'updated', or 'unchanged'."""
-        try:
-            # Check if meeting already exists
-            existing = self.supabase.table("calendar_meetings").select("id, status").eq(
-                "calendar_connection_id", connection_id
-            ).eq(
-                "external_event_id", event.external_event_id
-            ).execute()
-            
-            meeting_data = {
-                "calendar_connection_id": connection_id,
-                "organization_id": organization_id,
-                "user_id": user_id,
-                "external_event_id": event.external_event_id,
-                "title": event.title,
-                "description": event.description,
-                "start_time": event.start_time.isoformat(),
-                "end_time": event.end_time.isoformat(),
-                "original_timezone": event.original_timezone,
-                "location": event.location,
-                "is_online": event.is_online,
-                "meeting_url": event.meeting_url,
-                "attendees": event.attendees,
-                "organizer_email": event.organizer_email,
-                "status": event.status,
-                "is_recurring": event.is_recurring,
-                "recurrence_rule": event.recurrence_rule,
-                "recurring_event_id": event.recurring_event_id,
-            }
-            
-            if existing.data and len(existing.data) > 0:
-                # Update existing
-                self.supabase.table("calendar_meetings").update(
-                    meeting_data
-                ).eq("id", existing.data[0]["id"]).execute()
-                return "updated"
-            else:
-                # Insert new
-                self.supabase.table("calendar_meetings").insert(
-                    meeting_data
+    ) -> Dict[str, Any]:
+        """Map a parsed Google event to a calendar_meetings row."""
+        return {
+            "calendar_connection_id": connection_id,
+            "organization_id": organization_id,
+            "user_id": user_id,
+            "external_event_id": event.external_event_id,
+            "title": event.title,
+            "description": event.description,
+            "start_time": event.start_time.isoformat(),
+            "end_time": event.end_time.isoformat(),
+            "original_timezone": event.original_timezone,
+            "location": event.location,
+            "is_online": event.is_online,
+            "meeting_url": event.meeting_url,
+            "attendees": event.attendees,
+            "organizer_email": event.organizer_email,
+            "status": event.status,
+            "is_recurring": event.is_recurring,
+            "recurrence_rule": event.recurrence_rule,
+            "recurring_event_id": event.recurring_event_id,
+        }
+    
+    def _load_existing_meetings(self, connection_id: str) -> Dict[str, Dict[str, Any]]:
+        """Existing meetings of a connection, keyed by external event id."""
+        existing = self.supabase.table("calendar_meetings").select(
+            "id, external_event_id, status"
+        ).eq(
+            "calendar_connection_id", connection_id
+        ).execute()
+        return {m["external_event_id"]: m for m in existing.data or []}
+    
+    def _bulk_upsert_meetings(
+        self,
+        rows: List[Dict[str, Any]],
+        existing: Dict[str, Dict[str, Any]],
+        result: SyncResult
+    ) -> None:
+        """
+        Insert or update meetings with bulk upserts on the external event id.
+        
+        Counts new/updated meetings on result; a failed batch is recorded in
+        result.errors and the remaining batches are still written.
+        """
+        # Last occurrence wins if a provider returns the same event twice
+        unique = list({row["external_event_id"]: row for row in rows}.values())
+        
+        for start in range(0, len(unique), MEETING_UPSERT_BATCH_SIZE):
+            batch = unique[start:start + MEETING_UPSERT_BATCH_SIZE]
+            try:
+                self.supabase.table("calendar_meetings").upsert(
+                    batch,
+                    on_conflict="calendar_connection_id,external_event_id"
                 ).execute()
-                return "new"
-                
-        except Exception as e:
-            logger.error(f"Failed to upsert meeting {event.external_event_id}: {e}")
-            raise
+            except Exception as e:
+                logger.error(f"Failed to upsert {len(batch)} meetings: {e}")
+                result.errors.append(f"Failed to save {len(batch)} events: {str(e)}")
+                continue
+            
+            for row in batch:
+                if row["external_event_id"] in existing:
+                    result.updated_meetings += 1
+                else:
+                    result.new_meetings += 1
+            result.synced_meetings += len(batch)
     
     def _mark_cancelled_meetings(
         self, 
         connection_id: str, 
-        synced_event_ids: List[str]
+        synced_event_ids: List[str],
+        existing: Optional[Dict[str, Dict[str, Any]]] = None
     ) -> int:
         """Mark meetings as cancelled if they no longer appear in the calendar."""
         try:
-            # Get current non-cancelled meetings for this connection
-            current = self.supabase.table("calendar_meetings").select("id, external_event_id").eq(
-                "calendar_connection_id", connection_id
-            ).neq(
-                "status", "cancelled"
-            ).execute()
-            
-            cancelled_count = 0
-            for meeting in current.data or []:
-                if meeting["external_event_id"] not in synced_event_ids:
-                    self.supabase.table("calendar_meetings").update({
-                        "status": "cancelled"
-                    }).eq("id", meeting["id"]).execute()
-                    cancelled_count += 1
-            
-            return cancelled_count
+            if existing is None:
+                existing = self._load_existing_meetings(connection_id)
+            
+            synced = set(synced_event_ids)
+            stale_ids = [
+                m["id"] for external_id, m in existing.items()
+                if m.get("status") != "cancelled" and external_id not in synced
+            ]
+            
+            for start in range(0, len(stale_ids), MEETING_UPSERT_BATCH_SIZE):
+                self.supabase.table("calendar_meetings").update({
+                    "status": "cancelled"
+                }).in_("id", stale_ids[start:start + MEETING_UPSERT_BATCH_SIZE]).execute()
+            
+            return len(stale_ids)
             
         except Exception as e:
             logger.error(f"Failed to mark cancelled meetings: {e}")
             return 0
     
+    def _cancel_meetings(
+        self,
+        cancelled_event_ids: List[str],
+        existing: Dict[str, Dict[str, Any]]
+    ) -> int:
+        """Mark meetings cancelled/deleted at the provider (incremental sync)."""
+        ids = [
+            existing[external_id]["id"] for external_id in set(cancelled_event_ids)
+            if external_id in existing and existing[external_id].get("status") != "cancelled"
+        ]
+        try:
+            for start in range(0, len(ids), MEETING_UPSERT_BATCH_SIZE):
+                self.supabase.table("calendar_meetings").update({
+                    "status": "cancelled"
+                }).in_("id", ids[start:start + MEETING_UPSERT_BATCH_SIZE]).execute()
+            return len(ids)
+        except Exception as e:
+            logger.error(f"Failed to cancel meetings: {e}")
+            return 0
+    
+    def _apply_changes(
+        self,
+        connection_id: str,
+        rows: List[Dict[str, Any]],
+        cancelled_event_ids: List[str],
+        full_sync: bool,
+        result: SyncResult
+    ) -> None:
+        """
+        Write fetched events.
+        
+        Full sync: upsert everything and cancel meetings missing from the
+        window. Incremental: upsert changed events that fall in the window
+        (or are already stored) and cancel the deleted ones.
+        """
+        existing = self._load_existing_meetings(connection_id)
+        
+        if full_sync:
+            self._bulk_upsert_meetings(rows, existing, result)
+            synced_event_ids = [row["external_event_id"] for row in rows]
+            result.deleted_meetings = self._mark_cancelled_meetings(connection_id, synced_event_ids, existing)
+            return
+        
+        # Changes cover the whole calendar, keep only what the window sync would have stored
+        from_date, to_date = _sync_window()
+        in_scope = [
+            row for row in rows
+            if row["external_event_id"] in existing or self._in_window(row, from_date, to_date)
+        ]
+        self._bulk_upsert_meetings(in_scope, existing, result)
+        result.deleted_meetings = self._cancel_meetings(cancelled_event_ids, existing)
+    
+    @staticmethod
+    def _in_window(row: Dict[str, Any], from_date: datetime, to_date: datetime) -> bool:
+        try:
+            return _parse_time(row["end_time"]) >= from_date and _parse_time(row["start_time"]) <= to_date
+        except (TypeError, ValueError, AttributeError):
+            return True  # Let the upsert decide
+    
+    @staticmethod
+    def _use_cursor(conn: Dict) -> Optional[str]:
+        """Stored sync cursor, or None if a full sync is due."""
+        cursor = conn.get("sync_cursor")
+        last_full = conn.get("last_full_sync_at")
+        if not cursor or not last_full:
+            return None
+        if datetime.now(timezone.utc) - _parse_time(last_full) >= FULL_RESYNC_INTERVAL:
+            return None
+        return cursor
+    
+    def _save_sync_cursor(self, connection_id: str, cursor: Optional[str], full_sync: bool) -> None:
+        """Store the provider cursor for the next incremental sync."""
+        update = {"sync_cursor": cursor}
+        if full_sync:
+            update["last_full_sync_at"] = datetime.now(timezone.utc).isoformat()
+        self.supabase.table("calendar_connections").update(update).eq("id", connection_id).execute()
+    
     async def _sync_microsoft_connection(self, conn: Dict, connection_id: str) -> SyncResult:
         """Sync calendar events for a Microsoft connection."""
         result = SyncResult()
@@ -395,23 +573,35 @@ class CalendarSyncService:
                         "refresh_token_encrypted": encrypt_token(new_refresh) if new_refresh else None,
                     }).eq("id", connection_id).execute()
             
-            # Fetch events from Microsoft Graph
-            # Start from beginning of yesterday to include recent meetings
-            now = datetime.now(timezone.utc)
-            from_date = (now - timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
-            to_date = now + timedelta(days=SYNC_DAYS_AHEAD)
-            
-            events = await microsoft_calendar_service.fetch_calendar_events(
-                access_token, from_date, to_date
-            )
+            # Fetch changes from Microsoft Graph (full window if no usable delta link)
+            from_date, to_date = _sync_window()
+            delta_link = self._use_cursor(conn)
+            try:
+                events, new_delta_link = await microsoft_calendar_service.fetch_calendar_delta(
+                    access_token, from_date, to_date,
+                    delta_link=delta_link,
+                    rate_limiter=get_provider_bucket("microsoft")
+                )
+            except DeltaLinkExpired as e:
+                logger.info(f"Delta link expired for connection {connection_id}, running full sync: {e}")
+                delta_link = None
+                events, new_delta_link = await microsoft_calendar_service.fetch_calendar_delta(
+                    access_token, from_date, to_date,
+                    rate_limiter=get_provider_bucket("microsoft")
+                )
             
+            result.incremental = delta_link is not None
             if not events:
                 logger.info(f"No events fetched from Microsoft for connection {connection_id}")
             
-            synced_event_ids = []
+            rows = []
+            cancelled_event_ids = []
             
-            # Process each event
             for event_data in events:
+                if "@removed" in event_data:
+                    cancelled_event_ids.append(event_data["id"])
+                    continue
+                
                 # Parse Microsoft event to our format
                 parsed = microsoft_calendar_service.parse_event_to_meeting(
                     event_data, 
@@ -421,54 +611,32 @@ class CalendarSyncService:
                 )
                 
                 if parsed.get("status") == "cancelled":
+                    cancelled_event_ids.append(parsed["external_id"])
                     continue
                 
-                synced_event_ids.append(parsed["external_id"])
-                
-                try:
-                    # Check if meeting already exists
-                    existing = self.supabase.table("calendar_meetings").select("id").eq(
-                        "calendar_connection_id", connection_id
-                    ).eq(
-                        "external_event_id", parsed["external_id"]
-                    ).execute()
-                    
-                    # Map parsed data to meeting schema
-                    meeting_data = {
-                        "calendar_connection_id": connection_id,
-                        "organization_id": parsed["organization_id"],
-                        "user_id": parsed["user_id"],
-                        "external_event_id": parsed["external_id"],
-                        "title": parsed["title"],
-                        "start_time": parsed["start_time"],
-                        "end_time": parsed["end_time"],
-                        "original_timezone": parsed.get("timezone"),
-                        "location": parsed.get("location"),
-                        "is_online": parsed.get("is_online", False),
-                        "meeting_url": parsed.get("meeting_url"),
-                        "attendees": parsed.get("attendees", []),
-                        "status": parsed.get("status", "confirmed"),
-                        "is_recurring": False,  # Graph API expands recurring events
-                    }
-                    
-                    if existing.data and len(existing.data) > 0:
-                        self.supabase.table("calendar_meetings").update(
-                            meeting_data
-                        ).eq("id", existing.data[0]["id"]).execute()
-                        result.updated_meetings += 1
-                    else:
-                        self.supabase.table("calendar_meetings").insert(
-                            meeting_data
-                        ).execute()
-                        result.new_meetings += 1
-                    
-                    result.synced_meetings += 1
-                    
-                except Exception as e:
-                    result.errors.append(f"Failed to save Microsoft event {parsed['external_id']}: {str(e)}")
-            
-            # Mark meetings that no longer exist as cancelled
-            result.deleted_meetings = self._mark_cancelled_meetings(connection_id, synced_event_ids)
+                # Map parsed data to meeting schema
+                rows.append({
+                    "calendar_connection_id": connection_id,
+                    "organization_id": parsed["organization_id"],
+                    "user_id": parsed["user_id"],
+                    "external_event_id": parsed["external_id"],
+                    "title": parsed["title"],
+                    "start_time": parsed["start_time"],
+                    "end_time": parsed["end_time"],
+                    "original_timezone": parsed.get("timezone"),
+                    "location": parsed.get("location"),
+                    "is_online": parsed.get("is_online", False),
+                    "meeting_url": parsed.get("meeting_url"),
+                    "attendees": parsed.get("attendees", []),
+                    "status": parsed.get("status", "confirmed"),
+                    "is_recurring": False,  # Graph API expands recurring events
+                })
+            
+            self._apply_changes(connection_id, rows, cancelled_event_ids, delta_link is None, result)
+            
+            # Only move the cursor forward if every change was stored
+            if not result.errors:
+                self._save_sync_cursor(connection_id, new_delta_link, delta_link is None)
             
             return result
             
@@ -477,6 +645,47 @@ class CalendarSyncService:
             result.errors.append(str(e))
             return result
     
+    def _sync_google_connection(self, conn: Dict, connection_id: str) -> Optional[SyncResult]:
+        """Sync calendar events for a Google connection (None if no valid credentials)."""
+        result = SyncResult()
+        
+        credentials = self._get_google_credentials(conn)
+        if not credentials:
+            return None
+        
+        # Fetch changes (full window if no usable sync token)
+        sync_token = self._use_cursor(conn)
+        try:
+            events, next_sync_token = self._fetch_google_events(credentials, sync_token)
+        except SyncTokenExpired as e:
+            logger.info(f"Sync token expired for connection {connection_id}, running full sync: {e}")
+            sync_token = None
+            events, next_sync_token = self._fetch_google_events(credentials)
+        
+        result.incremental = sync_token is not None
+        rows = []
+        cancelled_event_ids = []
+        
+        for event_data in events:
+            # Deleted events in incremental results only carry id + status
+            if event_data.get("status") == "cancelled":
+                cancelled_event_ids.append(event_data["id"])
+                continue
+            
+            event = self._parse_google_event(event_data, connection_id)
+            if not event:
+                continue
+            
+            rows.append(self._meeting_row(event, connection_id, conn["organization_id"], conn["user_id"]))
+        
+        self._apply_changes(connection_id, rows, cancelled_event_ids, sync_token is None, result)
+        
+        # Only move the cursor forward if every change was stored
+        if not result.errors:
+            self._save_sync_cursor(connection_id, next_sync_token, sync_token is None)
+        
+        return result
+    
     def sync_connection(self, connection_id: str) -> SyncResult:
         """Sync calendar events for a specific connection."""
         result = SyncResult()
@@ -516,39 +725,10 @@ class CalendarSyncService:
                     # No running loop
                     result = asyncio.run(self._sync_microsoft_connection(conn, connection_id))
             else:
-                # Google sync (existing logic)
-                credentials = self._get_google_credentials(conn)
-                if not credentials:
-                    result.errors.append("Failed to get valid credentials")
-                    return result
-                
-                # Fetch events
-                events = self._fetch_google_events(credentials)
-                synced_event_ids = []
-                
-                # Process each event
-                for event_data in events:
-                    event = self._parse_google_event(event_data, connection_id)
-                    if not event:
-                        continue
-                    
-                    if event.status == "cancelled":
-                        continue  # Skip cancelled events
-                    
-                    synced_event_ids.append(event.external_event_id)
-                    
-                    try:
-                        action = self._upsert_meeting(event, connection_id, conn["organization_id"], conn["user_id"])
-                        if action == "new":
-                            result.new_meetings += 1
-                        elif action == "updated":
-                            result.updated_meetings += 1
-                        result.synced_meetings += 1
-                    except Exception as e:
-                        result.errors.append(f"Failed to save event {event.external_event_id}: {str(e)}")
-                
-                # Mark meetings that no longer exist as cancelled
-                result.deleted_meetings = self._mark_cancelled_meetings(connection_id, synced_event_ids)
+                # Google sync
+                result = self._sync_google_connection(conn, connection_id)
+                if result is None:
+                    return SyncResult(errors=["Failed to get valid credentials"])
             
             # Update connection sync status
             self.supabase.table("calendar_connections").update({
@@ -558,7 +738,8 @@ class CalendarSyncService:
             }).eq("id", connection_id).execute()
             
             logger.info(
-                f"Synced {provider} connection {connection_id}: "
+                f"Synced {provider} connection {connection_id} "
+                f"({'incremental' if result.incremental else 'full'}): "
                 f"{result.new_meetings} new, {result.updated_meetings} updated, "
                 f"{result.deleted_meetings} deleted"
             )
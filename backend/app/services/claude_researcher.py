@@ -14,7 +14,7 @@ import os
 import logging
 from datetime import datetime
 from typing import Dict, Any, Optional
-from anthropic import AsyncAnthropic
+from app.services.llm_gateway import get_claude
 from app.i18n.utils import get_language_instruction
 from app.i18n.config import DEFAULT_LANGUAGE
 
@@ -35,7 +35,7 @@ class ClaudeResearcher:
         if not api_key:
             raise ValueError("ANTHROPIC_API_KEY environment variable not set")
         
-        self.client = AsyncAnthropic(api_key=api_key)
+        self.client = get_claude("research_analysis")
         
         # Cache seller context per organization for efficiency
         self._seller_context_cache: Dict[str, str] = {}
@@ -600,6 +600,7 @@ Based on the research, these are the 3 most important immediate actions:
                 model="claude-sonnet-4-20250514",
                 max_tokens=8192,
                 temperature=0.2,
+                organization_id=org_id,
                 messages=[{
                     "role": "user",
                     "content": analysis_prompt
@@ -0,0 +1,166 @@
+"""
+Coach Event Buffer - batched ingestion of behavior events
+
+UI behavior events (page views, widget and suggestion interactions) are the
+highest-frequency writes in the app. Instead of one insert per event, the
+coach router queues rows here and they are written to
+coach_behavior_events with bulk inserts:
+
+- when COACH_EVENT_FLUSH_SIZE rows are queued, or
+- every COACH_EVENT_FLUSH_SECONDS, or
+- on app shutdown (close())
+
+Rows get their id and created_at when they are queued, so callers can
+return the event id right away and timestamps are not skewed by the
+flush delay. Events are analytics input: if a flush fails the rows are
+re-queued while there is room (COACH_EVENT_MAX_BUFFER), otherwise dropped
+with an error log.
+"""
+
+import os
+import uuid
+import asyncio
+import logging
+from datetime import datetime
+from typing import List, Optional
+
+from app.database import get_supabase_service
+
+logger = logging.getLogger(__name__)
+
+COACH_EVENT_FLUSH_SIZE = int(os.getenv("COACH_EVENT_FLUSH_SIZE", "200"))
+COACH_EVENT_FLUSH_SECONDS = float(os.getenv("COACH_EVENT_FLUSH_SECONDS", "2"))
+
+# Upper bound on queued rows (protects memory if the database is down)
+COACH_EVENT_MAX_BUFFER = int(os.getenv("COACH_EVENT_MAX_BUFFER", "10000"))
+
+# Rows per insert statement
+_INSERT_CHUNK_SIZE = 500
+
+
+class CoachEventBuffer:
+    """In-memory queue of coach_behavior_events rows, flushed in bulk."""
+    
+    def __init__(
+        self,
+        flush_size: int = COACH_EVENT_FLUSH_SIZE,
+        flush_seconds: float = COACH_EVENT_FLUSH_SECONDS,
+        max_buffer: int = COACH_EVENT_MAX_BUFFER
+    ):
+        self.flush_size = flush_size
+        self.flush_seconds = flush_seconds
+        self.max_buffer = max_buffer
+        self._rows: List[dict] = []
+        self._timer: Optional[asyncio.Task] = None
+        self._flushing: Optional[asyncio.Task] = None
+        self._closed = False
+    
+    def add(
+        self,
+        user_id: str,
+        organization_id: str,
+        events: List[dict]
+    ) -> List[str]:
+        """
+        Queue events ({event_type, event_data, page_context}) for a user.
+        
+        Returns the ids the rows will be stored with.
+        """
+        created_at = datetime.utcnow().isoformat()
+        rows = [
+            {
+                "id": str(uuid.uuid4()),
+                "user_id": user_id,
+                "organization_id": organization_id,
+                "event_type": event["event_type"],
+                "event_data": event.get("event_data") or {},
+                "page_context": event.get("page_context"),
+                "created_at": created_at,
+            }
+            for event in events
+        ]
+        
+        self._rows.extend(rows)
+        overflow = len(self._rows) - self.max_buffer
+        if overflow > 0:
+            logger.error(f"Coach event buffer full, dropping {overflow} oldest events")
+            del self._rows[:overflow]
+        
+        if self._closed:
+            # Shutting down: no timer anymore, write through
+            self._start_flush()
+        elif len(self._rows) >= self.flush_size:
+            self._start_flush()
+        else:
+            self._schedule_flush()
+        
+        return [row["id"] for row in rows]
+    
+    def _schedule_flush(self) -> None:
+        if self._timer is None or self._timer.done():
+            self._timer = asyncio.get_running_loop().create_task(self._flush_later())
+    
+    def _start_flush(self) -> None:
+        if self._flushing is None or self._flushing.done():
+            self._flushing = asyncio.get_running_loop().create_task(self.flush())
+    
+    async def _flush_later(self) -> None:
+        await asyncio.sleep(self.flush_seconds)
+        # Flush in its own task so cancelling the timer never interrupts a write
+        self._start_flush()
+    
+    async def flush(self) -> int:
+        """Write all queued rows. Returns the number of rows written."""
+        written = 0
+        while self._rows:
+            rows, self._rows = self._rows, []
+            
+            for start in range(0, len(rows), _INSERT_CHUNK_SIZE):
+                chunk = rows[start:start + _INSERT_CHUNK_SIZE]
+                try:
+                    await asyncio.to_thread(_insert_rows, chunk)
+                    written += len(chunk)
+                except Exception as e:
+                    failed = rows[start:]
+                    # Retry with the next flush (not possible once closed)
+                    requeue = [] if self._closed else failed[:max(0, self.max_buffer - len(self._rows))]
+                    self._rows[:0] = requeue
+                    if requeue:
+                        self._schedule_flush()
+                    logger.error(
+                        f"Error flushing {len(failed)} coach events "
+                        f"({len(failed) - len(requeue)} dropped): {e}"
+                    )
+                    return written
+        
+        if written:
+            logger.debug(f"Flushed {written} coach events")
+        return written
+    
+    async def close(self) -> None:
+        """Flush everything that is queued (app shutdown)."""
+        self._closed = True
+        if self._timer is not None and not self._timer.done():
+            self._timer.cancel()
+        if self._flushing is not None and not self._flushing.done():
+            await self._flushing
+        await self.flush()
+    
+    def stats(self) -> dict:
+        return {"queued": len(self._rows)}
+
+
+def _insert_rows(rows: List[dict]) -> None:
+    get_supabase_service().table("coach_behavior_events").insert(rows).execute()
+
+
+# Singleton instance
+_coach_event_buffer: Optional[CoachEventBuffer] = None
+
+
+def get_coach_event_buffer() -> CoachEventBuffer:
+    """Get or create the process-wide coach event buffer."""
+    global _coach_event_buffer
+    if _coach_event_buffer is None:
+        _coach_event_buffer = CoachEventBuffer()
+    return _coach_event_buffer
@@ -16,8 +16,7 @@ import logging
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Any
 from enum import Enum
-import os
-from anthropic import AsyncAnthropic  # Use async client to not block event loop
+from app.services.llm_gateway import get_claude, anthropic_configured
 
 logger = logging.getLogger(__name__)
 
@@ -47,10 +46,9 @@ class CoachInsightsService:
         self.supabase = supabase
         self.anthropic_client = None
         
-        # Initialize Claude client if API key available
-        api_key = os.getenv("ANTHROPIC_API_KEY")
-        if api_key:
-            self.anthropic_client = AsyncAnthropic(api_key=api_key)
+        # Shared Claude client (if API key available)
+        if anthropic_configured():
+            self.anthropic_client = get_claude("coach_insights")
     
     async def analyze_success_patterns(
         self, 
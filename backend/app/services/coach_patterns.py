@@ -9,16 +9,42 @@ Patterns tracked:
 - Step timing: How long users take between workflow steps
 - Dismiss patterns: Which suggestion types get dismissed frequently
 - Success patterns: What actions lead to successful outcomes
+
+Patterns are computed from coach_user_aggregates (see
+migration_coach_user_aggregates.sql): per-user hour/weekday histograms,
+step duration histograms and suggestion action counters that database
+triggers update as events, preps, follow-ups and suggestion actions are
+written. Counts decay with a 14-day half-life, so recent behavior weighs
+most and reading a user's patterns is a single small query instead of a
+scan of their history.
 """
 
-from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any
+from datetime import datetime
+from typing import Dict, List, Optional, Any, Tuple
 from enum import Enum
-from collections import defaultdict
 import logging
 
+from app.services.coach_rules import invalidate_coach_context
+
 logger = logging.getLogger(__name__)
 
+# Upper bounds (hours) of the step_hours buckets; the last bucket is open-ended
+STEP_BUCKET_BOUNDS = [1, 4, 12, 24, 48, 96, 168, 336, 720]
+
+# Slots of the suggestion_action counters
+SUGGESTION_ACTIONS = ["dismissed", "completed", "snoozed", "other"]
+
+# Decayed weight from which an hour counts as active (half an event)
+ACTIVE_HOUR_WEIGHT = 0.5
+
+DEFAULT_WORK_HOURS = {
+    "peak_hours": [9, 10, 11, 14, 15, 16],  # Default business hours
+    "active_days": [0, 1, 2, 3, 4],  # Mon-Fri
+    "quiet_hours": [0, 1, 2, 3, 4, 5, 6, 22, 23],
+}
+
+Aggregates = Dict[Tuple[str, str], Dict[str, Any]]
+
 
 class PatternType(str, Enum):
     """Types of patterns we can learn."""
@@ -31,16 +57,35 @@ class PatternType(str, Enum):
 
 class PatternLearner:
     """
-    Analyzes behavior events to learn user patterns.
+    Learns user patterns from the incrementally maintained coach aggregates.
+    
+    Every analyze_* method accepts already loaded aggregates so callers that
+    need several patterns (update_user_patterns) read them only once.
     """
     
     def __init__(self, supabase):
         self.supabase = supabase
     
+    async def load_aggregates(self, user_id: str) -> Aggregates:
+        """
+        Load all aggregates of a user, decayed to now.
+        
+        Returns:
+            Dict keyed by (metric, key), e.g. ("activity", "hour")
+        """
+        result = self.supabase.rpc("get_coach_user_aggregates", {
+            "p_user_id": user_id,
+        }).execute()
+        
+        return {
+            (row["metric"], row["key"]): row
+            for row in (result.data or [])
+        }
+    
     async def analyze_work_hours(
         self, 
         user_id: str, 
-        days: int = 30
+        aggregates: Optional[Aggregates] = None
     ) -> Dict[str, Any]:
         """
         Analyze when the user is typically active.
@@ -52,179 +97,77 @@ class PatternLearner:
             - quiet_hours: List of typically inactive hours
             - confidence: How confident we are in this pattern (0-1)
         """
-        since = (datetime.now() - timedelta(days=days)).isoformat()
-        
         try:
-            result = self.supabase.table("coach_behavior_events") \
-                .select("created_at") \
-                .eq("user_id", user_id) \
-                .gte("created_at", since) \
-                .execute()
+            if aggregates is None:
+                aggregates = await self.load_aggregates(user_id)
             
-            if not result.data or len(result.data) < 10:
-                # Not enough data
-                return {
-                    "peak_hours": [9, 10, 11, 14, 15, 16],  # Default business hours
-                    "active_days": [0, 1, 2, 3, 4],  # Mon-Fri
-                    "quiet_hours": [0, 1, 2, 3, 4, 5, 6, 22, 23],
-                    "confidence": 0.1,
-                }
-            
-            # Count events per hour and day
-            hour_counts = defaultdict(int)
-            day_counts = defaultdict(int)
+            hour_weights = _weights(aggregates.get(("activity", "hour")), 24)
+            day_weights = _weights(aggregates.get(("activity", "weekday")), 7)
+            total_events = sum(hour_weights)
             
-            for event in result.data:
-                dt = datetime.fromisoformat(event["created_at"].replace("Z", "+00:00"))
-                hour_counts[dt.hour] += 1
-                day_counts[dt.weekday()] += 1
+            if total_events < 10:
+                # Not enough data
+                return {**DEFAULT_WORK_HOURS, "confidence": 0.1}
             
             # Find peak hours (top 6)
-            sorted_hours = sorted(hour_counts.items(), key=lambda x: x[1], reverse=True)
-            peak_hours = [h for h, _ in sorted_hours[:6]]
+            active_hours = [h for h in range(24) if hour_weights[h] >= ACTIVE_HOUR_WEIGHT]
+            sorted_hours = sorted(active_hours, key=lambda h: hour_weights[h], reverse=True)
+            peak_hours = sorted_hours[:6]
             
-            # Find quiet hours (bottom 6 or hours with 0 events)
-            all_hours = set(range(24))
-            active_hours = set(hour_counts.keys())
-            inactive_hours = all_hours - active_hours
+            # Find quiet hours (hours without activity, topped up with the least active)
+            inactive_hours = [h for h in range(24) if h not in active_hours]
             
             if len(inactive_hours) >= 6:
-                quiet_hours = list(inactive_hours)[:9]
+                quiet_hours = inactive_hours[:9]
             else:
-                sorted_by_activity = sorted(hour_counts.items(), key=lambda x: x[1])
-                quiet_hours = list(inactive_hours) + [h for h, _ in sorted_by_activity[:9 - len(inactive_hours)]]
+                quiet_hours = inactive_hours + sorted_hours[::-1][:9 - len(inactive_hours)]
             
             # Find active days
-            sorted_days = sorted(day_counts.items(), key=lambda x: x[1], reverse=True)
-            active_days = [d for d, _ in sorted_days if day_counts[d] > 0]
+            active_days = [d for d in range(7) if day_weights[d] >= ACTIVE_HOUR_WEIGHT]
             
-            # Calculate confidence based on data volume
-            total_events = len(result.data)
+            # Calculate confidence based on (decayed) data volume
             confidence = min(1.0, total_events / 100)
             
             return {
                 "peak_hours": sorted(peak_hours),
-                "active_days": sorted(active_days),
+                "active_days": active_days,
                 "quiet_hours": sorted(quiet_hours),
                 "confidence": round(confidence, 2),
-                "total_events_analyzed": total_events,
+                "total_events_analyzed": round(total_events),
             }
-            
+        
         except Exception as e:
             logger.error(f"Error analyzing work hours: {e}")
-            return {
-                "peak_hours": [9, 10, 11, 14, 15, 16],
-                "active_days": [0, 1, 2, 3, 4],
-                "quiet_hours": [0, 1, 2, 3, 4, 5, 6, 22, 23],
-                "confidence": 0.0,
-                "error": str(e),
-            }
+            return {**DEFAULT_WORK_HOURS, "confidence": 0.0, "error": str(e)}
     
     async def analyze_step_timing(
         self, 
         user_id: str, 
-        organization_id: str
+        aggregates: Optional[Aggregates] = None
     ) -> Dict[str, Any]:
         """
-        Analyze how long users typically take between workflow steps.
+        Analyze how long the user typically takes between workflow steps.
         
-        E.g., time between research completion and prep creation.
+        E.g., time between research completion and prep creation. Timings
+        are recorded for the user who created the prep / follow-up.
         
         Returns:
             Dict with timing statistics for each step transition.
         """
         try:
-            # Get research briefs with their completion times
-            research_result = self.supabase.table("research_briefs") \
-                .select("company_name, completed_at, prospect_id") \
-                .eq("organization_id", organization_id) \
-                .eq("status", "completed") \
-                .not_.is_("completed_at", "null") \
-                .order("completed_at") \
-                .execute()
-            
-            # Get preps with their times
-            preps_result = self.supabase.table("meeting_preps") \
-                .select("prospect_company_name, created_at, completed_at") \
-                .eq("organization_id", organization_id) \
-                .order("created_at") \
-                .execute()
-            
-            # Get followups with their times
-            followups_result = self.supabase.table("followups") \
-                .select("prospect_company_name, created_at, completed_at") \
-                .eq("organization_id", organization_id) \
-                .order("created_at") \
-                .execute()
+            if aggregates is None:
+                aggregates = await self.load_aggregates(user_id)
             
-            # Calculate timing patterns
-            research_to_prep_times = []
-            prep_to_followup_times = []
-            
-            # Match research to preps by company name
-            research_by_company = {
-                r.get("company_name", "").lower(): r 
-                for r in (research_result.data or [])
-            }
-            preps_by_company = {
-                p.get("prospect_company_name", "").lower(): p 
-                for p in (preps_result.data or [])
-            }
-            followups_by_company = {
-                f.get("prospect_company_name", "").lower(): f 
-                for f in (followups_result.data or [])
-            }
-            
-            # Research → Prep timing
-            for company, research in research_by_company.items():
-                if company in preps_by_company:
-                    prep = preps_by_company[company]
-                    if research.get("completed_at") and prep.get("created_at"):
-                        research_time = datetime.fromisoformat(
-                            research["completed_at"].replace("Z", "+00:00")
-                        )
-                        prep_time = datetime.fromisoformat(
-                            prep["created_at"].replace("Z", "+00:00")
-                        )
-                        delta = (prep_time - research_time).total_seconds() / 3600  # hours
-                        if delta >= 0:  # Only positive deltas
-                            research_to_prep_times.append(delta)
-            
-            # Prep → Follow-up timing
-            for company, prep in preps_by_company.items():
-                if company in followups_by_company:
-                    followup = followups_by_company[company]
-                    if prep.get("completed_at") and followup.get("created_at"):
-                        prep_time = datetime.fromisoformat(
-                            prep["completed_at"].replace("Z", "+00:00")
-                        )
-                        followup_time = datetime.fromisoformat(
-                            followup["created_at"].replace("Z", "+00:00")
-                        )
-                        delta = (followup_time - prep_time).total_seconds() / 3600
-                        if delta >= 0:
-                            prep_to_followup_times.append(delta)
-            
-            def calculate_stats(times: List[float]) -> Dict[str, Any]:
-                if not times:
-                    return {"average_hours": None, "median_hours": None, "sample_size": 0}
-                sorted_times = sorted(times)
-                avg = sum(times) / len(times)
-                median = sorted_times[len(times) // 2]
-                return {
-                    "average_hours": round(avg, 1),
-                    "median_hours": round(median, 1),
-                    "min_hours": round(min(times), 1),
-                    "max_hours": round(max(times), 1),
-                    "sample_size": len(times),
-                }
+            research_to_prep = _step_stats(aggregates.get(("step_hours", "research_to_prep")))
+            prep_to_followup = _step_stats(aggregates.get(("step_hours", "prep_to_followup")))
+            samples = research_to_prep["sample_size"] + prep_to_followup["sample_size"]
             
             return {
-                "research_to_prep": calculate_stats(research_to_prep_times),
-                "prep_to_followup": calculate_stats(prep_to_followup_times),
-                "confidence": min(1.0, (len(research_to_prep_times) + len(prep_to_followup_times)) / 20),
+                "research_to_prep": research_to_prep,
+                "prep_to_followup": prep_to_followup,
+                "confidence": min(1.0, samples / 20),
             }
-            
+        
         except Exception as e:
             logger.error(f"Error analyzing step timing: {e}")
             return {
@@ -236,7 +179,8 @@ class PatternLearner:
     
     async def analyze_dismiss_patterns(
         self, 
-        user_id: str
+        user_id: str,
+        aggregates: Optional[Aggregates] = None
     ) -> Dict[str, Any]:
         """
         Analyze which suggestion types get dismissed frequently.
@@ -247,55 +191,44 @@ class PatternLearner:
             Dict with dismiss rates per suggestion type.
         """
         try:
-            # Get suggestion actions
-            result = self.supabase.table("coach_suggestions") \
-                .select("suggestion_type, action_taken") \
-                .eq("user_id", user_id) \
-                .not_.is_("action_taken", "null") \
-                .execute()
+            if aggregates is None:
+                aggregates = await self.load_aggregates(user_id)
+            
+            dismiss_rates = {}
+            total_actions = 0.0
             
-            if not result.data:
+            for (metric, stype), row in aggregates.items():
+                if metric != "suggestion_action":
+                    continue
+                
+                counts = dict(zip(SUGGESTION_ACTIONS, _weights(row, len(SUGGESTION_ACTIONS))))
+                total = sum(counts.values())
+                total_actions += total
+                
+                # Round before checking: counters decay but never reach 0
+                if round(total) > 0:
+                    dismiss_rates[stype] = {
+                        "dismiss_rate": round(counts["dismissed"] / total, 2),
+                        "complete_rate": round(counts["completed"] / total, 2),
+                        "snooze_rate": round(counts["snoozed"] / total, 2),
+                        "sample_size": round(total),
+                    }
+            
+            if not dismiss_rates:
                 return {
                     "dismiss_rates": {},
                     "confidence": 0.0,
                     "total_actions": 0,
                 }
             
-            # Count actions per suggestion type
-            type_stats = defaultdict(lambda: {"dismissed": 0, "completed": 0, "snoozed": 0, "total": 0})
-            
-            for suggestion in result.data:
-                stype = suggestion.get("suggestion_type", "unknown")
-                action = suggestion.get("action_taken", "")
-                type_stats[stype]["total"] += 1
-                
-                if action == "dismissed":
-                    type_stats[stype]["dismissed"] += 1
-                elif action == "completed":
-                    type_stats[stype]["completed"] += 1
-                elif action == "snoozed":
-                    type_stats[stype]["snoozed"] += 1
-            
-            # Calculate dismiss rates
-            dismiss_rates = {}
-            for stype, stats in type_stats.items():
-                if stats["total"] > 0:
-                    dismiss_rates[stype] = {
-                        "dismiss_rate": round(stats["dismissed"] / stats["total"], 2),
-                        "complete_rate": round(stats["completed"] / stats["total"], 2),
-                        "snooze_rate": round(stats["snoozed"] / stats["total"], 2),
-                        "sample_size": stats["total"],
-                    }
-            
-            total_actions = len(result.data)
             confidence = min(1.0, total_actions / 50)
             
             return {
                 "dismiss_rates": dismiss_rates,
                 "confidence": round(confidence, 2),
-                "total_actions": total_actions,
+                "total_actions": round(total_actions),
             }
-            
+        
         except Exception as e:
             logger.error(f"Error analyzing dismiss patterns: {e}")
             return {
@@ -306,7 +239,8 @@ class PatternLearner:
     
     async def get_priority_adjustments(
         self, 
-        user_id: str
+        user_id: str,
+        dismiss_data: Optional[Dict[str, Any]] = None
     ) -> Dict[str, float]:
         """
         Get priority adjustment factors based on learned patterns.
@@ -317,7 +251,8 @@ class PatternLearner:
             - < 1.0 = reduce priority (user often dismisses)
             - > 1.0 = increase priority (user often completes)
         """
-        dismiss_data = await self.analyze_dismiss_patterns(user_id)
+        if dismiss_data is None:
+            dismiss_data = await self.analyze_dismiss_patterns(user_id)
         
         adjustments = {}
         
@@ -349,64 +284,40 @@ class PatternLearner:
         """
         Recalculate and store all patterns for a user.
         
-        This should be called periodically (e.g., daily) or after significant activity.
+        Cheap enough to call after any significant activity: one aggregates
+        read and one upsert.
         """
         try:
-            # Gather all pattern data
-            work_hours = await self.analyze_work_hours(user_id)
-            step_timing = await self.analyze_step_timing(user_id, organization_id)
-            dismiss_patterns = await self.analyze_dismiss_patterns(user_id)
-            priority_adjustments = await self.get_priority_adjustments(user_id)
+            # Gather all pattern data from one aggregates read
+            aggregates = await self.load_aggregates(user_id)
+            work_hours = await self.analyze_work_hours(user_id, aggregates)
+            step_timing = await self.analyze_step_timing(user_id, aggregates)
+            dismiss_patterns = await self.analyze_dismiss_patterns(user_id, aggregates)
+            priority_adjustments = await self.get_priority_adjustments(user_id, dismiss_patterns)
             
             # Prepare pattern data for storage
+            now = datetime.now().isoformat()
             patterns_to_store = [
                 {
                     "user_id": user_id,
                     "organization_id": organization_id,
-                    "pattern_type": PatternType.WORK_HOURS.value,
-                    "pattern_data": work_hours,
-                    "confidence": work_hours.get("confidence", 0),
-                },
-                {
-                    "user_id": user_id,
-                    "organization_id": organization_id,
-                    "pattern_type": PatternType.STEP_TIMING.value,
-                    "pattern_data": step_timing,
-                    "confidence": step_timing.get("confidence", 0),
-                },
-                {
-                    "user_id": user_id,
-                    "organization_id": organization_id,
-                    "pattern_type": PatternType.DISMISS_PATTERN.value,
-                    "pattern_data": dismiss_patterns,
-                    "confidence": dismiss_patterns.get("confidence", 0),
-                },
+                    "pattern_type": pattern_type.value,
+                    "pattern_data": pattern_data,
+                    "confidence": pattern_data.get("confidence", 0),
+                    "updated_at": now,
+                }
+                for pattern_type, pattern_data in (
+                    (PatternType.WORK_HOURS, work_hours),
+                    (PatternType.STEP_TIMING, step_timing),
+                    (PatternType.DISMISS_PATTERN, dismiss_patterns),
+                )
             ]
             
             # Upsert patterns (update if exists, insert if not)
-            for pattern in patterns_to_store:
-                # Check if pattern exists
-                existing = self.supabase.table("coach_user_patterns") \
-                    .select("id") \
-                    .eq("user_id", user_id) \
-                    .eq("pattern_type", pattern["pattern_type"]) \
-                    .execute()
-                
-                if existing.data:
-                    # Update existing
-                    self.supabase.table("coach_user_patterns") \
-                        .update({
-                            "pattern_data": pattern["pattern_data"],
-                            "confidence": pattern["confidence"],
-                            "updated_at": datetime.now().isoformat(),
-                        }) \
-                        .eq("id", existing.data[0]["id"]) \
-                        .execute()
-                else:
-                    # Insert new
-                    self.supabase.table("coach_user_patterns") \
-                        .insert(pattern) \
-                        .execute()
+            self.supabase.table("coach_user_patterns") \
+                .upsert(patterns_to_store, on_conflict="user_id,pattern_type") \
+                .execute()
+            invalidate_coach_context(user_id=user_id)
             
             logger.info(f"Updated patterns for user {user_id}")
             
@@ -418,7 +329,7 @@ class PatternLearner:
                 "dismiss_patterns_confidence": dismiss_patterns.get("confidence", 0),
                 "priority_adjustments": priority_adjustments,
             }
-            
+        
         except Exception as e:
             logger.error(f"Error updating user patterns: {e}")
             return {
@@ -427,6 +338,52 @@ class PatternLearner:
             }
 
 
+# =============================================================================
+# AGGREGATE HELPERS
+# =============================================================================
+
+def _weights(row: Optional[Dict[str, Any]], size: int) -> List[float]:
+    """Weights of one aggregate row (zeros if the user has none yet)."""
+    weights = [float(w or 0) for w in (row or {}).get("weights") or []]
+    return (weights + [0.0] * size)[:size]
+
+
+def _step_stats(row: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Timing statistics from a step_hours histogram.
+    
+    The average comes from the decayed sum; the median is interpolated
+    within its bucket, so it is an estimate.
+    """
+    weights = _weights(row, len(STEP_BUCKET_BOUNDS) + 1)
+    total = sum(weights)
+    if round(total) == 0:
+        return {"average_hours": None, "median_hours": None, "sample_size": 0}
+    
+    min_hours = row.get("value_min") or 0.0
+    max_hours = row.get("value_max") or min_hours
+    
+    # Walk the buckets up to half the total weight
+    median = max_hours
+    cumulative = 0.0
+    for index, weight in enumerate(weights):
+        if weight > 0 and cumulative + weight >= total / 2:
+            lower = STEP_BUCKET_BOUNDS[index - 1] if index > 0 else 0
+            upper = STEP_BUCKET_BOUNDS[index] if index < len(STEP_BUCKET_BOUNDS) else max_hours
+            lower, upper = max(lower, min_hours), max(min(upper, max_hours), min_hours)
+            median = lower + (upper - lower) * (total / 2 - cumulative) / weight
+            break
+        cumulative += weight
+    
+    return {
+        "average_hours": round((row.get("value_sum") or 0) / total, 1),
+        "median_hours": round(median, 1),
+        "min_hours": round(min_hours, 1),
+        "max_hours": round(max_hours, 1),
+        "sample_size": round(total),
+    }
+
+
 # =============================================================================
 # HELPER FUNCTIONS
 # =============================================================================
@@ -6,8 +6,10 @@ This service evaluates rules to generate suggestions based on user context.
 """
 
 from typing import List, Dict, Any, Optional
-from datetime import datetime, timedelta, timezone
+from datetime import datetime, timezone
+import asyncio
 import logging
+import os
 
 from app.models.coach import (
     RuleDefinition,
@@ -15,6 +17,7 @@ from app.models.coach import (
     SuggestionBase,
     UserContext,
 )
+from app.utils.cache import TTLCache, MISSING
 
 logger = logging.getLogger(__name__)
 
@@ -293,6 +296,149 @@ class CoachRuleEngine:
 # =============================================================================
 # CONTEXT BUILDER
 # =============================================================================
+# The context is built with a fixed number of bulk queries (all organizations
+# at once via in_ filters, contacts/actions looked up for all briefs and
+# follow-ups in one query each), run concurrently. The result is cached per
+# user for COACH_CONTEXT_CACHE_TTL_SECONDS; writes that change the inputs
+# call invalidate_coach_context() so the worker that made them rebuilds it
+# on the next request (other workers pick changes up within the TTL).
+
+COACH_CONTEXT_CACHE_TTL_SECONDS = int(os.getenv("COACH_CONTEXT_CACHE_TTL_SECONDS", "60"))
+COACH_CONTEXT_CACHE_MAX_ENTRIES = int(os.getenv("COACH_CONTEXT_CACHE_MAX_ENTRIES", "5000"))
+
+# Max ids per in_ filter (keeps request URLs short)
+_IN_CHUNK_SIZE = 200
+# Rows per request; matches PostgREST's max-rows cap, which a chunk of ids
+# can exceed when each id has several rows (contacts, actions)
+_PAGE_SIZE = 1000
+
+# (user_id, organization_ids) -> UserContext (time fields are refreshed on read)
+_context_cache: TTLCache = TTLCache(
+    maxsize=COACH_CONTEXT_CACHE_MAX_ENTRIES,
+    ttl_seconds=COACH_CONTEXT_CACHE_TTL_SECONDS,
+)
+
+
+def invalidate_coach_context(
+    user_id: Optional[str] = None,
+    organization_id: Optional[str] = None
+) -> None:
+    """
+    Drop cached coach contexts for a user and/or every user of an organization.
+    
+    Call after writes to research briefs, contacts, preps, follow-ups,
+    follow-up actions, profiles, autopilot settings or learned patterns.
+    """
+    _context_cache.invalidate_where(
+        lambda key: key[0] == user_id or (organization_id is not None and organization_id in key[1])
+    )
+
+
+def _select_in(supabase, table: str, columns: str, column: str, values: List[str]) -> List[dict]:
+    """Select rows where column is in values (chunked, each chunk page by page)."""
+    rows = []
+    for start in range(0, len(values), _IN_CHUNK_SIZE):
+        chunk = values[start:start + _IN_CHUNK_SIZE]
+        offset = 0
+        while True:
+            result = supabase.table(table) \
+                .select(columns) \
+                .in_(column, chunk) \
+                .order("id") \
+                .range(offset, offset + _PAGE_SIZE - 1) \
+                .execute()
+            data = result.data or []
+            rows.extend(data)
+            if len(data) < _PAGE_SIZE:
+                break
+            offset += _PAGE_SIZE
+    return rows
+
+
+def _fetch_autopilot_enabled(supabase, user_id: str) -> bool:
+    try:
+        # Check if Autopilot is enabled for this user (to avoid duplicate suggestions)
+        result = supabase.table("autopilot_settings") \
+            .select("enabled") \
+            .eq("user_id", user_id) \
+            .execute()
+        return bool(result.data and result.data[0].get("enabled", False))
+    except Exception as e:
+        logger.warning(f"Failed to check autopilot settings: {e}")
+        return False
+
+
+def _fetch_has_sales_profile(supabase, user_id: str) -> bool:
+    # Sales profile is user-based, not org-based
+    result = supabase.table("sales_profiles") \
+        .select("full_name") \
+        .eq("user_id", user_id) \
+        .execute()
+    return bool(result.data and result.data[0].get("full_name"))
+
+
+def _fetch_has_company_profile(supabase, organization_ids: List[str]) -> bool:
+    result = supabase.table("company_profiles") \
+        .select("company_name") \
+        .in_("organization_id", organization_ids) \
+        .execute()
+    return any(row.get("company_name") for row in (result.data or []))
+
+
+def _fetch_completed(supabase, table: str, columns: str, organization_ids: List[str]) -> List[dict]:
+    result = supabase.table(table) \
+        .select(columns) \
+        .in_("organization_id", organization_ids) \
+        .eq("status", "completed") \
+        .execute()
+    return result.data or []
+
+
+def _fetch_followup_companies(supabase, organization_ids: List[str]) -> set:
+    result = supabase.table("followups") \
+        .select("prospect_company_name") \
+        .in_("organization_id", organization_ids) \
+        .execute()
+    return {
+        (row.get("prospect_company_name") or "").lower()
+        for row in (result.data or [])
+    }
+
+
+def _fetch_patterns(supabase, user_id: str) -> Dict[str, Any]:
+    result = supabase.table("coach_user_patterns") \
+        .select("pattern_type, pattern_data") \
+        .eq("user_id", user_id) \
+        .execute()
+    return {
+        pattern.get("pattern_type"): pattern.get("pattern_data", {})
+        for pattern in (result.data or [])
+    }
+
+
+def _inactive_prospects(research_briefs: List[dict], now_utc: datetime) -> List[dict]:
+    """Completed research without activity for 7+ days."""
+    inactive = []
+    for research in research_briefs:
+        completed_at_str = research.get("completed_at")
+        if not completed_at_str:
+            continue
+        # Handle both "Z" suffix and no timezone
+        completed_at = datetime.fromisoformat(completed_at_str.replace("Z", "+00:00"))
+        # Make naive datetimes UTC-aware
+        if completed_at.tzinfo is None:
+            completed_at = completed_at.replace(tzinfo=timezone.utc)
+        days_ago = (now_utc - completed_at).days
+        
+        if days_ago >= 7:
+            inactive.append({
+                "company_name": research.get("company_name"),
+                "research_id": research.get("id"),
+                "days_inactive": days_ago,
+                "last_activity": research.get("completed_at"),
+            })
+    return inactive
+
 
 async def build_user_context(
     supabase,
@@ -307,6 +453,15 @@ async def build_user_context(
     of multiple organizations. All data should be stored under the user's
     primary organization from organization_members table.
     """
+    now_utc = datetime.now(timezone.utc)
+    cache_key = (user_id, tuple(organization_ids))
+    
+    cached = _context_cache.get(cache_key)
+    if cached is not MISSING:
+        return cached.model_copy(update={
+            "current_hour": now_utc.hour,
+            "current_day_of_week": now_utc.weekday(),
+        })
     
     # Use first org as primary for backward compatibility
     primary_org_id = organization_ids[0] if organization_ids else ""
@@ -314,172 +469,74 @@ async def build_user_context(
     context = UserContext(
         user_id=user_id,
         organization_id=primary_org_id,
-        current_hour=datetime.now(timezone.utc).hour,
-        current_day_of_week=datetime.now(timezone.utc).weekday(),
+        current_hour=now_utc.hour,
+        current_day_of_week=now_utc.weekday(),
     )
     
     try:
-        # Check if Autopilot is enabled for this user (to avoid duplicate suggestions)
-        autopilot_settings = supabase.table("autopilot_settings") \
-            .select("enabled") \
-            .eq("user_id", user_id) \
-            .execute()
-        context.autopilot_enabled = bool(
-            autopilot_settings.data and 
-            autopilot_settings.data[0].get("enabled", False)
-        )
-    except Exception as e:
-        logger.warning(f"Failed to check autopilot settings: {e}")
-        context.autopilot_enabled = False
-    
-    try:
-        # Check sales profile (user-based, not org-based)
-        profile_result = supabase.table("sales_profiles") \
-            .select("full_name") \
-            .eq("user_id", user_id) \
-            .execute()
-        context.has_sales_profile = bool(
-            profile_result.data and 
-            profile_result.data[0].get("full_name")
+        (
+            context.autopilot_enabled,
+            context.has_sales_profile,
+            context.has_company_profile,
+            research_briefs,
+            preps,
+            followup_companies,
+            followups,
+            context.patterns,
+        ) = await asyncio.gather(
+            asyncio.to_thread(_fetch_autopilot_enabled, supabase, user_id),
+            asyncio.to_thread(_fetch_has_sales_profile, supabase, user_id),
+            asyncio.to_thread(_fetch_has_company_profile, supabase, organization_ids),
+            asyncio.to_thread(
+                _fetch_completed, supabase, "research_briefs",
+                "id, company_name, prospect_id, status, completed_at", organization_ids
+            ),
+            asyncio.to_thread(
+                _fetch_completed, supabase, "meeting_preps",
+                "id, prospect_company_name, status, completed_at", organization_ids
+            ),
+            asyncio.to_thread(_fetch_followup_companies, supabase, organization_ids),
+            asyncio.to_thread(
+                _fetch_completed, supabase, "followups",
+                "id, prospect_company_name, status, completed_at", organization_ids
+            ),
+            asyncio.to_thread(_fetch_patterns, supabase, user_id),
         )
         
-        # Check company profile - check ALL organizations
-        context.has_company_profile = False
-        for org_id in organization_ids:
-            company_result = supabase.table("company_profiles") \
-                .select("company_name") \
-                .eq("organization_id", org_id) \
-                .execute()
-            if company_result.data and company_result.data[0].get("company_name"):
-                context.has_company_profile = True
-                break
+        context.research_briefs = research_briefs
+        context.preps_completed = preps
+        context.followups_completed = followups
         
-        # Get completed research briefs - check ALL organizations
-        all_research = []
-        for org_id in organization_ids:
-            research_result = supabase.table("research_briefs") \
-                .select("id, company_name, prospect_id, status, completed_at") \
-                .eq("organization_id", org_id) \
-                .eq("status", "completed") \
-                .execute()
-            if research_result.data:
-                all_research.extend(research_result.data)
-        
-        if all_research:
-            context.research_briefs = all_research
-            
-            # For each research, check if it has contacts
-            for research in all_research:
-                prospect_id = research.get("prospect_id")
-                if prospect_id:
-                    contacts_result = supabase.table("prospect_contacts") \
-                        .select("id") \
-                        .eq("prospect_id", prospect_id) \
-                        .execute()
-                    
-                    if not contacts_result.data:
-                        context.research_without_contacts.append(research)
-        
-        # Get completed preps - check ALL organizations
-        all_preps = []
-        all_followups = []
-        for org_id in organization_ids:
-            preps_result = supabase.table("meeting_preps") \
-                .select("id, prospect_company_name, status, completed_at") \
-                .eq("organization_id", org_id) \
-                .eq("status", "completed") \
-                .execute()
-            if preps_result.data:
-                all_preps.extend(preps_result.data)
-            
-            followups_result = supabase.table("followups") \
-                .select("prospect_company_name") \
-                .eq("organization_id", org_id) \
-                .execute()
-            if followups_result.data:
-                all_followups.extend(followups_result.data)
-        
-        if all_preps:
-            context.preps_completed = all_preps
-            
-            followup_companies = {
-                f.get("prospect_company_name", "").lower() 
-                for f in all_followups
-            }
-            
-            for prep in all_preps:
-                company = prep.get("prospect_company_name", "").lower()
-                if company not in followup_companies:
-                    context.preps_without_followup.append(prep)
-        
-        # Get completed follow-ups - check ALL organizations
-        all_completed_followups = []
-        for org_id in organization_ids:
-            followups_result = supabase.table("followups") \
-                .select("id, prospect_company_name, status, completed_at") \
-                .eq("organization_id", org_id) \
-                .eq("status", "completed") \
-                .execute()
-            if followups_result.data:
-                all_completed_followups.extend(followups_result.data)
-        
-        if all_completed_followups:
-            context.followups_completed = all_completed_followups
-            
-            # Check which follow-ups have generated actions
-            for followup in all_completed_followups:
-                actions_result = supabase.table("followup_actions") \
-                    .select("id") \
-                    .eq("followup_id", followup.get("id")) \
-                    .execute()
-                
-                if not actions_result.data:
-                    context.followups_without_actions.append(followup)
-        
-        # Get inactive prospects (no activity in 7+ days) - check ALL organizations
-        now_utc = datetime.now(timezone.utc)
-        week_ago = (now_utc - timedelta(days=7)).isoformat()
-        
-        for org_id in organization_ids:
-            inactive_research = supabase.table("research_briefs") \
-                .select("id, company_name, completed_at") \
-                .eq("organization_id", org_id) \
-                .eq("status", "completed") \
-                .lt("completed_at", week_ago) \
-                .execute()
-            
-            if inactive_research.data:
-                for research in inactive_research.data:
-                    completed_at_str = research.get("completed_at", now_utc.isoformat())
-                    # Handle both "Z" suffix and no timezone
-                    completed_at_str = completed_at_str.replace("Z", "+00:00")
-                    completed_at = datetime.fromisoformat(completed_at_str)
-                    # Make naive datetimes UTC-aware
-                    if completed_at.tzinfo is None:
-                        completed_at = completed_at.replace(tzinfo=timezone.utc)
-                    days_ago = (now_utc - completed_at).days
-                    
-                    if days_ago >= 7:
-                        context.inactive_prospects.append({
-                            "company_name": research.get("company_name"),
-                            "research_id": research.get("id"),
-                            "days_inactive": days_ago,
-                            "last_activity": research.get("completed_at"),
-                        })
-        
-        # Get learned patterns
-        patterns_result = supabase.table("coach_user_patterns") \
-            .select("pattern_type, pattern_data") \
-            .eq("user_id", user_id) \
-            .execute()
+        # Which briefs' prospects have contacts / which follow-ups have actions
+        prospect_ids = list({r["prospect_id"] for r in research_briefs if r.get("prospect_id")})
+        followup_ids = [f["id"] for f in followups]
+        contact_rows, action_rows = await asyncio.gather(
+            asyncio.to_thread(_select_in, supabase, "prospect_contacts", "prospect_id", "prospect_id", prospect_ids),
+            asyncio.to_thread(_select_in, supabase, "followup_actions", "followup_id", "followup_id", followup_ids),
+        )
+        prospects_with_contacts = {row["prospect_id"] for row in contact_rows}
+        followups_with_actions = {row["followup_id"] for row in action_rows}
         
-        if patterns_result.data:
-            for pattern in patterns_result.data:
-                context.patterns[pattern.get("pattern_type")] = pattern.get("pattern_data", {})
+        context.research_without_contacts = [
+            research for research in research_briefs
+            if research.get("prospect_id") and research["prospect_id"] not in prospects_with_contacts
+        ]
+        context.preps_without_followup = [
+            prep for prep in preps
+            if (prep.get("prospect_company_name") or "").lower() not in followup_companies
+        ]
+        context.followups_without_actions = [
+            followup for followup in followups
+            if followup["id"] not in followups_with_actions
+        ]
+        context.inactive_prospects = _inactive_prospects(research_briefs, now_utc)
         
     except Exception as e:
         logger.error(f"Error building user context: {e}")
+        # Partial context: don't cache it
+        return context
     
+    _context_cache.set(cache_key, context)
     return context
 
 
@@ -3,11 +3,10 @@ Company Interview Service - AI-powered company profile onboarding
 
 English-First: Questions in English, frontend handles translations via messages/*.json
 """
-import os
 import json
 import uuid
 from typing import Dict, Any, Optional, List
-from anthropic import AsyncAnthropic  # Use async client to not block event loop
+from app.services.llm_gateway import get_claude
 
 
 class CompanyInterviewService:
@@ -113,7 +112,7 @@ class CompanyInterviewService:
     
     def __init__(self):
         """Initialize Anthropic client."""
-        self.client = AsyncAnthropic(api_key=os.getenv("ANTHROPIC_API_KEY"))
+        self.client = get_claude("company_interview")
         self.model = "claude-sonnet-4-20250514"
     
     def start_interview(self) -> Dict[str, Any]:
@@ -8,7 +8,6 @@ Uses multiple strategies:
 3. Common patterns for LinkedIn URLs
 """
 
-import os
 import re
 import asyncio
 import aiohttp
@@ -17,21 +16,13 @@ from typing import Dict, Any, Optional, List, Tuple
 from urllib.parse import quote_plus
 import logging
 
-logger = logging.getLogger(__name__)
+from app.services.llm_gateway import get_gemini_client, gemini_configured, gemini_generate
 
-# Lazy import for Gemini to avoid initialization issues
-_genai_client = None
+logger = logging.getLogger(__name__)
 
 def get_genai_client():
-    """Get or create Google GenAI client."""
-    global _genai_client
-    if _genai_client is None:
-        from google import genai
-        # Try both possible env var names
-        api_key = os.getenv("GOOGLE_AI_API_KEY") or os.getenv("GOOGLE_API_KEY")
-        if api_key:
-            _genai_client = genai.Client(api_key=api_key)
-    return _genai_client
+    """Shared Google GenAI client from the LLM gateway, or None if no API key."""
+    return get_gemini_client() if gemini_configured() else None
 
 
 class CompanyLookupService:
@@ -360,8 +351,9 @@ Rules:
 - Return valid JSON only, no markdown or explanations"""
 
             # Use Gemini with Google Search grounding
-            # Use client.aio for async to not block the event loop
-            response = await client.aio.models.generate_content(
+            # Async via the LLM gateway (pooled client, concurrency limits)
+            response = await gemini_generate(
+                "company_lookup",
                 model="gemini-2.0-flash",
                 contents=prompt,
                 config=types.GenerateContentConfig(
@@ -457,8 +449,9 @@ Rules:
 - Return empty array [] if no matches found
 - Return valid JSON array only, no markdown or explanations"""
 
-            # Use client.aio for async to not block the event loop
-            response = await client.aio.models.generate_content(
+            # Async via the LLM gateway (pooled client, concurrency limits)
+            response = await gemini_generate(
+                "company_lookup",
                 model="gemini-2.0-flash",
                 contents=prompt,
                 config=types.GenerateContentConfig(
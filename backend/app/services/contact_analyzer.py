@@ -25,7 +25,7 @@ import json
 import logging
 import aiohttp
 from typing import Dict, Any, Optional, List
-from anthropic import AsyncAnthropic
+from app.services.llm_gateway import get_claude
 from supabase import Client
 from app.database import get_supabase_service
 from app.i18n.utils import get_language_instruction, get_country_iso_code
@@ -70,7 +70,7 @@ class ContactAnalyzer:
         if not api_key:
             raise ValueError("ANTHROPIC_API_KEY not set")
         
-        self.client = AsyncAnthropic(api_key=api_key)
+        self.client = get_claude("contact_analysis")
         self.supabase: Client = get_supabase_service()
         self.brave_api_key = os.getenv("BRAVE_API_KEY")
         
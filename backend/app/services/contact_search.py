@@ -545,9 +545,9 @@ class ContactSearchService:
         Used as fallback when Gemini doesn't find enough results.
         """
         try:
-            from anthropic import AsyncAnthropic
+            from app.services.llm_gateway import get_claude
             
-            client = AsyncAnthropic(api_key=self.anthropic_api_key)
+            client = get_claude("contact_search")
             
             prompt = self._build_claude_prompt(name, role, company_name, company_linkedin_url)
             
@@ -18,7 +18,7 @@ import logging
 from decimal import Decimal
 from typing import Optional, Dict, Any, List, Tuple
 from datetime import datetime, timedelta
-from app.database import get_supabase_service
+from app.database import get_supabase_service, get_supabase_async
 
 logger = logging.getLogger(__name__)
 
@@ -136,11 +136,12 @@ class CreditService:
             }
         """
         try:
-            response = self.supabase.table("credit_balances").select("*").eq(
+            db = await get_supabase_async()
+            response = await db.table("credit_balances").select("*").eq(
                 "organization_id", organization_id
             ).maybe_single().execute()
             
-            if not response.data:
+            if not response or not response.data:
                 # Initialize balance for new org
                 await self._initialize_balance(organization_id)
                 return await self.get_balance(organization_id)
@@ -157,10 +158,10 @@ class CreditService:
             # Check if free plan - free users have one-time credits, no period reset
             is_free_plan = False
             try:
-                plan_response = self.supabase.table("organization_subscriptions").select(
+                plan_response = await db.table("organization_subscriptions").select(
                     "plan_id"
                 ).eq("organization_id", organization_id).maybe_single().execute()
-                if plan_response.data:
+                if plan_response and plan_response.data:
                     is_free_plan = plan_response.data.get("plan_id") == "free"
             except Exception:
                 pass  # Default to showing period for safety
@@ -1,11 +1,74 @@
 """
 Embeddings service using Voyage AI.
 Generates vector embeddings for text chunks.
+
+Large inputs are split into provider-sized batches which are embedded
+concurrently (bounded) with retry + backoff on transient errors
+(rate limits, 5xx, timeouts). Results are cached by content
+hash in memory and in the embedding_cache table, so identical chunks and
+repeated queries are only embedded once.
 """
 
 import os
-from typing import List
+import asyncio
+import hashlib
+import logging
+import random
+import time
+from array import array
+from typing import List, Dict
 import voyageai
+import voyageai.error
+
+from app.utils.cache import TTLCache, MISSING
+
+logger = logging.getLogger(__name__)
+
+# Voyage accepts at most 128 texts per request
+EMBED_BATCH_SIZE = int(os.getenv("EMBED_BATCH_SIZE", "128"))
+# Rough per-request token budget (voyage-2 allows 320k); chars/4 estimate
+EMBED_BATCH_MAX_TOKENS = int(os.getenv("EMBED_BATCH_MAX_TOKENS", "120000"))
+EMBED_MAX_CONCURRENCY = int(os.getenv("EMBED_MAX_CONCURRENCY", "4"))
+EMBED_MAX_RETRIES = int(os.getenv("EMBED_MAX_RETRIES", "4"))
+EMBED_RETRY_BASE_DELAY = float(os.getenv("EMBED_RETRY_BASE_DELAY", "1.0"))
+
+# Cache tiers
+EMBEDDING_CACHE_MAX_ENTRIES = int(os.getenv("EMBEDDING_CACHE_MAX_ENTRIES", "5000"))
+EMBEDDING_CACHE_TTL_SECONDS = int(os.getenv("EMBEDDING_CACHE_TTL_SECONDS", str(7 * 24 * 3600)))
+EMBEDDING_CACHE_DB_ENABLED = os.getenv("EMBEDDING_CACHE_DB_ENABLED", "true").lower() == "true"
+EMBEDDING_CACHE_TABLE = "embedding_cache"
+
+# Vectors are stored as float32 arrays (~4KB each instead of ~33KB as lists)
+_memory_cache: TTLCache = TTLCache(
+    maxsize=EMBEDDING_CACHE_MAX_ENTRIES,
+    ttl_seconds=EMBEDDING_CACHE_TTL_SECONDS,
+)
+
+
+# Errors worth retrying; other 4xx (bad input, auth) fail immediately
+_TRANSIENT_ERRORS = (
+    voyageai.error.RateLimitError,
+    voyageai.error.ServerError,
+    voyageai.error.ServiceUnavailableError,
+    voyageai.error.TryAgain,
+    voyageai.error.Timeout,
+    voyageai.error.APIConnectionError,
+    TimeoutError,
+    asyncio.TimeoutError,
+)
+
+
+def _is_transient_error(error: Exception) -> bool:
+    """True for rate limits (429), server errors (5xx) and timeouts."""
+    if isinstance(error, _TRANSIENT_ERRORS):
+        return True
+    status = getattr(error, "http_status", None) or getattr(error, "status_code", None)
+    return isinstance(status, int) and (status == 429 or status >= 500)
+
+
+def content_hash(text: str, model: str, input_type: str) -> str:
+    """Cache key for an embedding: model and input_type change the vector."""
+    return hashlib.sha256(f"{model}|{input_type}|{text}".encode("utf-8")).hexdigest()
 
 
 class EmbeddingsService:
@@ -18,8 +81,46 @@ class EmbeddingsService:
             raise ValueError("VOYAGE_API_KEY environment variable not set")
         
         self.client = voyageai.Client(api_key=api_key)
+        # Older SDKs have no AsyncClient; fall back to a worker thread
+        async_client_cls = getattr(voyageai, "AsyncClient", None)
+        self.async_client = async_client_cls(api_key=api_key) if async_client_cls else None
         self.model = "voyage-2"
     
+    # ==========================================
+    # BATCHING
+    # ==========================================
+    
+    @staticmethod
+    def _make_batches(texts: List[str]) -> List[List[str]]:
+        """Split texts into batches bounded by count and estimated tokens."""
+        batches: List[List[str]] = []
+        current: List[str] = []
+        current_tokens = 0
+        
+        for text in texts:
+            tokens = max(1, len(text) // 4)
+            if current and (
+                len(current) >= EMBED_BATCH_SIZE
+                or current_tokens + tokens > EMBED_BATCH_MAX_TOKENS
+            ):
+                batches.append(current)
+                current, current_tokens = [], 0
+            current.append(text)
+            current_tokens += tokens
+        
+        if current:
+            batches.append(current)
+        return batches
+    
+    @staticmethod
+    def _backoff_delay(attempt: int) -> float:
+        """Exponential backoff with jitter."""
+        return EMBED_RETRY_BASE_DELAY * (2 ** attempt) + random.uniform(0, EMBED_RETRY_BASE_DELAY)
+    
+    # ==========================================
+    # SYNC API
+    # ==========================================
+    
     def generate_embeddings(
         self,
         texts: List[str],
@@ -28,6 +129,8 @@ class EmbeddingsService:
         """
         Generate embeddings for a list of texts.
         
+        Prefer embed_documents() from async code - this blocks the caller.
+        
         Args:
             texts: List of text strings to embed
             input_type: "document" for knowledge base, "query" for search
@@ -38,15 +141,22 @@ class EmbeddingsService:
         if not texts:
             return []
         
-        try:
-            response = self.client.embed(
-                texts=texts,
-                model=self.model,
-                input_type=input_type
-            )
-            return response.embeddings
-        except Exception as e:
-            raise ValueError(f"Failed to generate embeddings: {str(e)}")
+        embeddings: List[List[float]] = []
+        for batch in self._make_batches(texts):
+            for attempt in range(EMBED_MAX_RETRIES + 1):
+                try:
+                    response = self.client.embed(
+                        texts=batch,
+                        model=self.model,
+                        input_type=input_type
+                    )
+                    embeddings.extend(response.embeddings)
+                    break
+                except Exception as e:
+                    if attempt >= EMBED_MAX_RETRIES or not _is_transient_error(e):
+                        raise ValueError(f"Failed to generate embeddings: {str(e)}")
+                    time.sleep(self._backoff_delay(attempt))
+        return embeddings
     
     def generate_embedding(self, text: str, input_type: str = "document") -> List[float]:
         """
@@ -62,9 +172,114 @@ class EmbeddingsService:
         embeddings = self.generate_embeddings([text], input_type)
         return embeddings[0] if embeddings else []
     
+    # ==========================================
+    # ASYNC API
+    # ==========================================
+    
+    async def _embed_batch(self, batch: List[str], input_type: str) -> List[List[float]]:
+        """Embed one provider batch with retry + backoff."""
+        for attempt in range(EMBED_MAX_RETRIES + 1):
+            try:
+                if self.async_client is not None:
+                    response = await self.async_client.embed(
+                        texts=batch,
+                        model=self.model,
+                        input_type=input_type
+                    )
+                else:
+                    response = await asyncio.to_thread(
+                        self.client.embed,
+                        texts=batch,
+                        model=self.model,
+                        input_type=input_type
+                    )
+                return response.embeddings
+            except Exception as e:
+                if attempt >= EMBED_MAX_RETRIES or not _is_transient_error(e):
+                    raise ValueError(f"Failed to generate embeddings: {str(e)}")
+                delay = self._backoff_delay(attempt)
+                logger.warning(
+                    f"Embedding batch of {len(batch)} failed (attempt {attempt + 1}), "
+                    f"retrying in {delay:.1f}s: {e}"
+                )
+                await asyncio.sleep(delay)
+        return []
+    
+    async def embed_documents(
+        self,
+        texts: List[str],
+        input_type: str = "document"
+    ) -> List[List[float]]:
+        """
+        Embed texts without blocking the event loop.
+        
+        Duplicate texts and anything embedded before (memory or DB cache)
+        are served from cache; the rest is embedded in bounded concurrent
+        batches. Output order matches input order.
+        
+        Args:
+            texts: List of text strings to embed
+            input_type: "document" for knowledge base, "query" for search
+            
+        Returns:
+            List of embedding vectors (1024 dimensions each)
+        """
+        if not texts:
+            return []
+        
+        hashes = [content_hash(t, self.model, input_type) for t in texts]
+        resolved: Dict[str, List[float]] = {}
+        
+        # Tier 1: in-process memory
+        for h in set(hashes):
+            cached = _memory_cache.get(h)
+            if cached is not MISSING:
+                resolved[h] = cached.tolist()
+        
+        # Tier 2: database
+        missing = [h for h in dict.fromkeys(hashes) if h not in resolved]
+        if missing and EMBEDDING_CACHE_DB_ENABLED:
+            for h, vector in (await self._load_from_db(missing)).items():
+                resolved[h] = vector
+                _memory_cache.set(h, array("f", vector))
+        
+        # Embed whatever is left (each unique text once)
+        to_embed: Dict[str, str] = {}
+        for h, text in zip(hashes, texts):
+            if h not in resolved and h not in to_embed:
+                to_embed[h] = text
+        
+        if to_embed:
+            pending_hashes = list(to_embed.keys())
+            batches = self._make_batches(list(to_embed.values()))
+            semaphore = asyncio.Semaphore(EMBED_MAX_CONCURRENCY)
+            
+            async def run(batch: List[str]) -> List[List[float]]:
+                async with semaphore:
+                    return await self._embed_batch(batch, input_type)
+            
+            results = await asyncio.gather(*(run(b) for b in batches))
+            vectors = [v for batch_vectors in results for v in batch_vectors]
+            
+            new_entries: Dict[str, List[float]] = {}
+            for h, vector in zip(pending_hashes, vectors):
+                resolved[h] = vector
+                new_entries[h] = vector
+                _memory_cache.set(h, array("f", vector))
+            
+            if EMBEDDING_CACHE_DB_ENABLED:
+                await self._store_in_db(new_entries, input_type)
+            
+            logger.info(
+                f"Embedded {len(to_embed)} texts in {len(batches)} batches "
+                f"({len(texts) - len(to_embed)} served from cache)"
+            )
+        
+        return [resolved[h] for h in hashes]
+    
     async def embed_text(self, text: str, input_type: str = "query") -> List[float]:
         """
-        Async wrapper for embedding a single text (for search queries).
+        Embed a single text (for search queries).
         
         Args:
             text: Text string to embed
@@ -73,6 +288,50 @@ class EmbeddingsService:
         Returns:
             Embedding vector (1024 dimensions)
         """
-        # The underlying API is synchronous, but we provide async interface
-        # for compatibility with async code
-        return self.generate_embedding(text, input_type)
\ No newline at end of file
+        embeddings = await self.embed_documents([text], input_type)
+        return embeddings[0] if embeddings else []
+    
+    # ==========================================
+    # DB CACHE TIER
+    # ==========================================
+    
+    async def _load_from_db(self, hashes: List[str]) -> Dict[str, List[float]]:
+        """Fetch cached embeddings by hash. Cache failures are non-fatal."""
+        found: Dict[str, List[float]] = {}
+        try:
+            from app.database import get_supabase_async
+            db = await get_supabase_async()
+            # Keep the IN-list (and URL) reasonably small
+            for start in range(0, len(hashes), 200):
+                result = await db.table(EMBEDDING_CACHE_TABLE) \
+                    .select("content_hash, embedding") \
+                    .in_("content_hash", hashes[start:start + 200]) \
+                    .execute()
+                for row in (result.data or []):
+                    found[row["content_hash"]] = row["embedding"]
+        except Exception as e:
+            logger.warning(f"Embedding cache lookup failed: {e}")
+        return found
+    
+    async def _store_in_db(self, entries: Dict[str, List[float]], input_type: str) -> None:
+        """Persist new embeddings. Cache failures are non-fatal."""
+        if not entries:
+            return
+        try:
+            from app.database import get_supabase_async
+            db = await get_supabase_async()
+            rows = [
+                {
+                    "content_hash": h,
+                    "model": self.model,
+                    "input_type": input_type,
+                    "embedding": vector,
+                }
+                for h, vector in entries.items()
+            ]
+            for start in range(0, len(rows), 100):
+                await db.table(EMBEDDING_CACHE_TABLE) \
+                    .upsert(rows[start:start + 100], on_conflict="content_hash") \
+                    .execute()
+        except Exception as e:
+            logger.warning(f"Embedding cache write failed: {e}")
@@ -4,7 +4,8 @@ Supports: PDF, DOCX, TXT, MD (Markdown)
 """
 
 import io
-from typing import BinaryIO
+import re
+from typing import BinaryIO, Iterator
 import PyPDF2
 from docx import Document
 import markdown
@@ -43,6 +44,57 @@ class FileProcessor:
         else:
             raise ValueError(f"Unsupported file type: {file_type}")
     
+    @staticmethod
+    def iter_text_blocks(file: BinaryIO, file_type: str) -> Iterator[str]:
+        """
+        Extract text incrementally, one block at a time.
+        
+        PDFs yield one block per page and DOCX one per paragraph, so large
+        documents never need to be held as a single string. Plain text and
+        markdown are yielded in paragraph groups.
+        
+        Args:
+            file: Binary file object
+            file_type: MIME type of the file
+            
+        Yields:
+            Non-empty text blocks in document order
+            
+        Raises:
+            ValueError: If file type is not supported or extraction fails
+        """
+        if file_type == "application/pdf":
+            try:
+                pdf_reader = PyPDF2.PdfReader(file)
+                for page in pdf_reader.pages:
+                    text = page.extract_text()
+                    if text:
+                        yield text
+            except Exception as e:
+                raise ValueError(f"Failed to extract text from PDF: {str(e)}")
+        elif file_type == "application/vnd.openxmlformats-officedocument.wordprocessingml.document":
+            try:
+                doc = Document(file)
+                for paragraph in doc.paragraphs:
+                    if paragraph.text.strip():
+                        yield paragraph.text
+            except Exception as e:
+                raise ValueError(f"Failed to extract text from DOCX: {str(e)}")
+        else:
+            text = FileProcessor.extract_text(file, file_type)
+            # ~64KB groups of paragraphs keep blocks small without splitting them
+            group, size = [], 0
+            for paragraph in re.split(r"\n\s*\n", text):
+                if not paragraph.strip():
+                    continue
+                group.append(paragraph)
+                size += len(paragraph)
+                if size >= 65536:
+                    yield "\n\n".join(group)
+                    group, size = [], 0
+            if group:
+                yield "\n\n".join(group)
+    
     @staticmethod
     def _extract_from_pdf(file: BinaryIO) -> str:
         """Extract text from PDF file."""
@@ -8,24 +8,42 @@ using AI based on transcription and FULL context including:
 - Meeting preparation (talking points, questions, strategy)
 - Previous follow-ups
 - Knowledge base (case studies, product info)
+
+stream_summary() and stream_email_draft() yield tokens (and parsed summary
+sections) while Claude is writing, for the SSE endpoints in the followup
+router. They log usage themselves once the stream has finished.
 """
 
-import os
 import json
 import logging
-from typing import Dict, Any, Optional, List
-from anthropic import AsyncAnthropic  # Use async client to not block event loop
+from typing import Dict, Any, Optional, List, AsyncIterator
 from app.i18n.utils import get_language_instruction
 from app.i18n.config import DEFAULT_LANGUAGE
+from app.services.api_usage_service import get_api_usage_service
+from app.services.llm_gateway import get_claude
+from app.services.llm_streaming import SectionStreamParser, StreamedMessage, stream_claude, token_event
 
 logger = logging.getLogger(__name__)
 
+# Summary headings (new and legacy format) -> fields from _parse_summary_response
+SUMMARY_SECTION_MARKERS = {
+    "meeting_gist": ["Gist"],
+    "executive_summary": ["In One Sentence", "Executive Summary", "Samenvatting"],
+    "key_points": ["What Happened", "Key Discussion", "Belangrijkste"],
+    "decisions": ["Agreements", "Decisions", "Beslissingen"],
+    "next_steps": ["Next Steps", "Vervolgstappen"],
+    "noteworthy_moments": ["Noteworthy"],
+    "at_a_glance": ["At a Glance"],
+    "concerns": ["Client Concerns", "Bezwaren"],
+    "sales_insights": ["Sales Insights"],
+}
+
 
 class FollowupGenerator:
     """Service for generating follow-up content from meeting transcriptions"""
     
     def __init__(self):
-        self.client = AsyncAnthropic(api_key=os.getenv("ANTHROPIC_API_KEY"))
+        self.client = get_claude("followup")
         self.model = "claude-sonnet-4-20250514"
     
     async def generate_summary(
@@ -189,6 +207,131 @@ If there are no action items, return an empty array: []
             logger.error(f"Error generating email: {e}")
             raise
     
+    async def stream_summary(
+        self,
+        transcription: str,
+        prospect_context: Optional[Dict[str, Any]] = None,
+        language: str = DEFAULT_LANGUAGE,
+        prospect_company: Optional[str] = None,
+        organization_id: Optional[str] = None,
+        user_id: Optional[str] = None,
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream a meeting summary as it is generated
+        
+        Yields token events, a section event per "## " section (with the
+        fields parsed so far for that section), and finally a done event
+        with the same dict generate_summary() returns.
+        """
+        prompt = self._build_summary_prompt(
+            transcription,
+            prospect_context=prospect_context,
+            language=language,
+            prospect_company=prospect_company
+        )
+        
+        parser = SectionStreamParser(SUMMARY_SECTION_MARKERS)
+        message = StreamedMessage()
+        written: List[str] = []
+        
+        async for delta in stream_claude(
+            self.client, message,
+            organization_id=organization_id,
+            model=self.model,
+            max_tokens=4000,
+            messages=[{"role": "user", "content": prompt}]
+        ):
+            written.append(delta)
+            yield token_event(delta)
+            for section in parser.feed(delta):
+                yield self._summary_section_event(section, "".join(written))
+        for section in parser.close():
+            yield self._summary_section_event(section, message.text)
+        
+        await self._log_usage(
+            "followup_summary", message, organization_id, user_id,
+            {**(metadata or {}), "prospect_company": prospect_company}
+        )
+        
+        yield {"event": "done", "data": self._parse_summary_response(message.text)}
+    
+    async def stream_email_draft(
+        self,
+        summary: Dict[str, Any],
+        action_items: List[Dict[str, Any]],
+        prospect_context: Optional[Dict[str, Any]] = None,
+        language: str = DEFAULT_LANGUAGE,
+        prospect_company: Optional[str] = None,
+        tone: str = "professional",
+        organization_id: Optional[str] = None,
+        user_id: Optional[str] = None,
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream a follow-up email draft as it is generated
+        
+        Yields token events and a done event with {"email_draft": text}.
+        """
+        prompt = self._build_email_prompt(
+            summary,
+            action_items,
+            prospect_context=prospect_context,
+            language=language,
+            prospect_company=prospect_company,
+            tone=tone
+        )
+        
+        message = StreamedMessage()
+        async for delta in stream_claude(
+            self.client, message,
+            organization_id=organization_id,
+            model=self.model,
+            max_tokens=2000,
+            messages=[{"role": "user", "content": prompt}]
+        ):
+            yield token_event(delta)
+        
+        await self._log_usage(
+            "followup_email", message, organization_id, user_id,
+            {**(metadata or {}), "prospect_company": prospect_company, "tone": tone}
+        )
+        
+        yield {"event": "done", "data": {"email_draft": message.text.strip()}}
+    
+    def _summary_section_event(self, section: Dict[str, Any], text_so_far: str) -> Dict[str, Any]:
+        """Section event carrying the parsed value of that section's field"""
+        key = section["key"]
+        if key:
+            section["value"] = self._parse_summary_response(text_so_far).get(key)
+        return {"event": "section", "data": section}
+    
+    async def _log_usage(
+        self,
+        service: str,
+        message: StreamedMessage,
+        organization_id: Optional[str],
+        user_id: Optional[str],
+        metadata: Dict[str, Any]
+    ) -> None:
+        """Log streamed Claude usage; never fails the generation"""
+        if not organization_id:
+            return
+        try:
+            await get_api_usage_service().log_llm_usage(
+                organization_id=organization_id,
+                provider="anthropic",
+                model=self.model,
+                input_tokens=message.input_tokens,
+                output_tokens=message.output_tokens,
+                user_id=user_id,
+                service=service,
+                credits_consumed=0,  # Credits tracked separately
+                metadata={**metadata, "streamed": True}
+            )
+        except Exception as usage_err:
+            logger.warning(f"Failed to log {service} Claude usage: {usage_err}")
+    
     def _build_summary_prompt(
         self,
         transcription: str,
@@ -585,18 +585,14 @@ class GDPRService:
             return False
             
         try:
-            from app.services.vector_store import VectorStore
+            from app.services.vector_store import get_vector_store
             
-            vector_store = VectorStore()
-            namespace = f"kb-{org_id}"
+            vector_store = get_vector_store()
             
-            # Delete all vectors in the namespace
-            await vector_store.delete_by_filter(
-                namespace=namespace,
-                filter={"organization_id": org_id}
-            )
+            # Delete all vectors for the organization
+            vector_store.delete_by_filter({"organization_id": org_id})
             
-            logger.info(f"Deleted vectors from namespace {namespace}")
+            logger.info(f"Deleted vectors for organization {org_id}")
             return True
             
         except Exception as e:
@@ -18,8 +18,8 @@ import logging
 import asyncio
 from datetime import datetime
 from typing import Dict, Any, Optional
-from google import genai
 from google.genai import types
+from app.services.llm_gateway import gemini_generate
 from app.i18n.utils import get_language_instruction
 from app.i18n.config import DEFAULT_LANGUAGE
 
@@ -82,8 +82,7 @@ class GeminiResearcher:
         if not api_key:
             raise ValueError("GOOGLE_AI_API_KEY environment variable not set")
         
-        # Initialize client with explicit API key
-        self.client = genai.Client(api_key=api_key)
+        # Calls go through the LLM gateway (shared pooled client)
         
         # Configure Google Search tool for grounding
         self.search_tool = types.Tool(
@@ -105,7 +104,8 @@ class GeminiResearcher:
         try:
             logger.info(f"Gemini searching {topic_name} for {company_name}")
             
-            response = await self.client.aio.models.generate_content(
+            response = await gemini_generate(
+                "research_gemini",
                 model='gemini-2.0-flash',
                 contents=prompt,
                 config=self.config
@@ -0,0 +1,214 @@
+"""
+Health Prober - background service health checks with a cached snapshot
+
+Admin health checks used to run on every page load: one live call per
+external service per request. The prober runs the checks on an interval
+instead and keeps:
+
+- the latest result per service (the snapshot served by
+  GET /admin/health/overview)
+- a rolling latency histogram per service (last HEALTH_PROBE_WINDOW checks)
+
+All checks share one pooled httpx.AsyncClient, and each probe round is
+written to admin_service_health_logs with a single bulk insert.
+
+Probes are single-flight: a forced refresh while a round is running waits
+for that round instead of starting another one.
+
+Where rounds run:
+- Scheduled: the admin-health-probe Inngest cron runs one round per
+  interval for the whole deployment (not once per worker).
+- On demand: the admin health page probes when this worker's snapshot is
+  older than twice the interval.
+- start() runs an in-process loop instead; it is opt-in
+  (HEALTH_PROBER_ENABLED) for single-worker deployments without Inngest.
+
+A check is an async callable taking the shared client and returning an
+object with name, status, response_time_ms and error_message attributes.
+"""
+
+import os
+import math
+import asyncio
+import logging
+from collections import deque
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional
+
+import httpx
+
+from app.database import get_supabase_service
+
+logger = logging.getLogger(__name__)
+
+# Seconds between probe rounds (every round sends one request per service);
+# matches the admin-health-probe cron schedule
+HEALTH_PROBE_INTERVAL_SECONDS = float(os.getenv("HEALTH_PROBE_INTERVAL_SECONDS", "600"))
+
+# Checks kept per service for the latency histogram (~10h at the default interval)
+HEALTH_PROBE_WINDOW = int(os.getenv("HEALTH_PROBE_WINDOW", "60"))
+
+# Upper bound for a full round (individual checks have their own timeouts)
+HEALTH_PROBE_ROUND_TIMEOUT_SECONDS = 30.0
+
+# Histogram bucket upper bounds in ms (last bucket is open-ended)
+LATENCY_BUCKETS_MS = (100, 250, 500, 1000, 2500, 5000, 10000)
+
+HealthCheck = Callable[[httpx.AsyncClient], Awaitable[Any]]
+
+
+class LatencyHistogram:
+    """Rolling latency histogram over the last `window` samples."""
+    
+    def __init__(self, window: int = HEALTH_PROBE_WINDOW):
+        self._samples: Deque[int] = deque(maxlen=window)
+    
+    def add(self, latency_ms: Optional[int]) -> None:
+        if latency_ms is not None:
+            self._samples.append(latency_ms)
+    
+    def _percentile(self, ordered: List[int], pct: float) -> int:
+        index = max(0, math.ceil(pct / 100 * len(ordered)) - 1)
+        return ordered[index]
+    
+    def snapshot(self) -> dict:
+        ordered = sorted(self._samples)
+        
+        buckets = {f"le_{bound}": 0 for bound in LATENCY_BUCKETS_MS}
+        buckets["gt_max"] = 0
+        for sample in ordered:
+            for bound in LATENCY_BUCKETS_MS:
+                if sample <= bound:
+                    buckets[f"le_{bound}"] += 1
+                    break
+            else:
+                buckets["gt_max"] += 1
+        
+        return {
+            "samples": len(ordered),
+            "p50_ms": self._percentile(ordered, 50) if ordered else None,
+            "p95_ms": self._percentile(ordered, 95) if ordered else None,
+            "max_ms": ordered[-1] if ordered else None,
+            "buckets": buckets,
+        }
+
+
+class HealthProber:
+    """Runs health checks periodically and caches the results."""
+    
+    def __init__(
+        self,
+        checks: List[HealthCheck],
+        interval_seconds: float = HEALTH_PROBE_INTERVAL_SECONDS
+    ):
+        self._checks = checks
+        self._interval = interval_seconds
+        self._client: Optional[httpx.AsyncClient] = None
+        self._task: Optional[asyncio.Task] = None
+        self._probe: Optional[asyncio.Task] = None
+        
+        self.results: List[Any] = []
+        self.checked_at: Optional[datetime] = None
+        self.histograms: Dict[str, LatencyHistogram] = {}
+    
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                timeout=10.0,
+                limits=httpx.Limits(max_connections=20, max_keepalive_connections=len(self._checks)),
+            )
+        return self._client
+    
+    async def probe(self) -> List[Any]:
+        """Run one round of checks (joins the running round, if any)."""
+        if self._probe is None or self._probe.done():
+            self._probe = asyncio.ensure_future(self._run_round())
+        # Shielded so a cancelled request does not abort the shared round
+        return await asyncio.shield(self._probe)
+    
+    async def _run_round(self) -> List[Any]:
+        client = self._get_client()
+        
+        checks = await asyncio.wait_for(
+            asyncio.gather(*(check(client) for check in self._checks), return_exceptions=True),
+            timeout=HEALTH_PROBE_ROUND_TIMEOUT_SECONDS,
+        )
+        
+        results = []
+        for check in checks:
+            if isinstance(check, Exception):
+                # Handle unexpected errors
+                logger.error(f"Health check error: {check}")
+                continue
+            if check:
+                results.append(check)
+                self.histograms.setdefault(check.name, LatencyHistogram()).add(check.response_time_ms)
+        
+        self.results = results
+        self.checked_at = datetime.utcnow()
+        
+        await asyncio.to_thread(_write_logs, results)
+        return results
+    
+    async def get_results(self, max_age_seconds: Optional[float] = None) -> List[Any]:
+        """
+        Cached results; probes first if there are none yet or they are
+        older than max_age_seconds.
+        """
+        if self.checked_at is None:
+            return await self.probe()
+        if max_age_seconds is not None:
+            age = (datetime.utcnow() - self.checked_at).total_seconds()
+            if age > max_age_seconds:
+                return await self.probe()
+        return self.results
+    
+    def latency(self) -> Dict[str, dict]:
+        """Rolling latency histogram per service."""
+        return {name: histogram.snapshot() for name, histogram in self.histograms.items()}
+    
+    async def _loop(self) -> None:
+        while True:
+            try:
+                await self.probe()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Health probe round failed: {e}")
+            await asyncio.sleep(self._interval)
+    
+    def start(self) -> None:
+        """Start probing in the background (call from the running event loop)."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._loop())
+            logger.info(f"Health prober started ({len(self._checks)} services every {self._interval:.0f}s)")
+    
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+def _write_logs(results: List[Any]) -> None:
+    """Write one probe round to admin_service_health_logs (single insert)."""
+    if not results:
+        return
+    try:
+        get_supabase_service().table("admin_service_health_logs").insert([
+            {
+                "service_name": result.name,
+                "status": result.status,
+                "response_time_ms": result.response_time_ms,
+                "error_message": result.error_message,
+            }
+            for result in results
+        ]).execute()
+    except Exception as e:
+        logger.warning(f"Failed to log health checks: {e}")
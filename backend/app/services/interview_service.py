@@ -3,7 +3,7 @@ Interview Service - AI-powered sales rep onboarding interview
 """
 import os
 from typing import Dict, Any, List, Optional
-from anthropic import AsyncAnthropic  # Use async client to not block event loop
+from app.services.llm_gateway import get_claude
 import json
 
 
@@ -147,7 +147,7 @@ class InterviewService:
         if not api_key:
             raise ValueError("ANTHROPIC_API_KEY environment variable not set")
         
-        self.client = AsyncAnthropic(api_key=api_key)
+        self.client = get_claude("interview")
     
     def start_interview(self) -> Dict[str, Any]:
         """
@@ -0,0 +1,234 @@
+"""
+Streaming knowledge base ingestion.
+
+Processes an uploaded knowledge base file without ever holding the full
+text, chunk list or embedding list in memory:
+
+1. Download the file from storage into a spooled temp file (streamed)
+2. Extract text block by block (PDF page / DOCX paragraph)
+3. Chunk incrementally as blocks arrive
+4. Embed + upsert vectors + bulk insert chunk rows per batch, with a
+   bounded number of batches in flight
+
+Only a compact manifest (counts, timings) is returned, so Inngest steps
+never carry document content in their payloads.
+
+Used by the Inngest knowledge-file-process function and by the
+BackgroundTasks fallback in the knowledge base router.
+"""
+
+import os
+import time
+import asyncio
+import logging
+import tempfile
+from itertools import islice
+from dataclasses import dataclass, asdict
+from typing import List, Dict, Any, Optional, Iterator, BinaryIO
+
+import httpx
+
+from app.database import get_supabase_service, get_supabase_async
+from app.services.file_processor import FileProcessor
+from app.services.text_chunker import TextChunker
+from app.services.embeddings import EmbeddingsService
+from app.services.vector_store import get_vector_store
+
+logger = logging.getLogger(__name__)
+
+KNOWLEDGE_BUCKET = "knowledge-base-files"
+
+# Chunks per embed/upsert/insert batch (matches the Voyage request cap)
+INGEST_BATCH_SIZE = int(os.getenv("INGEST_BATCH_SIZE", "128"))
+# Batches being embedded/stored concurrently (bounds memory and API load)
+INGEST_MAX_INFLIGHT_BATCHES = int(os.getenv("INGEST_MAX_INFLIGHT_BATCHES", "3"))
+# Files up to this size stay in memory while downloading, larger spill to disk
+INGEST_SPOOL_MAX_BYTES = 2 * 1024 * 1024
+
+
+class DocumentExtractionError(ValueError):
+    """The file yields no usable text (unsupported type, unreadable or empty); retrying won't help."""
+
+
+@dataclass
+class IngestionManifest:
+    """Compact result of an ingestion run (safe to pass between steps)."""
+    file_id: str
+    organization_id: str
+    chunk_count: int = 0
+    token_count: int = 0
+    batch_count: int = 0
+    duration_ms: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+class KnowledgeIngestionPipeline:
+    """Stream a knowledge base file into the vector store and database."""
+
+    def __init__(
+        self,
+        batch_size: int = INGEST_BATCH_SIZE,
+        max_inflight_batches: int = INGEST_MAX_INFLIGHT_BATCHES
+    ):
+        self.batch_size = batch_size
+        self.max_inflight_batches = max_inflight_batches
+        self.supabase = get_supabase_service()
+        self.embeddings = EmbeddingsService()
+        self.vector_store = get_vector_store()
+        self.chunker = TextChunker(chunk_size=500, chunk_overlap=50)
+
+    async def ingest(
+        self,
+        file_id: str,
+        file_path: str,
+        file_type: str,
+        organization_id: str,
+        filename: Optional[str] = None
+    ) -> IngestionManifest:
+        """
+        Run the full pipeline for one file.
+
+        Safe to retry: previous chunk rows for the file are removed first and
+        vector ids are deterministic ("{file_id}:{chunk_index}").
+
+        Raises:
+            DocumentExtractionError: If the file type is unsupported or no
+                text could be extracted (embedding, vector store and storage
+                errors propagate unchanged and may be transient)
+        """
+        started = time.perf_counter()
+        manifest = IngestionManifest(file_id=file_id, organization_id=organization_id)
+
+        with tempfile.SpooledTemporaryFile(max_size=INGEST_SPOOL_MAX_BYTES) as fh:
+            await self._download(file_path, fh)
+            fh.seek(0)
+
+            await self._clear_previous_chunks(file_id)
+
+            chunks = self.chunker.chunk_stream(FileProcessor.iter_text_blocks(fh, file_type))
+            semaphore = asyncio.Semaphore(self.max_inflight_batches)
+            tasks: List[asyncio.Task] = []
+
+            try:
+                while True:
+                    # Extraction/tokenization is CPU-bound - keep it off the event loop
+                    batch = await asyncio.to_thread(self._take_extracted, chunks, self.batch_size)
+                    if not batch:
+                        break
+
+                    manifest.batch_count += 1
+                    manifest.chunk_count += len(batch)
+                    manifest.token_count += sum(c["token_count"] for c in batch)
+
+                    # Wait for a free slot before extracting further ahead
+                    await semaphore.acquire()
+                    task = asyncio.create_task(
+                        self._store_batch(batch, file_id, organization_id, filename)
+                    )
+                    task.add_done_callback(lambda _: semaphore.release())
+                    tasks.append(task)
+
+                    # Surface failures early instead of extracting the whole file
+                    for done in [t for t in tasks if t.done()]:
+                        done.result()
+
+                await asyncio.gather(*tasks)
+            except Exception:
+                for task in tasks:
+                    task.cancel()
+                raise
+
+        if manifest.chunk_count == 0:
+            raise DocumentExtractionError("No text could be extracted from file")
+
+        manifest.duration_ms = int((time.perf_counter() - started) * 1000)
+        logger.info(
+            f"Ingested file {file_id}: {manifest.chunk_count} chunks, "
+            f"{manifest.batch_count} batches in {manifest.duration_ms}ms"
+        )
+        return manifest
+
+    # ==========================================
+    # STEPS
+    # ==========================================
+
+    @staticmethod
+    def _take_extracted(chunks: Iterator[Dict[str, Any]], n: int) -> List[Dict[str, Any]]:
+        """Next n chunks; extraction failures (FileProcessor's ValueErrors) become DocumentExtractionError."""
+        try:
+            return list(islice(chunks, n))
+        except ValueError as e:
+            raise DocumentExtractionError(str(e)) from e
+
+    async def _download(self, file_path: str, fh: BinaryIO) -> None:
+        """Stream the file from storage into fh (falls back to a full download)."""
+        try:
+            signed = self.supabase.storage.from_(KNOWLEDGE_BUCKET).create_signed_url(file_path, 300)
+            url = (signed.get("signedURL") or signed.get("signedUrl")) if isinstance(signed, dict) else None
+            if url:
+                async with httpx.AsyncClient(timeout=60.0) as client:
+                    async with client.stream("GET", url) as response:
+                        response.raise_for_status()
+                        async for part in response.aiter_bytes(64 * 1024):
+                            fh.write(part)
+                return
+        except Exception as e:
+            logger.warning(f"Streaming download failed for {file_path}, falling back: {e}")
+            fh.seek(0)
+            fh.truncate()
+
+        data = await asyncio.to_thread(
+            self.supabase.storage.from_(KNOWLEDGE_BUCKET).download, file_path
+        )
+        fh.write(data)
+
+    async def _clear_previous_chunks(self, file_id: str) -> None:
+        """Remove chunk rows from an earlier (failed) attempt."""
+        db = await get_supabase_async()
+        await db.table("knowledge_base_chunks").delete().eq("file_id", file_id).execute()
+
+    async def _store_batch(
+        self,
+        batch: List[Dict[str, Any]],
+        file_id: str,
+        organization_id: str,
+        filename: Optional[str]
+    ) -> None:
+        """Embed one batch, upsert its vectors and insert its chunk rows."""
+        embeddings = await self.embeddings.embed_documents(
+            [chunk["content"] for chunk in batch],
+            input_type="document"
+        )
+
+        vectors = []
+        chunk_records = []
+        for chunk, embedding in zip(batch, embeddings):
+            index = chunk["chunk_index"]
+            vector_id = f"{file_id}:{index}"
+            vectors.append({
+                "id": vector_id,
+                "values": embedding,
+                "metadata": {
+                    "file_id": file_id,
+                    "chunk_index": index,
+                    "organization_id": organization_id,
+                    "filename": filename or "",
+                    "text": chunk["content"],
+                    "content_preview": chunk["content"][:200]
+                }
+            })
+            chunk_records.append({
+                "file_id": file_id,
+                "organization_id": organization_id,
+                "chunk_index": index,
+                "content": chunk["content"],
+                "token_count": chunk["token_count"],
+                "embedding_id": vector_id
+            })
+
+        await asyncio.to_thread(self.vector_store.upsert_vectors, vectors)
+
+        db = await get_supabase_async()
+        await db.table("knowledge_base_chunks").insert(chunk_records).execute()
@@ -0,0 +1,393 @@
+"""
+LLM Gateway
+
+Process-wide access point for LLM providers (Anthropic Claude, Google Gemini).
+
+- One pooled keep-alive HTTP client per provider. Async clients are bound to
+  the event loop they were created on, so there is one per running loop
+  (the server loop, plus any asyncio.run() loops in background threads)
+  instead of one per service instance or per call.
+- Global (per provider) and per-organization concurrency limits, shared
+  across threads and event loops.
+- Anthropic prompt caching: system prompts get a cache_control breakpoint so
+  large static prefixes (instructions, seller context) are cached between
+  calls; cached_block() marks a static prefix inside a user message.
+- Uniform metrics per provider/service/model: calls, errors, latency
+  percentiles and token counts including cache reads/writes.
+
+Usage:
+    claude = get_claude("preparation")
+    response = await claude.messages.create(
+        model=..., max_tokens=..., messages=[...],
+        organization_id=org_id,          # optional, enables the per-org limit
+    )
+    async with claude.messages.stream(...) as stream:
+        ...
+
+    response = await gemini_generate("research_gemini", model=..., contents=..., config=...)
+"""
+
+import os
+import time
+import asyncio
+import logging
+import threading
+import weakref
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+import httpx
+from anthropic import AsyncAnthropic, DefaultAsyncHttpxClient
+
+from app.utils.rate_limit import ConcurrencyLimiter
+
+logger = logging.getLogger(__name__)
+
+
+# =============================================================================
+# Configuration
+# =============================================================================
+
+LLM_MAX_CONNECTIONS = int(os.getenv("LLM_MAX_CONNECTIONS", "100"))
+LLM_MAX_KEEPALIVE = int(os.getenv("LLM_MAX_KEEPALIVE", "20"))
+LLM_KEEPALIVE_SECONDS = float(os.getenv("LLM_KEEPALIVE_SECONDS", "120"))
+LLM_TIMEOUT_SECONDS = float(os.getenv("LLM_TIMEOUT_SECONDS", "600"))
+
+# Max in-flight calls per provider (whole process) and per organization
+LLM_GLOBAL_CONCURRENCY = int(os.getenv("LLM_GLOBAL_CONCURRENCY", "48"))
+LLM_ORG_CONCURRENCY = int(os.getenv("LLM_ORG_CONCURRENCY", "6"))
+
+PROVIDERS = ("anthropic", "gemini")
+
+# Latency samples kept per metrics key for percentiles
+_LATENCY_WINDOW = 500
+
+CACHE_CONTROL = {"type": "ephemeral"}
+
+
+# =============================================================================
+# Pooled clients (one per provider per event loop)
+# =============================================================================
+
+_clients_lock = threading.Lock()
+_clients: Dict[str, "weakref.WeakKeyDictionary"] = {p: weakref.WeakKeyDictionary() for p in PROVIDERS}
+_loopless_clients: Dict[str, Any] = {}
+
+
+def _current_loop() -> Optional[asyncio.AbstractEventLoop]:
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+
+def _client_for(provider: str, factory):
+    loop = _current_loop()
+    with _clients_lock:
+        pool = _clients[provider] if loop is not None else _loopless_clients
+        key = loop if loop is not None else provider
+        client = pool.get(key)
+        if client is None:
+            client = factory()
+            pool[key] = client
+        return client
+
+
+def _new_anthropic() -> AsyncAnthropic:
+    http_client = DefaultAsyncHttpxClient(
+        limits=httpx.Limits(
+            max_connections=LLM_MAX_CONNECTIONS,
+            max_keepalive_connections=LLM_MAX_KEEPALIVE,
+            keepalive_expiry=LLM_KEEPALIVE_SECONDS,
+        ),
+        timeout=httpx.Timeout(LLM_TIMEOUT_SECONDS, connect=10.0),
+    )
+    return AsyncAnthropic(api_key=os.getenv("ANTHROPIC_API_KEY"), http_client=http_client)
+
+
+def _gemini_api_key() -> Optional[str]:
+    return os.getenv("GOOGLE_AI_API_KEY") or os.getenv("GOOGLE_API_KEY") or os.getenv("GEMINI_API_KEY")
+
+
+def _new_gemini():
+    # google-genai keeps its own (sync + async) connection pools per Client
+    from google import genai
+
+    return genai.Client(api_key=_gemini_api_key())
+
+
+def get_anthropic_client() -> AsyncAnthropic:
+    """Pooled AsyncAnthropic for the current event loop (no limits/metrics)."""
+    return _client_for("anthropic", _new_anthropic)
+
+
+def get_gemini_client():
+    """Pooled google-genai Client for the current event loop (no limits/metrics)."""
+    return _client_for("gemini", _new_gemini)
+
+
+# =============================================================================
+# Concurrency limits
+# =============================================================================
+
+_global_limits: Dict[str, ConcurrencyLimiter] = {p: ConcurrencyLimiter(LLM_GLOBAL_CONCURRENCY) for p in PROVIDERS}
+_org_limits: Dict[str, ConcurrencyLimiter] = {}
+_org_limits_lock = threading.Lock()
+
+
+def _org_limit(organization_id: str) -> ConcurrencyLimiter:
+    with _org_limits_lock:
+        limiter = _org_limits.get(organization_id)
+        if limiter is None:
+            limiter = _org_limits[organization_id] = ConcurrencyLimiter(LLM_ORG_CONCURRENCY)
+        return limiter
+
+
+@asynccontextmanager
+async def llm_slot(provider: str, organization_id: Optional[str] = None) -> AsyncIterator[float]:
+    """
+    Hold one global (and, with organization_id, one per-org) call slot.
+
+    The org slot is taken first so a busy organization queues on its own
+    limit without holding global slots. Yields seconds spent waiting.
+    """
+    started = time.perf_counter()
+    org_limit = _org_limit(organization_id) if organization_id else None
+    if org_limit:
+        await org_limit.acquire()
+    try:
+        async with _global_limits[provider]:
+            yield time.perf_counter() - started
+    finally:
+        if org_limit:
+            org_limit.release()
+
+
+# =============================================================================
+# Metrics
+# =============================================================================
+
+class LLMMetrics:
+    """Thread-safe counters and latency windows keyed by (provider, service, model)."""
+
+    _FIELDS = ("calls", "errors", "input_tokens", "output_tokens", "cache_read_tokens", "cache_write_tokens")
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: Dict[Tuple[str, str, str], Dict[str, int]] = {}
+        self._latency: Dict[Tuple[str, str, str], deque] = {}
+        self._queue_ms: Dict[Tuple[str, str, str], float] = {}
+
+    def record(
+        self,
+        provider: str,
+        service: str,
+        model: str,
+        duration_ms: float,
+        queued_ms: float = 0.0,
+        usage: Optional[Dict[str, int]] = None,
+        error: bool = False
+    ) -> None:
+        key = (provider, service or "unknown", model or "unknown")
+        with self._lock:
+            counters = self._counters.setdefault(key, dict.fromkeys(self._FIELDS, 0))
+            counters["calls"] += 1
+            counters["errors"] += int(error)
+            for field, value in (usage or {}).items():
+                counters[field] += value or 0
+            self._latency.setdefault(key, deque(maxlen=_LATENCY_WINDOW)).append(duration_ms)
+            self._queue_ms[key] = self._queue_ms.get(key, 0.0) + queued_ms
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        """One row per (provider, service, model) with latency percentiles."""
+        with self._lock:
+            rows = []
+            for key, counters in self._counters.items():
+                samples = sorted(self._latency.get(key, ()))
+                rows.append({
+                    "provider": key[0],
+                    "service": key[1],
+                    "model": key[2],
+                    **counters,
+                    "p50_ms": round(_percentile(samples, 0.50), 1),
+                    "p95_ms": round(_percentile(samples, 0.95), 1),
+                    "avg_queue_ms": round(self._queue_ms.get(key, 0.0) / counters["calls"], 1),
+                })
+            return sorted(rows, key=lambda r: (r["provider"], r["service"], r["model"]))
+
+
+def _percentile(samples: List[float], q: float) -> float:
+    if not samples:
+        return 0.0
+    return samples[min(len(samples) - 1, int(q * len(samples)))]
+
+
+metrics = LLMMetrics()
+
+
+def get_llm_metrics() -> Dict[str, Any]:
+    """Metrics plus current limiter usage, for the admin health endpoint."""
+    with _org_limits_lock:
+        busy_orgs = sum(1 for limiter in _org_limits.values() if limiter.stats()["in_use"])
+    return {
+        "services": metrics.snapshot(),
+        "limits": {provider: limiter.stats() for provider, limiter in _global_limits.items()},
+        "org_limit": LLM_ORG_CONCURRENCY,
+        "busy_organizations": busy_orgs,
+    }
+
+
+def _anthropic_usage(usage) -> Dict[str, int]:
+    if usage is None:
+        return {}
+    return {
+        "input_tokens": getattr(usage, "input_tokens", 0) or 0,
+        "output_tokens": getattr(usage, "output_tokens", 0) or 0,
+        "cache_read_tokens": getattr(usage, "cache_read_input_tokens", 0) or 0,
+        "cache_write_tokens": getattr(usage, "cache_creation_input_tokens", 0) or 0,
+    }
+
+
+def _gemini_usage(response) -> Dict[str, int]:
+    usage = getattr(response, "usage_metadata", None)
+    if usage is None:
+        return {}
+    return {
+        "input_tokens": getattr(usage, "prompt_token_count", 0) or 0,
+        "output_tokens": getattr(usage, "candidates_token_count", 0) or 0,
+        "cache_read_tokens": getattr(usage, "cached_content_token_count", 0) or 0,
+    }
+
+
+# =============================================================================
+# Prompt caching
+# =============================================================================
+
+def cached_block(text: str) -> Dict[str, Any]:
+    """Text content block with a cache breakpoint (for static prompt prefixes)."""
+    return {"type": "text", "text": text, "cache_control": CACHE_CONTROL}
+
+
+def _has_cache_marker(blocks: Any) -> bool:
+    return isinstance(blocks, list) and any(isinstance(b, dict) and b.get("cache_control") for b in blocks)
+
+
+def apply_prompt_cache(request: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Put a cache breakpoint at the end of the system prompt.
+
+    Requests that already carry a marker (system or messages) are left alone.
+    """
+    system = request.get("system")
+    if not system:
+        return request
+    if _has_cache_marker(system) or any(_has_cache_marker(m.get("content")) for m in request.get("messages", [])):
+        return request
+
+    if isinstance(system, str):
+        blocks = [cached_block(system)]
+    else:
+        blocks = [dict(b) for b in system]
+        blocks[-1]["cache_control"] = CACHE_CONTROL
+    return {**request, "system": blocks}
+
+
+# =============================================================================
+# Claude
+# =============================================================================
+
+class _ClaudeMessages:
+    def __init__(self, service: str):
+        self._service = service
+
+    async def create(self, *, organization_id: Optional[str] = None, **request):
+        """messages.create() with pooling, limits, prompt caching and metrics."""
+        request = apply_prompt_cache(request)
+        async with llm_slot("anthropic", organization_id) as waited:
+            started = time.perf_counter()
+            response = None
+            try:
+                response = await get_anthropic_client().messages.create(**request)
+                return response
+            finally:
+                metrics.record(
+                    "anthropic", self._service, request.get("model"),
+                    duration_ms=(time.perf_counter() - started) * 1000,
+                    queued_ms=waited * 1000,
+                    usage=_anthropic_usage(getattr(response, "usage", None)),
+                    error=response is None,
+                )
+
+    @asynccontextmanager
+    async def stream(self, *, organization_id: Optional[str] = None, **request):
+        """messages.stream() with the same treatment; the slot is held until the stream closes."""
+        request = apply_prompt_cache(request)
+        async with llm_slot("anthropic", organization_id) as waited:
+            started = time.perf_counter()
+            usage = None
+            error = True
+            try:
+                async with get_anthropic_client().messages.stream(**request) as stream:
+                    yield stream
+                    try:
+                        usage = stream.current_message_snapshot.usage
+                    except Exception:
+                        usage = None
+                error = False
+            finally:
+                metrics.record(
+                    "anthropic", self._service, request.get("model"),
+                    duration_ms=(time.perf_counter() - started) * 1000,
+                    queued_ms=waited * 1000,
+                    usage=_anthropic_usage(usage),
+                    error=error,
+                )
+
+
+class ClaudeClient:
+    """
+    AsyncAnthropic-compatible facade bound to a service name.
+
+    Cheap to construct; services keep one as self.client. The underlying
+    pooled client is resolved per call, so instances created at import time
+    work on whatever event loop later uses them.
+    """
+
+    def __init__(self, service: str):
+        self.service = service
+        self.messages = _ClaudeMessages(service)
+
+
+def get_claude(service: str) -> ClaudeClient:
+    return ClaudeClient(service)
+
+
+def anthropic_configured() -> bool:
+    return bool(os.getenv("ANTHROPIC_API_KEY"))
+
+
+def gemini_configured() -> bool:
+    return bool(_gemini_api_key())
+
+
+# =============================================================================
+# Gemini
+# =============================================================================
+
+async def gemini_generate(service: str, organization_id: Optional[str] = None, **request):
+    """client.aio.models.generate_content() with pooling, limits and metrics."""
+    async with llm_slot("gemini", organization_id) as waited:
+        started = time.perf_counter()
+        response = None
+        try:
+            response = await get_gemini_client().aio.models.generate_content(**request)
+            return response
+        finally:
+            metrics.record(
+                "gemini", service, request.get("model"),
+                duration_ms=(time.perf_counter() - started) * 1000,
+                queued_ms=waited * 1000,
+                usage=_gemini_usage(response) if response is not None else None,
+                error=response is None,
+            )
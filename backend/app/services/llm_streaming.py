@@ -0,0 +1,135 @@
+"""
+LLM Streaming Helpers
+
+Shared pieces for generators that stream Claude output to the client:
+
+- stream_claude(): yields text deltas from messages.stream() and fills a
+  StreamedMessage with the full text and token usage when the stream ends
+- SectionStreamParser: incremental markdown section splitter that emits a
+  section as soon as the next heading of the same (or higher) level starts
+
+Events produced by the generators are plain dicts that app.utils.sse turns
+into SSE frames:
+
+    {"event": "token",   "data": {"text": "..."}}
+    {"event": "section", "data": {"key": "questions", "title": "...", "content": "...", ...}}
+    {"event": "done",    "data": {...final structured result...}}
+"""
+
+import re
+import logging
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+_HEADING_RE = re.compile(r"^(#{1,6})\s+(.*?)\s*#*\s*$")
+
+
+@dataclass
+class StreamedMessage:
+    """Filled in by stream_claude() once the stream has finished."""
+    text: str = ""
+    input_tokens: int = 0
+    output_tokens: int = 0
+    stop_reason: Optional[str] = None
+
+
+async def stream_claude(client, result: StreamedMessage, **request) -> AsyncIterator[str]:
+    """
+    Stream a Claude message, yielding text deltas as they arrive.
+
+    Args:
+        client: AsyncAnthropic client
+        result: Receives the full text and usage after the last delta
+        **request: Arguments for messages.stream() (model, max_tokens, messages, ...)
+    """
+    async with client.messages.stream(**request) as stream:
+        async for text in stream.text_stream:
+            yield text
+        final = await stream.get_final_message()
+
+    result.text = "".join(block.text for block in final.content if getattr(block, "type", None) == "text")
+    result.input_tokens = final.usage.input_tokens
+    result.output_tokens = final.usage.output_tokens
+    result.stop_reason = final.stop_reason
+
+
+def token_event(text: str) -> Dict[str, Any]:
+    return {"event": "token", "data": {"text": text}}
+
+
+class SectionStreamParser:
+    """
+    Split streamed markdown into sections incrementally.
+
+    A section starts at a heading of `level` or higher (e.g. "## ...") and
+    ends where the next such heading starts; deeper headings stay inside the
+    section. Sections whose title contains one of the configured markers
+    (case-insensitive) get that key, others get key None.
+
+    Usage:
+        parser = SectionStreamParser({"questions": ["Questions"]})
+        for delta in deltas:
+            for section in parser.feed(delta):
+                ...
+        for section in parser.close():
+            ...
+    """
+
+    def __init__(self, markers: Dict[str, Sequence[str]], level: int = 2):
+        self.markers = {key: [m.lower() for m in values] for key, values in markers.items()}
+        self.level = level
+        self._partial = ""
+        self._title: Optional[str] = None
+        self._lines: List[str] = []
+
+    def _key_for(self, title: str) -> Optional[str]:
+        lowered = title.lower()
+        for key, markers in self.markers.items():
+            if any(m in lowered for m in markers):
+                return key
+        return None
+
+    def _flush(self) -> Optional[Dict[str, Any]]:
+        content = "\n".join(self._lines).strip()
+        title = self._title
+        self._lines = []
+        if title is None and not content:
+            return None
+        return {"key": self._key_for(title) if title else None, "title": title or "", "content": content}
+
+    def _line(self, line: str) -> Optional[Dict[str, Any]]:
+        match = _HEADING_RE.match(line.strip())
+        if match and len(match.group(1)) <= self.level:
+            section = self._flush()
+            self._title = match.group(2)
+            self._lines = [line]
+            return section
+        self._lines.append(line)
+        return None
+
+    def feed(self, delta: str) -> List[Dict[str, Any]]:
+        """Add streamed text; return sections completed by it."""
+        self._partial += delta
+        *lines, self._partial = self._partial.split("\n")
+        completed = []
+        for line in lines:
+            section = self._line(line)
+            if section:
+                completed.append(section)
+        return completed
+
+    def close(self) -> List[Dict[str, Any]]:
+        """Flush the trailing partial line and the last open section."""
+        completed = []
+        if self._partial:
+            section = self._line(self._partial)
+            self._partial = ""
+            if section:
+                completed.append(section)
+        section = self._flush()
+        if section:
+            completed.append(section)
+        self._title = None
+        return completed
@@ -0,0 +1,622 @@
+"""
+Local vector store backend.
+
+Per-organization NumPy index persisted in memory-mapped files, so knowledge
+base retrieval needs no network round-trip and tests can run offline.
+
+On-disk layout per organization:
+
+    {VECTOR_STORE_LOCAL_DIR}/{organization_id}/
+        vectors.npy   float32 [capacity, dim], rows L2-normalised (memory-mapped)
+        meta.jsonl    append-only log of row puts/deletes (id + metadata)
+
+Search:
+- exact cosine top-k (one matrix-vector product) for small organizations
+- organizations above LOCAL_VECTOR_IVF_THRESHOLD vectors also get an IVF
+  (inverted file) index: spherical k-means centroids with per-centroid
+  posting lists; a query probes the LOCAL_VECTOR_IVF_NPROBE closest lists.
+  The IVF lives in memory and is rebuilt lazily after enough writes.
+
+Metadata filters follow Pinecone's filter language ($eq, $ne, $in, $nin,
+$gt, $gte, $lt, $lte, $exists, $and, $or) so both backends behave the same.
+"""
+
+import os
+import re
+import json
+import shutil
+import logging
+import threading
+from dataclasses import dataclass, field
+from typing import List, Dict, Optional, Any, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+VECTOR_STORE_LOCAL_DIR = os.getenv("VECTOR_STORE_LOCAL_DIR", "./data/vector_index")
+
+# Use an IVF index above this many live vectors per organization
+LOCAL_VECTOR_IVF_THRESHOLD = int(os.getenv("LOCAL_VECTOR_IVF_THRESHOLD", "20000"))
+# Number of posting lists probed per query
+LOCAL_VECTOR_IVF_NPROBE = int(os.getenv("LOCAL_VECTOR_IVF_NPROBE", "8"))
+# Rebuild the IVF once this fraction of rows changed since the last build
+LOCAL_VECTOR_IVF_REBUILD_RATIO = float(os.getenv("LOCAL_VECTOR_IVF_REBUILD_RATIO", "0.1"))
+
+# Compact files once this fraction of rows are deleted
+_COMPACT_RATIO = 0.3
+_MIN_CAPACITY = 64
+
+# Vectors without an organization_id are kept in a shared partition
+_SHARED_PARTITION = "_shared"
+
+
+@dataclass
+class VectorMatch:
+    """Query result (same attributes as Pinecone's ScoredVector)."""
+    id: str
+    score: float
+    metadata: Dict[str, Any] = field(default_factory=dict)
+    values: Optional[List[float]] = None
+
+
+# =============================================================================
+# Metadata filters (Pinecone semantics)
+# =============================================================================
+
+def matches_filter(metadata: Dict[str, Any], filter: Optional[Dict]) -> bool:
+    """Evaluate a Pinecone-style metadata filter against one metadata dict."""
+    if not filter:
+        return True
+
+    for key, condition in filter.items():
+        if key == "$and":
+            if not all(matches_filter(metadata, sub) for sub in condition):
+                return False
+            continue
+        if key == "$or":
+            if not any(matches_filter(metadata, sub) for sub in condition):
+                return False
+            continue
+
+        value = metadata.get(key)
+        if not isinstance(condition, dict):
+            condition = {"$eq": condition}
+
+        for op, operand in condition.items():
+            if op == "$eq":
+                ok = value == operand or (isinstance(value, list) and operand in value)
+            elif op == "$ne":
+                ok = value != operand
+            elif op == "$in":
+                ok = value in operand or (isinstance(value, list) and any(v in operand for v in value))
+            elif op == "$nin":
+                ok = value not in operand
+            elif op == "$exists":
+                ok = (key in metadata) == bool(operand)
+            elif op in ("$gt", "$gte", "$lt", "$lte"):
+                if value is None:
+                    ok = False
+                elif op == "$gt":
+                    ok = value > operand
+                elif op == "$gte":
+                    ok = value >= operand
+                elif op == "$lt":
+                    ok = value < operand
+                else:
+                    ok = value <= operand
+            else:
+                raise ValueError(f"Unsupported filter operator: {op}")
+            if not ok:
+                return False
+
+    return True
+
+
+def _organization_from_filter(filter: Optional[Dict]) -> Optional[str]:
+    """Extract an organization_id equality from a filter (to pick one partition)."""
+    if not filter:
+        return None
+
+    condition = filter.get("organization_id")
+    if isinstance(condition, str):
+        return condition
+    if isinstance(condition, dict) and isinstance(condition.get("$eq"), str):
+        return condition["$eq"]
+
+    for sub in filter.get("$and", []):
+        org_id = _organization_from_filter(sub)
+        if org_id:
+            return org_id
+    return None
+
+
+def _residual_filter(filter: Optional[Dict]) -> Optional[Dict]:
+    """Filter without the top-level organization_id clause (handled by partitioning)."""
+    if not filter:
+        return None
+    rest = {k: v for k, v in filter.items() if k != "organization_id"}
+    return rest or None
+
+
+# =============================================================================
+# IVF index
+# =============================================================================
+
+class _IVFIndex:
+    """Inverted-file index over a fixed snapshot of rows."""
+
+    def __init__(self, vectors: np.ndarray, rows: np.ndarray, seed: int = 0):
+        n = len(rows)
+        self.nlist = int(min(4096, max(16, np.sqrt(n))))
+        self.built_upto = int(rows.max()) + 1 if n else 0
+
+        rng = np.random.default_rng(seed)
+        sample_size = min(n, self.nlist * 50)
+        sample = vectors[np.sort(rng.choice(rows, size=sample_size, replace=False))]
+        centroids = sample[rng.choice(sample_size, size=self.nlist, replace=False)].copy()
+
+        # Spherical k-means on the sample
+        for _ in range(10):
+            assign = np.argmax(sample @ centroids.T, axis=1)
+            for c in range(self.nlist):
+                members = sample[assign == c]
+                if len(members):
+                    centroid = members.sum(axis=0)
+                    norm = np.linalg.norm(centroid)
+                    if norm > 0:
+                        centroids[c] = centroid / norm
+        self.centroids = centroids.astype(np.float32)
+
+        # Assign every row (in blocks to bound memory)
+        assignment = np.empty(n, dtype=np.int32)
+        for start in range(0, n, 8192):
+            block = vectors[rows[start:start + 8192]]
+            assignment[start:start + 8192] = np.argmax(block @ self.centroids.T, axis=1)
+
+        # CSR posting lists
+        order = np.argsort(assignment, kind="stable")
+        self.rows = rows[order]
+        counts = np.bincount(assignment, minlength=self.nlist)
+        self.offsets = np.concatenate([[0], np.cumsum(counts)])
+
+    def candidates(self, query: np.ndarray, nprobe: int) -> np.ndarray:
+        """Rows in the nprobe posting lists closest to the query."""
+        nprobe = min(nprobe, self.nlist)
+        centroid_scores = self.centroids @ query
+        probe = np.argpartition(-centroid_scores, nprobe - 1)[:nprobe]
+        return np.concatenate([
+            self.rows[self.offsets[c]:self.offsets[c + 1]] for c in probe
+        ])
+
+
+# =============================================================================
+# Per-organization index
+# =============================================================================
+
+class _OrganizationIndex:
+    """Vectors + metadata for one organization."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.lock = threading.RLock()
+        self.dim: Optional[int] = None
+        self.count = 0  # rows in use (including deleted)
+        self.ids: List[Optional[str]] = []
+        self.metadata: List[Optional[Dict[str, Any]]] = []
+        self.alive = np.zeros(0, dtype=bool)
+        self.id_to_row: Dict[str, int] = {}
+        self.vectors: Optional[np.ndarray] = None
+        self.ivf: Optional[_IVFIndex] = None
+        self.writes_since_ivf = 0
+        self._load()
+
+    @property
+    def vectors_path(self) -> str:
+        return os.path.join(self.path, "vectors.npy")
+
+    @property
+    def log_path(self) -> str:
+        return os.path.join(self.path, "meta.jsonl")
+
+    @property
+    def live_count(self) -> int:
+        return int(self.alive[:self.count].sum())
+
+    # ---- persistence ----
+
+    def _load(self) -> None:
+        if not os.path.exists(self.vectors_path):
+            return
+
+        self.vectors = np.load(self.vectors_path, mmap_mode="r+")
+        self.dim = self.vectors.shape[1]
+        self.alive = np.zeros(self.vectors.shape[0], dtype=bool)
+
+        if os.path.exists(self.log_path):
+            with open(self.log_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    entry = json.loads(line)
+                    row = entry["row"]
+                    if entry["op"] == "put":
+                        self._grow_lists(row + 1)
+                        old_id = self.ids[row]
+                        if old_id is not None and self.id_to_row.get(old_id) == row:
+                            del self.id_to_row[old_id]
+                        self.ids[row] = entry["id"]
+                        self.metadata[row] = entry.get("metadata") or {}
+                        self.alive[row] = True
+                        self.id_to_row[entry["id"]] = row
+                    elif entry["op"] == "del" and row < self.count:
+                        if self.ids[row] is not None and self.id_to_row.get(self.ids[row]) == row:
+                            del self.id_to_row[self.ids[row]]
+                        self.alive[row] = False
+
+    def _grow_lists(self, size: int) -> None:
+        if size > self.count:
+            self.ids.extend([None] * (size - self.count))
+            self.metadata.extend([None] * (size - self.count))
+            self.count = size
+
+    def _append_log(self, entries: List[Dict[str, Any]]) -> None:
+        with open(self.log_path, "a", encoding="utf-8") as f:
+            for entry in entries:
+                f.write(json.dumps(entry, separators=(",", ":")) + "\n")
+
+    def _ensure_capacity(self, rows_needed: int, dim: int) -> None:
+        """Create or grow the memory-mapped vectors file (capacity doubling)."""
+        os.makedirs(self.path, exist_ok=True)
+
+        if self.vectors is None:
+            self.dim = dim
+            capacity = max(_MIN_CAPACITY, rows_needed)
+            self.vectors = np.lib.format.open_memmap(
+                self.vectors_path, mode="w+", dtype=np.float32, shape=(capacity, dim)
+            )
+            self.alive = np.zeros(capacity, dtype=bool)
+            return
+
+        if dim != self.dim:
+            raise ValueError(f"Vector dimension {dim} does not match index dimension {self.dim}")
+
+        capacity = self.vectors.shape[0]
+        if rows_needed <= capacity:
+            return
+
+        new_capacity = max(rows_needed, capacity * 2)
+        self._rewrite(np.arange(self.count), new_capacity, keep_rows=True)
+
+    def _rewrite(self, rows: np.ndarray, capacity: int, keep_rows: bool) -> None:
+        """
+        Write rows into a fresh vectors file and swap it in atomically.
+
+        keep_rows=True preserves row numbers (growth); False packs the given
+        rows to the front (compaction) and rewrites the metadata log.
+        """
+        tmp_path = self.vectors_path + ".tmp"
+        new_vectors = np.lib.format.open_memmap(
+            tmp_path, mode="w+", dtype=np.float32, shape=(capacity, self.dim)
+        )
+        if len(rows):
+            new_vectors[:len(rows)] = self.vectors[rows]
+        new_vectors.flush()
+        del new_vectors
+
+        self.vectors = None
+        os.replace(tmp_path, self.vectors_path)
+        self.vectors = np.load(self.vectors_path, mmap_mode="r+")
+
+        new_alive = np.zeros(capacity, dtype=bool)
+        if keep_rows:
+            new_alive[:len(self.alive)] = self.alive[:capacity]
+            self.alive = new_alive
+            return
+
+        # Compaction: renumber rows and rewrite the metadata log
+        self.ids = [self.ids[r] for r in rows]
+        self.metadata = [self.metadata[r] for r in rows]
+        self.count = len(rows)
+        new_alive[:self.count] = True
+        self.alive = new_alive
+        self.id_to_row = {vid: i for i, vid in enumerate(self.ids)}
+
+        tmp_log = self.log_path + ".tmp"
+        with open(tmp_log, "w", encoding="utf-8") as f:
+            for i, (vid, meta) in enumerate(zip(self.ids, self.metadata)):
+                f.write(json.dumps({"op": "put", "row": i, "id": vid, "metadata": meta}, separators=(",", ":")) + "\n")
+        os.replace(tmp_log, self.log_path)
+        self.ivf = None
+
+    # ---- writes ----
+
+    def upsert(self, items: List[Tuple[str, np.ndarray, Dict[str, Any]]]) -> int:
+        with self.lock:
+            dim = len(items[0][1])
+            new_ids = {vid for vid, _, _ in items if vid not in self.id_to_row}
+            self._ensure_capacity(self.count + len(new_ids), dim)
+
+            log_entries = []
+            for vid, vector, metadata in items:
+                norm = np.linalg.norm(vector)
+                row = self.id_to_row.get(vid)
+                if row is None:
+                    row = self.count
+                    self._grow_lists(row + 1)
+                    self.id_to_row[vid] = row
+                self.vectors[row] = vector / norm if norm > 0 else vector
+                self.ids[row] = vid
+                self.metadata[row] = metadata
+                self.alive[row] = True
+                log_entries.append({"op": "put", "row": row, "id": vid, "metadata": metadata})
+
+            self.vectors.flush()
+            self._append_log(log_entries)
+            self.writes_since_ivf += len(items)
+            return len(items)
+
+    def delete_rows(self, rows: List[int]) -> int:
+        with self.lock:
+            if not rows:
+                return 0
+            log_entries = []
+            for row in rows:
+                vid = self.ids[row]
+                if vid is not None and self.id_to_row.get(vid) == row:
+                    del self.id_to_row[vid]
+                self.alive[row] = False
+                log_entries.append({"op": "del", "row": row})
+            self._append_log(log_entries)
+            self.writes_since_ivf += len(rows)
+
+            dead = self.count - self.live_count
+            if self.count >= 256 and dead > self.count * _COMPACT_RATIO:
+                live_rows = np.flatnonzero(self.alive[:self.count])
+                self._rewrite(live_rows, max(_MIN_CAPACITY, len(live_rows) * 2), keep_rows=False)
+            return len(rows)
+
+    def rows_matching(self, filter: Optional[Dict]) -> List[int]:
+        return [
+            r for r in np.flatnonzero(self.alive[:self.count]).tolist()
+            if matches_filter(self.metadata[r] or {}, filter)
+        ]
+
+    # ---- search ----
+
+    def _maybe_build_ivf(self) -> None:
+        live = self.live_count
+        if live < LOCAL_VECTOR_IVF_THRESHOLD:
+            self.ivf = None
+            return
+        if self.ivf is not None and self.writes_since_ivf <= live * LOCAL_VECTOR_IVF_REBUILD_RATIO:
+            return
+        rows = np.flatnonzero(self.alive[:self.count])
+        self.ivf = _IVFIndex(self.vectors, rows)
+        self.writes_since_ivf = 0
+        logger.info(f"Built IVF index ({self.ivf.nlist} lists) over {len(rows)} vectors at {self.path}")
+
+    def search(
+        self,
+        query: np.ndarray,
+        top_k: int,
+        filter: Optional[Dict]
+    ) -> List[Tuple[int, float]]:
+        with self.lock:
+            if self.vectors is None or self.count == 0:
+                return []
+
+            mask = self.alive[:self.count].copy()
+            if filter:
+                for r in np.flatnonzero(mask):
+                    if not matches_filter(self.metadata[r] or {}, filter):
+                        mask[r] = False
+            available = int(mask.sum())
+            if available == 0:
+                return []
+            k = min(top_k, available)
+
+            self._maybe_build_ivf()
+            if self.ivf is not None:
+                # Probed lists + rows written after the IVF was built
+                candidates = np.concatenate([
+                    self.ivf.candidates(query, LOCAL_VECTOR_IVF_NPROBE),
+                    np.arange(self.ivf.built_upto, self.count),
+                ])
+                candidates = np.unique(candidates)
+                candidates = candidates[mask[candidates]]
+                if len(candidates) >= k:
+                    scores = self.vectors[candidates] @ query
+                    best = np.argpartition(-scores, k - 1)[:k]
+                    best = best[np.argsort(-scores[best])]
+                    return [(int(candidates[i]), float(scores[i])) for i in best]
+                # Too few candidates survive the filter - fall back to exact
+
+            scores = np.asarray(self.vectors[:self.count] @ query)
+            scores[~mask] = -np.inf
+            best = np.argpartition(-scores, k - 1)[:k]
+            best = best[np.argsort(-scores[best])]
+            return [(int(r), float(scores[r])) for r in best]
+
+
+# =============================================================================
+# Store
+# =============================================================================
+
+class LocalVectorStore:
+    """
+    Vector store backed by per-organization memory-mapped NumPy indexes.
+
+    Implements the VectorStore protocol (see vector_store.py).
+    """
+
+    def __init__(self, base_dir: Optional[str] = None):
+        self.base_dir = base_dir or VECTOR_STORE_LOCAL_DIR
+        os.makedirs(self.base_dir, exist_ok=True)
+        self._indexes: Dict[str, _OrganizationIndex] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _partition_name(organization_id: Optional[str]) -> str:
+        if not organization_id:
+            return _SHARED_PARTITION
+        return re.sub(r"[^A-Za-z0-9_-]", "_", str(organization_id))
+
+    def _index(self, partition: str) -> _OrganizationIndex:
+        with self._lock:
+            index = self._indexes.get(partition)
+            if index is None:
+                index = _OrganizationIndex(os.path.join(self.base_dir, partition))
+                self._indexes[partition] = index
+            return index
+
+    def _partitions(self, filter: Optional[Dict]) -> List[str]:
+        """Partitions a filter can touch: one organization, or all of them."""
+        organization_id = _organization_from_filter(filter)
+        if organization_id:
+            return [self._partition_name(organization_id)]
+        on_disk = [
+            name for name in os.listdir(self.base_dir)
+            if os.path.isdir(os.path.join(self.base_dir, name))
+        ]
+        return sorted(set(on_disk) | set(self._indexes.keys()))
+
+    def upsert_vectors(self, vectors: List[Dict[str, Any]]) -> Dict[str, int]:
+        """
+        Upsert vectors into their organization's index.
+
+        Args:
+            vectors: List of {id, values, metadata}; metadata.organization_id
+                selects the partition
+
+        Returns:
+            Dict with upserted_count
+        """
+        try:
+            grouped: Dict[str, List[Tuple[str, np.ndarray, Dict[str, Any]]]] = {}
+            for v in vectors:
+                metadata = dict(v.get("metadata") or {})
+                partition = self._partition_name(metadata.get("organization_id"))
+                grouped.setdefault(partition, []).append(
+                    (v["id"], np.asarray(v["values"], dtype=np.float32), metadata)
+                )
+
+            upserted = 0
+            for partition, items in grouped.items():
+                upserted += self._index(partition).upsert(items)
+            return {"upserted_count": upserted}
+        except Exception as e:
+            raise ValueError(f"Failed to upsert vectors: {str(e)}")
+
+    def query_vectors(
+        self,
+        query_vector: List[float],
+        top_k: int = 5,
+        filter: Optional[Dict] = None,
+        include_metadata: bool = True
+    ) -> List[VectorMatch]:
+        """
+        Query most similar vectors by cosine similarity.
+
+        Args:
+            query_vector: Query embedding
+            top_k: Number of results to return
+            filter: Metadata filter (e.g., {"organization_id": "uuid"})
+            include_metadata: Whether to include metadata in results
+
+        Returns:
+            List of VectorMatch (id, score, metadata), best first
+        """
+        try:
+            query = np.asarray(query_vector, dtype=np.float32)
+            norm = np.linalg.norm(query)
+            if norm > 0:
+                query = query / norm
+
+            residual = _residual_filter(filter) if _organization_from_filter(filter) else filter
+
+            results: List[VectorMatch] = []
+            for partition in self._partitions(filter):
+                index = self._index(partition)
+                for row, score in index.search(query, top_k, residual):
+                    results.append(VectorMatch(
+                        id=index.ids[row],
+                        score=score,
+                        metadata=dict(index.metadata[row] or {}) if include_metadata else {},
+                    ))
+
+            results.sort(key=lambda m: m.score, reverse=True)
+            return results[:top_k]
+        except Exception as e:
+            raise ValueError(f"Failed to query vectors: {str(e)}")
+
+    def delete_vectors(self, ids: List[str]) -> None:
+        """
+        Delete vectors by id.
+
+        Args:
+            ids: List of vector IDs to delete
+        """
+        try:
+            wanted = set(ids)
+            for partition in self._partitions(None):
+                index = self._index(partition)
+                rows = [index.id_to_row[vid] for vid in wanted if vid in index.id_to_row]
+                index.delete_rows(rows)
+        except Exception as e:
+            raise ValueError(f"Failed to delete vectors: {str(e)}")
+
+    def delete_by_filter(self, filter: Dict) -> None:
+        """
+        Delete vectors by metadata filter.
+
+        Args:
+            filter: Metadata filter (e.g., {"file_id": "uuid"})
+        """
+        try:
+            organization_id = _organization_from_filter(filter)
+            if organization_id and not _residual_filter(filter):
+                # Whole organization: drop the partition
+                partition = self._partition_name(organization_id)
+                with self._lock:
+                    self._indexes.pop(partition, None)
+                shutil.rmtree(os.path.join(self.base_dir, partition), ignore_errors=True)
+                return
+
+            residual = _residual_filter(filter) if organization_id else filter
+            for partition in self._partitions(filter):
+                index = self._index(partition)
+                index.delete_rows(index.rows_matching(residual))
+        except Exception as e:
+            raise ValueError(f"Failed to delete vectors by filter: {str(e)}")
+
+    def delete_by_file(self, file_id: str) -> None:
+        """
+        Delete all vectors for a specific file.
+
+        Args:
+            file_id: File ID to delete vectors for
+        """
+        self.delete_by_filter({"file_id": file_id})
+
+    def get_stats(self) -> Dict:
+        """
+        Get index statistics.
+
+        Returns:
+            Dict with total_vector_count, dimension and per-organization counts
+        """
+        organizations = {}
+        dimension = None
+        for partition in self._partitions(None):
+            index = self._index(partition)
+            organizations[partition] = {
+                "vector_count": index.live_count,
+                "ivf": index.ivf is not None,
+            }
+            dimension = dimension or index.dim
+        return {
+            "total_vector_count": sum(o["vector_count"] for o in organizations.values()),
+            "dimension": dimension,
+            "organizations": organizations,
+        }
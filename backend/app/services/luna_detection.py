@@ -9,12 +9,13 @@ Detection engine for creating Luna messages:
 - Deduplication via dedupe_key
 """
 
+import asyncio
 import logging
 from datetime import datetime, timedelta
 from typing import List, Dict, Any, Optional, Set
 from dataclasses import dataclass
 
-from app.database import get_supabase_service
+from app.database import get_supabase_service, get_supabase_async
 from app.models.luna import (
     MessageType,
     MessageStatus,
@@ -113,12 +114,30 @@ class LunaDetectionEngine:
         organization_id: str
     ) -> DetectionContext:
         """Build detection context with existing state."""
-        # Get user settings
-        settings_result = self.supabase.table("luna_settings") \
-            .select("*") \
-            .eq("user_id", user_id) \
-            .limit(1) \
-            .execute()
+        db = await get_supabase_async()
+        
+        # Settings, open messages and recently completed messages are
+        # independent, so fetch them concurrently
+        settings_result, existing_result, completed_result = await asyncio.gather(
+            db.table("luna_settings")
+                .select("*")
+                .eq("user_id", user_id)
+                .limit(1)
+                .execute(),
+            # Existing dedupe keys for pending/snoozed messages
+            db.table("luna_messages")
+                .select("dedupe_key, message_type, meeting_id, status")
+                .eq("user_id", user_id)
+                .in_("status", ["pending", "executing", "snoozed"])
+                .execute(),
+            # Completed message types by entity (for dependency checking)
+            db.table("luna_messages")
+                .select("message_type, meeting_id")
+                .eq("user_id", user_id)
+                .eq("status", "completed")
+                .gte("acted_at", (datetime.utcnow() - timedelta(days=7)).isoformat())
+                .execute(),
+        )
         
         settings = settings_result.data[0] if settings_result.data else {
             "enabled": True,
@@ -127,13 +146,6 @@ class LunaDetectionEngine:
             "excluded_meeting_keywords": ["internal", "1:1", "standup", "sync"]
         }
         
-        # Get existing dedupe keys for pending/snoozed messages
-        existing_result = self.supabase.table("luna_messages") \
-            .select("dedupe_key, message_type, meeting_id, status") \
-            .eq("user_id", user_id) \
-            .in_("status", ["pending", "executing", "snoozed"]) \
-            .execute()
-        
         existing_dedupe_keys = set()
         pending_types = set()
         
@@ -141,14 +153,6 @@ class LunaDetectionEngine:
             existing_dedupe_keys.add(row["dedupe_key"])
             pending_types.add(row["message_type"])
         
-        # Get completed message types by entity (for dependency checking)
-        completed_result = self.supabase.table("luna_messages") \
-            .select("message_type, meeting_id") \
-            .eq("user_id", user_id) \
-            .eq("status", "completed") \
-            .gte("acted_at", (datetime.utcnow() - timedelta(days=7)).isoformat()) \
-            .execute()
-        
         completed_by_entity: Dict[str, Set[str]] = {}
         for row in (completed_result.data or []):
             meeting_id = row.get("meeting_id") or "global"
@@ -10,13 +10,12 @@ This service transforms the traditional 19-question interview into a magic exper
 The output maintains full compatibility with the existing profile structure.
 """
 
-import os
 import json
 import asyncio
 import logging
 from typing import Dict, Any, Optional, List, Tuple
 from dataclasses import dataclass, field, asdict
-from anthropic import AsyncAnthropic
+from app.services.llm_gateway import get_claude
 
 from app.services.people_search_provider import get_people_search_provider, PeopleSearchProvider
 from app.services.company_lookup import get_company_lookup, CompanyLookupService
@@ -109,7 +108,7 @@ class MagicOnboardingService:
     
     def __init__(self):
         """Initialize the service with required clients."""
-        self.anthropic = AsyncAnthropic(api_key=os.getenv("ANTHROPIC_API_KEY"))
+        self.anthropic = get_claude("magic_onboarding")
         self.model = "claude-sonnet-4-20250514"
         self.people_search: PeopleSearchProvider = get_people_search_provider()
         self.company_lookup: CompanyLookupService = get_company_lookup()
@@ -39,6 +39,13 @@ GRAPH_API_BASE = "https://graph.microsoft.com/v1.0"
 # Microsoft OAuth endpoints
 AUTHORITY = f"https://login.microsoftonline.com/{MICROSOFT_TENANT_ID}"
 
+# Graph error codes meaning the delta token can no longer be used
+DELTA_EXPIRED_CODES = {"SyncStateNotFound", "SyncStateInvalid", "resyncRequired"}
+
+
+class DeltaLinkExpired(Exception):
+    """The stored calendarView delta link was rejected; a full sync is needed."""
+
 
 class MicrosoftCalendarService:
     """Service for Microsoft Calendar OAuth and API operations."""
@@ -198,7 +205,8 @@ class MicrosoftCalendarService:
         self,
         access_token: str,
         from_date: datetime,
-        to_date: datetime
+        to_date: datetime,
+        rate_limiter=None
     ) -> List[dict]:
         """
         Fetch calendar events from Microsoft Graph API.
@@ -207,6 +215,7 @@ class MicrosoftCalendarService:
             access_token: Valid access token
             from_date: Start date for events
             to_date: End date for events
+            rate_limiter: Optional TokenBucket awaited before each request
             
         Returns:
             List of calendar events
@@ -229,6 +238,8 @@ class MicrosoftCalendarService:
                     "$top": 250,  # Max per page
                 }
                 
+                if rate_limiter:
+                    await rate_limiter.acquire_async()
                 response = await client.get(
                     url,
                     params=params,
@@ -246,6 +257,8 @@ class MicrosoftCalendarService:
                 # Handle pagination
                 next_link = data.get("@odata.nextLink")
                 while next_link:
+                    if rate_limiter:
+                        await rate_limiter.acquire_async()
                     response = await client.get(
                         next_link,
                         headers={"Authorization": f"Bearer {access_token}"},
@@ -265,6 +278,79 @@ class MicrosoftCalendarService:
             logger.error(f"Error fetching calendar events: {e}")
             return []
     
+    async def fetch_calendar_delta(
+        self,
+        access_token: str,
+        from_date: datetime,
+        to_date: datetime,
+        delta_link: Optional[str] = None,
+        rate_limiter=None
+    ) -> Tuple[List[dict], Optional[str]]:
+        """
+        Fetch calendar changes with calendarView delta query.
+        
+        Without delta_link this returns every event in the window (a full
+        sync); with delta_link only events created, updated or deleted since
+        that link was issued. Deleted events carry an "@removed" key.
+        
+        Args:
+            access_token: Valid access token
+            from_date: Start of the window (full sync only)
+            to_date: End of the window (full sync only)
+            delta_link: @odata.deltaLink from the previous sync
+            rate_limiter: Optional TokenBucket awaited before each request
+            
+        Returns:
+            (events, new delta link)
+            
+        Raises:
+            DeltaLinkExpired: If Graph rejects the delta link
+        """
+        events = []
+        headers = {
+            "Authorization": f"Bearer {access_token}",
+            "Prefer": "odata.maxpagesize=250",
+        }
+        
+        if delta_link:
+            url, params = delta_link, None
+        else:
+            url = f"{GRAPH_API_BASE}/me/calendarView/delta"
+            params = {
+                "startDateTime": from_date.strftime("%Y-%m-%dT%H:%M:%SZ"),
+                "endDateTime": to_date.strftime("%Y-%m-%dT%H:%M:%SZ"),
+            }
+        
+        async with httpx.AsyncClient() as client:
+            while url:
+                if rate_limiter:
+                    await rate_limiter.acquire_async()
+                response = await client.get(url, params=params, headers=headers, timeout=30.0)
+                
+                if response.status_code != 200:
+                    error_code = ""
+                    try:
+                        error_code = response.json().get("error", {}).get("code", "")
+                    except ValueError:
+                        pass
+                    if delta_link and (response.status_code == 410 or error_code in DELTA_EXPIRED_CODES):
+                        raise DeltaLinkExpired(f"Delta link expired ({response.status_code} {error_code})")
+                    raise RuntimeError(
+                        f"Failed to fetch calendar delta: {response.status_code} - {response.text[:200]}"
+                    )
+                
+                data = response.json()
+                events.extend(data.get("value", []))
+                
+                # nextLink = more pages in this round; deltaLink = round complete
+                new_delta_link = data.get("@odata.deltaLink")
+                url = data.get("@odata.nextLink")
+                params = None
+        
+        kind = "incremental" if delta_link else "full"
+        logger.info(f"Fetched {len(events)} events from Microsoft Calendar ({kind} delta)")
+        return events, new_delta_link
+    
     def is_configured(self) -> bool:
         """Check if Microsoft OAuth is properly configured."""
         return bool(MICROSOFT_CLIENT_ID and MICROSOFT_CLIENT_SECRET)
@@ -2,25 +2,34 @@
 Meeting Prep Generator Service
 
 Generates AI-powered meeting briefs using Claude/GPT-4 with context from RAG.
+stream_meeting_brief() yields tokens and parsed sections while the brief is
+being written (used by the SSE endpoint in the preparation router).
 """
 
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, AsyncIterator
 import logging
-import os
 import json
-from anthropic import AsyncAnthropic  # Use async client to not block event loop
 from app.i18n.utils import get_language_instruction
 from app.i18n.config import DEFAULT_LANGUAGE
 from app.services.api_usage_service import get_api_usage_service
+from app.services.llm_gateway import get_claude
+from app.services.llm_streaming import SectionStreamParser, StreamedMessage, stream_claude, token_event
 
 logger = logging.getLogger(__name__)
 
+# Headings that map to the structured fields (see _parse_brief)
+BRIEF_SECTION_MARKERS = {
+    "talking_points": ["Talking Points"],
+    "questions": ["Questions"],
+    "strategy": ["Strategy"],
+}
+
 
 class PrepGeneratorService:
     """Service for generating meeting preparation briefs"""
     
     def __init__(self):
-        self.anthropic = AsyncAnthropic(api_key=os.getenv("ANTHROPIC_API_KEY"))
+        self.anthropic = get_claude("preparation")
         self.model = "claude-sonnet-4-20250514"
     
     async def generate_meeting_brief(
@@ -46,52 +55,128 @@ class PrepGeneratorService:
             logger.info(f"Generating brief for {context['prospect_company']} ({context['meeting_type']})")
             
             response = await self.anthropic.messages.create(
-                model=self.model,
-                max_tokens=8000,  # Increased for complete state-of-the-art briefs with all sections
-                temperature=0.5,  # Balanced: creative but consistent business output
-                messages=[{
-                    "role": "user",
-                    "content": prompt
-                }]
+                **self._request(prompt, context, language)
             )
             
             # Extract content
             brief_text = response.content[0].text
             
-            # Parse structured output
-            parsed = self._parse_brief(brief_text, context['meeting_type'])
-            
             # Log Claude usage with actual token counts from API response
-            try:
-                usage_service = get_api_usage_service()
-                await usage_service.log_llm_usage(
-                    organization_id=context.get("organization_id"),
-                    provider="anthropic",
-                    model=self.model,
-                    input_tokens=response.usage.input_tokens,
-                    output_tokens=response.usage.output_tokens,
-                    user_id=context.get("user_id"),
-                    service="preparation",
-                    credits_consumed=0,  # Credits tracked separately
-                    metadata={"prospect_company": context.get("prospect_company")}
-                )
-            except Exception as usage_err:
-                logger.warning(f"Failed to log prep Claude usage: {usage_err}")
+            await self._log_usage(context, response.usage.input_tokens, response.usage.output_tokens)
             
             logger.info(f"Successfully generated brief ({len(brief_text)} chars, {response.usage.input_tokens} in/{response.usage.output_tokens} out)")
             
-            return {
-                "brief_content": brief_text,
-                "talking_points": parsed["talking_points"],
-                "questions": parsed["questions"],
-                "strategy": parsed["strategy"],
-                "rag_sources": self._extract_sources(context)
-            }
+            return self._build_result(brief_text, context)
             
         except Exception as e:
             logger.error(f"Error generating brief: {e}")
             raise
     
+    async def stream_meeting_brief(
+        self,
+        context: Dict[str, Any],
+        language: str = DEFAULT_LANGUAGE
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream a meeting brief as it is generated
+        
+        Same prompt and parsing as generate_meeting_brief(), but yields events
+        while Claude is still writing:
+        - token: each text delta
+        - section: each "## " section once the next one starts; talking
+          points, questions and strategy sections carry their parsed data
+        - done: the final structured result (same shape as
+          generate_meeting_brief), after usage has been logged
+        
+        Args:
+            context: RAG context with KB and Research data
+            language: Output language code
+        """
+        prompt = self._build_prompt(context, language)
+        logger.info(f"Streaming brief for {context['prospect_company']} ({context['meeting_type']})")
+        
+        parser = SectionStreamParser(BRIEF_SECTION_MARKERS)
+        message = StreamedMessage()
+        
+        async for delta in stream_claude(self.anthropic, message, **self._request(prompt, context, language)):
+            yield token_event(delta)
+            for section in parser.feed(delta):
+                yield self._section_event(section)
+        for section in parser.close():
+            yield self._section_event(section)
+        
+        await self._log_usage(context, message.input_tokens, message.output_tokens, streamed=True)
+        logger.info(f"Successfully streamed brief ({len(message.text)} chars, {message.input_tokens} in/{message.output_tokens} out)")
+        
+        yield {"event": "done", "data": self._build_result(message.text, context)}
+    
+    def _request(self, prompt: str, context: Dict[str, Any], language: str) -> Dict[str, Any]:
+        """
+        Claude request arguments shared by the blocking and streaming paths
+        
+        The meeting type instructions are static per (meeting type, language),
+        so they are sent as the system prompt, which the LLM gateway marks for
+        prompt caching; the per-meeting context is the user message.
+        """
+        return {
+            "model": self.model,
+            "max_tokens": 8000,  # Increased for complete state-of-the-art briefs with all sections
+            "temperature": 0.5,  # Balanced: creative but consistent business output
+            "system": self._get_meeting_type_instructions(context["meeting_type"], language),
+            "organization_id": context.get("organization_id"),
+            "messages": [{
+                "role": "user",
+                "content": prompt
+            }]
+        }
+    
+    async def _log_usage(
+        self,
+        context: Dict[str, Any],
+        input_tokens: int,
+        output_tokens: int,
+        streamed: bool = False
+    ) -> None:
+        """Log Claude usage; never fails the generation"""
+        try:
+            metadata = {"prospect_company": context.get("prospect_company")}
+            if streamed:
+                metadata["streamed"] = True
+            usage_service = get_api_usage_service()
+            await usage_service.log_llm_usage(
+                organization_id=context.get("organization_id"),
+                provider="anthropic",
+                model=self.model,
+                input_tokens=input_tokens,
+                output_tokens=output_tokens,
+                user_id=context.get("user_id"),
+                service="preparation",
+                credits_consumed=0,  # Credits tracked separately
+                metadata=metadata
+            )
+        except Exception as usage_err:
+            logger.warning(f"Failed to log prep Claude usage: {usage_err}")
+    
+    def _build_result(self, brief_text: str, context: Dict[str, Any]) -> Dict[str, Any]:
+        """Final structured brief stored on meeting_preps"""
+        parsed = self._parse_brief(brief_text, context['meeting_type'])
+        return {
+            "brief_content": brief_text,
+            "talking_points": parsed["talking_points"],
+            "questions": parsed["questions"],
+            "strategy": parsed["strategy"],
+            "rag_sources": self._extract_sources(context)
+        }
+    
+    def _section_event(self, section: Dict[str, Any]) -> Dict[str, Any]:
+        """Section event with parsed data for the sections we structure"""
+        key = section["key"]
+        if key == "talking_points":
+            section["talking_points"] = self._structure_talking_points(section["content"])
+        elif key == "questions":
+            section["questions"] = self._extract_questions(section["content"])
+        return {"event": "section", "data": section}
+    
     def _build_prompt(self, context: Dict[str, Any], language: str = DEFAULT_LANGUAGE) -> str:
         """Build AI prompt based on context and meeting type"""
         
@@ -175,9 +260,7 @@ IMPORTANT:
 
 """
         
-        # Add meeting type-specific instructions
-        prompt += self._get_meeting_type_instructions(meeting_type, language)
-        
+        # Meeting type-specific instructions go in the system prompt (see _request)
         return prompt
     
     def _format_contacts_context(self, contacts: list) -> str:
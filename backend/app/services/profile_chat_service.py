@@ -11,13 +11,12 @@ This service enables a ChatGPT-like experience for profile onboarding:
 The conversation feels natural while systematically gathering all needed information.
 """
 
-import os
 import json
 import logging
 from typing import Dict, Any, Optional, List, Tuple
 from dataclasses import dataclass, field, asdict
 from datetime import datetime
-from anthropic import AsyncAnthropic
+from app.services.llm_gateway import get_claude
 
 logger = logging.getLogger(__name__)
 
@@ -117,7 +116,7 @@ class ProfileChatService:
     
     def __init__(self):
         """Initialize the chat service."""
-        self.anthropic = AsyncAnthropic(api_key=os.getenv("ANTHROPIC_API_KEY"))
+        self.anthropic = get_claude("profile_chat")
         self.model = "claude-sonnet-4-20250514"
         self.save_threshold = 0.80  # 80% = user CAN save
         self.complete_threshold = 1.0  # 100% = chat stops asking (but user can always continue)
@@ -5,6 +5,7 @@ from typing import Optional, Dict, Any, List
 from datetime import datetime
 from supabase import Client
 from app.database import get_supabase_service
+from app.services.coach_rules import invalidate_coach_context
 import json
 
 
@@ -89,6 +90,7 @@ class ProfileService:
             response = self.client.table("sales_profiles")\
                 .insert(data)\
                 .execute()
+            invalidate_coach_context(user_id=user_id)
             
             if response.data and len(response.data) > 0:
                 profile = response.data[0]
@@ -156,6 +158,7 @@ class ProfileService:
                 .update(updates)\
                 .eq("id", current["id"])\
                 .execute()
+            invalidate_coach_context(user_id=user_id)
             
             if response.data and len(response.data) > 0:
                 profile = response.data[0]
@@ -201,6 +204,7 @@ class ProfileService:
                 .delete()\
                 .eq("user_id", user_id)\
                 .execute()
+            invalidate_coach_context(user_id=user_id)
             
             return True
             
@@ -268,6 +272,7 @@ class ProfileService:
             response = self.client.table("company_profiles")\
                 .insert(data)\
                 .execute()
+            invalidate_coach_context(organization_id=organization_id)
             
             if response.data and len(response.data) > 0:
                 profile = response.data[0]
@@ -326,6 +331,7 @@ class ProfileService:
                 .update(updates)\
                 .eq("organization_id", organization_id)\
                 .execute()
+            invalidate_coach_context(organization_id=organization_id)
             
             if response.data and len(response.data) > 0:
                 profile = response.data[0]
@@ -362,6 +368,7 @@ class ProfileService:
                 .delete()\
                 .eq("organization_id", organization_id)\
                 .execute()
+            invalidate_coach_context(organization_id=organization_id)
             
             return True
             
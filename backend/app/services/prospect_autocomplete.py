@@ -0,0 +1,440 @@
+"""
+Prospect Autocomplete - typo-tolerant search over prospect names, domains
+and contact names
+
+Each organization gets an in-memory trigram index (pg_trgm-style trigrams
+of the ProspectMatcher-normalized text) over:
+
+- prospect company names
+- prospect domains (website, primary contact email)
+- contact names and email domains (matches return the contact's prospect)
+
+A query scores every key that shares a trigram with it: the share of the
+query's trigrams found in the key (typo tolerance), the overall trigram
+similarity, and a bonus when the key (or one of its words) starts with the
+query. Results are ranked per prospect, best key first.
+
+Index lifecycle:
+- Built on first use per organization (single-flight, in the background);
+  until it is ready, queries are answered by the pg_trgm variant
+  search_prospects_fuzzy() (see migration_prospect_search.sql).
+- Write paths apply incremental updates (upsert_/remove_ methods); updates
+  that arrive while an index is building are replayed onto it.
+- Indexes older than PROSPECT_AUTOCOMPLETE_TTL_SECONDS are rebuilt in the
+  background (stale results are served meanwhile), which also picks up
+  writes from other workers and paths without hooks.
+"""
+
+import os
+import time
+import heapq
+import asyncio
+import logging
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+from app.database import get_supabase_service
+from app.services.prospect_matcher import ProspectMatcher
+
+logger = logging.getLogger(__name__)
+
+# Index age before a background rebuild
+PROSPECT_AUTOCOMPLETE_TTL_SECONDS = float(os.getenv("PROSPECT_AUTOCOMPLETE_TTL_SECONDS", "600"))
+
+# Organizations kept in memory (least recently used are dropped)
+PROSPECT_AUTOCOMPLETE_MAX_ORGS = int(os.getenv("PROSPECT_AUTOCOMPLETE_MAX_ORGS", "500"))
+
+# Minimum share of the query's trigrams a key must contain (unless it is a prefix match)
+MIN_WORD_SIMILARITY = 0.3
+
+# Score bonus when the key starts with the query / a word of the key does
+PREFIX_BONUS = 0.5
+WORD_PREFIX_BONUS = 0.25
+
+# best_match(): a name only resolves to a prospect when it is (nearly) the
+# whole company name or domain - prefix bonuses do not count, so "ING" never
+# resolves to "Ingram Micro"
+RESOLVE_MIN_SIMILARITY = 0.8
+RESOLVE_MIN_LENGTH_RATIO = 0.8
+
+# Ranked search results checked by best_match()
+RESOLVE_CANDIDATES = 5
+
+PROSPECT_COLUMNS = "id, company_name, status, industry, last_activity_at, website, contact_email"
+CONTACT_COLUMNS = "id, prospect_id, name, email"
+
+# Prospect fields returned with each match
+RESULT_FIELDS = ("id", "company_name", "status", "industry", "last_activity_at")
+
+# Prospect fields kept in the index (results + domain sources)
+_PROSPECT_FIELDS = RESULT_FIELDS + ("website", "contact_email")
+
+
+def trigrams(text: str) -> FrozenSet[str]:
+    """pg_trgm-style trigrams: every word padded with two leading and one trailing space."""
+    grams: Set[str] = set()
+    for word in text.split():
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return frozenset(grams)
+
+
+def similarity(a: str, b: str) -> float:
+    """pg_trgm similarity() of two normalized strings (shared / union of trigrams)."""
+    grams_a, grams_b = trigrams(a), trigrams(b)
+    if not grams_a or not grams_b:
+        return 0.0
+    shared = len(grams_a & grams_b)
+    return shared / (len(grams_a) + len(grams_b) - shared)
+
+
+@dataclass(frozen=True, eq=False)
+class SearchKey:
+    """One searchable string of a prospect (identity-hashed)."""
+    prospect_id: str
+    source: str  # "name", "domain" or "contact"
+    text: str  # Original text, returned as matched_text
+    normalized: str
+    grams: FrozenSet[str]
+
+
+class OrganizationIndex:
+    """Trigram index of one organization (guarded by ProspectAutocomplete's lock)."""
+    
+    def __init__(self, organization_id: str, matcher: ProspectMatcher):
+        self.organization_id = organization_id
+        self.built_at = time.monotonic()
+        self._matcher = matcher
+        self.prospects: Dict[str, dict] = {}
+        self._keys: Dict[Tuple[str, str], List[SearchKey]] = {}  # (kind, id) -> keys
+        self._postings: Dict[str, Set[SearchKey]] = {}
+    
+    # ==========================================
+    # UPDATES
+    # ==========================================
+    
+    def _make_key(self, prospect_id: str, source: str, text: Optional[str]) -> Optional[SearchKey]:
+        normalized = self._matcher.normalize_company_name(text or "")
+        if not normalized:
+            return None
+        return SearchKey(prospect_id, source, text, normalized, trigrams(normalized))
+    
+    def _set_keys(self, owner: Tuple[str, str], keys: Iterable[Optional[SearchKey]]) -> None:
+        self._remove_keys(owner)
+        keys = [key for key in keys if key is not None]
+        if not keys:
+            return
+        self._keys[owner] = keys
+        for key in keys:
+            for gram in key.grams:
+                self._postings.setdefault(gram, set()).add(key)
+    
+    def _remove_keys(self, owner: Tuple[str, str]) -> None:
+        for key in self._keys.pop(owner, ()):
+            for gram in key.grams:
+                posting = self._postings.get(gram)
+                if posting is not None:
+                    posting.discard(key)
+                    if not posting:
+                        del self._postings[gram]
+    
+    def upsert_prospect(self, row: dict, overwrite: bool = True) -> None:
+        """Add or update a prospect; with overwrite=False existing fields win."""
+        prospect_id = row["id"]
+        existing = self.prospects.get(prospect_id, {})
+        fields = {field: row[field] for field in _PROSPECT_FIELDS if field in row}
+        prospect = {**existing, **fields} if overwrite else {**fields, **existing}
+        self.prospects[prospect_id] = prospect
+        
+        domains = {
+            self._matcher.extract_domain_from_website(prospect.get("website")),
+            self._matcher.extract_domain_from_email(prospect.get("contact_email")),
+        }
+        self._set_keys(("prospect", prospect_id), [
+            self._make_key(prospect_id, "name", prospect.get("company_name")),
+            *(self._make_key(prospect_id, "domain", domain) for domain in domains if domain),
+        ])
+    
+    def remove_prospect(self, prospect_id: str) -> None:
+        self.prospects.pop(prospect_id, None)
+        self._remove_keys(("prospect", prospect_id))
+        # Contacts are deleted with their prospect
+        owners = [
+            owner for owner, keys in self._keys.items()
+            if owner[0] == "contact" and keys[0].prospect_id == prospect_id
+        ]
+        for owner in owners:
+            self._remove_keys(owner)
+    
+    def upsert_contact(self, row: dict) -> None:
+        prospect_id = row.get("prospect_id")
+        if not prospect_id:
+            return
+        domain = self._matcher.extract_domain_from_email(row.get("email"))
+        self._set_keys(("contact", row["id"]), [
+            self._make_key(prospect_id, "contact", row.get("name")),
+            self._make_key(prospect_id, "domain", domain) if domain else None,
+        ])
+    
+    def remove_contact(self, contact_id: str) -> None:
+        self._remove_keys(("contact", contact_id))
+    
+    # ==========================================
+    # SEARCH
+    # ==========================================
+    
+    def search(self, query: str, limit: int, sources: Optional[Iterable[str]] = None) -> List[dict]:
+        """Ranked matches for a normalized query, one per prospect."""
+        grams = trigrams(query)
+        if not grams:
+            return []
+        
+        shared: Dict[SearchKey, int] = {}
+        for gram in grams:
+            for key in self._postings.get(gram, ()):
+                shared[key] = shared.get(key, 0) + 1
+        
+        allowed = set(sources) if sources else None
+        best: Dict[str, Tuple[float, SearchKey]] = {}
+        for key, count in shared.items():
+            if allowed is not None and key.source not in allowed:
+                continue
+            if key.prospect_id not in self.prospects:
+                continue
+            
+            word_similarity = count / len(grams)
+            similarity = count / (len(grams) + len(key.grams) - count)
+            if key.normalized.startswith(query):
+                bonus = PREFIX_BONUS
+            elif f" {query}" in f" {key.normalized}":
+                bonus = WORD_PREFIX_BONUS
+            elif word_similarity >= MIN_WORD_SIMILARITY:
+                bonus = 0.0
+            else:
+                continue
+            
+            score = 0.6 * word_similarity + 0.4 * similarity + bonus
+            current = best.get(key.prospect_id)
+            if current is None or score > current[0]:
+                best[key.prospect_id] = (score, key)
+        
+        ranked = heapq.nlargest(
+            limit,
+            best.items(),
+            key=lambda item: (item[1][0], self.prospects[item[0]].get("last_activity_at") or "")
+        )
+        
+        results = []
+        for prospect_id, (score, key) in ranked:
+            prospect = self.prospects[prospect_id]
+            results.append({
+                **{field: prospect.get(field) for field in RESULT_FIELDS},
+                "matched_on": key.source,
+                "matched_text": key.text,
+                "score": round(score, 3),
+            })
+        return results
+
+
+class ProspectAutocomplete:
+    """Per-organization autocomplete indexes with a pg_trgm fallback."""
+    
+    def __init__(
+        self,
+        ttl_seconds: float = PROSPECT_AUTOCOMPLETE_TTL_SECONDS,
+        max_orgs: int = PROSPECT_AUTOCOMPLETE_MAX_ORGS
+    ):
+        self.supabase = get_supabase_service()
+        self.matcher = ProspectMatcher(self.supabase)
+        self.ttl_seconds = ttl_seconds
+        self.max_orgs = max_orgs
+        self._indexes: "OrderedDict[str, OrganizationIndex]" = OrderedDict()
+        self._builds: Dict[str, asyncio.Future] = {}
+        # Updates received while an organization's index is building
+        self._pending: Dict[str, List[Callable[[OrganizationIndex], None]]] = {}
+        # Write hooks can run in worker threads
+        self._lock = threading.Lock()
+    
+    def normalize(self, text: str) -> str:
+        return self.matcher.normalize_company_name(text)
+    
+    # ==========================================
+    # QUERIES
+    # ==========================================
+    
+    async def search(
+        self,
+        organization_id: str,
+        query: str,
+        limit: int = 10,
+        sources: Optional[Iterable[str]] = None
+    ) -> List[dict]:
+        """
+        Ranked prospects matching query by name, domain or contact name.
+        
+        Each result has the prospect fields (RESULT_FIELDS) plus matched_on
+        ("name", "domain", "contact"), matched_text and score.
+        """
+        normalized = self.normalize(query)
+        if not normalized:
+            return []
+        
+        index = self._get_index(organization_id)
+        if index is None:
+            # Cold start: answer from Postgres while the index builds
+            return await asyncio.to_thread(self._search_sql, organization_id, query, limit, sources)
+        
+        with self._lock:
+            return index.search(normalized, limit, sources)
+    
+    async def best_match(
+        self,
+        organization_id: str,
+        name: str,
+        min_similarity: float = RESOLVE_MIN_SIMILARITY
+    ) -> Optional[dict]:
+        """
+        The prospect a company name refers to (by name or domain), if any.
+        
+        Unlike search(), only near-identical names resolve: the whole-string
+        trigram similarity must reach min_similarity and the lengths must be
+        comparable. The result's score is that similarity.
+        """
+        normalized = self.normalize(name)
+        if not normalized:
+            return None
+        
+        candidates = await self.search(organization_id, name, limit=RESOLVE_CANDIDATES, sources=("name", "domain"))
+        
+        best, best_similarity = None, 0.0
+        for match in candidates:
+            for text in (match.get("company_name"), match.get("matched_text")):
+                target = self.normalize(text or "")
+                if not target:
+                    continue
+                if min(len(target), len(normalized)) / max(len(target), len(normalized)) < RESOLVE_MIN_LENGTH_RATIO:
+                    continue
+                score = similarity(normalized, target)
+                if score >= min_similarity and score > best_similarity:
+                    best, best_similarity = {**match, "score": round(score, 3)}, score
+        return best
+    
+    def _search_sql(
+        self,
+        organization_id: str,
+        query: str,
+        limit: int,
+        sources: Optional[Iterable[str]]
+    ) -> List[dict]:
+        result = self.supabase.rpc("search_prospects_fuzzy", {
+            "p_organization_id": organization_id,
+            "p_query": query,
+            "p_limit": limit,
+            "p_sources": list(sources) if sources else None,
+        }).execute()
+        return result.data or []
+    
+    # ==========================================
+    # INDEX LIFECYCLE
+    # ==========================================
+    
+    def _get_index(self, organization_id: str) -> Optional[OrganizationIndex]:
+        """Ready index (possibly stale; a rebuild is started), or None while building."""
+        with self._lock:
+            index = self._indexes.get(organization_id)
+            if index is not None:
+                self._indexes.move_to_end(organization_id)
+        
+        if index is None or time.monotonic() - index.built_at > self.ttl_seconds:
+            self._start_build(organization_id)
+        return index
+    
+    def _start_build(self, organization_id: str) -> None:
+        if organization_id in self._builds:
+            return
+        with self._lock:
+            self._pending[organization_id] = []
+        build = asyncio.ensure_future(self._build(organization_id))
+        self._builds[organization_id] = build
+        build.add_done_callback(lambda _: self._builds.pop(organization_id, None))
+    
+    async def _build(self, organization_id: str) -> None:
+        try:
+            started = time.monotonic()
+            prospects, contacts = await asyncio.gather(
+                asyncio.to_thread(self.matcher._select_all, "prospects", PROSPECT_COLUMNS, organization_id),
+                asyncio.to_thread(self.matcher._select_all, "prospect_contacts", CONTACT_COLUMNS, organization_id),
+            )
+            index = await asyncio.to_thread(self._index_from_rows, organization_id, prospects, contacts)
+            
+            with self._lock:
+                for update in self._pending.pop(organization_id, []):
+                    update(index)
+                self._indexes[organization_id] = index
+                self._indexes.move_to_end(organization_id)
+                while len(self._indexes) > self.max_orgs:
+                    self._indexes.popitem(last=False)
+            
+            logger.info(
+                f"Built autocomplete index for org {organization_id}: {len(prospects)} prospects, "
+                f"{len(contacts)} contacts in {(time.monotonic() - started) * 1000:.0f}ms"
+            )
+        except Exception as e:
+            with self._lock:
+                self._pending.pop(organization_id, None)
+            logger.warning(f"Failed to build autocomplete index for org {organization_id}: {e}")
+    
+    def _index_from_rows(self, organization_id: str, prospects: List[dict], contacts: List[dict]) -> OrganizationIndex:
+        index = OrganizationIndex(organization_id, self.matcher)
+        for row in prospects:
+            index.upsert_prospect(row)
+        for row in contacts:
+            index.upsert_contact(row)
+        return index
+    
+    # ==========================================
+    # INCREMENTAL UPDATES (call after writes)
+    # ==========================================
+    
+    def _apply(self, organization_id: Optional[str], update: Callable[[OrganizationIndex], None]) -> None:
+        if not organization_id:
+            return
+        with self._lock:
+            index = self._indexes.get(organization_id)
+            if index is not None:
+                update(index)
+            pending = self._pending.get(organization_id)
+            if pending is not None:
+                pending.append(update)
+    
+    def upsert_prospect(self, organization_id: str, row: dict, overwrite: bool = True) -> None:
+        """Index a created/updated prospect row (partial rows merge with the indexed one)."""
+        self._apply(organization_id, lambda index: index.upsert_prospect(row, overwrite))
+    
+    def remove_prospect(self, organization_id: str, prospect_id: str) -> None:
+        self._apply(organization_id, lambda index: index.remove_prospect(prospect_id))
+    
+    def upsert_contact(self, organization_id: str, row: dict) -> None:
+        self._apply(organization_id, lambda index: index.upsert_contact(row))
+    
+    def remove_contact(self, organization_id: str, contact_id: str) -> None:
+        self._apply(organization_id, lambda index: index.remove_contact(contact_id))
+    
+    def invalidate(self, organization_id: str) -> None:
+        """Drop an organization's index (rebuilt on next use)."""
+        with self._lock:
+            self._indexes.pop(organization_id, None)
+
+
+# Singleton instance
+_prospect_autocomplete: Optional[ProspectAutocomplete] = None
+
+
+def get_prospect_autocomplete() -> ProspectAutocomplete:
+    """Get or create the process-wide prospect autocomplete."""
+    global _prospect_autocomplete
+    if _prospect_autocomplete is None:
+        _prospect_autocomplete = ProspectAutocomplete()
+    return _prospect_autocomplete
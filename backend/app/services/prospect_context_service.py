@@ -443,10 +443,10 @@ Value Propositions: {value_props_str}""")
         try:
             # Lazy import to avoid circular imports
             from app.services.embeddings import EmbeddingsService
-            from app.services.vector_store import VectorStore
+            from app.services.vector_store import get_vector_store
             
             embeddings = EmbeddingsService()
-            vector_store = VectorStore()
+            vector_store = get_vector_store()
             
             # Search for case studies and relevant product info
             query = f"{prospect_company} case study success story product solution"
@@ -25,12 +25,12 @@ from dataclasses import dataclass, field
 from typing import Optional, List, Dict, Any, Tuple
 from datetime import datetime, timedelta
 
-import anthropic
 from supabase import Client
 
 from app.database import get_supabase_service
 from app.services.seller_context_builder import get_seller_context_builder
 from app.services.api_usage_service import get_api_usage_service
+from app.services.llm_gateway import get_claude, anthropic_configured
 
 logger = logging.getLogger(__name__)
 
@@ -561,9 +561,8 @@ class ProspectDiscoveryService:
         
         # Anthropic client for query generation and scoring
         self._anthropic = None
-        api_key = os.getenv("ANTHROPIC_API_KEY")
-        if api_key:
-            self._anthropic = anthropic.Anthropic(api_key=api_key)
+        if anthropic_configured():
+            self._anthropic = get_claude("discovery")
         
         # Exa client for discovery search
         self._exa = None
@@ -829,7 +828,7 @@ USE these sector-specific terms in your queries instead of generic tech terms!
         )
         
         try:
-            response = self._anthropic.messages.create(
+            response = await self._anthropic.messages.create(
                 model="claude-sonnet-4-20250514",
                 max_tokens=1024,
                 messages=[{"role": "user", "content": prompt}]
@@ -943,7 +942,7 @@ USE these sector-specific terms in your queries instead of generic tech terms!
                 research_data=research_data
             )
             
-            response = self._anthropic.messages.create(
+            response = await self._anthropic.messages.create(
                 model="claude-sonnet-4-20250514",
                 max_tokens=500,
                 messages=[{"role": "user", "content": prompt}]
@@ -1501,7 +1500,7 @@ USE these sector-specific terms in your queries instead of generic tech terms!
         )
         
         try:
-            response = self._anthropic.messages.create(
+            response = await self._anthropic.messages.create(
                 model="claude-sonnet-4-20250514",
                 max_tokens=8000,  # Sufficient for 25 prospects
                 messages=[{"role": "user", "content": prompt}]
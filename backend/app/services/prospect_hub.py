@@ -0,0 +1,207 @@
+"""
+Prospect Hub - data for the Prospect Hub page
+
+The hub combines a prospect with its latest research, contacts, deals,
+preparations, follow-ups and recent activities. All queries run
+concurrently with projected columns (one round trip of wall time), and the
+assembled hub is cached per prospect for PROSPECT_HUB_CACHE_TTL_SECONDS.
+
+Writes to any of those tables call invalidate_prospect_hub(prospect_id).
+The cache is per worker process, so the short TTL bounds how long writes
+from other workers and background jobs without a hook stay invisible.
+"""
+
+import os
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional
+
+from app.database import get_supabase_service
+from app.utils.cache import TTLCache, MISSING
+
+logger = logging.getLogger(__name__)
+
+PROSPECT_HUB_CACHE_TTL_SECONDS = float(os.getenv("PROSPECT_HUB_CACHE_TTL_SECONDS", "30"))
+PROSPECT_HUB_CACHE_MAX_ENTRIES = int(os.getenv("PROSPECT_HUB_CACHE_MAX_ENTRIES", "2000"))
+
+# Recent activities shown on the hub
+HUB_ACTIVITY_LIMIT = 10
+
+PROSPECT_COLUMNS = (
+    "id, organization_id, company_name, status, website, linkedin_url, industry, company_size, "
+    "country, city, contact_name, contact_email, contact_role, contact_linkedin, preferred_language, "
+    "notes, tags, created_at, updated_at, last_activity_at"
+)
+RESEARCH_COLUMNS = "id, company_name, brief_content, status, created_at, completed_at"
+CONTACT_COLUMNS = (
+    "id, prospect_id, name, role, email, phone, linkedin_url, communication_style, decision_authority, "
+    "is_primary, profile_brief, opening_suggestions, questions_to_ask, topics_to_avoid, analyzed_at, created_at"
+)
+DEAL_COLUMNS = "id, name, is_active, created_at"
+PREP_COLUMNS = "id, prospect_company_name, meeting_type, status, created_at, completed_at, contact_ids"
+FOLLOWUP_COLUMNS = "id, prospect_company_name, meeting_subject, status, created_at, completed_at, contact_ids"
+ACTIVITY_COLUMNS = "id, activity_type, title, description, created_at"
+
+# Keyed by (prospect_id, variant, scope): the hub variant (response shape)
+# and the organization it was read for
+_hub_cache: TTLCache = TTLCache(
+    maxsize=PROSPECT_HUB_CACHE_MAX_ENTRIES,
+    ttl_seconds=PROSPECT_HUB_CACHE_TTL_SECONDS
+)
+
+
+def invalidate_prospect_hub(prospect_id: Optional[str]) -> None:
+    """
+    Drop cached hubs for a prospect (call after writes to the prospect or its linked rows).
+    
+    Never raises: callers invalidate inside their success paths, and a stale
+    hub (bounded by the TTL) is better than failing a completed write.
+    """
+    if not prospect_id:
+        return
+    try:
+        prospect_id = str(prospect_id)
+        _hub_cache.invalidate_where(lambda key: key[0] == prospect_id)
+    except Exception as e:
+        logger.warning(f"Failed to invalidate prospect hub cache for {prospect_id}: {e}")
+
+
+def invalidate_prospect_hubs(rows: Optional[Iterable[Dict[str, Any]]]) -> None:
+    """invalidate_prospect_hub() for the prospects of written rows (e.g. an update's result.data). Never raises."""
+    try:
+        prospect_ids = {row.get("prospect_id") for row in rows or ()}
+    except Exception as e:
+        logger.warning(f"Failed to collect prospect ids for hub cache invalidation: {e}")
+        return
+    for prospect_id in prospect_ids:
+        invalidate_prospect_hub(prospect_id)
+
+
+async def cached_hub(
+    prospect_id: str,
+    variant: str,
+    scope: str,
+    load: Callable[[], Awaitable[Optional[Any]]]
+) -> Optional[Any]:
+    """Hub from cache, or load() it; None (not found) is not cached."""
+    key = (str(prospect_id), variant, str(scope))
+    hub = _hub_cache.get(key)
+    if hub is MISSING:
+        hub = await load()
+        if hub is not None:
+            _hub_cache.set(key, hub)
+    return hub
+
+
+async def fetch_first(query) -> Optional[Dict[str, Any]]:
+    result = await asyncio.to_thread(query.execute)
+    return result.data[0] if result.data else None
+
+
+async def fetch_all(query) -> List[Dict[str, Any]]:
+    result = await asyncio.to_thread(query.execute)
+    return result.data or []
+
+
+async def fetch_latest_research(
+    supabase,
+    prospect_id: str,
+    organization_id: str,
+    columns: str = RESEARCH_COLUMNS
+) -> Optional[Dict[str, Any]]:
+    """Latest completed research, else the latest in progress (both queried concurrently)."""
+    def briefs():
+        return supabase.table("research_briefs").select(columns).eq(
+            "prospect_id", prospect_id
+        ).eq("organization_id", organization_id)
+    
+    completed, in_progress = await asyncio.gather(
+        fetch_first(briefs().eq("status", "completed").order("completed_at", desc=True).limit(1)),
+        fetch_first(briefs().in_("status", ["pending", "researching"]).order("created_at", desc=True).limit(1)),
+    )
+    return completed or in_progress
+
+
+def _with_contact_names(rows: List[Dict[str, Any]], contact_name_map: Dict[str, str]) -> List[Dict[str, Any]]:
+    return [
+        {**row, "contact_names": [contact_name_map[cid] for cid in row.get("contact_ids") or [] if contact_name_map.get(cid)]}
+        for row in rows
+    ]
+
+
+async def get_prospect_hub(prospect_id: str, organization_id: str) -> Optional[Dict[str, Any]]:
+    """
+    Hub data for the Prospect Hub page (GET /prospects/{id}/hub), or None
+    if the prospect does not exist in the organization.
+    """
+    return await cached_hub(prospect_id, "hub", organization_id, lambda: _load_prospect_hub(prospect_id, organization_id))
+
+
+async def _load_prospect_hub(prospect_id: str, organization_id: str) -> Optional[Dict[str, Any]]:
+    supabase = get_supabase_service()
+    
+    # Linked rows are filtered by organization as well, so a foreign
+    # prospect_id yields nothing even before the prospect check
+    prospect, research, contacts, deals, preps, followups, recent_activities = await asyncio.gather(
+        fetch_first(
+            supabase.table("prospects").select(PROSPECT_COLUMNS)
+            .eq("id", prospect_id).eq("organization_id", organization_id).limit(1)
+        ),
+        fetch_latest_research(supabase, prospect_id, organization_id),
+        fetch_all(
+            supabase.table("prospect_contacts").select(CONTACT_COLUMNS)
+            .eq("prospect_id", prospect_id).eq("organization_id", organization_id)
+            .order("is_primary", desc=True).order("created_at", desc=True)
+        ),
+        fetch_all(
+            supabase.table("deals").select(DEAL_COLUMNS)
+            .eq("prospect_id", prospect_id).eq("organization_id", organization_id).eq("is_active", True)
+        ),
+        fetch_all(
+            supabase.table("meeting_preps").select(PREP_COLUMNS)
+            .eq("prospect_id", prospect_id).eq("organization_id", organization_id)
+            .order("created_at", desc=True)
+        ),
+        fetch_all(
+            supabase.table("followups").select(FOLLOWUP_COLUMNS)
+            .eq("prospect_id", prospect_id).eq("organization_id", organization_id)
+            .order("created_at", desc=True)
+        ),
+        fetch_all(
+            supabase.table("prospect_activities").select(ACTIVITY_COLUMNS)
+            .eq("prospect_id", prospect_id).eq("organization_id", organization_id)
+            .order("created_at", desc=True).limit(HUB_ACTIVITY_LIMIT)
+        ),
+    )
+    
+    if not prospect:
+        return None
+    
+    contact_name_map = {c["id"]: c["name"] for c in contacts}
+    preparations = _with_contact_names(preps, contact_name_map)
+    followups = _with_contact_names(followups, contact_name_map)
+    
+    stats = {
+        "prospect_id": prospect_id,
+        "company_name": prospect.get("company_name"),
+        "status": prospect.get("status"),
+        "research_count": 1 if research else 0,
+        "contact_count": len(contacts),
+        "active_deal_count": len(deals),
+        "meeting_count": 0,  # Not tracking meetings separately for now
+        "prep_count": sum(1 for p in preparations if p.get("status") == "completed"),
+        "followup_count": sum(1 for f in followups if f.get("status") == "completed"),
+        "created_at": prospect.get("created_at"),
+        "last_activity_at": prospect.get("last_activity_at")
+    }
+    
+    return {
+        "prospect": prospect,
+        "research": research,
+        "contacts": contacts,
+        "deals": deals,
+        "preparations": preparations,
+        "followups": followups,
+        "recent_activities": recent_activities,
+        "stats": stats
+    }
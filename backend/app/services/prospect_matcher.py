@@ -1,9 +1,18 @@
 """
 Prospect Matcher Service - Match calendar meetings to prospects
 SPEC-038: Meetings & Calendar Integration
+
+Batch matching builds one immutable ProspectIndex per organization
+(normalized names, token -> prospect inverted index, domain map and the
+contacts lookup) and scores every meeting against it in memory. Only
+prospects that share a title token or an attendee domain are scored, and
+auto-links are written as grouped update().in_("id", ids) batches (one per
+set of identical link values), touching only the link columns.
 """
-from typing import Optional, List, Tuple
-from dataclasses import dataclass
+from typing import Optional, List, Tuple, Dict, FrozenSet, Mapping
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from collections import defaultdict
 from urllib.parse import urlparse
 import re
 import logging
@@ -12,6 +21,12 @@ from supabase import Client
 
 logger = logging.getLogger(__name__)
 
+# Rows per page when loading prospects/contacts (PostgREST caps responses)
+FETCH_PAGE_SIZE = 1000
+
+# Max meeting ids per bulk update when writing auto-links (keeps request URLs short)
+LINK_UPDATE_BATCH_SIZE = 200
+
 
 @dataclass
 class ProspectMatch:
@@ -38,6 +53,38 @@ class MatchResult:
             self.matched_contact_ids = []
 
 
+@dataclass(frozen=True)
+class IndexedProspect:
+    """A prospect with its matching keys precomputed."""
+    prospect_id: str
+    company_name: str
+    normalized_name: str
+    words: FrozenSet[str]
+
+
+@dataclass(frozen=True)
+class ProspectIndex:
+    """
+    Immutable per-organization matching index.
+    
+    Built once per batch (see ProspectMatcher.build_index) and safe to share
+    between concurrent matching calls.
+    """
+    organization_id: str
+    prospects: Tuple[IndexedProspect, ...] = ()
+    by_token: Mapping[str, Tuple[int, ...]] = field(default_factory=lambda: MappingProxyType({}))
+    by_domain: Mapping[str, Tuple[int, ...]] = field(default_factory=lambda: MappingProxyType({}))
+    contacts_lookup: Mapping[str, dict] = field(default_factory=lambda: MappingProxyType({}))
+    
+    @property
+    def is_empty(self) -> bool:
+        return (
+            not self.prospects
+            and not self.contacts_lookup.get("by_email")
+            and not self.contacts_lookup.get("by_name")
+        )
+
+
 class ProspectMatcher:
     """Service for matching calendar meetings to prospects."""
     
@@ -181,93 +228,170 @@ class ProspectMatcher:
             # Fetch contacts with their prospect info (include name field!)
             # Note: table is "prospect_contacts" not "contacts"
             # Note: contacts have a single "name" field, not first_name/last_name
-            contacts_result = self.supabase.table("prospect_contacts").select(
-                "id, email, name, prospect_id, prospects(id, company_name)"
-            ).eq("organization_id", organization_id).execute()
+            contacts = self._select_all(
+                "prospect_contacts",
+                "id, email, name, prospect_id, prospects(id, company_name)",
+                organization_id
+            )
+            return self.build_contacts_lookup(contacts)
             
-            contacts = contacts_result.data or []
+        except Exception as e:
+            logger.error(f"Error fetching contacts for matching: {e}")
+            return {"by_email": {}, "by_domain": {}, "by_name": {}, "prospect_names": {}}
+    
+    def build_contacts_lookup(self, contacts: List[dict]) -> dict:
+        """Build the contacts lookup structures (see get_contacts_for_matching)."""
+        by_email = {}
+        by_domain = {}
+        by_name = {}  # New: name-based lookup
+        prospect_names = {}
+        
+        for contact in contacts:
+            prospect_id = contact.get("prospect_id")
+            contact_id = contact.get("id")
             
-            by_email = {}
-            by_domain = {}
-            by_name = {}  # New: name-based lookup
-            prospect_names = {}
+            if not prospect_id:
+                continue
             
-            for contact in contacts:
-                prospect_id = contact.get("prospect_id")
-                contact_id = contact.get("id")
-                
-                if not prospect_id:
-                    continue
-                
-                # Store prospect name
-                prospect_data = contact.get("prospects") or {}
-                if prospect_id not in prospect_names:
-                    prospect_names[prospect_id] = prospect_data.get("company_name", "Unknown")
+            # Store prospect name
+            prospect_data = contact.get("prospects") or {}
+            if prospect_id not in prospect_names:
+                prospect_names[prospect_id] = prospect_data.get("company_name", "Unknown")
+            
+            # Email-based lookup
+            email = (contact.get("email") or "").lower().strip()
+            if email:
+                by_email[email] = {
+                    "prospect_id": prospect_id,
+                    "contact_id": contact_id
+                }
                 
-                # Email-based lookup
-                email = (contact.get("email") or "").lower().strip()
-                if email:
-                    by_email[email] = {
+                # Domain lookup
+                domain = self.extract_domain_from_email(email)
+                if domain:
+                    if domain not in by_domain:
+                        by_domain[domain] = []
+                    by_domain[domain].append({
                         "prospect_id": prospect_id,
                         "contact_id": contact_id
-                    }
-                    
-                    # Domain lookup
-                    domain = self.extract_domain_from_email(email)
-                    if domain:
-                        if domain not in by_domain:
-                            by_domain[domain] = []
-                        by_domain[domain].append({
-                            "prospect_id": prospect_id,
-                            "contact_id": contact_id
-                        })
+                    })
+            
+            # Name-based lookup (most important!)
+            # Note: contacts have a single "name" field like "Geert Menting"
+            full_name = (contact.get("name") or "").strip()
+            
+            if full_name:
+                # Split into parts for partial matching
+                name_parts = full_name.split()
+                first_name = name_parts[0] if name_parts else ""
+                last_name = name_parts[-1] if len(name_parts) > 1 else ""
                 
-                # Name-based lookup (most important!)
-                # Note: contacts have a single "name" field like "Geert Menting"
-                full_name = (contact.get("name") or "").strip()
+                contact_info = {
+                    "prospect_id": prospect_id,
+                    "contact_id": contact_id,
+                    "full_name": full_name
+                }
                 
-                if full_name:
-                    # Split into parts for partial matching
-                    name_parts = full_name.split()
-                    first_name = name_parts[0] if name_parts else ""
-                    last_name = name_parts[-1] if len(name_parts) > 1 else ""
-                    
-                    contact_info = {
-                        "prospect_id": prospect_id,
-                        "contact_id": contact_id,
-                        "full_name": full_name
-                    }
-                    
-                    # Index by normalized full name
-                    norm_full = full_name.lower()
-                    if norm_full not in by_name:
-                        by_name[norm_full] = []
-                    by_name[norm_full].append(contact_info)
-                    
-                    # Also index by first name (for partial matches)
-                    if first_name and len(first_name) >= 3:
-                        norm_first = first_name.lower()
-                        if norm_first not in by_name:
-                            by_name[norm_first] = []
-                        by_name[norm_first].append(contact_info)
-                    
-                    # Also index by last name
-                    if last_name and len(last_name) >= 3:
-                        norm_last = last_name.lower()
-                        if norm_last not in by_name:
-                            by_name[norm_last] = []
-                        by_name[norm_last].append(contact_info)
-            
-            return {
-                "by_email": by_email,
-                "by_domain": by_domain,
-                "by_name": by_name,
-                "prospect_names": prospect_names
-            }
+                # Index by normalized full name
+                norm_full = full_name.lower()
+                if norm_full not in by_name:
+                    by_name[norm_full] = []
+                by_name[norm_full].append(contact_info)
+                
+                # Also index by first name (for partial matches)
+                if first_name and len(first_name) >= 3:
+                    norm_first = first_name.lower()
+                    if norm_first not in by_name:
+                        by_name[norm_first] = []
+                    by_name[norm_first].append(contact_info)
+                
+                # Also index by last name
+                if last_name and len(last_name) >= 3:
+                    norm_last = last_name.lower()
+                    if norm_last not in by_name:
+                        by_name[norm_last] = []
+                    by_name[norm_last].append(contact_info)
+        
+        return {
+            "by_email": by_email,
+            "by_domain": by_domain,
+            "by_name": by_name,
+            "prospect_names": prospect_names
+        }
+    
+    def _select_all(self, table: str, columns: str, organization_id: str) -> List[dict]:
+        """Select all rows of an organization, page by page."""
+        rows: List[dict] = []
+        offset = 0
+        while True:
+            page = self.supabase.table(table).select(columns).eq(
+                "organization_id", organization_id
+            ).order("id").range(offset, offset + FETCH_PAGE_SIZE - 1).execute()
+            data = page.data or []
+            rows.extend(data)
+            if len(data) < FETCH_PAGE_SIZE:
+                return rows
+            offset += FETCH_PAGE_SIZE
+    
+    # ==========================================
+    # INDEX
+    # ==========================================
+    
+    async def build_index(
+        self,
+        organization_id: str,
+        contacts_lookup: dict = None
+    ) -> ProspectIndex:
+        """Load prospects and contacts once and build the matching index."""
+        if contacts_lookup is None:
+            contacts_lookup = await self.get_contacts_for_matching(organization_id)
+        
+        prospects = self._select_all(
+            "prospects", "id, company_name, website, contact_email", organization_id
+        )
+        return self.build_index_from_rows(organization_id, prospects, contacts_lookup)
+    
+    def build_index_from_rows(
+        self,
+        organization_id: str,
+        prospects: List[dict],
+        contacts_lookup: dict
+    ) -> ProspectIndex:
+        """Build a ProspectIndex from already loaded prospect rows (no I/O)."""
+        indexed: List[IndexedProspect] = []
+        by_token: Dict[str, List[int]] = {}
+        by_domain: Dict[str, List[int]] = {}
+        
+        for prospect in prospects:
+            i = len(indexed)
+            company_name = prospect.get("company_name") or ""
+            normalized = self.normalize_company_name(company_name)
+            words = frozenset(normalized.split())
+            indexed.append(IndexedProspect(
+                prospect_id=prospect["id"],
+                company_name=company_name,
+                normalized_name=normalized,
+                words=words
+            ))
             
-        except Exception as e:
-            logger.error(f"Error fetching contacts for matching: {e}")
-            return {"by_email": {}, "by_domain": {}, "by_name": {}, "prospect_names": {}}
+            for word in words:
+                by_token.setdefault(word, []).append(i)
+            
+            domains = {
+                self.extract_domain_from_website(prospect.get("website")),
+                self.extract_domain_from_email(prospect.get("contact_email")),
+            }
+            for domain in domains:
+                if domain:
+                    by_domain.setdefault(domain, []).append(i)
+        
+        return ProspectIndex(
+            organization_id=organization_id,
+            prospects=tuple(indexed),
+            by_token=MappingProxyType({k: tuple(v) for k, v in by_token.items()}),
+            by_domain=MappingProxyType({k: tuple(v) for k, v in by_domain.items()}),
+            contacts_lookup=MappingProxyType(dict(contacts_lookup or {}))
+        )
     
     def calculate_contact_match(
         self,
@@ -378,7 +502,8 @@ class ProspectMatcher:
         attendees: List[dict],
         organization_id: str,
         contacts_lookup: dict = None,
-        organizer_email: str = None
+        organizer_email: str = None,
+        index: ProspectIndex = None
     ) -> MatchResult:
         """
         Match a single meeting to prospects in the organization.
@@ -390,10 +515,68 @@ class ProspectMatcher:
         4. Attendee domain matches prospect website/email (70%)
         5. Title contains partial company name (60%)
         
+        Pass a prebuilt index to avoid reloading prospects and contacts.
+        
         Returns MatchResult with best match and all matches above threshold.
         """
         result = MatchResult(meeting_id=meeting_id)
         
+        try:
+            if index is None:
+                index = await self.build_index(organization_id, contacts_lookup)
+            
+            result = self.score_meeting(index, meeting_id, meeting_title, attendees, organizer_email)
+            
+            # Auto-link if confidence is high enough
+            if result.best_match and result.best_match.confidence >= self.AUTO_LINK_THRESHOLD:
+                await self._auto_link_meeting(
+                    meeting_id, 
+                    result.best_match.prospect_id,
+                    result.best_match.confidence,
+                    result.matched_contact_ids
+                )
+                result.auto_linked = True
+                self._log_auto_link(result)
+            
+            return result
+            
+        except Exception as e:
+            logger.error(f"Error matching meeting {meeting_id}: {str(e)}")
+            return result
+    
+    def match_meetings(self, index: ProspectIndex, meetings: List[dict]) -> List[MatchResult]:
+        """
+        Score many meetings against one index (pure, no I/O).
+        
+        Args:
+            index: Index built with build_index()
+            meetings: Rows with id, title, attendees and organizer_email
+        
+        Returns:
+            One MatchResult per meeting, in input order (auto_linked is not set)
+        """
+        return [
+            self.score_meeting(
+                index,
+                meeting["id"],
+                meeting.get("title") or "",
+                meeting.get("attendees") or [],
+                meeting.get("organizer_email")
+            )
+            for meeting in meetings
+        ]
+    
+    def score_meeting(
+        self,
+        index: ProspectIndex,
+        meeting_id: str,
+        meeting_title: str,
+        attendees: List[dict],
+        organizer_email: str = None
+    ) -> MatchResult:
+        """Score one meeting against the index (no I/O, no auto-linking)."""
+        result = MatchResult(meeting_id=meeting_id)
+        
         # Build complete attendees list including organizer
         all_attendees = list(attendees) if attendees else []
         
@@ -401,125 +584,120 @@ class ProspectMatcher:
         if organizer_email:
             org_email = organizer_email.lower().strip()
             # Check if organizer is already in attendees list
-            existing_emails = [a.get('email', '').lower() for a in all_attendees]
+            existing_emails = {(a.get('email') or '').lower() for a in all_attendees}
             if org_email and org_email not in existing_emails:
                 all_attendees.append({"email": org_email, "name": "", "is_organizer": True})
         
-        # Extract emails for domain-based matching against prospects
-        attendee_emails = [
-            a.get('email', '').lower().strip()
-            for a in all_attendees 
-            if a.get('email')
-        ]
+        if index.is_empty:
+            return result
         
-        logger.debug(f"Matching meeting {meeting_id[:8]}... with {len(all_attendees)} attendees")
+        matches: List[ProspectMatch] = []
+        matched_prospect_ids = set()
+        prospect_names = index.contacts_lookup.get("prospect_names", {})
         
-        try:
-            # Fetch contacts lookup if not provided (for batch efficiency)
-            if contacts_lookup is None:
-                contacts_lookup = await self.get_contacts_for_matching(organization_id)
+        # Strategy 1: Contact-based matching by NAME (highest priority!) and email
+        contact_matches, matched_contact_ids = self.calculate_contact_match(
+            all_attendees, index.contacts_lookup
+        )
+        result.matched_contact_ids = matched_contact_ids
+        
+        for prospect_id, confidence, reason in contact_matches:
+            if prospect_id in matched_prospect_ids:
+                continue
+            matched_prospect_ids.add(prospect_id)
             
-            # Fetch all prospects for organization
-            prospects_result = self.supabase.table("prospects").select(
-                "id, company_name, website, contact_email"
-            ).eq("organization_id", organization_id).execute()
+            company_name = prospect_names.get(prospect_id)
+            if not company_name:
+                company_name = next(
+                    (p.company_name for p in index.prospects if p.prospect_id == prospect_id),
+                    None
+                )
             
-            prospects = prospects_result.data or []
-            prospect_map = {p['id']: p for p in prospects}
+            matches.append(ProspectMatch(
+                prospect_id=prospect_id,
+                company_name=company_name or "Unknown",
+                confidence=confidence,
+                match_reason=reason
+            ))
+        
+        # Strategy 2, 4, 5: Prospect-based matching, only for candidates that
+        # share a title word or an attendee email domain
+        title_normalized = self.normalize_company_name(meeting_title) if meeting_title else ""
+        title_words = set(title_normalized.split())
+        
+        domain_hits = set()
+        for attendee in all_attendees:
+            domain = self.extract_domain_from_email((attendee.get('email') or '').lower().strip())
+            if domain:
+                domain_hits.update(index.by_domain.get(domain, ()))
+        
+        candidates = set(domain_hits)
+        for word in title_words:
+            candidates.update(index.by_token.get(word, ()))
+        
+        # Sorted so ties keep the prospect order, like a full scan would
+        for i in sorted(candidates):
+            prospect = index.prospects[i]
+            if prospect.prospect_id in matched_prospect_ids:
+                continue  # Already matched via contacts
             
-            if not prospects and not contacts_lookup.get("by_email") and not contacts_lookup.get("by_name"):
-                return result
+            confidence = 0.0
+            reasons = []
             
-            matches: List[ProspectMatch] = []
-            matched_prospect_ids = set()
+            # Title matching (exact or partial)
+            title_score = self._title_score(title_normalized, title_words, prospect)
+            if title_score > 0:
+                confidence = max(confidence, title_score)
+                reasons.append(f"title match ({title_score:.0%})")
             
-            # Strategy 1: Contact-based matching by NAME (highest priority!) and email
-            contact_matches, matched_contact_ids = self.calculate_contact_match(all_attendees, contacts_lookup)
-            result.matched_contact_ids = matched_contact_ids
+            # Email domain matching against prospect website/email
+            if i in domain_hits:
+                confidence = max(confidence, self.WEIGHT_EMAIL_DOMAIN)
+                reasons.append(f"email domain match ({self.WEIGHT_EMAIL_DOMAIN:.0%})")
             
-            for prospect_id, confidence, reason in contact_matches:
-                if prospect_id in matched_prospect_ids:
-                    continue
-                matched_prospect_ids.add(prospect_id)
-                
-                # Get company name
-                company_name = contacts_lookup.get("prospect_names", {}).get(prospect_id)
-                if not company_name and prospect_id in prospect_map:
-                    company_name = prospect_map[prospect_id].get("company_name", "Unknown")
-                
+            # Only include if we have some confidence
+            if confidence >= 0.3:
                 matches.append(ProspectMatch(
-                    prospect_id=prospect_id,
-                    company_name=company_name or "Unknown",
+                    prospect_id=prospect.prospect_id,
+                    company_name=prospect.company_name,
                     confidence=confidence,
-                    match_reason=reason
+                    match_reason=', '.join(reasons)
                 ))
-            
-            # Strategy 2, 4, 5: Prospect-based matching
-            for prospect in prospects:
-                if prospect['id'] in matched_prospect_ids:
-                    continue  # Already matched via contacts
-                
-                confidence = 0.0
-                reasons = []
-                
-                # Title matching (exact or partial)
-                title_score = self.calculate_title_match(
-                    meeting_title, 
-                    prospect.get('company_name', '')
-                )
-                if title_score > 0:
-                    confidence = max(confidence, title_score)
-                    reasons.append(f"title match ({title_score:.0%})")
-                
-                # Email domain matching against prospect website/email
-                email_score = self.calculate_email_domain_match(
-                    attendee_emails,
-                    prospect.get('website'),
-                    prospect.get('contact_email')
-                )
-                if email_score > 0:
-                    confidence = max(confidence, email_score)
-                    reasons.append(f"email domain match ({email_score:.0%})")
-                
-                # Only include if we have some confidence
-                if confidence >= 0.3:
-                    matches.append(ProspectMatch(
-                        prospect_id=prospect['id'],
-                        company_name=prospect['company_name'],
-                        confidence=confidence,
-                        match_reason=', '.join(reasons)
-                    ))
-            
-            # Sort by confidence descending
-            matches.sort(key=lambda m: m.confidence, reverse=True)
-            
-            result.all_matches = matches
-            
-            if matches:
-                result.best_match = matches[0]
-                
-                # Auto-link if confidence is high enough
-                if result.best_match.confidence >= self.AUTO_LINK_THRESHOLD:
-                    await self._auto_link_meeting(
-                        meeting_id, 
-                        result.best_match.prospect_id,
-                        result.best_match.confidence,
-                        result.matched_contact_ids
-                    )
-                    result.auto_linked = True
-                    contact_info = f", contacts: {len(result.matched_contact_ids)}" if result.matched_contact_ids else ""
-                    logger.info(
-                        f"Auto-linked meeting {meeting_id} to prospect "
-                        f"{result.best_match.company_name} "
-                        f"(confidence: {result.best_match.confidence:.0%}, "
-                        f"reason: {result.best_match.match_reason}{contact_info})"
-                    )
-            
-            return result
-            
-        except Exception as e:
-            logger.error(f"Error matching meeting {meeting_id}: {str(e)}")
-            return result
+        
+        # Sort by confidence descending
+        matches.sort(key=lambda m: m.confidence, reverse=True)
+        
+        result.all_matches = matches
+        if matches:
+            result.best_match = matches[0]
+        
+        return result
+    
+    def _title_score(self, title_normalized: str, title_words: set, prospect: IndexedProspect) -> float:
+        """calculate_title_match() on precomputed normalized values."""
+        if not title_normalized or not prospect.words:
+            return 0.0
+        
+        # Exact match (full company name in title)
+        if prospect.normalized_name in title_normalized:
+            return self.WEIGHT_TITLE_EXACT
+        
+        # At least half of the company's words appear in the title
+        overlap_ratio = len(prospect.words & title_words) / len(prospect.words)
+        if overlap_ratio >= 0.5:
+            return self.WEIGHT_TITLE_PARTIAL * overlap_ratio
+        
+        return 0.0
+    
+    @staticmethod
+    def _log_auto_link(result: MatchResult) -> None:
+        contact_info = f", contacts: {len(result.matched_contact_ids)}" if result.matched_contact_ids else ""
+        logger.info(
+            f"Auto-linked meeting {result.meeting_id} to prospect "
+            f"{result.best_match.company_name} "
+            f"(confidence: {result.best_match.confidence:.0%}, "
+            f"reason: {result.best_match.match_reason}{contact_info})"
+        )
     
     async def _auto_link_meeting(
         self, 
@@ -546,21 +724,83 @@ class ProspectMatcher:
         except Exception as e:
             logger.error(f"Failed to auto-link meeting {meeting_id}: {str(e)}")
     
+    @classmethod
+    def group_auto_links(cls, results: List[MatchResult]) -> Dict[tuple, List[MatchResult]]:
+        """
+        Results to auto-link, grouped by identical link values.
+        
+        Keys are (prospect_id, confidence, contact_ids tuple); each group is
+        written with one update per LINK_UPDATE_BATCH_SIZE meetings.
+        """
+        groups: Dict[tuple, List[MatchResult]] = defaultdict(list)
+        for r in results:
+            if r.best_match and r.best_match.confidence >= cls.AUTO_LINK_THRESHOLD:
+                key = (r.best_match.prospect_id, r.best_match.confidence, tuple(r.matched_contact_ids or ()))
+                groups[key].append(r)
+        return groups
+    
+    async def _bulk_link_meetings(self, results: List[MatchResult]) -> int:
+        """
+        Write all auto-links with bulk updates on calendar_meetings.
+        
+        Meetings with identical link values (prospect, confidence, contacts)
+        share one update(...).in_("id", ids), so only the link columns are
+        written. Meetings linked in the meantime (prospect_id no longer null)
+        are left alone.
+        
+        Returns:
+            Number of meetings linked (results are marked auto_linked)
+        """
+        linked = 0
+        for (prospect_id, confidence, contact_ids), group in self.group_auto_links(results).items():
+            update_data = {
+                "prospect_id": prospect_id,
+                "match_confidence": confidence,
+                "prospect_link_type": "auto"
+            }
+            # Existing contact links are kept when no contacts matched
+            if contact_ids:
+                update_data["contact_ids"] = list(contact_ids)
+            
+            for start in range(0, len(group), LINK_UPDATE_BATCH_SIZE):
+                batch = group[start:start + LINK_UPDATE_BATCH_SIZE]
+                try:
+                    result = self.supabase.table("calendar_meetings").update(
+                        update_data
+                    ).in_(
+                        "id", [r.meeting_id for r in batch]
+                    ).is_(
+                        "prospect_id", "null"
+                    ).execute()
+                except Exception as e:
+                    logger.error(f"Failed to bulk link {len(batch)} meetings: {str(e)}")
+                    continue
+                
+                updated_ids = {row["id"] for row in (result.data or [])}
+                for r in batch:
+                    if r.meeting_id in updated_ids:
+                        r.auto_linked = True
+                        self._log_auto_link(r)
+                linked += len(updated_ids)
+        
+        return linked
+    
     async def match_all_unlinked(self, organization_id: str) -> List[MatchResult]:
         """
         Match all unlinked meetings to prospects.
         
-        Pre-fetches contacts lookup for efficiency when processing multiple meetings.
+        Builds the organization's index once, scores every meeting in memory
+        and writes the auto-links in bulk.
         """
         results = []
         
         try:
-            # Pre-fetch contacts lookup (once for all meetings)
-            contacts_lookup = await self.get_contacts_for_matching(organization_id)
+            index = await self.build_index(organization_id)
             
             logger.debug(
-                f"Contacts lookup: {len(contacts_lookup.get('by_email', {}))} emails, "
-                f"{len(contacts_lookup.get('by_domain', {}))} domains"
+                f"Prospect index: {len(index.prospects)} prospects, "
+                f"{len(index.by_token)} tokens, {len(index.by_domain)} domains, "
+                f"{len(index.contacts_lookup.get('by_email', {}))} contact emails"
             )
             
             # Fetch unlinked meetings (including organizer_email)
@@ -576,19 +816,10 @@ class ProspectMatcher:
             
             logger.info(f"Matching {len(meetings)} unlinked meetings for org {organization_id[:8]}...")
             
-            for meeting in meetings:
-                result = await self.match_meeting(
-                    meeting_id=meeting['id'],
-                    meeting_title=meeting.get('title', ''),
-                    attendees=meeting.get('attendees', []),
-                    organization_id=organization_id,
-                    contacts_lookup=contacts_lookup,  # Reuse for efficiency
-                    organizer_email=meeting.get('organizer_email')  # Include organizer!
-                )
-                results.append(result)
+            results = self.match_meetings(index, meetings)
+            auto_linked = await self._bulk_link_meetings(results)
             
             # Log summary
-            auto_linked = sum(1 for r in results if r.auto_linked)
             logger.info(f"Matching complete: {auto_linked}/{len(results)} auto-linked")
             
             return results
@@ -596,4 +827,3 @@ class ProspectMatcher:
         except Exception as e:
             logger.error(f"Error matching unlinked meetings: {str(e)}")
             return results
-
@@ -6,6 +6,8 @@ from typing import Optional, Dict, Any, List
 from supabase import Client
 import logging
 from app.database import get_supabase_service
+from app.services.prospect_autocomplete import get_prospect_autocomplete
+from app.services.prospect_hub import invalidate_prospect_hub
 
 logger = logging.getLogger(__name__)
 
@@ -44,6 +46,12 @@ class ProspectService:
             ).execute()
             
             if result.data:
+                # Existing prospects keep their indexed name
+                get_prospect_autocomplete().upsert_prospect(
+                    organization_id,
+                    {"id": result.data, "company_name": company_name.strip()},
+                    overwrite=False
+                )
                 return result.data
             return None
             
@@ -178,6 +186,7 @@ class ProspectService:
                 .eq("id", prospect_id)\
                 .eq("organization_id", organization_id)\
                 .execute()
+            invalidate_prospect_hub(prospect_id)
             
             if response.data and len(response.data) > 0:
                 return response.data[0]
@@ -208,6 +217,7 @@ class ProspectService:
                 .eq("id", prospect_id)\
                 .eq("organization_id", organization_id)\
                 .execute()
+            invalidate_prospect_hub(prospect_id)
             
             return True
             
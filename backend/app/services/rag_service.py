@@ -9,7 +9,8 @@ Enhanced with Profile Context for personalized outputs.
 
 from typing import List, Dict, Any, Optional
 import logging
-from app.database import get_supabase_service
+from app.database import get_supabase_service, get_supabase_async
+from app.services.prospect_autocomplete import get_prospect_autocomplete
 
 logger = logging.getLogger(__name__)
 
@@ -28,8 +29,8 @@ def get_embeddings_service():
 def get_vector_store():
     global _vector_store
     if _vector_store is None:
-        from app.services.vector_store import VectorStore
-        _vector_store = VectorStore()
+        from app.services.vector_store import get_vector_store as get_configured_vector_store
+        _vector_store = get_configured_vector_store()
     return _vector_store
 
 def get_context_service():
@@ -100,7 +101,8 @@ class RAGService:
         """
         Find existing research brief for company.
         
-        Uses exact matching to prevent cross-prospect data leakage.
+        Uses exact matching to prevent cross-prospect data leakage; near
+        spellings only resolve to a prospect with a high autocomplete score.
         
         Args:
             company_name: Prospect company name
@@ -110,8 +112,10 @@ class RAGService:
             Research brief data if found, None otherwise
         """
         try:
+            db = await get_supabase_async()
+            
             # First try exact match (case-sensitive)
-            response = self.supabase.table("research_briefs").select(
+            response = await db.table("research_briefs").select(
                 "id, company_name, brief_content, created_at"
             ).eq(
                 "organization_id", organization_id
@@ -129,7 +133,7 @@ class RAGService:
                 return research
             
             # Fallback: case-insensitive exact match
-            response = self.supabase.table("research_briefs").select(
+            response = await db.table("research_briefs").select(
                 "id, company_name, brief_content, created_at"
             ).eq(
                 "organization_id", organization_id
@@ -146,6 +150,31 @@ class RAGService:
                 logger.info(f"Found research brief for {company_name} (case-insensitive)")
                 return research
             
+            # Fallback: near-spelling of a known prospect (whole-name
+            # similarity only - a prefix such as "Acme" for "Acme Logistics"
+            # does not resolve, so a brief is never taken from another company)
+            match = await get_prospect_autocomplete().best_match(organization_id, company_name)
+            if match:
+                response = await db.table("research_briefs").select(
+                    "id, company_name, brief_content, created_at"
+                ).eq(
+                    "organization_id", organization_id
+                ).eq(
+                    "prospect_id", match["id"]
+                ).eq(
+                    "status", "completed"
+                ).order(
+                    "created_at", desc=True
+                ).limit(1).execute()
+                
+                if response.data and len(response.data) > 0:
+                    research = response.data[0]
+                    logger.info(
+                        f"Found research brief for {company_name} via prospect "
+                        f"'{match['company_name']}' (score {match['score']})"
+                    )
+                    return research
+            
             logger.info(f"No research brief found for {company_name}")
             return None
                 
@@ -485,10 +485,10 @@ class ResearchOrchestrator:
         """
         try:
             from app.services.embeddings import EmbeddingsService
-            from app.services.vector_store import VectorStore
+            from app.services.vector_store import get_vector_store
             
             embeddings = EmbeddingsService()
-            vector_store = VectorStore()
+            vector_store = get_vector_store()
             
             # Build query based on prospect and what we sell
             products = ", ".join([
@@ -0,0 +1,172 @@
+"""
+Resumable Storage Uploads
+
+Thin client for Supabase Storage's resumable (TUS 1.0) upload endpoint, used
+to stream large files into storage in fixed-size parts without buffering
+them in worker memory:
+
+- create_upload(): registers an upload of a known length, returns its URL
+- get_offset(): bytes storage has acknowledged so far (source of truth for
+  resuming)
+- append_part(): PATCHes one part at a given offset; the body can be an
+  async iterator (e.g. an incoming request stream) so it is passed through
+  without being held in memory
+- upload_file(): uploads an UploadFile (spooled to disk) part by part
+
+Supabase requires every part except the last to be exactly
+STORAGE_PART_SIZE bytes. Upload URLs are valid for 24 hours.
+"""
+
+import base64
+import logging
+from typing import AsyncIterable, Optional, Union
+from urllib.parse import urljoin
+
+import httpx
+
+from app.database import get_config
+
+logger = logging.getLogger(__name__)
+
+# Fixed part size required by Supabase Storage's TUS endpoint
+STORAGE_PART_SIZE = 6 * 1024 * 1024
+
+# Upload URLs expire after this long on the storage side
+UPLOAD_URL_TTL_HOURS = 24
+
+TUS_VERSION = "1.0.0"
+
+# Generous read/write timeouts for slow mobile connections
+_TIMEOUT = httpx.Timeout(60.0, connect=10.0)
+
+
+class StorageUploadError(Exception):
+    """Storage rejected or failed a resumable upload request."""
+    
+    def __init__(self, message: str, status_code: Optional[int] = None):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class OffsetMismatchError(StorageUploadError):
+    """The part's offset does not match what storage has received."""
+
+
+def _endpoint() -> str:
+    return f"{get_config().supabase_url.rstrip('/')}/storage/v1/upload/resumable"
+
+
+def _headers(**extra: str) -> dict:
+    key = get_config().service_key
+    return {
+        "Authorization": f"Bearer {key}",
+        "apikey": key,
+        "Tus-Resumable": TUS_VERSION,
+        **extra,
+    }
+
+
+def _metadata(**values: str) -> str:
+    return ",".join(
+        f"{key} {base64.b64encode(value.encode()).decode()}" for key, value in values.items()
+    )
+
+
+async def create_upload(
+    bucket: str,
+    object_name: str,
+    length: int,
+    content_type: str,
+    upsert: bool = True
+) -> str:
+    """Register a resumable upload and return its upload URL."""
+    headers = _headers(**{
+        "Upload-Length": str(length),
+        "Upload-Metadata": _metadata(
+            bucketName=bucket,
+            objectName=object_name,
+            contentType=content_type,
+            cacheControl="3600",
+        ),
+        "x-upsert": "true" if upsert else "false",
+    })
+    
+    async with httpx.AsyncClient(timeout=_TIMEOUT) as client:
+        response = await client.post(_endpoint(), headers=headers)
+    
+    if response.status_code != 201 or "location" not in response.headers:
+        raise StorageUploadError(
+            f"Could not create upload for {object_name}: {response.status_code} {response.text[:200]}",
+            response.status_code,
+        )
+    return urljoin(_endpoint() + "/", response.headers["location"])
+
+
+async def get_offset(upload_url: str) -> Optional[int]:
+    """Bytes received by storage, or None if the upload no longer exists."""
+    async with httpx.AsyncClient(timeout=_TIMEOUT) as client:
+        response = await client.head(upload_url, headers=_headers())
+    
+    if response.status_code in (404, 410):
+        return None
+    if response.status_code >= 400 or "upload-offset" not in response.headers:
+        raise StorageUploadError(f"Could not read upload offset: {response.status_code}", response.status_code)
+    return int(response.headers["upload-offset"])
+
+
+async def append_part(
+    upload_url: str,
+    offset: int,
+    body: Union[bytes, AsyncIterable[bytes]],
+    length: int
+) -> int:
+    """
+    Append one part at `offset` and return the new offset.
+    
+    Raises OffsetMismatchError if storage is at a different offset (the
+    part was already received, or an earlier one is missing).
+    """
+    headers = _headers(**{
+        "Upload-Offset": str(offset),
+        "Content-Type": "application/offset+octet-stream",
+        # Explicit length so streamed bodies are not sent chunked
+        "Content-Length": str(length),
+    })
+    
+    async with httpx.AsyncClient(timeout=_TIMEOUT) as client:
+        response = await client.patch(upload_url, headers=headers, content=body)
+    
+    if response.status_code == 409:
+        raise OffsetMismatchError(f"Upload offset mismatch at {offset}", 409)
+    if response.status_code in (404, 410):
+        raise StorageUploadError("Upload expired or not found", response.status_code)
+    if response.status_code >= 400:
+        raise StorageUploadError(
+            f"Part upload failed: {response.status_code} {response.text[:200]}",
+            response.status_code,
+        )
+    return int(response.headers.get("upload-offset", offset + length))
+
+
+async def upload_file(
+    bucket: str,
+    object_name: str,
+    file,
+    length: int,
+    content_type: str
+) -> None:
+    """
+    Upload a file in STORAGE_PART_SIZE parts (one part in memory at a time).
+    
+    `file` is anything with an async read(size), e.g. FastAPI's UploadFile.
+    """
+    upload_url = await create_upload(bucket, object_name, length, content_type)
+    
+    offset = 0
+    while offset < length:
+        part = await file.read(STORAGE_PART_SIZE)
+        if not part:
+            raise StorageUploadError(f"File ended at {offset} of {length} bytes")
+        offset = await append_part(upload_url, offset, part, len(part))
+    
+    logger.info(f"Uploaded {length} bytes to {bucket}/{object_name} in {-(-length // STORAGE_PART_SIZE)} parts")
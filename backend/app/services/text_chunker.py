@@ -1,15 +1,45 @@
 """
 Text chunking service for splitting documents into manageable chunks.
 Uses tiktoken for accurate token counting.
+
+The document is tokenized once; chunks are then cut from the original
+string by character span (no re-decoding), and cut points prefer, in order:
+headings, paragraph breaks, line breaks and sentence ends within the last
+half of each window.
 """
 
+import re
 import tiktoken
-from typing import List, Dict
+from bisect import bisect_left, bisect_right
+from functools import lru_cache
+from typing import List, Dict, Iterable, Iterator, Tuple
+
+
+# Boundary priorities (higher = better place to cut)
+_HEADING = 4
+_PARAGRAPH = 3
+_LINE = 2
+_SENTENCE = 1
+
+# Markdown headings, or a short title-like line right after a blank line
+_HEADING_RE = re.compile(r"(?m)^(?:#{1,6}\s|(?<=\n\n)[^\n]{1,80}\n(?=\S))")
+_PARAGRAPH_RE = re.compile(r"\n[ \t]*\n")
+_LINE_RE = re.compile(r"\n")
+_SENTENCE_RE = re.compile(r"[.!?…][\"')\]]?(?=\s)")
+
+# A chunk is never cut before this fraction of chunk_size
+_MIN_FILL = 0.5
+
+
+@lru_cache(maxsize=4)
+def get_encoding(encoding_name: str = "cl100k_base"):
+    """Process-wide tiktoken encoding (loading one is expensive)."""
+    return tiktoken.get_encoding(encoding_name)
 
 
 class TextChunker:
     """Split text into chunks with overlap for better context preservation."""
-    
+
     def __init__(
         self,
         chunk_size: int = 500,
@@ -18,7 +48,7 @@ class TextChunker:
     ):
         """
         Initialize text chunker.
-        
+
         Args:
             chunk_size: Target size of each chunk in tokens
             chunk_overlap: Number of tokens to overlap between chunks
@@ -26,15 +56,15 @@ class TextChunker:
         """
         self.chunk_size = chunk_size
         self.chunk_overlap = chunk_overlap
-        self.encoding = tiktoken.get_encoding(encoding_name)
-    
+        self.encoding = get_encoding(encoding_name)
+
     def chunk_text(self, text: str) -> List[Dict[str, any]]:
         """
         Split text into chunks with overlap.
-        
+
         Args:
             text: Text to chunk
-            
+
         Returns:
             List of chunks, each containing:
                 - content: The chunk text
@@ -43,43 +73,153 @@ class TextChunker:
         """
         if not text or not text.strip():
             return []
-        
-        # Tokenize the entire text
-        tokens = self.encoding.encode(text)
-        
-        chunks = []
-        start_idx = 0
+
+        spans, _ = self._plan(text, final=True)
+        return [
+            {"content": content, "token_count": token_count, "chunk_index": i}
+            for i, (content, token_count) in enumerate(spans)
+        ]
+
+    def chunk_stream(self, blocks: Iterable[str]) -> Iterator[Dict[str, any]]:
+        """
+        Chunk a stream of text blocks (e.g. PDF pages) incrementally.
+
+        Produces the same chunks as chunk_text() on the joined text, but only
+        buffers roughly one window plus the current block, and yields each
+        chunk as soon as the text after it is known.
+
+        Args:
+            blocks: Iterable of text blocks in document order
+
+        Yields:
+            Chunk dicts (content, token_count, chunk_index)
+        """
+        pending = ""
         chunk_index = 0
-        
-        while start_idx < len(tokens):
-            # Get chunk tokens
-            end_idx = start_idx + self.chunk_size
-            chunk_tokens = tokens[start_idx:end_idx]
-            
-            # Decode back to text
-            chunk_text = self.encoding.decode(chunk_tokens)
-            
-            # Create chunk object
-            chunks.append({
-                "content": chunk_text,
-                "token_count": len(chunk_tokens),
-                "chunk_index": chunk_index
-            })
-            
-            # Move to next chunk with overlap
-            start_idx += self.chunk_size - self.chunk_overlap
-            chunk_index += 1
-        
-        return chunks
-    
+        first = True
+
+        for block in blocks:
+            if not block or not block.strip():
+                continue
+            pending += block if first else "\n\n" + block
+            first = False
+
+            # Only plan once there is more than a full window of lookahead
+            if len(pending) < self.chunk_size * 8:
+                continue
+            spans, consumed = self._plan(pending, final=False)
+            for content, token_count in spans:
+                yield {"content": content, "token_count": token_count, "chunk_index": chunk_index}
+                chunk_index += 1
+            pending = pending[consumed:]
+
+        if pending.strip():
+            spans, _ = self._plan(pending, final=True)
+            for content, token_count in spans:
+                yield {"content": content, "token_count": token_count, "chunk_index": chunk_index}
+                chunk_index += 1
+
     def count_tokens(self, text: str) -> int:
         """
         Count tokens in text.
-        
+
         Args:
             text: Text to count tokens for
-            
+
         Returns:
             Number of tokens
         """
-        return len(self.encoding.encode(text))
+        return len(self.encoding.encode_ordinary(text))
+
+    # ==========================================
+    # PLANNING
+    # ==========================================
+
+    def _token_offsets(self, text: str, tokens: List[int]) -> List[int]:
+        """Character offset where each token starts, plus len(text) at the end."""
+        _, offsets = self.encoding.decode_with_offsets(tokens)
+        return offsets + [len(text)]
+
+    @staticmethod
+    def _boundaries(text: str, offsets: List[int]) -> Dict[int, List[int]]:
+        """Token indices where a chunk may end, grouped by priority."""
+        def to_tokens(positions: Iterable[int]) -> List[int]:
+            # First token starting at or after the boundary
+            return sorted({bisect_left(offsets, p) for p in positions})
+
+        return {
+            _HEADING: to_tokens(m.start() for m in _HEADING_RE.finditer(text)),
+            _PARAGRAPH: to_tokens(m.start() for m in _PARAGRAPH_RE.finditer(text)),
+            _LINE: to_tokens(m.start() for m in _LINE_RE.finditer(text)),
+            _SENTENCE: to_tokens(m.end() for m in _SENTENCE_RE.finditer(text)),
+        }
+
+    def _plan(self, text: str, final: bool) -> Tuple[List[Tuple[str, int]], int]:
+        """
+        Plan chunk spans over text.
+
+        Args:
+            text: Text to split
+            final: If False, stop before the last (incomplete) window so the
+                caller can append more text and plan again
+
+        Returns:
+            (list of (content, token_count), character offset consumed)
+        """
+        tokens = self.encoding.encode_ordinary(text)
+        n = len(tokens)
+        if n == 0:
+            return [], len(text)
+
+        offsets = self._token_offsets(text, tokens)
+        boundaries = self._boundaries(text, offsets)
+        min_fill = max(1, int(self.chunk_size * _MIN_FILL))
+
+        spans: List[Tuple[str, int]] = []
+        start = 0
+
+        while start < n:
+            end = start + self.chunk_size
+            if end >= n:
+                if not final:
+                    break
+                cut = n
+            else:
+                cut = self._best_cut(boundaries, start + min_fill, end)
+
+            content = text[offsets[start]:offsets[cut]].strip()
+            if content:
+                spans.append((content, cut - start))
+            if cut >= n:
+                start = n
+                break
+
+            start = self._next_start(boundaries, cut, start)
+
+        return spans, offsets[start]
+
+    @staticmethod
+    def _best_cut(boundaries: Dict[int, List[int]], lo: int, hi: int) -> int:
+        """Latest boundary in [lo, hi], preferring higher priorities; else hi."""
+        for priority in (_HEADING, _PARAGRAPH, _LINE, _SENTENCE):
+            candidates = boundaries[priority]
+            j = bisect_right(candidates, hi) - 1
+            if j >= 0 and candidates[j] >= lo:
+                return candidates[j]
+        return hi
+
+    def _next_start(self, boundaries: Dict[int, List[int]], cut: int, start: int) -> int:
+        """Start of the next chunk: cut minus overlap, snapped to a sentence start."""
+        if self.chunk_overlap <= 0:
+            return cut
+
+        lo = max(start + 1, cut - self.chunk_overlap)
+        best = None
+        for priority in (_HEADING, _PARAGRAPH, _LINE, _SENTENCE):
+            candidates = boundaries[priority]
+            j = bisect_left(candidates, lo)
+            if j < len(candidates) and candidates[j] < cut:
+                best = candidates[j] if best is None else min(best, candidates[j])
+        if best is not None:
+            return best
+        return lo if lo < cut else cut
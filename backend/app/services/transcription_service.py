@@ -4,22 +4,48 @@ Transcription Service - Audio to text using Deepgram
 Handles audio file transcription with speaker diarization.
 Falls back to OpenAI Whisper if Deepgram is not configured.
 
-Includes automatic webm -> mp3 conversion for browser recordings.
+Every recording is first transcoded to speech-optimized mp3 with ffmpeg
+(see audio_processing). Recordings longer than TRANSCRIPTION_CHUNK_MINUTES
+are split on silences and the chunks are transcribed concurrently, then
+stitched back together:
+
+- timestamps are shifted by each chunk's offset
+- each chunk after the first starts TRANSCRIPTION_CHUNK_OVERLAP_SECONDS
+  before its cut; diarization labels in that overlap are matched against
+  the already stitched speakers so "Speaker 2" stays the same person across
+  chunks, then the overlap is dropped
 """
 
 import os
+import asyncio
 import logging
 import httpx
-import subprocess
-import tempfile
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Tuple, Union
 from dataclasses import dataclass
 
+from app.services.audio_processing import (
+    AudioProcessingError,
+    FFmpegNotFoundError,
+    TranscodedAudio,
+    cut_chunk,
+    plan_chunks,
+    read_file,
+    transcode,
+)
+
 logger = logging.getLogger(__name__)
 
 # Timeout for transcription API calls (5 minutes for long audio)
 TRANSCRIPTION_TIMEOUT = 300
 
+# Recordings longer than this are split and transcribed in parallel
+TRANSCRIPTION_CHUNK_MINUTES = float(os.getenv("TRANSCRIPTION_CHUNK_MINUTES", "10"))
+TRANSCRIPTION_PARALLEL_CHUNKS = int(os.getenv("TRANSCRIPTION_PARALLEL_CHUNKS", "6"))
+# Audio shared between neighbouring chunks, used to line up speaker labels
+TRANSCRIPTION_CHUNK_OVERLAP_SECONDS = float(os.getenv("TRANSCRIPTION_CHUNK_OVERLAP_SECONDS", "20"))
+# Attempts per chunk request (transient provider errors)
+TRANSCRIPTION_CHUNK_ATTEMPTS = 3
+
 
 @dataclass
 class TranscriptionSegment:
@@ -89,12 +115,124 @@ class TranscriptionService:
         Returns:
             TranscriptionResult
         """
+        self._require_provider()
+        try:
+            return await self._transcribe_transcoded(audio_data, filename, language)
+        except AudioProcessingError as e:
+            # Send the original file as-is (providers accept most formats)
+            self._log_transcode_fallback(filename, e)
+            return await self._transcribe_prepared(audio_data, filename, language)
+    
+    async def transcribe_audio_stream(
+        self,
+        audio_url: str,
+        filename: str,
+        language: str = "en"
+    ) -> TranscriptionResult:
+        """
+        Transcribe a remote recording without loading it into memory.
+        
+        ffmpeg reads the URL directly; only the transcoded chunks being
+        uploaded to the provider are held in memory.
+        
+        Args:
+            audio_url: Signed URL to the audio file (Supabase Storage)
+            filename: Original filename
+            language: Language code
+            
+        Returns:
+            TranscriptionResult
+        """
+        self._require_provider()
+        try:
+            return await self._transcribe_transcoded(audio_url, filename, language)
+        except AudioProcessingError as e:
+            self._log_transcode_fallback(filename, e)
+            return await self.transcribe_audio(audio_url, language)
+    
+    def _require_provider(self) -> None:
+        if not self.deepgram_api_key and not self.openai_api_key:
+            raise ValueError("No transcription API configured")
+    
+    def _log_transcode_fallback(self, filename: str, error: AudioProcessingError) -> None:
+        if isinstance(error, FFmpegNotFoundError):
+            logger.warning("ffmpeg not found, transcribing without conversion")
+        else:
+            logger.error(f"Audio conversion failed for {filename}, transcribing original: {error}")
+    
+    async def _transcribe_prepared(
+        self,
+        audio_data: bytes,
+        filename: str,
+        language: str
+    ) -> TranscriptionResult:
+        """Send audio to the configured provider in a single request."""
         if self.deepgram_api_key:
             return await self._transcribe_bytes_deepgram(audio_data, filename, language)
-        elif self.openai_api_key:
-            return await self._transcribe_bytes_whisper(audio_data, filename, language)
-        else:
-            raise ValueError("No transcription API configured")
+        return await self._transcribe_bytes_whisper(audio_data, filename, language)
+    
+    async def _transcribe_transcoded(
+        self,
+        source: Union[bytes, str],
+        filename: str,
+        language: str
+    ) -> TranscriptionResult:
+        """Transcode, then transcribe in one request or in parallel chunks."""
+        async with transcode(source, filename) as audio:
+            chunks = plan_chunks(audio.duration, audio.silences, TRANSCRIPTION_CHUNK_MINUTES * 60)
+            
+            if len(chunks) == 1:
+                audio_data = await asyncio.to_thread(read_file, audio.path)
+                return await self._transcribe_prepared(audio_data, "audio.mp3", language)
+            
+            return await self._transcribe_chunks(audio, chunks, language)
+    
+    async def _transcribe_chunks(
+        self,
+        audio: TranscodedAudio,
+        chunks: List[Tuple[float, float]],
+        language: str
+    ) -> TranscriptionResult:
+        """Transcribe chunks concurrently and stitch the results."""
+        # Whisper has no diarization, so there is nothing to line up
+        overlap = TRANSCRIPTION_CHUNK_OVERLAP_SECONDS if self.deepgram_api_key else 0.0
+        semaphore = asyncio.Semaphore(TRANSCRIPTION_PARALLEL_CHUNKS)
+        
+        logger.info(
+            f"Transcribing {audio.duration / 60:.1f} min recording in {len(chunks)} chunks "
+            f"({TRANSCRIPTION_PARALLEL_CHUNKS} parallel)"
+        )
+        
+        async def transcribe_chunk(index: int, start: float, end: float) -> Tuple[float, TranscriptionResult]:
+            offset = max(0.0, start - overlap) if index else 0.0
+            async with semaphore:
+                path = await cut_chunk(audio, offset, end, f"chunk-{index:03d}")
+                try:
+                    audio_data = await asyncio.to_thread(read_file, path)
+                finally:
+                    os.unlink(path)
+                
+                for attempt in range(1, TRANSCRIPTION_CHUNK_ATTEMPTS + 1):
+                    try:
+                        result = await self._transcribe_prepared(audio_data, "audio.mp3", language)
+                        return offset, result
+                    except (httpx.TransportError, httpx.HTTPStatusError) as e:
+                        retryable = not isinstance(e, httpx.HTTPStatusError) or (
+                            e.response.status_code == 429 or e.response.status_code >= 500
+                        )
+                        if not retryable or attempt == TRANSCRIPTION_CHUNK_ATTEMPTS:
+                            raise
+                        logger.warning(f"Chunk {index} transcription failed (attempt {attempt}), retrying: {e}")
+                        await asyncio.sleep(2 ** attempt)
+        
+        parts = await asyncio.gather(*(
+            transcribe_chunk(index, start, end) for index, (start, end) in enumerate(chunks)
+        ))
+        
+        return _stitch_chunks(
+            [(offset, start, result) for (offset, result), (start, _) in zip(parts, chunks)],
+            audio.duration
+        )
     
     async def _transcribe_with_deepgram(
         self,
@@ -142,12 +280,6 @@ class TranscriptionService:
     ) -> TranscriptionResult:
         """Transcribe using Deepgram API from bytes"""
         
-        # Convert webm to mp3 for better Deepgram compatibility
-        ext = filename.lower().split(".")[-1] if "." in filename else ""
-        if ext in ["webm", "ogg"]:
-            logger.info(f"Converting {ext} to mp3 for Deepgram compatibility")
-            audio_data, filename = self._convert_to_mp3(audio_data, filename)
-        
         url = "https://api.deepgram.com/v1/listen"
         
         params = {
@@ -182,65 +314,6 @@ class TranscriptionService:
         
         return self._parse_deepgram_response(result)
     
-    def _convert_to_mp3(self, audio_data: bytes, filename: str) -> tuple[bytes, str]:
-        """Convert audio to mp3 using ffmpeg for better Deepgram compatibility."""
-        try:
-            # Create temp files for input and output
-            ext = filename.lower().split(".")[-1] if "." in filename else "webm"
-            
-            with tempfile.NamedTemporaryFile(suffix=f".{ext}", delete=False) as input_file:
-                input_file.write(audio_data)
-                input_path = input_file.name
-            
-            output_path = input_path.rsplit(".", 1)[0] + ".mp3"
-            
-            # Run ffmpeg conversion with high quality for transcription
-            result = subprocess.run(
-                [
-                    "ffmpeg", "-y",  # Overwrite output
-                    "-i", input_path,
-                    "-acodec", "libmp3lame",
-                    "-ab", "192k",   # 192kbps for better quality
-                    "-ar", "16000",  # 16kHz - optimal for speech recognition
-                    "-ac", "1",      # Mono channel
-                    "-af", "highpass=f=200,lowpass=f=3000",  # Focus on voice frequencies
-                    output_path
-                ],
-                capture_output=True,
-                timeout=60  # 1 minute timeout
-            )
-            
-            if result.returncode != 0:
-                logger.error(f"ffmpeg conversion failed: {result.stderr.decode()}")
-                # Return original data if conversion fails
-                return audio_data, filename
-            
-            # Read converted file
-            with open(output_path, "rb") as f:
-                converted_data = f.read()
-            
-            # Cleanup temp files
-            try:
-                os.unlink(input_path)
-                os.unlink(output_path)
-            except:
-                pass
-            
-            new_filename = filename.rsplit(".", 1)[0] + ".mp3"
-            logger.info(f"Converted {filename} ({len(audio_data)} bytes) to {new_filename} ({len(converted_data)} bytes)")
-            
-            return converted_data, new_filename
-            
-        except subprocess.TimeoutExpired:
-            logger.error("ffmpeg conversion timed out")
-            return audio_data, filename
-        except FileNotFoundError:
-            logger.warning("ffmpeg not found, skipping conversion")
-            return audio_data, filename
-        except Exception as e:
-            logger.error(f"Audio conversion failed: {e}")
-            return audio_data, filename
-    
     def _parse_deepgram_response(self, result: Dict[str, Any]) -> TranscriptionResult:
         """Parse Deepgram API response into TranscriptionResult"""
         
@@ -387,6 +460,111 @@ class TranscriptionService:
         return content_types.get(ext, "audio/mpeg")
 
 
+def _talk_time(segments: List[TranscriptionSegment]) -> Dict[str, float]:
+    totals: Dict[str, float] = {}
+    for seg in segments:
+        totals[seg.speaker] = totals.get(seg.speaker, 0.0) + (seg.end - seg.start)
+    return totals
+
+
+def _match_speakers(
+    local: List[TranscriptionSegment],
+    stitched: List[TranscriptionSegment],
+    window: Tuple[float, float]
+) -> Dict[str, str]:
+    """
+    Map a chunk's speaker labels onto the labels stitched so far.
+    
+    Labels are paired greedily by how long they talk at the same time in
+    the overlap window (same audio, so the same person). Labels that do
+    not speak in the overlap are paired by talk-time rank with the
+    remaining known speakers; only when those run out is a new speaker
+    added.
+    """
+    window_start, window_end = window
+    
+    scores: Dict[Tuple[str, str], float] = {}
+    for seg in local:
+        if seg.end <= window_start or seg.start >= window_end:
+            continue
+        for known in stitched:
+            if known.end <= window_start or known.start >= window_end:
+                continue
+            shared = min(seg.end, known.end, window_end) - max(seg.start, known.start, window_start)
+            if shared > 0:
+                key = (seg.speaker, known.speaker)
+                scores[key] = scores.get(key, 0.0) + shared
+    
+    mapping: Dict[str, str] = {}
+    for (local_label, known_label), _ in sorted(scores.items(), key=lambda item: -item[1]):
+        if local_label not in mapping and known_label not in mapping.values():
+            mapping[local_label] = known_label
+    
+    local_talk = _talk_time(local)
+    known_talk = _talk_time(stitched)
+    unmatched = sorted((l for l in local_talk if l not in mapping), key=lambda l: -local_talk[l])
+    available = sorted((k for k in known_talk if k not in mapping.values()), key=lambda k: -known_talk[k])
+    
+    next_number = len(known_talk) + 1
+    for local_label in unmatched:
+        if available:
+            mapping[local_label] = available.pop(0)
+        else:
+            mapping[local_label] = f"Speaker {next_number}"
+            next_number += 1
+    
+    return mapping
+
+
+def _stitch_chunks(
+    parts: List[Tuple[float, float, TranscriptionResult]],
+    duration: float
+) -> TranscriptionResult:
+    """
+    Combine per-chunk results into one transcription.
+    
+    Args:
+        parts: (audio offset, cut point, result) per chunk, in order. Audio
+            between offset and cut overlaps the previous chunk.
+        duration: Total recording duration
+    """
+    segments: List[TranscriptionSegment] = []
+    texts: List[str] = []
+    weighted_confidence = 0.0
+    
+    for index, (offset, cut, result) in enumerate(parts):
+        local = [
+            TranscriptionSegment(speaker=seg.speaker, start=seg.start + offset, end=seg.end + offset, text=seg.text)
+            for seg in result.segments
+        ]
+        
+        if index:
+            mapping = _match_speakers(local, segments, (offset, cut))
+            for seg in local:
+                seg.speaker = mapping.get(seg.speaker, seg.speaker)
+            # The overlap was already transcribed by the previous chunk
+            local = [seg for seg in local if (seg.start + seg.end) / 2 >= cut]
+        
+        segments.extend(local)
+        if result.segments:
+            texts.extend(seg.text for seg in local if seg.text)
+        elif result.full_text:
+            texts.append(result.full_text)
+        
+        chunk_end = parts[index + 1][1] if index + 1 < len(parts) else duration
+        weighted_confidence += result.confidence * max(0.0, chunk_end - cut)
+    
+    speakers = {seg.speaker for seg in segments}
+    
+    return TranscriptionResult(
+        full_text=" ".join(texts),
+        segments=segments,
+        speaker_count=len(speakers) if speakers else 1,
+        duration_seconds=duration,
+        confidence=weighted_confidence / duration if duration else 0
+    )
+
+
 # Lazy singleton
 _transcription_service: Optional[TranscriptionService] = None
 
@@ -1,18 +1,64 @@
 """
-Vector store service using Pinecone.
+Vector store service.
 Stores and retrieves embeddings for knowledge base chunks.
+
+Backends (selected with VECTOR_STORE_BACKEND):
+- "pinecone" (default): hosted Pinecone index
+- "local": per-organization NumPy index in memory-mapped files
+  (see local_vector_store.py) - no network round-trip, works offline
+
+All backends implement the VectorStore protocol and return matches with
+`.id`, `.score` and `.metadata` attributes. Use get_vector_store() to get
+the configured backend.
 """
 
 import os
-from typing import List, Dict, Optional
-from pinecone import Pinecone
+from functools import lru_cache
+from typing import List, Dict, Optional, Any, Protocol, runtime_checkable
+
+
+@runtime_checkable
+class VectorStore(Protocol):
+    """Interface shared by all vector store backends."""
+    
+    def upsert_vectors(self, vectors: List[Dict[str, Any]]) -> Dict[str, int]:
+        """Insert or replace vectors ({id, values, metadata})."""
+        ...
+    
+    def query_vectors(
+        self,
+        query_vector: List[float],
+        top_k: int = 5,
+        filter: Optional[Dict] = None,
+        include_metadata: bool = True
+    ) -> List[Any]:
+        """Return top_k matches by cosine similarity, optionally filtered."""
+        ...
+    
+    def delete_vectors(self, ids: List[str]) -> None:
+        """Delete vectors by id."""
+        ...
+    
+    def delete_by_filter(self, filter: Dict) -> None:
+        """Delete vectors whose metadata matches filter."""
+        ...
+    
+    def delete_by_file(self, file_id: str) -> None:
+        """Delete all vectors for a knowledge base file."""
+        ...
+    
+    def get_stats(self) -> Dict:
+        """Backend statistics (total_vector_count, ...)."""
+        ...
 
 
-class VectorStore:
+class PineconeVectorStore:
     """Manage vector storage in Pinecone."""
     
     def __init__(self):
         """Initialize Pinecone client and connect to index."""
+        from pinecone import Pinecone
+        
         api_key = os.getenv("PINECONE_API_KEY")
         index_name = os.getenv("PINECONE_INDEX_NAME", "dealmotion-knowledge-base")
         
@@ -122,3 +168,19 @@ class VectorStore:
             return self.index.describe_index_stats()
         except Exception as e:
             raise ValueError(f"Failed to get index stats: {str(e)}")
+
+
+@lru_cache(maxsize=1)
+def get_vector_store() -> VectorStore:
+    """
+    Get the configured vector store backend (singleton).
+    
+    VECTOR_STORE_BACKEND=pinecone (default) or local.
+    """
+    backend = os.getenv("VECTOR_STORE_BACKEND", "pinecone").lower()
+    if backend == "local":
+        from app.services.local_vector_store import LocalVectorStore
+        return LocalVectorStore()
+    if backend == "pinecone":
+        return PineconeVectorStore()
+    raise ValueError(f"Unknown VECTOR_STORE_BACKEND: {backend}")
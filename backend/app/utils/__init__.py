@@ -22,6 +22,16 @@ from .errors import (
     ErrorCodes,
 )
 
+from .cache import (
+    TTLCache,
+    MISSING,
+)
+
+from .rate_limit import (
+    TokenBucket,
+    ConcurrencyLimiter,
+)
+
 __all__ = [
     # Timeout utilities
     "with_timeout",
@@ -39,5 +49,11 @@ __all__ = [
     "raise_validation_error",
     "AppError",
     "ErrorCodes",
+    # Cache utilities
+    "TTLCache",
+    "MISSING",
+    # Rate limiting utilities
+    "TokenBucket",
+    "ConcurrencyLimiter",
 ]
 
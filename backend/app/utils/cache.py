@@ -0,0 +1,112 @@
+"""
+In-process cache utilities.
+
+Small LRU + TTL cache used for hot lookups that are read on nearly every
+request (auth/org resolution, snapshots, etc.). Each worker process keeps
+its own copy, so entries must be safe to serve slightly stale for up to
+`ttl_seconds` and writers should call invalidate() where they can.
+
+Caches are shared by the event loop and worker threads (asyncio.to_thread),
+so every operation holds a per-cache re-entrant lock.
+"""
+
+import time
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Generic, Hashable, Optional, TypeVar
+
+V = TypeVar('V')
+
+# Sentinel returned by get() on a miss, so None can be cached as a value
+MISSING = object()
+
+
+class TTLCache(Generic[V]):
+    """
+    Bounded LRU cache with per-entry expiry.
+    
+    Usage:
+        cache = TTLCache(maxsize=10_000, ttl_seconds=60)
+        value = cache.get(key)
+        if value is MISSING:
+            value = load(key)
+            cache.set(key, value)
+    """
+    
+    def __init__(self, maxsize: int = 1024, ttl_seconds: float = 60.0):
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        # Re-entrant: invalidate_where() predicates are caller code
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+    
+    def get(self, key: Hashable) -> Any:
+        """Return the cached value, or MISSING if absent or expired."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return MISSING
+            
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._data[key]
+                self.misses += 1
+                return MISSING
+            
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+    
+    def set(self, key: Hashable, value: V, ttl_seconds: Optional[float] = None) -> None:
+        """Store a value, evicting the least recently used entry when full."""
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        with self._lock:
+            self._data[key] = (time.monotonic() + ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+    
+    def invalidate(self, key: Hashable) -> None:
+        """Drop a single entry (no-op if absent)."""
+        with self._lock:
+            self._data.pop(key, None)
+    
+    def invalidate_where(self, predicate: Callable[[Hashable], bool]) -> int:
+        """Drop all entries whose key matches predicate. Returns count removed."""
+        with self._lock:
+            stale = [k for k in list(self._data) if predicate(k)]
+            for k in stale:
+                self._data.pop(k, None)
+            return len(stale)
+    
+    def invalidate_items_where(self, predicate: Callable[[Hashable, Any], bool]) -> int:
+        """Drop all entries for which predicate(key, value) is true. Returns count removed."""
+        with self._lock:
+            stale = [k for k, (_, value) in list(self._data.items()) if predicate(k, value)]
+            for k in stale:
+                self._data.pop(k, None)
+            return len(stale)
+    
+    def clear(self) -> None:
+        """Drop all entries."""
+        with self._lock:
+            self._data.clear()
+    
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._data)
+    
+    def stats(self) -> dict:
+        """Hit/miss counters for diagnostics."""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / total, 3) if total else 0.0,
+            }
@@ -0,0 +1,135 @@
+"""
+Rate limiting utilities.
+
+Token buckets used to pace calls to third-party APIs with per-user or
+per-app quotas (calendar providers, etc.), and concurrency limiters that cap
+in-flight calls (LLM gateway). Both are thread-safe and can be shared
+between the sync code paths (worker threads) and async code running on
+different event loops.
+"""
+
+import time
+import asyncio
+import threading
+from collections import deque
+from typing import Dict, Tuple
+
+
+class TokenBucket:
+    """
+    Token bucket with reservation semantics.
+
+    Each acquire() reserves its tokens immediately (the balance may go
+    negative) and then waits until the reservation is covered, so waiters
+    are served in arrival order without holding a lock while sleeping.
+
+    Usage:
+        bucket = TokenBucket(rate=10, capacity=20)   # 10/s, bursts of 20
+        bucket.acquire()            # sync, sleeps if needed
+        await bucket.acquire_async()
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        if rate <= 0 or capacity <= 0:
+            raise ValueError("rate and capacity must be positive")
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reserve(self, tokens: float) -> float:
+        """Reserve tokens and return how long the caller must wait."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+            self._updated_at = now
+            self._tokens -= tokens
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+    def acquire(self, tokens: float = 1) -> float:
+        """Block until tokens are available. Returns seconds waited."""
+        wait = self._reserve(tokens)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    async def acquire_async(self, tokens: float = 1) -> float:
+        """Await until tokens are available. Returns seconds waited."""
+        wait = self._reserve(tokens)
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            return {"rate": self.rate, "capacity": self.capacity, "tokens": self._tokens}
+
+
+class ConcurrencyLimiter:
+    """
+    Counting semaphore usable from any thread and any event loop.
+
+    asyncio.Semaphore is bound to one loop, but LLM calls are made from the
+    main server loop, from asyncio.run() inside BackgroundTasks threads and
+    from Inngest handlers. Waiters are queued FIFO and woken on their own
+    loop with call_soon_threadsafe.
+
+    Usage:
+        limiter = ConcurrencyLimiter(20)
+        async with limiter:
+            ...
+    """
+
+    def __init__(self, limit: int):
+        if limit <= 0:
+            raise ValueError("limit must be positive")
+        self.limit = limit
+        self._available = limit
+        self._waiters: "deque[Tuple[asyncio.AbstractEventLoop, asyncio.Future]]" = deque()
+        self._lock = threading.Lock()
+
+    async def acquire(self) -> None:
+        with self._lock:
+            if self._available > 0 and not self._waiters:
+                self._available -= 1
+                return
+            loop = asyncio.get_running_loop()
+            waiter = (loop, loop.create_future())
+            self._waiters.append(waiter)
+
+        try:
+            await waiter[1]
+        except asyncio.CancelledError:
+            with self._lock:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+            # If the slot was already handed over, _grant() passes it on
+            raise
+
+    def _grant(self, future: asyncio.Future) -> None:
+        if future.done():
+            self.release()
+        else:
+            future.set_result(None)
+
+    def release(self) -> None:
+        with self._lock:
+            while self._waiters:
+                loop, future = self._waiters.popleft()
+                if loop.is_closed():
+                    continue
+                loop.call_soon_threadsafe(self._grant, future)
+                return
+            self._available = min(self.limit, self._available + 1)
+
+    async def __aenter__(self) -> "ConcurrencyLimiter":
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        self.release()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"limit": self.limit, "in_use": self.limit - self._available, "waiting": len(self._waiters)}
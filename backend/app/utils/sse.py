@@ -0,0 +1,113 @@
+"""
+Server-Sent Events utilities.
+
+Helpers for endpoints that stream LLM output to the browser:
+
+- sse_event() formats one event frame
+- detach() runs a producer in its own task, so work that persists results
+  at the end of a stream (DB writes, usage logging, credits) still finishes
+  when the client disconnects halfway
+- sse_response() wraps an event iterator in a StreamingResponse with the
+  headers proxies need to not buffer the stream, and sends a comment frame
+  immediately so time-to-first-byte does not wait on the model
+"""
+
+import json
+import asyncio
+import logging
+from typing import Any, AsyncIterator, Dict, Set
+
+from fastapi.responses import StreamingResponse
+
+logger = logging.getLogger(__name__)
+
+# Events are plain dicts: {"event": "<name>", "data": <json-serializable>}
+StreamEvent = Dict[str, Any]
+
+# Comment frame sent while waiting for the next event (keeps proxies from
+# closing idle connections during long prompts)
+KEEPALIVE_SECONDS = 15.0
+
+# Strong references to detached producers (the loop only keeps weak ones)
+_background_tasks: Set[asyncio.Task] = set()
+
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "Connection": "keep-alive",
+    "X-Accel-Buffering": "no",  # Disable nginx/Railway response buffering
+}
+
+
+def sse_event(event: str, data: Any) -> str:
+    """Format a single SSE frame. Data is JSON-encoded on one line."""
+    payload = data if isinstance(data, str) else json.dumps(data, ensure_ascii=False, default=str)
+    lines = "\n".join(f"data: {line}" for line in payload.split("\n"))
+    return f"event: {event}\n{lines}\n\n"
+
+
+async def detach(events: AsyncIterator[StreamEvent]) -> AsyncIterator[StreamEvent]:
+    """
+    Consume `events` in a background task and re-yield them.
+
+    If the consumer stops early (client disconnect), the producer keeps
+    running to completion so its end-of-stream persistence still happens;
+    remaining events are simply dropped.
+    """
+    queue: asyncio.Queue = asyncio.Queue()
+    done = object()
+    listening = True
+
+    async def pump():
+        try:
+            async for item in events:
+                if listening:
+                    await queue.put(item)
+        except Exception as e:
+            logger.error(f"Stream producer failed: {e}")
+            if listening:
+                await queue.put({"event": "error", "data": {"message": str(e)}})
+        finally:
+            if listening:
+                await queue.put(done)
+
+    task = asyncio.create_task(pump())
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+    try:
+        while True:
+            item = await queue.get()
+            if item is done:
+                break
+            yield item
+    finally:
+        listening = False
+        if not task.done():
+            logger.info("Stream client disconnected; finishing generation in background")
+
+
+async def _frames(events: AsyncIterator[StreamEvent]) -> AsyncIterator[str]:
+    # Flush headers + a first byte right away
+    yield ": stream open\n\n"
+
+    iterator = events.__aiter__()
+    pending = asyncio.ensure_future(iterator.__anext__())
+    try:
+        while True:
+            finished, _ = await asyncio.wait({pending}, timeout=KEEPALIVE_SECONDS)
+            if not finished:
+                yield ": keep-alive\n\n"
+                continue
+            try:
+                item = pending.result()
+            except StopAsyncIteration:
+                break
+            yield sse_event(item["event"], item.get("data"))
+            pending = asyncio.ensure_future(iterator.__anext__())
+    finally:
+        if not pending.done():
+            pending.cancel()
+
+
+def sse_response(events: AsyncIterator[StreamEvent]) -> StreamingResponse:
+    """StreamingResponse (text/event-stream) for an iterator of event dicts."""
+    return StreamingResponse(_frames(events), media_type="text/event-stream", headers=SSE_HEADERS)
@@ -0,0 +1,328 @@
+-- Migration: Pre-aggregated API cost rollups
+-- Purpose: Serve the admin cost analytics (/api/v1/admin/costs/*) from
+-- hourly and daily buckets instead of scanning api_usage_logs.
+--
+--   api_usage_rollups_hourly / api_usage_rollups_daily
+--       One row per bucket x organization x user x provider x service with
+--       summed cost, requests, tokens and duration.
+--   api_usage_rollup_state
+--       Watermark: every log with created_at < watermark is in the rollups.
+--   refresh_api_usage_rollups()
+--       Rolls up [watermark, now - lag) and advances the watermark in the
+--       same transaction (run every 10 minutes by the cost-rollups-refresh
+--       Inngest job). Logs are append-only, so adding a window's sums to the
+--       buckets is exact.
+--   rebuild_api_usage_rollups(day)
+--       Recomputes one UTC day from the logs (backfill / repair), see
+--       scripts/backfill_cost_rollups.py.
+--   get_api_cost_rollup()
+--       Grouped totals for a period: daily buckets for whole days, hourly
+--       buckets for the partial days at the edges, raw logs after the
+--       watermark (the last few minutes).
+
+-- ============================================================================
+-- Rollup Tables
+-- ============================================================================
+
+CREATE TABLE IF NOT EXISTS api_usage_rollups_hourly (
+    bucket_start TIMESTAMPTZ NOT NULL,
+    organization_id UUID NOT NULL REFERENCES organizations(id) ON DELETE CASCADE,
+    user_id UUID,  -- No FK: keep the bucket key stable when a user is deleted
+    api_provider TEXT NOT NULL,
+    api_service TEXT NOT NULL DEFAULT '',  -- '' = no service on the log
+
+    cost_cents BIGINT NOT NULL DEFAULT 0,
+    request_count BIGINT NOT NULL DEFAULT 0,
+    input_tokens BIGINT NOT NULL DEFAULT 0,
+    output_tokens BIGINT NOT NULL DEFAULT 0,
+    duration_seconds BIGINT NOT NULL DEFAULT 0,
+    log_count BIGINT NOT NULL DEFAULT 0,
+
+    UNIQUE NULLS NOT DISTINCT (bucket_start, organization_id, user_id, api_provider, api_service)
+);
+
+CREATE INDEX IF NOT EXISTS idx_api_usage_rollups_hourly_bucket
+    ON api_usage_rollups_hourly(bucket_start);
+
+CREATE TABLE IF NOT EXISTS api_usage_rollups_daily (
+    bucket_date DATE NOT NULL,
+    organization_id UUID NOT NULL REFERENCES organizations(id) ON DELETE CASCADE,
+    user_id UUID,
+    api_provider TEXT NOT NULL,
+    api_service TEXT NOT NULL DEFAULT '',
+
+    cost_cents BIGINT NOT NULL DEFAULT 0,
+    request_count BIGINT NOT NULL DEFAULT 0,
+    input_tokens BIGINT NOT NULL DEFAULT 0,
+    output_tokens BIGINT NOT NULL DEFAULT 0,
+    duration_seconds BIGINT NOT NULL DEFAULT 0,
+    log_count BIGINT NOT NULL DEFAULT 0,
+
+    UNIQUE NULLS NOT DISTINCT (bucket_date, organization_id, user_id, api_provider, api_service)
+);
+
+CREATE INDEX IF NOT EXISTS idx_api_usage_rollups_daily_bucket
+    ON api_usage_rollups_daily(bucket_date);
+
+CREATE TABLE IF NOT EXISTS api_usage_rollup_state (
+    name TEXT PRIMARY KEY,
+    watermark TIMESTAMPTZ NOT NULL,
+    updated_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+-- Only the backend (service role) reads/writes rollups
+ALTER TABLE api_usage_rollups_hourly ENABLE ROW LEVEL SECURITY;
+ALTER TABLE api_usage_rollups_daily ENABLE ROW LEVEL SECURITY;
+ALTER TABLE api_usage_rollup_state ENABLE ROW LEVEL SECURITY;
+
+-- ============================================================================
+-- Aggregation
+-- ============================================================================
+
+-- Add the logs with created_at in [p_from, p_to) to both rollup tables.
+-- Returns the number of logs added.
+CREATE OR REPLACE FUNCTION add_api_usage_rollups(p_from TIMESTAMPTZ, p_to TIMESTAMPTZ)
+RETURNS BIGINT AS $$
+DECLARE
+    v_logs BIGINT;
+BEGIN
+    WITH src AS MATERIALIZED (
+        SELECT
+            date_trunc('hour', created_at AT TIME ZONE 'UTC') AT TIME ZONE 'UTC' AS bucket_start,
+            organization_id,
+            user_id,
+            api_provider,
+            COALESCE(api_service, '') AS api_service,
+            SUM(COALESCE(estimated_cost_cents, 0)) AS cost_cents,
+            SUM(COALESCE(request_count, 1)) AS request_count,
+            SUM(COALESCE(input_tokens, 0)) AS input_tokens,
+            SUM(COALESCE(output_tokens, 0)) AS output_tokens,
+            SUM(COALESCE(duration_seconds, 0)) AS duration_seconds,
+            COUNT(*) AS log_count
+        FROM api_usage_logs
+        WHERE created_at >= p_from AND created_at < p_to
+        GROUP BY 1, 2, 3, 4, 5
+    ),
+    hourly AS (
+        INSERT INTO api_usage_rollups_hourly AS h (
+            bucket_start, organization_id, user_id, api_provider, api_service,
+            cost_cents, request_count, input_tokens, output_tokens, duration_seconds, log_count
+        )
+        SELECT * FROM src
+        ON CONFLICT (bucket_start, organization_id, user_id, api_provider, api_service) DO UPDATE SET
+            cost_cents = h.cost_cents + EXCLUDED.cost_cents,
+            request_count = h.request_count + EXCLUDED.request_count,
+            input_tokens = h.input_tokens + EXCLUDED.input_tokens,
+            output_tokens = h.output_tokens + EXCLUDED.output_tokens,
+            duration_seconds = h.duration_seconds + EXCLUDED.duration_seconds,
+            log_count = h.log_count + EXCLUDED.log_count
+        RETURNING 1
+    ),
+    daily AS (
+        INSERT INTO api_usage_rollups_daily AS d (
+            bucket_date, organization_id, user_id, api_provider, api_service,
+            cost_cents, request_count, input_tokens, output_tokens, duration_seconds, log_count
+        )
+        SELECT
+            (bucket_start AT TIME ZONE 'UTC')::date,
+            organization_id, user_id, api_provider, api_service,
+            SUM(cost_cents), SUM(request_count), SUM(input_tokens),
+            SUM(output_tokens), SUM(duration_seconds), SUM(log_count)
+        FROM src
+        GROUP BY 1, 2, 3, 4, 5
+        ON CONFLICT (bucket_date, organization_id, user_id, api_provider, api_service) DO UPDATE SET
+            cost_cents = d.cost_cents + EXCLUDED.cost_cents,
+            request_count = d.request_count + EXCLUDED.request_count,
+            input_tokens = d.input_tokens + EXCLUDED.input_tokens,
+            output_tokens = d.output_tokens + EXCLUDED.output_tokens,
+            duration_seconds = d.duration_seconds + EXCLUDED.duration_seconds,
+            log_count = d.log_count + EXCLUDED.log_count
+        RETURNING 1
+    )
+    SELECT COALESCE(SUM(log_count), 0) INTO v_logs FROM src;
+
+    RETURN v_logs;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Current watermark, row-locked so refreshes and rebuilds never interleave.
+-- First use starts at the oldest log, so the refresh job rolls up history.
+CREATE OR REPLACE FUNCTION lock_api_usage_rollup_watermark()
+RETURNS TIMESTAMPTZ AS $$
+DECLARE
+    v_watermark TIMESTAMPTZ;
+BEGIN
+    INSERT INTO api_usage_rollup_state (name, watermark)
+    SELECT 'api_usage', COALESCE(MIN(created_at), NOW()) FROM api_usage_logs
+    ON CONFLICT (name) DO NOTHING;
+
+    SELECT watermark INTO v_watermark
+    FROM api_usage_rollup_state
+    WHERE name = 'api_usage'
+    FOR UPDATE;
+
+    RETURN v_watermark;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Roll up the next window of logs. p_lag leaves room for inserts whose
+-- created_at (transaction start) is slightly in the past; p_max_window
+-- bounds the work per call while catching up.
+CREATE OR REPLACE FUNCTION refresh_api_usage_rollups(
+    p_lag INTERVAL DEFAULT INTERVAL '5 minutes',
+    p_max_window INTERVAL DEFAULT INTERVAL '1 day'
+)
+RETURNS TABLE (
+    window_start TIMESTAMPTZ,
+    window_end TIMESTAMPTZ,
+    logs_rolled_up BIGINT,
+    caught_up BOOLEAN
+) AS $$
+DECLARE
+    v_from TIMESTAMPTZ := lock_api_usage_rollup_watermark();
+    v_until TIMESTAMPTZ := NOW() - p_lag;
+    v_to TIMESTAMPTZ;
+    v_logs BIGINT := 0;
+BEGIN
+    v_to := GREATEST(v_from, LEAST(v_until, v_from + p_max_window));
+
+    IF v_to > v_from THEN
+        v_logs := add_api_usage_rollups(v_from, v_to);
+
+        UPDATE api_usage_rollup_state
+        SET watermark = v_to, updated_at = NOW()
+        WHERE name = 'api_usage';
+    END IF;
+
+    RETURN QUERY SELECT v_from, v_to, v_logs, v_to >= v_until;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Recompute one UTC day from the logs (up to the watermark; the refresh job
+-- adds the rest). Safe to run while the refresh job is active.
+CREATE OR REPLACE FUNCTION rebuild_api_usage_rollups(p_day DATE)
+RETURNS BIGINT AS $$
+DECLARE
+    v_watermark TIMESTAMPTZ := lock_api_usage_rollup_watermark();
+    v_start TIMESTAMPTZ := p_day::timestamp AT TIME ZONE 'UTC';
+    v_end TIMESTAMPTZ := (p_day + 1)::timestamp AT TIME ZONE 'UTC';
+BEGIN
+    DELETE FROM api_usage_rollups_hourly
+    WHERE bucket_start >= v_start AND bucket_start < v_end;
+
+    DELETE FROM api_usage_rollups_daily
+    WHERE bucket_date = p_day;
+
+    IF v_watermark <= v_start THEN
+        RETURN 0;
+    END IF;
+
+    RETURN add_api_usage_rollups(v_start, LEAST(v_end, v_watermark));
+END;
+$$ LANGUAGE plpgsql;
+
+-- ============================================================================
+-- Reads
+-- ============================================================================
+
+-- Totals for [p_from, p_to) (hour precision), grouped by p_group_by:
+--   'none', 'day', 'provider', 'service', 'day_provider', 'user'
+-- Rows are ordered by cost (highest first) and cut at p_limit; group_count
+-- is the number of groups before the limit.
+CREATE OR REPLACE FUNCTION get_api_cost_rollup(
+    p_from TIMESTAMPTZ,
+    p_to TIMESTAMPTZ DEFAULT NOW(),
+    p_group_by TEXT DEFAULT 'none',
+    p_provider TEXT DEFAULT NULL,
+    p_limit INTEGER DEFAULT NULL
+)
+RETURNS TABLE (
+    day DATE,
+    api_provider TEXT,
+    api_service TEXT,
+    user_id UUID,
+    cost_cents BIGINT,
+    request_count BIGINT,
+    input_tokens BIGINT,
+    output_tokens BIGINT,
+    duration_seconds BIGINT,
+    log_count BIGINT,
+    group_count BIGINT
+) AS $$
+    WITH bounds AS (
+        SELECT
+            hour_from,
+            rolled_to,
+            watermark,
+            -- Whole UTC days inside [hour_from, rolled_to)
+            (date_trunc('day', hour_from AT TIME ZONE 'UTC' + INTERVAL '1 day' - INTERVAL '1 hour'))::date AS day_from,
+            (rolled_to AT TIME ZONE 'UTC')::date AS day_to
+        FROM (
+            SELECT
+                date_trunc('hour', p_from AT TIME ZONE 'UTC') AT TIME ZONE 'UTC' AS hour_from,
+                LEAST(p_to, s.watermark) AS rolled_to,
+                s.watermark
+            FROM (
+                SELECT COALESCE(
+                    (SELECT watermark FROM api_usage_rollup_state WHERE name = 'api_usage'),
+                    '-infinity'::timestamptz
+                ) AS watermark
+            ) s
+        ) b
+    ),
+    usage AS (
+        SELECT d.bucket_date AS day, d.api_provider, d.api_service, d.user_id,
+               d.cost_cents, d.request_count, d.input_tokens, d.output_tokens,
+               d.duration_seconds, d.log_count
+        FROM api_usage_rollups_daily d, bounds b
+        WHERE d.bucket_date >= b.day_from AND d.bucket_date < b.day_to
+
+        UNION ALL
+
+        SELECT (h.bucket_start AT TIME ZONE 'UTC')::date, h.api_provider, h.api_service, h.user_id,
+               h.cost_cents, h.request_count, h.input_tokens, h.output_tokens,
+               h.duration_seconds, h.log_count
+        FROM api_usage_rollups_hourly h, bounds b
+        WHERE h.bucket_start >= b.hour_from
+          AND h.bucket_start < b.rolled_to
+          AND NOT (
+              h.bucket_start >= b.day_from::timestamp AT TIME ZONE 'UTC'
+              AND h.bucket_start < b.day_to::timestamp AT TIME ZONE 'UTC'
+          )
+
+        UNION ALL
+
+        -- Not rolled up yet
+        SELECT (l.created_at AT TIME ZONE 'UTC')::date, l.api_provider, COALESCE(l.api_service, ''), l.user_id,
+               COALESCE(l.estimated_cost_cents, 0), COALESCE(l.request_count, 1),
+               COALESCE(l.input_tokens, 0), COALESCE(l.output_tokens, 0),
+               COALESCE(l.duration_seconds, 0), 1
+        FROM api_usage_logs l, bounds b
+        WHERE l.created_at >= GREATEST(b.watermark, p_from)
+          AND l.created_at < p_to
+    )
+    SELECT
+        CASE WHEN p_group_by IN ('day', 'day_provider') THEN u.day END,
+        CASE WHEN p_group_by IN ('provider', 'day_provider') THEN u.api_provider END,
+        CASE WHEN p_group_by = 'service' THEN NULLIF(u.api_service, '') END,
+        CASE WHEN p_group_by = 'user' THEN u.user_id END,
+        SUM(u.cost_cents)::BIGINT,
+        SUM(u.request_count)::BIGINT,
+        SUM(u.input_tokens)::BIGINT,
+        SUM(u.output_tokens)::BIGINT,
+        SUM(u.duration_seconds)::BIGINT,
+        SUM(u.log_count)::BIGINT,
+        COUNT(*) OVER ()
+    FROM usage u
+    WHERE (p_provider IS NULL OR u.api_provider = p_provider)
+      AND (p_group_by <> 'user' OR u.user_id IS NOT NULL)
+    GROUP BY 1, 2, 3, 4
+    ORDER BY 5 DESC
+    LIMIT p_limit;
+$$ LANGUAGE sql STABLE;
+
+-- Comments for documentation
+COMMENT ON TABLE api_usage_rollups_hourly IS 'api_usage_logs summed per UTC hour/org/user/provider/service; maintained by refresh_api_usage_rollups()';
+COMMENT ON TABLE api_usage_rollups_daily IS 'api_usage_logs summed per UTC day/org/user/provider/service; maintained by refresh_api_usage_rollups()';
+COMMENT ON TABLE api_usage_rollup_state IS 'Rollup watermark: logs created before it are included in the rollups';
+COMMENT ON FUNCTION get_api_cost_rollup IS 'Admin cost analytics: grouped api usage totals for a period, read from the rollups';
@@ -0,0 +1,17 @@
+-- Migration: Incremental calendar sync
+-- Purpose: Store the provider sync cursor on the calendar connection so
+-- syncs only fetch changed/deleted events:
+--   - Google: nextSyncToken from events.list
+--   - Microsoft: @odata.deltaLink from calendarView/delta
+
+-- Provider sync cursor (NULL = next sync is a full sync)
+ALTER TABLE calendar_connections
+ADD COLUMN IF NOT EXISTS sync_cursor TEXT;
+
+-- Last full (non-incremental) sync; the window is re-anchored daily
+ALTER TABLE calendar_connections
+ADD COLUMN IF NOT EXISTS last_full_sync_at TIMESTAMPTZ;
+
+-- Comments for documentation
+COMMENT ON COLUMN calendar_connections.sync_cursor IS 'Google nextSyncToken or Microsoft Graph deltaLink; NULL forces a full sync';
+COMMENT ON COLUMN calendar_connections.last_full_sync_at IS 'When the last full sync (window re-anchor) ran';
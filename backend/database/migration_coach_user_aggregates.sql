@@ -0,0 +1,441 @@
+-- Migration: Incremental per-user coach pattern aggregates
+-- Purpose: PatternLearner (app/services/coach_patterns.py) used to rescan
+-- 30 days of coach_behavior_events, all suggestion actions and the org's
+-- research/prep/followup history every time patterns were requested.
+-- These aggregates are maintained by triggers as rows arrive, so pattern
+-- reads are a handful of rows per user.
+--
+-- One row per (user, metric, key), holding a small weight vector:
+--   activity / hour            24 weights: events per UTC hour of day
+--   activity / weekday          7 weights: events per weekday (0 = Monday)
+--   step_hours / research_to_prep, prep_to_followup
+--                              10 weights: log-scale histogram of hours
+--                              between the steps (see coach_step_bucket),
+--                              plus weighted sum, min and max
+--   suggestion_action / <suggestion_type>
+--                               4 weights: dismissed, completed, snoozed, other
+--
+-- Weights decay exponentially (half-life 14 days, coach_aggregate_half_life)
+-- so old behavior fades out instead of falling off a 30-day cliff. Decay is
+-- applied lazily: a row stores its weights as of decayed_at and is decayed
+-- further on the next write, or on read by get_coach_user_aggregates().
+
+-- ============================================================================
+-- Aggregates Table
+-- ============================================================================
+
+CREATE TABLE IF NOT EXISTS coach_user_aggregates (
+    user_id UUID NOT NULL REFERENCES auth.users(id) ON DELETE CASCADE,
+    organization_id UUID NOT NULL REFERENCES organizations(id) ON DELETE CASCADE,
+    metric TEXT NOT NULL,
+    key TEXT NOT NULL,
+
+    weights FLOAT8[] NOT NULL,
+    value_sum FLOAT8 NOT NULL DEFAULT 0,  -- Decayed sum of values (step_hours)
+    value_min FLOAT8,
+    value_max FLOAT8,
+    decayed_at TIMESTAMPTZ NOT NULL,
+
+    PRIMARY KEY (user_id, metric, key)
+);
+
+-- Only the backend (service role) reads/writes aggregates
+ALTER TABLE coach_user_aggregates ENABLE ROW LEVEL SECURITY;
+
+-- Lookups for the step timing triggers
+CREATE INDEX IF NOT EXISTS idx_research_briefs_org_company_completed
+    ON research_briefs(organization_id, lower(company_name), completed_at DESC);
+
+CREATE INDEX IF NOT EXISTS idx_meeting_preps_org_company_completed
+    ON meeting_preps(organization_id, lower(prospect_company_name), completed_at DESC);
+
+-- ============================================================================
+-- Helpers
+-- ============================================================================
+
+CREATE OR REPLACE FUNCTION coach_aggregate_half_life()
+RETURNS INTERVAL AS $$
+    SELECT INTERVAL '14 days';
+$$ LANGUAGE sql IMMUTABLE;
+
+-- Multiplier for weights recorded at p_from when viewed at p_to
+CREATE OR REPLACE FUNCTION coach_decay_factor(p_from TIMESTAMPTZ, p_to TIMESTAMPTZ)
+RETURNS FLOAT8 AS $$
+    SELECT power(
+        0.5,
+        GREATEST(0, EXTRACT(EPOCH FROM p_to - p_from))
+            / EXTRACT(EPOCH FROM coach_aggregate_half_life())
+    )::float8;
+$$ LANGUAGE sql IMMUTABLE;
+
+-- Step duration bucket (0-9) for a number of hours:
+-- <1h, <4h, <12h, <1d, <2d, <4d, <1w, <2w, <30d, 30d+
+CREATE OR REPLACE FUNCTION coach_step_bucket(p_hours FLOAT8)
+RETURNS INTEGER AS $$
+    SELECT width_bucket(p_hours, ARRAY[1, 4, 12, 24, 48, 96, 168, 336, 720]::float8[]);
+$$ LANGUAGE sql IMMUTABLE;
+
+CREATE OR REPLACE FUNCTION coach_suggestion_action_index(p_action TEXT)
+RETURNS INTEGER AS $$
+    SELECT CASE p_action
+        WHEN 'dismissed' THEN 0
+        WHEN 'completed' THEN 1
+        WHEN 'snoozed' THEN 2
+        ELSE 3
+    END;
+$$ LANGUAGE sql IMMUTABLE;
+
+-- Add p_amount (may be negative; weights never go below 0) at 0-based
+-- p_index of one aggregate, decaying the row to p_at first. p_value is the
+-- observed value for step_hours rows.
+CREATE OR REPLACE FUNCTION bump_coach_user_aggregate(
+    p_user_id UUID,
+    p_organization_id UUID,
+    p_metric TEXT,
+    p_key TEXT,
+    p_size INTEGER,
+    p_index INTEGER,
+    p_amount FLOAT8 DEFAULT 1,
+    p_value FLOAT8 DEFAULT NULL,
+    p_at TIMESTAMPTZ DEFAULT NOW()
+)
+RETURNS VOID AS $$
+DECLARE
+    v_weights FLOAT8[];
+    v_value_sum FLOAT8;
+    v_value_min FLOAT8;
+    v_value_max FLOAT8;
+    v_decayed_at TIMESTAMPTZ;
+    v_factor FLOAT8 := 1;
+    v_amount FLOAT8 := p_amount;
+BEGIN
+    INSERT INTO coach_user_aggregates (user_id, organization_id, metric, key, weights, decayed_at)
+    VALUES (p_user_id, p_organization_id, p_metric, p_key, array_fill(0::float8, ARRAY[p_size]), p_at)
+    ON CONFLICT (user_id, metric, key) DO NOTHING;
+
+    SELECT weights, value_sum, value_min, value_max, decayed_at
+    INTO v_weights, v_value_sum, v_value_min, v_value_max, v_decayed_at
+    FROM coach_user_aggregates
+    WHERE user_id = p_user_id AND metric = p_metric AND key = p_key
+    FOR UPDATE;
+
+    IF p_at >= v_decayed_at THEN
+        v_factor := coach_decay_factor(v_decayed_at, p_at);
+        v_decayed_at := p_at;
+    ELSE
+        -- Late row: weigh it as if it had decayed since p_at
+        v_amount := p_amount * coach_decay_factor(p_at, v_decayed_at);
+    END IF;
+
+    v_weights := ARRAY(
+        SELECT w * v_factor FROM unnest(v_weights) WITH ORDINALITY AS t(w, i) ORDER BY i
+    );
+    v_weights[p_index + 1] := GREATEST(0, v_weights[p_index + 1] + v_amount);
+    v_value_sum := v_value_sum * v_factor;
+
+    IF p_value IS NOT NULL THEN
+        v_value_sum := GREATEST(0, v_value_sum + v_amount * p_value);
+        v_value_min := LEAST(v_value_min, p_value);
+        v_value_max := GREATEST(v_value_max, p_value);
+    END IF;
+
+    UPDATE coach_user_aggregates
+    SET weights = v_weights,
+        value_sum = v_value_sum,
+        value_min = v_value_min,
+        value_max = v_value_max,
+        decayed_at = v_decayed_at
+    WHERE user_id = p_user_id AND metric = p_metric AND key = p_key;
+END;
+$$ LANGUAGE plpgsql;
+
+-- ============================================================================
+-- Triggers
+-- ============================================================================
+
+-- Behavior events arrive in bulk inserts; aggregate per statement
+CREATE OR REPLACE FUNCTION trg_coach_events_aggregate()
+RETURNS TRIGGER AS $$
+DECLARE
+    r RECORD;
+BEGIN
+    FOR r IN
+        SELECT user_id, organization_id, 'hour' AS key, 24 AS size,
+               EXTRACT(HOUR FROM created_at AT TIME ZONE 'UTC')::int AS slot,
+               COUNT(*) AS amount, MAX(created_at) AS at
+        FROM new_events
+        GROUP BY 1, 2, 5
+        UNION ALL
+        SELECT user_id, organization_id, 'weekday', 7,
+               EXTRACT(ISODOW FROM created_at AT TIME ZONE 'UTC')::int - 1,
+               COUNT(*), MAX(created_at)
+        FROM new_events
+        GROUP BY 1, 2, 5
+    LOOP
+        PERFORM bump_coach_user_aggregate(
+            r.user_id, r.organization_id, 'activity', r.key, r.size, r.slot, r.amount, NULL, r.at
+        );
+    END LOOP;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trigger_coach_events_aggregate ON coach_behavior_events;
+CREATE TRIGGER trigger_coach_events_aggregate
+    AFTER INSERT ON coach_behavior_events
+    REFERENCING NEW TABLE AS new_events
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION trg_coach_events_aggregate();
+
+-- Suggestion actions: move the count from the old to the new action
+CREATE OR REPLACE FUNCTION trg_coach_suggestions_aggregate()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'UPDATE' AND OLD.action_taken IS NOT DISTINCT FROM NEW.action_taken THEN
+        RETURN NULL;
+    END IF;
+
+    IF TG_OP = 'UPDATE' AND OLD.action_taken IS NOT NULL THEN
+        PERFORM bump_coach_user_aggregate(
+            OLD.user_id, OLD.organization_id, 'suggestion_action', OLD.suggestion_type,
+            4, coach_suggestion_action_index(OLD.action_taken), -1
+        );
+    END IF;
+
+    IF NEW.action_taken IS NOT NULL THEN
+        PERFORM bump_coach_user_aggregate(
+            NEW.user_id, NEW.organization_id, 'suggestion_action', NEW.suggestion_type,
+            4, coach_suggestion_action_index(NEW.action_taken), 1
+        );
+    END IF;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trigger_coach_suggestions_aggregate ON coach_suggestions;
+CREATE TRIGGER trigger_coach_suggestions_aggregate
+    AFTER INSERT OR UPDATE OF action_taken ON coach_suggestions
+    FOR EACH ROW
+    EXECUTE FUNCTION trg_coach_suggestions_aggregate();
+
+-- Research -> prep: hours from the latest completed research on the same
+-- company to the prep's creation
+CREATE OR REPLACE FUNCTION trg_meeting_preps_step_timing()
+RETURNS TRIGGER AS $$
+DECLARE
+    v_completed_at TIMESTAMPTZ;
+    v_hours FLOAT8;
+BEGIN
+    IF NEW.prospect_company_name IS NULL THEN
+        RETURN NULL;
+    END IF;
+
+    SELECT completed_at INTO v_completed_at
+    FROM research_briefs
+    WHERE organization_id = NEW.organization_id
+      AND lower(company_name) = lower(NEW.prospect_company_name)
+      AND completed_at IS NOT NULL
+      AND completed_at <= NEW.created_at
+    ORDER BY completed_at DESC
+    LIMIT 1;
+
+    IF v_completed_at IS NOT NULL THEN
+        v_hours := EXTRACT(EPOCH FROM NEW.created_at - v_completed_at) / 3600;
+        PERFORM bump_coach_user_aggregate(
+            NEW.user_id, NEW.organization_id, 'step_hours', 'research_to_prep',
+            10, coach_step_bucket(v_hours), 1, v_hours, NEW.created_at
+        );
+    END IF;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trigger_meeting_preps_step_timing ON meeting_preps;
+CREATE TRIGGER trigger_meeting_preps_step_timing
+    AFTER INSERT ON meeting_preps
+    FOR EACH ROW
+    EXECUTE FUNCTION trg_meeting_preps_step_timing();
+
+-- Prep -> follow-up: hours from the latest completed prep on the same
+-- company to the follow-up's creation
+CREATE OR REPLACE FUNCTION trg_followups_step_timing()
+RETURNS TRIGGER AS $$
+DECLARE
+    v_completed_at TIMESTAMPTZ;
+    v_hours FLOAT8;
+BEGIN
+    IF NEW.prospect_company_name IS NULL THEN
+        RETURN NULL;
+    END IF;
+
+    SELECT completed_at INTO v_completed_at
+    FROM meeting_preps
+    WHERE organization_id = NEW.organization_id
+      AND lower(prospect_company_name) = lower(NEW.prospect_company_name)
+      AND completed_at IS NOT NULL
+      AND completed_at <= NEW.created_at
+    ORDER BY completed_at DESC
+    LIMIT 1;
+
+    IF v_completed_at IS NOT NULL THEN
+        v_hours := EXTRACT(EPOCH FROM NEW.created_at - v_completed_at) / 3600;
+        PERFORM bump_coach_user_aggregate(
+            NEW.user_id, NEW.organization_id, 'step_hours', 'prep_to_followup',
+            10, coach_step_bucket(v_hours), 1, v_hours, NEW.created_at
+        );
+    END IF;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trigger_followups_step_timing ON followups;
+CREATE TRIGGER trigger_followups_step_timing
+    AFTER INSERT ON followups
+    FOR EACH ROW
+    EXECUTE FUNCTION trg_followups_step_timing();
+
+-- ============================================================================
+-- Reads
+-- ============================================================================
+
+-- All aggregates of a user, decayed to now
+CREATE OR REPLACE FUNCTION get_coach_user_aggregates(p_user_id UUID)
+RETURNS TABLE (
+    metric TEXT,
+    key TEXT,
+    weights FLOAT8[],
+    value_sum FLOAT8,
+    value_min FLOAT8,
+    value_max FLOAT8
+) AS $$
+    SELECT
+        a.metric,
+        a.key,
+        ARRAY(
+            SELECT w * coach_decay_factor(a.decayed_at, NOW())
+            FROM unnest(a.weights) WITH ORDINALITY AS t(w, i)
+            ORDER BY i
+        ),
+        a.value_sum * coach_decay_factor(a.decayed_at, NOW()),
+        a.value_min,
+        a.value_max
+    FROM coach_user_aggregates a
+    WHERE a.user_id = p_user_id;
+$$ LANGUAGE sql STABLE;
+
+-- ============================================================================
+-- Recompute (backfill; also repairs drift, e.g. after bulk deletes)
+-- ============================================================================
+
+CREATE OR REPLACE FUNCTION recompute_coach_user_aggregates(p_user_id UUID DEFAULT NULL)
+RETURNS VOID AS $$
+BEGIN
+    DELETE FROM coach_user_aggregates
+    WHERE p_user_id IS NULL OR user_id = p_user_id;
+
+    -- Observations older than 8 half-lives weigh < 0.4% and are skipped
+    WITH observations AS (
+        -- Activity
+        SELECT user_id, organization_id, 'activity' AS metric, 'hour' AS key, 24 AS size,
+               EXTRACT(HOUR FROM created_at AT TIME ZONE 'UTC')::int AS slot,
+               NULL::float8 AS value, created_at AS at
+        FROM coach_behavior_events
+        WHERE created_at > NOW() - 8 * coach_aggregate_half_life()
+        UNION ALL
+        SELECT user_id, organization_id, 'activity', 'weekday', 7,
+               EXTRACT(ISODOW FROM created_at AT TIME ZONE 'UTC')::int - 1,
+               NULL, created_at
+        FROM coach_behavior_events
+        WHERE created_at > NOW() - 8 * coach_aggregate_half_life()
+        UNION ALL
+        -- Suggestion actions
+        SELECT user_id, organization_id, 'suggestion_action', suggestion_type, 4,
+               coach_suggestion_action_index(action_taken),
+               NULL, COALESCE(acted_at, created_at)
+        FROM coach_suggestions
+        WHERE action_taken IS NOT NULL
+        UNION ALL
+        -- Research -> prep
+        SELECT p.user_id, p.organization_id, 'step_hours', 'research_to_prep', 10,
+               coach_step_bucket(h.hours), h.hours, p.created_at
+        FROM meeting_preps p
+        CROSS JOIN LATERAL (
+            SELECT EXTRACT(EPOCH FROM p.created_at - r.completed_at) / 3600 AS hours
+            FROM research_briefs r
+            WHERE r.organization_id = p.organization_id
+              AND lower(r.company_name) = lower(p.prospect_company_name)
+              AND r.completed_at IS NOT NULL
+              AND r.completed_at <= p.created_at
+            ORDER BY r.completed_at DESC
+            LIMIT 1
+        ) h
+        WHERE p.prospect_company_name IS NOT NULL
+          AND p.created_at > NOW() - 8 * coach_aggregate_half_life()
+        UNION ALL
+        -- Prep -> follow-up
+        SELECT f.user_id, f.organization_id, 'step_hours', 'prep_to_followup', 10,
+               coach_step_bucket(h.hours), h.hours, f.created_at
+        FROM followups f
+        CROSS JOIN LATERAL (
+            SELECT EXTRACT(EPOCH FROM f.created_at - mp.completed_at) / 3600 AS hours
+            FROM meeting_preps mp
+            WHERE mp.organization_id = f.organization_id
+              AND lower(mp.prospect_company_name) = lower(f.prospect_company_name)
+              AND mp.completed_at IS NOT NULL
+              AND mp.completed_at <= f.created_at
+            ORDER BY mp.completed_at DESC
+            LIMIT 1
+        ) h
+        WHERE f.prospect_company_name IS NOT NULL
+          AND f.created_at > NOW() - 8 * coach_aggregate_half_life()
+    ),
+    slots AS (
+        SELECT user_id, metric, key, slot,
+               SUM(coach_decay_factor(at, NOW())) AS weight
+        FROM observations
+        WHERE p_user_id IS NULL OR user_id = p_user_id
+        GROUP BY user_id, metric, key, slot
+    ),
+    aggregates AS (
+        SELECT user_id, metric, key,
+               MAX(size) AS size,
+               MAX(organization_id::text)::uuid AS organization_id,
+               COALESCE(SUM(coach_decay_factor(at, NOW()) * value), 0) AS value_sum,
+               MIN(value) AS value_min,
+               MAX(value) AS value_max
+        FROM observations
+        WHERE p_user_id IS NULL OR user_id = p_user_id
+        GROUP BY user_id, metric, key
+    )
+    INSERT INTO coach_user_aggregates (
+        user_id, organization_id, metric, key, weights, value_sum, value_min, value_max, decayed_at
+    )
+    SELECT
+        a.user_id,
+        a.organization_id,
+        a.metric,
+        a.key,
+        ARRAY(
+            SELECT COALESCE(s.weight, 0)
+            FROM generate_series(0, a.size - 1) AS g(slot)
+            LEFT JOIN slots s
+              ON s.user_id = a.user_id AND s.metric = a.metric AND s.key = a.key AND s.slot = g.slot
+            ORDER BY g.slot
+        ),
+        a.value_sum,
+        a.value_min,
+        a.value_max,
+        NOW()
+    FROM aggregates a;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Backfill
+SELECT recompute_coach_user_aggregates();
+
+-- Comments for documentation
+COMMENT ON TABLE coach_user_aggregates IS 'Decaying per-user coach pattern aggregates (activity histograms, step timing sketches, suggestion action counts), maintained by triggers';
+COMMENT ON COLUMN coach_user_aggregates.weights IS 'Weights as of decayed_at; read through get_coach_user_aggregates() for current values';
@@ -0,0 +1,41 @@
+-- ============================================================================
+-- MIGRATION: Embedding Cache
+-- Content-hash keyed cache for Voyage AI embeddings, so duplicate chunks,
+-- re-uploaded files and repeated RAG queries are never embedded twice.
+-- Date: 16 October 2026
+-- ============================================================================
+
+-- ============================================================================
+-- 1. CREATE EMBEDDING CACHE TABLE
+-- ============================================================================
+
+CREATE TABLE IF NOT EXISTS embedding_cache (
+    -- sha256(model | input_type | text)
+    content_hash TEXT PRIMARY KEY,
+    model TEXT NOT NULL,
+    input_type TEXT NOT NULL,
+    embedding REAL[] NOT NULL,
+    created_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+-- ============================================================================
+-- 2. ADD INDEXES
+-- ============================================================================
+
+-- Cleanup of old entries / model migrations
+CREATE INDEX IF NOT EXISTS idx_embedding_cache_created
+ON embedding_cache(created_at);
+
+CREATE INDEX IF NOT EXISTS idx_embedding_cache_model
+ON embedding_cache(model);
+
+-- ============================================================================
+-- 3. ROW LEVEL SECURITY
+-- ============================================================================
+
+-- Backend-only table: hashes reveal nothing, but embeddings are derived
+-- from customer content, so only the service role may read/write.
+ALTER TABLE embedding_cache ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY "Service role full access" ON embedding_cache
+    FOR ALL USING (auth.role() = 'service_role');
@@ -0,0 +1,67 @@
+-- Migration: Resumable mobile recording uploads
+-- Purpose: Track chunked upload sessions from the mobile app
+-- (init -> append parts -> complete). Parts are streamed straight into
+-- Supabase Storage's resumable upload endpoint; this table only keeps the
+-- session state so a dropped connection can resume from the last
+-- acknowledged part.
+
+-- ============================================================================
+-- Upload Sessions Table
+-- ============================================================================
+
+CREATE TABLE IF NOT EXISTS mobile_recording_uploads (
+    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    organization_id UUID NOT NULL REFERENCES organizations(id) ON DELETE CASCADE,
+    user_id UUID NOT NULL REFERENCES auth.users(id) ON DELETE CASCADE,
+
+    -- Id the mobile_recordings row gets when the upload completes
+    recording_id UUID NOT NULL,
+    local_recording_id TEXT NOT NULL,
+    prospect_id UUID REFERENCES prospects(id) ON DELETE SET NULL,
+
+    -- File
+    storage_path TEXT NOT NULL,
+    original_filename TEXT,
+    content_type TEXT,
+    file_size_bytes BIGINT NOT NULL,
+    duration_seconds INTEGER NOT NULL DEFAULT 0,
+
+    -- Upload progress
+    part_size INTEGER NOT NULL,
+    upload_url TEXT NOT NULL,  -- Storage resumable (TUS) upload URL
+    received_bytes BIGINT NOT NULL DEFAULT 0,
+    status TEXT NOT NULL DEFAULT 'uploading' CHECK (status IN ('uploading', 'completed')),
+    expires_at TIMESTAMPTZ NOT NULL,
+
+    -- Timestamps
+    created_at TIMESTAMPTZ DEFAULT NOW(),
+    updated_at TIMESTAMPTZ DEFAULT NOW(),
+    completed_at TIMESTAMPTZ,
+
+    -- One session per local recording (init is idempotent)
+    UNIQUE(organization_id, local_recording_id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_mobile_recording_uploads_user
+    ON mobile_recording_uploads(user_id);
+
+CREATE INDEX IF NOT EXISTS idx_mobile_recording_uploads_expires
+    ON mobile_recording_uploads(expires_at)
+    WHERE status = 'uploading';
+
+-- Only the backend (service role) reads/writes upload sessions
+ALTER TABLE mobile_recording_uploads ENABLE ROW LEVEL SECURITY;
+
+-- ============================================================================
+-- Trigger for updated_at
+-- ============================================================================
+
+DROP TRIGGER IF EXISTS trigger_mobile_recording_uploads_updated_at ON mobile_recording_uploads;
+CREATE TRIGGER trigger_mobile_recording_uploads_updated_at
+    BEFORE UPDATE ON mobile_recording_uploads
+    FOR EACH ROW
+    EXECUTE FUNCTION update_mobile_recordings_updated_at();
+
+-- Comments for documentation
+COMMENT ON TABLE mobile_recording_uploads IS 'Resumable upload sessions for mobile recordings';
+COMMENT ON COLUMN mobile_recording_uploads.received_bytes IS 'Bytes acknowledged by storage; next part = received_bytes / part_size';
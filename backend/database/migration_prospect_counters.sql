@@ -0,0 +1,276 @@
+-- Migration: Maintained prospect activity counters and status counts
+-- Purpose: GET /api/v1/prospects embedded research_briefs, meeting_preps,
+-- followups and prospect_contacts for every listed prospect only to count
+-- them, and /prospects/stats read every prospect's status. Both now read
+-- counters that triggers keep current.
+--
+--   prospects.research_count / prep_count / followup_count / contact_count
+--       Rows linked to the prospect (any status), maintained by
+--       trg_prospect_activity_count() on the four child tables.
+--   prospect_status_counts
+--       Prospects per (organization, status), maintained by
+--       trg_prospect_status_count() on prospects.
+--   reconcile_prospect_counters()
+--       Recomputes both from the source rows for a batch of organizations
+--       and fixes any drift (run nightly by the prospect-counters-reconcile
+--       Inngest job).
+--
+-- The list endpoint pages with a keyset on (sort column, id), so the sort
+-- columns are made NOT NULL and get (organization_id, column, id) indexes.
+
+-- ============================================================================
+-- Counter Columns
+-- ============================================================================
+
+ALTER TABLE prospects ADD COLUMN IF NOT EXISTS research_count INTEGER NOT NULL DEFAULT 0;
+ALTER TABLE prospects ADD COLUMN IF NOT EXISTS prep_count INTEGER NOT NULL DEFAULT 0;
+ALTER TABLE prospects ADD COLUMN IF NOT EXISTS followup_count INTEGER NOT NULL DEFAULT 0;
+ALTER TABLE prospects ADD COLUMN IF NOT EXISTS contact_count INTEGER NOT NULL DEFAULT 0;
+
+CREATE TABLE IF NOT EXISTS prospect_status_counts (
+    organization_id UUID NOT NULL REFERENCES organizations(id) ON DELETE CASCADE,
+    status TEXT NOT NULL,
+    prospect_count BIGINT NOT NULL DEFAULT 0,
+
+    PRIMARY KEY (organization_id, status)
+);
+
+-- Only the backend (service role) reads/writes status counts
+ALTER TABLE prospect_status_counts ENABLE ROW LEVEL SECURITY;
+
+-- ============================================================================
+-- Keyset Pagination
+-- ============================================================================
+
+UPDATE prospects SET status = 'new' WHERE status IS NULL;
+UPDATE prospects SET created_at = NOW() WHERE created_at IS NULL;
+UPDATE prospects SET last_activity_at = COALESCE(updated_at, created_at) WHERE last_activity_at IS NULL;
+
+ALTER TABLE prospects
+    ALTER COLUMN status SET NOT NULL,
+    ALTER COLUMN created_at SET NOT NULL,
+    ALTER COLUMN last_activity_at SET NOT NULL;
+
+-- One index per sort column; scanned backwards for descending pages
+CREATE INDEX IF NOT EXISTS idx_prospects_org_last_activity_id
+    ON prospects(organization_id, last_activity_at, id);
+
+CREATE INDEX IF NOT EXISTS idx_prospects_org_created_id
+    ON prospects(organization_id, created_at, id);
+
+CREATE INDEX IF NOT EXISTS idx_prospects_org_company_name_id
+    ON prospects(organization_id, company_name, id);
+
+CREATE INDEX IF NOT EXISTS idx_prospects_org_status_id
+    ON prospects(organization_id, status, id);
+
+-- Superseded by idx_prospects_org_last_activity_id
+DROP INDEX IF EXISTS idx_prospects_last_activity;
+
+-- ============================================================================
+-- Triggers
+-- ============================================================================
+
+-- Activity counts: TG_ARGV[0] is the prospects counter column. Moving a row
+-- to another prospect moves the count.
+CREATE OR REPLACE FUNCTION trg_prospect_activity_count()
+RETURNS TRIGGER AS $$
+DECLARE
+    v_column TEXT := TG_ARGV[0];
+    v_old UUID;
+    v_new UUID;
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        v_old := OLD.prospect_id;
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        v_new := NEW.prospect_id;
+    END IF;
+
+    IF v_old IS NOT DISTINCT FROM v_new THEN
+        RETURN NULL;
+    END IF;
+
+    IF v_old IS NOT NULL THEN
+        EXECUTE format('UPDATE public.prospects SET %1$I = GREATEST(%1$I - 1, 0) WHERE id = $1', v_column)
+        USING v_old;
+    END IF;
+
+    IF v_new IS NOT NULL THEN
+        EXECUTE format('UPDATE public.prospects SET %1$I = %1$I + 1 WHERE id = $1', v_column)
+        USING v_new;
+    END IF;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql SET search_path = '';
+
+DROP TRIGGER IF EXISTS trigger_research_briefs_prospect_count ON research_briefs;
+CREATE TRIGGER trigger_research_briefs_prospect_count
+    AFTER INSERT OR DELETE OR UPDATE OF prospect_id ON research_briefs
+    FOR EACH ROW
+    EXECUTE FUNCTION trg_prospect_activity_count('research_count');
+
+DROP TRIGGER IF EXISTS trigger_meeting_preps_prospect_count ON meeting_preps;
+CREATE TRIGGER trigger_meeting_preps_prospect_count
+    AFTER INSERT OR DELETE OR UPDATE OF prospect_id ON meeting_preps
+    FOR EACH ROW
+    EXECUTE FUNCTION trg_prospect_activity_count('prep_count');
+
+DROP TRIGGER IF EXISTS trigger_followups_prospect_count ON followups;
+CREATE TRIGGER trigger_followups_prospect_count
+    AFTER INSERT OR DELETE OR UPDATE OF prospect_id ON followups
+    FOR EACH ROW
+    EXECUTE FUNCTION trg_prospect_activity_count('followup_count');
+
+DROP TRIGGER IF EXISTS trigger_prospect_contacts_prospect_count ON prospect_contacts;
+CREATE TRIGGER trigger_prospect_contacts_prospect_count
+    AFTER INSERT OR DELETE OR UPDATE OF prospect_id ON prospect_contacts
+    FOR EACH ROW
+    EXECUTE FUNCTION trg_prospect_activity_count('contact_count');
+
+-- Status counts. Decrements only update existing rows, so the cascade from
+-- an organization delete never inserts a row for the deleted organization.
+CREATE OR REPLACE FUNCTION trg_prospect_status_count()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'UPDATE'
+       AND OLD.organization_id = NEW.organization_id
+       AND OLD.status = NEW.status THEN
+        RETURN NULL;
+    END IF;
+
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        UPDATE public.prospect_status_counts
+        SET prospect_count = GREATEST(prospect_count - 1, 0)
+        WHERE organization_id = OLD.organization_id AND status = OLD.status;
+    END IF;
+
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        INSERT INTO public.prospect_status_counts AS c (organization_id, status, prospect_count)
+        VALUES (NEW.organization_id, NEW.status, 1)
+        ON CONFLICT (organization_id, status) DO UPDATE SET
+            prospect_count = c.prospect_count + 1;
+    END IF;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql SET search_path = '';
+
+DROP TRIGGER IF EXISTS trigger_prospects_status_count ON prospects;
+CREATE TRIGGER trigger_prospects_status_count
+    AFTER INSERT OR DELETE OR UPDATE OF status, organization_id ON prospects
+    FOR EACH ROW
+    EXECUTE FUNCTION trg_prospect_status_count();
+
+-- ============================================================================
+-- Reconciliation
+-- ============================================================================
+
+-- Recompute the counters of the next p_max_organizations organizations
+-- (ordered by id, after p_after_organization_id) and fix rows that drifted.
+-- Counts written by concurrent transactions during a run can still be off;
+-- the next run corrects them.
+CREATE OR REPLACE FUNCTION reconcile_prospect_counters(
+    p_after_organization_id UUID DEFAULT NULL,
+    p_max_organizations INTEGER DEFAULT 200
+)
+RETURNS TABLE (
+    last_organization_id UUID,
+    prospects_fixed BIGINT,
+    status_counts_fixed BIGINT,
+    done BOOLEAN
+) AS $$
+DECLARE
+    v_orgs UUID[];
+    v_prospects BIGINT := 0;
+    v_statuses BIGINT := 0;
+BEGIN
+    SELECT array_agg(o.id ORDER BY o.id) INTO v_orgs
+    FROM (
+        SELECT id
+        FROM organizations
+        WHERE p_after_organization_id IS NULL OR id > p_after_organization_id
+        ORDER BY id
+        LIMIT p_max_organizations
+    ) o;
+
+    IF v_orgs IS NULL THEN
+        RETURN QUERY SELECT NULL::UUID, 0::BIGINT, 0::BIGINT, TRUE;
+        RETURN;
+    END IF;
+
+    WITH actual AS (
+        SELECT
+            p.id,
+            (SELECT COUNT(*) FROM research_briefs r WHERE r.prospect_id = p.id)::INTEGER AS research_count,
+            (SELECT COUNT(*) FROM meeting_preps m WHERE m.prospect_id = p.id)::INTEGER AS prep_count,
+            (SELECT COUNT(*) FROM followups f WHERE f.prospect_id = p.id)::INTEGER AS followup_count,
+            (SELECT COUNT(*) FROM prospect_contacts c WHERE c.prospect_id = p.id)::INTEGER AS contact_count
+        FROM prospects p
+        WHERE p.organization_id = ANY(v_orgs)
+    )
+    UPDATE prospects p SET
+        research_count = a.research_count,
+        prep_count = a.prep_count,
+        followup_count = a.followup_count,
+        contact_count = a.contact_count
+    FROM actual a
+    WHERE p.id = a.id
+      AND (p.research_count, p.prep_count, p.followup_count, p.contact_count)
+          IS DISTINCT FROM (a.research_count, a.prep_count, a.followup_count, a.contact_count);
+
+    GET DIAGNOSTICS v_prospects = ROW_COUNT;
+
+    WITH actual AS (
+        SELECT organization_id, status, COUNT(*) AS prospect_count
+        FROM prospects
+        WHERE organization_id = ANY(v_orgs)
+        GROUP BY organization_id, status
+    ),
+    upserted AS (
+        INSERT INTO prospect_status_counts AS c (organization_id, status, prospect_count)
+        SELECT organization_id, status, prospect_count FROM actual
+        ON CONFLICT (organization_id, status) DO UPDATE SET
+            prospect_count = EXCLUDED.prospect_count
+        WHERE c.prospect_count <> EXCLUDED.prospect_count
+        RETURNING 1
+    ),
+    removed AS (
+        DELETE FROM prospect_status_counts c
+        WHERE c.organization_id = ANY(v_orgs)
+          AND NOT EXISTS (
+              SELECT 1 FROM actual a
+              WHERE a.organization_id = c.organization_id AND a.status = c.status
+          )
+        RETURNING 1
+    )
+    SELECT (SELECT COUNT(*) FROM upserted) + (SELECT COUNT(*) FROM removed) INTO v_statuses;
+
+    RETURN QUERY SELECT
+        v_orgs[array_length(v_orgs, 1)],
+        v_prospects,
+        v_statuses,
+        array_length(v_orgs, 1) < p_max_organizations;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Backfill
+DO $$
+DECLARE
+    v_after UUID;
+    v_done BOOLEAN := FALSE;
+BEGIN
+    WHILE NOT v_done LOOP
+        SELECT r.last_organization_id, r.done INTO v_after, v_done
+        FROM reconcile_prospect_counters(v_after, 1000) r;
+    END LOOP;
+END $$;
+
+-- Comments for documentation
+COMMENT ON COLUMN prospects.research_count IS 'research_briefs linked to the prospect; maintained by trigger, see reconcile_prospect_counters()';
+COMMENT ON COLUMN prospects.prep_count IS 'meeting_preps linked to the prospect; maintained by trigger, see reconcile_prospect_counters()';
+COMMENT ON COLUMN prospects.followup_count IS 'followups linked to the prospect; maintained by trigger, see reconcile_prospect_counters()';
+COMMENT ON COLUMN prospects.contact_count IS 'prospect_contacts of the prospect; maintained by trigger, see reconcile_prospect_counters()';
+COMMENT ON TABLE prospect_status_counts IS 'Prospects per organization and status (served by /prospects/stats); maintained by trigger';
+COMMENT ON FUNCTION reconcile_prospect_counters IS 'Recompute prospect activity counters and status counts for a batch of organizations, fixing drift';
@@ -0,0 +1,107 @@
+-- Migration: Typo-tolerant prospect search (pg_trgm)
+-- Purpose: Postgres variant of the in-memory autocomplete index
+-- (app/services/prospect_autocomplete.py), used while an organization's
+-- index is still being built. ilike '%q%' scans could not use an index and
+-- missed near-spellings; trigram GIN indexes serve both.
+--
+--   search_prospects_fuzzy(org, query, limit, sources)
+--       Prospects matching the query by company name, website domain or
+--       contact name, ranked like the in-memory index: word similarity
+--       plus a bonus for prefix matches, best match per prospect.
+--
+-- Text is matched lower-cased (the in-memory index additionally strips
+-- company suffixes and punctuation, see ProspectMatcher.normalize_company_name),
+-- so scores are comparable but not identical.
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+-- ============================================================================
+-- Indexes
+-- ============================================================================
+
+CREATE INDEX IF NOT EXISTS idx_prospects_company_name_trgm
+    ON prospects USING gin (lower(company_name) gin_trgm_ops);
+
+CREATE INDEX IF NOT EXISTS idx_prospects_website_trgm
+    ON prospects USING gin (lower(website) gin_trgm_ops);
+
+CREATE INDEX IF NOT EXISTS idx_prospect_contacts_name_trgm
+    ON prospect_contacts USING gin (lower(name) gin_trgm_ops);
+
+-- ============================================================================
+-- Search
+-- ============================================================================
+
+CREATE OR REPLACE FUNCTION search_prospects_fuzzy(
+    p_organization_id UUID,
+    p_query TEXT,
+    p_limit INTEGER DEFAULT 10,
+    p_sources TEXT[] DEFAULT NULL  -- 'name', 'domain', 'contact'; NULL = all
+)
+RETURNS TABLE (
+    id UUID,
+    company_name TEXT,
+    status TEXT,
+    industry TEXT,
+    last_activity_at TIMESTAMPTZ,
+    matched_on TEXT,
+    matched_text TEXT,
+    score REAL
+) AS $$
+    WITH q AS (
+        SELECT lower(trim(p_query)) AS q
+    ),
+    matches AS (
+        SELECT p.id AS prospect_id, 'name' AS matched_on, p.company_name AS matched_text,
+               word_similarity(q.q, lower(p.company_name)) AS similarity,
+               lower(p.company_name) AS target
+        FROM prospects p, q
+        WHERE p.organization_id = p_organization_id
+          AND (p_sources IS NULL OR 'name' = ANY(p_sources))
+          AND q.q <% lower(p.company_name)
+
+        UNION ALL
+
+        SELECT p.id, 'domain', p.website,
+               word_similarity(q.q, lower(p.website)),
+               regexp_replace(lower(p.website), '^(https?://)?(www\.)?', '')
+        FROM prospects p, q
+        WHERE p.organization_id = p_organization_id
+          AND (p_sources IS NULL OR 'domain' = ANY(p_sources))
+          AND p.website IS NOT NULL
+          AND q.q <% lower(p.website)
+
+        UNION ALL
+
+        SELECT c.prospect_id, 'contact', c.name,
+               word_similarity(q.q, lower(c.name)),
+               lower(c.name)
+        FROM prospect_contacts c, q
+        WHERE c.organization_id = p_organization_id
+          AND (p_sources IS NULL OR 'contact' = ANY(p_sources))
+          AND q.q <% lower(c.name)
+    ),
+    scored AS (
+        SELECT DISTINCT ON (m.prospect_id)
+            m.prospect_id,
+            m.matched_on,
+            m.matched_text,
+            m.similarity + CASE
+                WHEN starts_with(m.target, q.q) THEN 0.5
+                WHEN position(' ' || q.q IN ' ' || m.target) > 0 THEN 0.25
+                ELSE 0
+            END AS score
+        FROM matches m, q
+        ORDER BY m.prospect_id, score DESC
+    )
+    SELECT p.id, p.company_name, p.status, p.industry, p.last_activity_at,
+           s.matched_on, s.matched_text, s.score::REAL
+    FROM scored s
+    JOIN prospects p ON p.id = s.prospect_id
+    ORDER BY s.score DESC, p.last_activity_at DESC
+    LIMIT p_limit;
+$$ LANGUAGE sql STABLE
+SET pg_trgm.word_similarity_threshold = 0.3;
+
+-- Comments for documentation
+COMMENT ON FUNCTION search_prospects_fuzzy IS 'Typo-tolerant prospect search by name, website domain or contact name (pg_trgm); cold-start fallback of the in-memory autocomplete index';
@@ -0,0 +1,298 @@
+-- Migration: Recordings feed keyset pagination + incremental counters
+-- Purpose:
+--   1. Give every source of GET /api/v1/recordings an indexed sort key so the
+--      feed can be read page by page with keyset pagination on (key, id)
+--      instead of loading every recording of the organization:
+--        mobile_recordings    -> created_at
+--        external_recordings  -> recording_date
+--        followups            -> feed_at = COALESCE(meeting_date, created_at)
+--        scheduled_recordings -> feed_at = COALESCE(completed_at, scheduled_time)
+--   2. Keep per organization / source / status counts up to date with
+--      triggers so GET /api/v1/recordings/stats is a single small read.
+
+-- ============================================================================
+-- Sort keys
+-- ============================================================================
+
+-- meeting_date is a DATE; interpret it as midnight UTC
+-- (note: adding a stored generated column rewrites the table)
+ALTER TABLE followups
+ADD COLUMN IF NOT EXISTS feed_at TIMESTAMPTZ
+    GENERATED ALWAYS AS (COALESCE(meeting_date::timestamp AT TIME ZONE 'UTC', created_at)) STORED;
+
+ALTER TABLE scheduled_recordings
+ADD COLUMN IF NOT EXISTS feed_at TIMESTAMPTZ
+    GENERATED ALWAYS AS (COALESCE(completed_at, scheduled_time)) STORED;
+
+CREATE INDEX IF NOT EXISTS idx_mobile_recordings_feed
+    ON mobile_recordings(organization_id, created_at DESC, id DESC);
+
+CREATE INDEX IF NOT EXISTS idx_external_recordings_feed
+    ON external_recordings(organization_id, recording_date DESC, id DESC);
+
+CREATE INDEX IF NOT EXISTS idx_followups_audio_feed
+    ON followups(organization_id, feed_at DESC, id DESC)
+    WHERE audio_url IS NOT NULL;
+
+CREATE INDEX IF NOT EXISTS idx_scheduled_recordings_feed
+    ON scheduled_recordings(organization_id, feed_at DESC, id DESC);
+
+-- Used to exclude AI Notetaker followups from the web_upload source
+CREATE INDEX IF NOT EXISTS idx_scheduled_recordings_followup
+    ON scheduled_recordings(followup_id)
+    WHERE followup_id IS NOT NULL;
+
+-- ============================================================================
+-- Counters
+-- ============================================================================
+
+-- status is the unified status bucket: pending, processing, completed,
+-- failed, or other (counted in totals only)
+CREATE TABLE IF NOT EXISTS recording_feed_counters (
+    organization_id UUID NOT NULL,
+    source TEXT NOT NULL,
+    status TEXT NOT NULL,
+    count BIGINT NOT NULL DEFAULT 0,
+    PRIMARY KEY (organization_id, source, status)
+);
+
+-- Only the backend (service role) reads the counters
+ALTER TABLE recording_feed_counters ENABLE ROW LEVEL SECURITY;
+
+CREATE OR REPLACE FUNCTION bump_recording_feed_counter(
+    p_organization_id UUID,
+    p_source TEXT,
+    p_status TEXT,
+    p_delta INTEGER
+)
+RETURNS VOID AS $$
+BEGIN
+    IF p_organization_id IS NULL OR p_source IS NULL THEN
+        RETURN;
+    END IF;
+    INSERT INTO recording_feed_counters (organization_id, source, status, count)
+    VALUES (p_organization_id, p_source, p_status, GREATEST(p_delta, 0))
+    ON CONFLICT (organization_id, source, status)
+    DO UPDATE SET count = GREATEST(recording_feed_counters.count + p_delta, 0);
+END;
+$$ LANGUAGE plpgsql;
+
+-- Status buckets (same mapping as the recordings router)
+CREATE OR REPLACE FUNCTION recording_feed_status_mobile(p_status TEXT)
+RETURNS TEXT AS $$
+    SELECT CASE WHEN p_status IN ('pending', 'processing', 'completed', 'failed') THEN p_status ELSE 'other' END;
+$$ LANGUAGE sql IMMUTABLE;
+
+CREATE OR REPLACE FUNCTION recording_feed_status_external(p_status TEXT)
+RETURNS TEXT AS $$
+    SELECT CASE p_status
+        WHEN 'pending' THEN 'pending'
+        WHEN 'imported' THEN 'completed'
+        WHEN 'skipped' THEN 'completed'
+        WHEN 'failed' THEN 'failed'
+        ELSE 'other'
+    END;
+$$ LANGUAGE sql IMMUTABLE;
+
+CREATE OR REPLACE FUNCTION recording_feed_status_followup(p_status TEXT)
+RETURNS TEXT AS $$
+    SELECT CASE
+        WHEN p_status = 'uploading' THEN 'pending'
+        WHEN p_status IN ('transcribing', 'summarizing') THEN 'processing'
+        WHEN p_status IN ('completed', 'failed') THEN p_status
+        ELSE 'other'
+    END;
+$$ LANGUAGE sql IMMUTABLE;
+
+CREATE OR REPLACE FUNCTION recording_feed_status_scheduled(p_status TEXT)
+RETURNS TEXT AS $$
+    SELECT CASE
+        WHEN p_status = 'scheduled' THEN 'pending'
+        WHEN p_status IN ('joining', 'waiting_room', 'recording', 'processing') THEN 'processing'
+        WHEN p_status = 'complete' THEN 'completed'
+        WHEN p_status IN ('error', 'cancelled') THEN 'failed'
+        ELSE 'other'
+    END;
+$$ LANGUAGE sql IMMUTABLE;
+
+-- A followup is a web_upload recording if it has audio and is not the
+-- result of an AI Notetaker recording (those are shown as ai_notetaker)
+CREATE OR REPLACE FUNCTION is_web_upload_followup(p_followup_id UUID, p_audio_url TEXT)
+RETURNS BOOLEAN AS $$
+    SELECT p_audio_url IS NOT NULL AND NOT EXISTS (
+        SELECT 1 FROM scheduled_recordings WHERE followup_id = p_followup_id
+    );
+$$ LANGUAGE sql STABLE;
+
+-- ---------------------------------------------------------------------------
+-- Triggers
+-- ---------------------------------------------------------------------------
+
+CREATE OR REPLACE FUNCTION trg_mobile_recordings_feed_counter()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        PERFORM bump_recording_feed_counter(OLD.organization_id, 'mobile', recording_feed_status_mobile(OLD.status), -1);
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        PERFORM bump_recording_feed_counter(NEW.organization_id, 'mobile', recording_feed_status_mobile(NEW.status), 1);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trigger_mobile_recordings_feed_counter ON mobile_recordings;
+CREATE TRIGGER trigger_mobile_recordings_feed_counter
+    AFTER INSERT OR DELETE OR UPDATE OF status, organization_id ON mobile_recordings
+    FOR EACH ROW
+    EXECUTE FUNCTION trg_mobile_recordings_feed_counter();
+
+CREATE OR REPLACE FUNCTION trg_external_recordings_feed_counter()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        PERFORM bump_recording_feed_counter(OLD.organization_id, OLD.provider, recording_feed_status_external(OLD.import_status), -1);
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        PERFORM bump_recording_feed_counter(NEW.organization_id, NEW.provider, recording_feed_status_external(NEW.import_status), 1);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trigger_external_recordings_feed_counter ON external_recordings;
+CREATE TRIGGER trigger_external_recordings_feed_counter
+    AFTER INSERT OR DELETE OR UPDATE OF import_status, provider, organization_id ON external_recordings
+    FOR EACH ROW
+    EXECUTE FUNCTION trg_external_recordings_feed_counter();
+
+CREATE OR REPLACE FUNCTION trg_followups_feed_counter()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') AND is_web_upload_followup(OLD.id, OLD.audio_url) THEN
+        PERFORM bump_recording_feed_counter(OLD.organization_id, 'web_upload', recording_feed_status_followup(OLD.status), -1);
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') AND is_web_upload_followup(NEW.id, NEW.audio_url) THEN
+        PERFORM bump_recording_feed_counter(NEW.organization_id, 'web_upload', recording_feed_status_followup(NEW.status), 1);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trigger_followups_feed_counter ON followups;
+CREATE TRIGGER trigger_followups_feed_counter
+    AFTER INSERT OR DELETE OR UPDATE OF status, audio_url, organization_id ON followups
+    FOR EACH ROW
+    EXECUTE FUNCTION trg_followups_feed_counter();
+
+CREATE OR REPLACE FUNCTION trg_scheduled_recordings_feed_counter()
+RETURNS TRIGGER AS $$
+DECLARE
+    linked RECORD;
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        PERFORM bump_recording_feed_counter(OLD.organization_id, 'ai_notetaker', recording_feed_status_scheduled(OLD.status), -1);
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        PERFORM bump_recording_feed_counter(NEW.organization_id, 'ai_notetaker', recording_feed_status_scheduled(NEW.status), 1);
+    END IF;
+
+    -- Linking a followup moves it out of web_upload; unlinking moves it back
+    IF TG_OP IN ('UPDATE', 'DELETE') AND OLD.followup_id IS NOT NULL
+       AND (TG_OP = 'DELETE' OR NEW.followup_id IS DISTINCT FROM OLD.followup_id) THEN
+        SELECT id, organization_id, status, audio_url INTO linked FROM followups WHERE id = OLD.followup_id;
+        IF FOUND AND is_web_upload_followup(linked.id, linked.audio_url) THEN
+            PERFORM bump_recording_feed_counter(linked.organization_id, 'web_upload', recording_feed_status_followup(linked.status), 1);
+        END IF;
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') AND NEW.followup_id IS NOT NULL
+       AND (TG_OP = 'INSERT' OR NEW.followup_id IS DISTINCT FROM OLD.followup_id) THEN
+        SELECT id, organization_id, status, audio_url INTO linked FROM followups WHERE id = NEW.followup_id;
+        IF FOUND AND linked.audio_url IS NOT NULL AND NOT EXISTS (
+            SELECT 1 FROM scheduled_recordings WHERE followup_id = NEW.followup_id AND id <> NEW.id
+        ) THEN
+            PERFORM bump_recording_feed_counter(linked.organization_id, 'web_upload', recording_feed_status_followup(linked.status), -1);
+        END IF;
+    END IF;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trigger_scheduled_recordings_feed_counter ON scheduled_recordings;
+CREATE TRIGGER trigger_scheduled_recordings_feed_counter
+    AFTER INSERT OR DELETE OR UPDATE OF status, organization_id, followup_id ON scheduled_recordings
+    FOR EACH ROW
+    EXECUTE FUNCTION trg_scheduled_recordings_feed_counter();
+
+-- ============================================================================
+-- Web upload source
+-- ============================================================================
+
+-- Followups with audio that are not the result of an AI Notetaker recording,
+-- so the web_upload source is a single keyset query (served by
+-- idx_followups_audio_feed and idx_scheduled_recordings_followup)
+CREATE OR REPLACE VIEW web_upload_recordings
+WITH (security_invoker = true)
+AS
+SELECT
+    f.id,
+    f.organization_id,
+    f.user_id,
+    f.prospect_id,
+    f.prospect_company_name,
+    f.meeting_subject,
+    f.meeting_date,
+    f.audio_url,
+    f.audio_filename,
+    f.audio_size_bytes,
+    f.audio_duration_seconds,
+    f.status,
+    f.error_message,
+    f.created_at,
+    f.completed_at,
+    f.feed_at
+FROM followups f
+WHERE f.audio_url IS NOT NULL
+  AND NOT EXISTS (SELECT 1 FROM scheduled_recordings sr WHERE sr.followup_id = f.id);
+
+-- ============================================================================
+-- Recompute (backfill; also repairs drift, e.g. after bulk imports)
+-- ============================================================================
+
+CREATE OR REPLACE FUNCTION recompute_recording_feed_counters(p_organization_id UUID DEFAULT NULL)
+RETURNS VOID AS $$
+BEGIN
+    DELETE FROM recording_feed_counters
+    WHERE p_organization_id IS NULL OR organization_id = p_organization_id;
+
+    INSERT INTO recording_feed_counters (organization_id, source, status, count)
+    SELECT organization_id, source, status, COUNT(*)
+    FROM (
+        SELECT organization_id, 'mobile' AS source, recording_feed_status_mobile(status) AS status
+        FROM mobile_recordings
+        UNION ALL
+        SELECT organization_id, provider, recording_feed_status_external(import_status)
+        FROM external_recordings
+        UNION ALL
+        SELECT f.organization_id, 'web_upload', recording_feed_status_followup(f.status)
+        FROM followups f
+        WHERE f.audio_url IS NOT NULL
+          AND NOT EXISTS (SELECT 1 FROM scheduled_recordings sr WHERE sr.followup_id = f.id)
+        UNION ALL
+        SELECT organization_id, 'ai_notetaker', recording_feed_status_scheduled(status)
+        FROM scheduled_recordings
+    ) rows
+    WHERE p_organization_id IS NULL OR organization_id = p_organization_id
+    GROUP BY organization_id, source, status;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Backfill
+SELECT recompute_recording_feed_counters();
+
+-- Comments for documentation
+COMMENT ON TABLE recording_feed_counters IS 'Recordings per organization/source/status, maintained by triggers; rebuild with recompute_recording_feed_counters()';
+COMMENT ON COLUMN followups.feed_at IS 'Recordings feed sort key: meeting_date (midnight UTC) or created_at';
+COMMENT ON COLUMN scheduled_recordings.feed_at IS 'Recordings feed sort key: completed_at or scheduled_time';
+COMMENT ON VIEW web_upload_recordings IS 'Recordings feed web_upload source: followups with audio, excluding AI Notetaker followups';
@@ -160,6 +160,33 @@ if INNGEST_ENABLED:
     )
     logger.info("Inngest workflow orchestration enabled at /api/inngest")
 
+@app.on_event("startup")
+async def start_health_prober():
+    """
+    Probe external services from this worker (opt-in; normally the
+    admin-health-probe Inngest cron runs the probes once per deployment).
+    """
+    if os.getenv("HEALTH_PROBER_ENABLED", "false").lower() == "true":
+        from app.routers.admin.health import health_prober
+        health_prober.start()
+
+@app.on_event("shutdown")
+async def stop_health_prober():
+    from app.routers.admin.health import health_prober
+    await health_prober.stop()
+
+@app.on_event("shutdown")
+async def flush_coach_events():
+    """Write coach behavior events still queued in memory."""
+    from app.services.coach_event_buffer import get_coach_event_buffer
+    await get_coach_event_buffer().close()
+
+@app.on_event("shutdown")
+async def close_database_pools():
+    """Release pooled async database connections on shutdown."""
+    from app.database import close_supabase_async
+    await close_supabase_async()
+
 @app.get("/")
 def read_root():
     return {
@@ -0,0 +1,99 @@
+"""
+Backfill Script: Rebuild API cost rollups from api_usage_logs
+
+Recomputes api_usage_rollups_hourly / api_usage_rollups_daily one UTC day
+at a time (short transactions, safe while the cost-rollups-refresh job is
+running), then rolls up everything after the watermark.
+
+Use after applying migration_api_usage_rollups.sql, or to repair the
+rollups after logs were corrected or deleted.
+
+Usage:
+    # Rebuild the last 90 days and catch up to now
+    python scripts/backfill_cost_rollups.py --days 90
+    
+    # Rebuild a specific range (inclusive)
+    python scripts/backfill_cost_rollups.py --since 2025-01-01 --until 2025-03-31
+    
+    # Only catch up from the watermark (no rebuild)
+    python scripts/backfill_cost_rollups.py --days 0
+
+Requirements:
+    - Run from backend directory: cd backend && python scripts/backfill_cost_rollups.py
+"""
+import os
+import sys
+import argparse
+import logging
+from datetime import date, datetime, timedelta
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.database import get_supabase_service
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+# Safety bound for the catch-up loop (one day of logs per call)
+MAX_CATCH_UP_CALLS = 10000
+
+
+def rebuild_days(supabase, since: date, until: date) -> int:
+    """Rebuild the rollups for every day in [since, until]. Returns logs rolled up."""
+    total = 0
+    day = since
+    while day <= until:
+        result = supabase.rpc("rebuild_api_usage_rollups", {"p_day": day.isoformat()}).execute()
+        logs = result.data or 0
+        total += logs
+        logger.info(f"Rebuilt {day}: {logs} logs")
+        day += timedelta(days=1)
+    return total
+
+
+def catch_up(supabase) -> int:
+    """Roll up all logs after the watermark. Returns logs rolled up."""
+    total = 0
+    for _ in range(MAX_CATCH_UP_CALLS):
+        result = supabase.rpc("refresh_api_usage_rollups", {}).execute()
+        row = (result.data or [{}])[0]
+        total += row.get("logs_rolled_up") or 0
+        logger.info(f"Rolled up to {row.get('window_end')}: {row.get('logs_rolled_up')} logs")
+        if row.get("caught_up", True):
+            break
+    return total
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild API cost rollups")
+    parser.add_argument("--days", type=int, default=90, help="Rebuild the last N days (default: 90)")
+    parser.add_argument("--since", type=date.fromisoformat, help="First day to rebuild (YYYY-MM-DD)")
+    parser.add_argument("--until", type=date.fromisoformat, help="Last day to rebuild (default: today)")
+    args = parser.parse_args()
+    
+    supabase = get_supabase_service()
+    
+    today = datetime.utcnow().date()
+    until = args.until or today
+    since = args.since or (today - timedelta(days=args.days - 1))
+    
+    rebuilt = 0
+    if args.since or args.days > 0:
+        logger.info(f"Rebuilding cost rollups for {since} .. {until}")
+        rebuilt = rebuild_days(supabase, since, until)
+    
+    caught_up = catch_up(supabase)
+    
+    logger.info("=" * 50)
+    logger.info("BACKFILL SUMMARY")
+    logger.info("=" * 50)
+    logger.info(f"Logs rebuilt: {rebuilt}")
+    logger.info(f"Logs rolled up after watermark: {caught_up}")
+
+
+if __name__ == "__main__":
+    main()
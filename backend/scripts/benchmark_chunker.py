@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Benchmark: legacy vs structure-aware TextChunker.
+
+Compares the previous chunker (fresh tiktoken encoding per instance, fixed
+500-token windows decoded back to text) with the current TextChunker on
+synthetic documents of 1k - 100k tokens.
+
+Reports per document size:
+- throughput (tokens/second) and time per document
+- chunk count and mean chunk size
+- sentence integrity: % of sentences that land whole in at least one chunk
+- retrieval quality: recall@1 / recall@3 for "fact" questions using an
+  offline IDF-weighted retriever (a hit = the retrieved chunk contains the whole
+  fact sentence). No embedding API is needed.
+
+Usage:
+    python scripts/benchmark_chunker.py
+    python scripts/benchmark_chunker.py --sizes 1000,10000,100000 --repeat 5
+"""
+
+import os
+import re
+import sys
+import math
+import time
+import random
+import argparse
+from collections import Counter
+from typing import List, Dict, Tuple
+
+# Add backend to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import tiktoken
+from app.services.text_chunker import TextChunker, get_encoding
+
+
+WORDS = (
+    "sales pipeline customer revenue pricing contract renewal onboarding "
+    "integration platform security compliance analytics dashboard forecast "
+    "quarter budget procurement stakeholder champion objection discovery "
+    "proposal negotiation implementation support training rollout"
+).split()
+
+
+# =============================================================================
+# Legacy chunker (previous implementation, kept here for comparison only)
+# =============================================================================
+
+def legacy_chunk_text(text: str, chunk_size: int = 500, chunk_overlap: int = 50) -> List[Dict]:
+    encoding = tiktoken.get_encoding("cl100k_base")
+    tokens = encoding.encode(text)
+    chunks = []
+    start_idx = 0
+    chunk_index = 0
+    while start_idx < len(tokens):
+        chunk_tokens = tokens[start_idx:start_idx + chunk_size]
+        chunks.append({
+            "content": encoding.decode(chunk_tokens),
+            "token_count": len(chunk_tokens),
+            "chunk_index": chunk_index
+        })
+        start_idx += chunk_size - chunk_overlap
+        chunk_index += 1
+    return chunks
+
+
+# =============================================================================
+# Synthetic documents
+# =============================================================================
+
+def make_document(target_tokens: int, seed: int = 42) -> Tuple[str, List[Tuple[str, str]]]:
+    """
+    Build a document with headings, paragraphs and embedded facts.
+
+    Returns:
+        (text, facts) where facts is a list of (query, fact_sentence)
+    """
+    rng = random.Random(seed)
+    encoding = get_encoding("cl100k_base")
+    parts: List[str] = []
+    facts: List[Tuple[str, str]] = []
+    tokens = 0
+    section = 0
+
+    while tokens < target_tokens:
+        if len(parts) % 6 == 0:
+            section += 1
+            heading = f"## Section {section}: {rng.choice(WORDS).title()} {rng.choice(WORDS).title()}"
+            parts.append(heading)
+            tokens += len(encoding.encode_ordinary(heading))
+
+        sentences = []
+        for _ in range(rng.randint(3, 8)):
+            words = [rng.choice(WORDS) for _ in range(rng.randint(8, 20))]
+            sentences.append(" ".join(words).capitalize() + ".")
+
+        code = f"PRJ{len(facts):05d}"
+        amount = rng.randint(10, 999) * 1000
+        fact = f"The {code} account has an approved budget of {amount} euros for the next quarter."
+        sentences.insert(rng.randint(0, len(sentences)), fact)
+        facts.append((f"{code} approved budget", fact))
+
+        paragraph = " ".join(sentences)
+        parts.append(paragraph)
+        tokens += len(encoding.encode_ordinary(paragraph))
+
+    return "\n\n".join(parts), facts
+
+
+# =============================================================================
+# Quality metrics
+# =============================================================================
+
+def _terms(text: str) -> List[str]:
+    return re.findall(r"[a-z0-9]+", text.lower())
+
+
+def retrieval_recall(chunks: List[str], facts: List[Tuple[str, str]]) -> Tuple[float, float]:
+    """Recall@1 and recall@3 with an IDF-weighted term-match retriever."""
+    doc_terms = [Counter(_terms(c)) for c in chunks]
+    df = Counter(t for terms in doc_terms for t in terms)
+    n = len(chunks)
+    idf = {t: math.log((n + 1) / (d + 1)) + 1 for t, d in df.items()}
+
+    hits1 = hits3 = 0
+    for query, fact in facts:
+        q_terms = _terms(query)
+        scores = []
+        for i, terms in enumerate(doc_terms):
+            scores.append((sum(idf.get(t, 0) for t in q_terms if t in terms), -i))
+        ranked = [-i for _, i in sorted(scores, reverse=True)[:3]]
+        if fact in chunks[ranked[0]]:
+            hits1 += 1
+        if any(fact in chunks[i] for i in ranked):
+            hits3 += 1
+    return hits1 / len(facts), hits3 / len(facts)
+
+
+def sentence_integrity(text: str, chunks: List[str]) -> float:
+    """Share of sentences that appear whole in at least one chunk."""
+    sentences = [s.strip() for s in re.split(r"(?<=\.)\s+", text) if s.strip().endswith(".")]
+    joined = "\u0000".join(chunks)
+    whole = sum(1 for s in sentences if s in joined)
+    return whole / len(sentences) if sentences else 1.0
+
+
+# =============================================================================
+# Runner
+# =============================================================================
+
+def run(sizes: List[int], repeat: int) -> None:
+    print(f"\n{'size':>8} {'chunker':<8} {'ms/doc':>9} {'tok/s':>11} {'chunks':>7} "
+          f"{'avg tok':>8} {'intact':>7} {'R@1':>6} {'R@3':>6}")
+
+    for size in sizes:
+        text, facts = make_document(size)
+        n_tokens = len(get_encoding("cl100k_base").encode_ordinary(text))
+
+        for label, fn in (
+            ("legacy", lambda t: legacy_chunk_text(t)),
+            ("current", lambda t: TextChunker(chunk_size=500, chunk_overlap=50).chunk_text(t)),
+        ):
+            fn(text)  # warm-up (encoding load)
+            started = time.perf_counter()
+            for _ in range(repeat):
+                chunks = fn(text)
+            elapsed = (time.perf_counter() - started) / repeat
+
+            contents = [c["content"] for c in chunks]
+            r1, r3 = retrieval_recall(contents, facts)
+            print(
+                f"{n_tokens:>8} {label:<8} {elapsed * 1000:>9.1f} {n_tokens / elapsed:>11,.0f} "
+                f"{len(chunks):>7} {sum(c['token_count'] for c in chunks) / len(chunks):>8.0f} "
+                f"{sentence_integrity(text, contents):>7.1%} {r1:>6.1%} {r3:>6.1%}"
+            )
+    print()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the knowledge base text chunker")
+    parser.add_argument("--sizes", default="1000,10000,50000,100000", help="Comma-separated document sizes in tokens")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement")
+    args = parser.parse_args()
+
+    run([int(s) for s in args.sizes.split(",")], args.repeat)
+
+
+if __name__ == "__main__":
+    main()
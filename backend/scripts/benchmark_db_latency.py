@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Benchmark: sync vs async Supabase access under concurrent load.
+
+Simulates N concurrent "requests" that each run the same PostgREST query
+that sits on the hot path of every authenticated API call
+(organization_members lookup in get_user_org).
+
+- sync:  the query runs via get_supabase_service().execute() inside an
+         async handler, which blocks the event loop (old behaviour)
+- async: the query runs via await get_supabase_async() (new behaviour)
+
+Reports p50 / p95 / p99 / max latency per request and total throughput.
+
+Usage:
+    python scripts/benchmark_db_latency.py --user-id <uuid>
+    python scripts/benchmark_db_latency.py --user-id <uuid> --requests 500 --concurrency 50
+
+Environment:
+    SUPABASE_URL, SUPABASE_KEY, SUPABASE_SERVICE_ROLE_KEY
+"""
+
+import os
+import sys
+import time
+import asyncio
+import argparse
+import statistics
+from typing import List, Dict
+
+# Add backend to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.database import get_supabase_service, get_supabase_async, close_supabase_async
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of a list of values."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+async def sync_request(user_id: str) -> float:
+    """One request using the blocking client (old path)."""
+    start = time.perf_counter()
+    supabase = get_supabase_service()
+    supabase.table("organization_members").select("organization_id").eq("user_id", user_id).limit(1).execute()
+    return (time.perf_counter() - start) * 1000
+
+
+async def async_request(user_id: str) -> float:
+    """One request using the pooled async client (new path)."""
+    start = time.perf_counter()
+    db = await get_supabase_async()
+    await db.table("organization_members").select("organization_id").eq("user_id", user_id).limit(1).execute()
+    return (time.perf_counter() - start) * 1000
+
+
+async def run_load(handler, user_id: str, total: int, concurrency: int) -> Dict[str, float]:
+    """Fire `total` requests with at most `concurrency` in flight."""
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+
+    async def one():
+        # Measure from before admission, so time queued behind the
+        # concurrency limit counts (as a client would see it)
+        queued = time.perf_counter()
+        async with semaphore:
+            await handler(user_id)
+            latencies.append((time.perf_counter() - queued) * 1000)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(total)))
+    elapsed = time.perf_counter() - started
+
+    return {
+        "p50": percentile(latencies, 50),
+        "p95": percentile(latencies, 95),
+        "p99": percentile(latencies, 99),
+        "max": max(latencies) if latencies else 0.0,
+        "mean": statistics.mean(latencies) if latencies else 0.0,
+        "rps": total / elapsed if elapsed else 0.0,
+    }
+
+
+def print_row(label: str, stats: Dict[str, float]) -> None:
+    print(
+        f"{label:<8} p50={stats['p50']:8.1f}ms  p95={stats['p95']:8.1f}ms  "
+        f"p99={stats['p99']:8.1f}ms  max={stats['max']:8.1f}ms  "
+        f"mean={stats['mean']:8.1f}ms  rps={stats['rps']:7.1f}"
+    )
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Benchmark sync vs async DB access")
+    parser.add_argument("--user-id", required=True, help="User id to look up in organization_members")
+    parser.add_argument("--requests", type=int, default=200, help="Total requests per run")
+    parser.add_argument("--concurrency", type=int, default=25, help="Concurrent requests in flight")
+    args = parser.parse_args()
+
+    # Warm up both clients so connection setup is not measured
+    await sync_request(args.user_id)
+    await async_request(args.user_id)
+
+    print(f"\n{args.requests} requests, concurrency {args.concurrency}\n")
+    print_row("sync", await run_load(sync_request, args.user_id, args.requests, args.concurrency))
+    print_row("async", await run_load(async_request, args.user_id, args.requests, args.concurrency))
+    print()
+
+    await close_supabase_async()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
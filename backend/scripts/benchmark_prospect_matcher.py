@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Benchmark: per-meeting full scan vs indexed batch prospect matching.
+
+Builds a synthetic organization (default 10k prospects with contacts) and
+matches a batch of meetings (default 1k) two ways:
+
+- legacy: score every prospect for every meeting with calculate_title_match
+  and calculate_email_domain_match (the previous match_meeting loop)
+- indexed: build one ProspectIndex and score all meetings with
+  match_meetings()
+
+Reports index build time, matching time, meetings/second and how often both
+approaches agree on the best match. No database is needed.
+
+Usage:
+    python scripts/benchmark_prospect_matcher.py
+    python scripts/benchmark_prospect_matcher.py --prospects 10000 --meetings 1000
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+from typing import List, Dict, Tuple
+
+# Add backend to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.prospect_matcher import ProspectMatcher, ProspectMatch, LINK_UPDATE_BATCH_SIZE
+
+SYLLABLES = "ac me tri on vel ox nova lum ber gen tek sol ar qua zen fin dat ix kor med".split()
+SUFFIXES = ["", " BV", " B.V.", " Inc", " Ltd", " GmbH", " Group", " Holding"]
+FIRST_NAMES = "Anna Bram Chris Daan Eva Femke Geert Hanna Iris Joost Koen Lisa Mark Noor Pieter Sanne".split()
+LAST_NAMES = "Jansen Visser Smit Bakker Menting Mulder Bos Vos Peters Hendriks Dekker Brouwer".split()
+TOPICS = ["Intro call", "Demo", "Kickoff", "QBR", "Pricing review", "Sync", "Workshop"]
+
+
+# =============================================================================
+# Synthetic data
+# =============================================================================
+
+def make_org(n_prospects: int, seed: int = 7) -> Tuple[List[Dict], List[Dict]]:
+    """Prospect rows and contact rows for one organization."""
+    rng = random.Random(seed)
+    prospects = []
+    contacts = []
+    for i in range(n_prospects):
+        word = "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 3)))
+        extra = f" {rng.choice(SYLLABLES)}{rng.choice(SYLLABLES)}" if rng.random() < 0.4 else ""
+        name = f"{word.title()}{extra.title()}{i}{rng.choice(SUFFIXES)}"
+        domain = f"{word}{i}.com"
+        prospects.append({
+            "id": f"p{i:06d}",
+            "company_name": name,
+            "website": f"https://www.{domain}" if rng.random() < 0.7 else None,
+            "contact_email": f"info@{domain}" if rng.random() < 0.3 else None,
+        })
+        for _ in range(rng.randint(0, 2)):
+            first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+            contacts.append({
+                "id": f"c{len(contacts):06d}",
+                "prospect_id": f"p{i:06d}",
+                "name": f"{first} {last} {len(contacts)}",
+                "email": f"{first.lower()}.{len(contacts)}@{domain}",
+                "prospects": {"id": f"p{i:06d}", "company_name": name},
+            })
+    return prospects, contacts
+
+
+def make_meetings(prospects: List[Dict], n_meetings: int, seed: int = 11) -> List[Dict]:
+    """Meetings that mention a prospect in the title, by domain, or not at all."""
+    rng = random.Random(seed)
+    meetings = []
+    for i in range(n_meetings):
+        prospect = rng.choice(prospects)
+        kind = rng.random()
+        attendees = [{"email": "seller@dealmotion.ai", "name": "Seller", "is_organizer": True}]
+        if kind < 0.4:
+            title = f"{rng.choice(TOPICS)} {prospect['company_name']}"
+        elif kind < 0.7:
+            title = rng.choice(TOPICS)
+            site = prospect.get("website") or "https://unknown.example"
+            domain = site.split("//")[-1].removeprefix("www.")
+            attendees.append({"email": f"buyer@{domain}", "name": "Buyer"})
+        else:
+            title = f"{rng.choice(TOPICS)} internal"
+        meetings.append({
+            "id": f"m{i:05d}",
+            "title": title,
+            "attendees": attendees,
+            "organizer_email": "seller@dealmotion.ai",
+        })
+    return meetings
+
+
+# =============================================================================
+# Legacy full scan (previous match_meeting scoring loop)
+# =============================================================================
+
+def legacy_best_match(matcher: ProspectMatcher, meeting: Dict, prospects: List[Dict], contacts_lookup: Dict):
+    attendees = meeting["attendees"]
+    emails = [a["email"].lower() for a in attendees if a.get("email")]
+    matches = []
+    matched = set()
+
+    contact_matches, _ = matcher.calculate_contact_match(attendees, contacts_lookup)
+    for prospect_id, confidence, reason in contact_matches:
+        if prospect_id not in matched:
+            matched.add(prospect_id)
+            matches.append(ProspectMatch(prospect_id, "", confidence, reason))
+
+    for prospect in prospects:
+        if prospect["id"] in matched:
+            continue
+        confidence = max(
+            matcher.calculate_title_match(meeting["title"], prospect["company_name"]),
+            matcher.calculate_email_domain_match(emails, prospect.get("website"), prospect.get("contact_email")),
+        )
+        if confidence >= 0.3:
+            matches.append(ProspectMatch(prospect["id"], prospect["company_name"], confidence, ""))
+
+    matches.sort(key=lambda m: m.confidence, reverse=True)
+    return matches[0] if matches else None
+
+
+# =============================================================================
+# Runner
+# =============================================================================
+
+def run(n_prospects: int, n_meetings: int, legacy_sample: int) -> None:
+    matcher = ProspectMatcher(supabase=None)
+    prospects, contacts = make_org(n_prospects)
+    meetings = make_meetings(prospects, n_meetings)
+    contacts_lookup = matcher.build_contacts_lookup(contacts)
+
+    started = time.perf_counter()
+    index = matcher.build_index_from_rows("org", prospects, contacts_lookup)
+    build_s = time.perf_counter() - started
+
+    started = time.perf_counter()
+    results = matcher.match_meetings(index, meetings)
+    indexed_s = time.perf_counter() - started
+
+    sample = meetings[:legacy_sample]
+    started = time.perf_counter()
+    legacy = [legacy_best_match(matcher, m, prospects, contacts_lookup) for m in sample]
+    legacy_s = (time.perf_counter() - started) * len(meetings) / max(1, len(sample))
+
+    agree = sum(
+        1 for old, new in zip(legacy, results)
+        if (old and old.prospect_id) == (new.best_match and new.best_match.prospect_id)
+    )
+    link_groups = ProspectMatcher.group_auto_links(results)
+    linked = sum(len(group) for group in link_groups.values())
+    link_updates = sum(-(-len(group) // LINK_UPDATE_BATCH_SIZE) for group in link_groups.values())
+
+    print(f"\n{n_prospects:,} prospects, {len(contacts):,} contacts, {n_meetings:,} meetings")
+    print(f"  index build        {build_s * 1000:>10.1f} ms")
+    print(f"  indexed matching   {indexed_s * 1000:>10.1f} ms  ({n_meetings / indexed_s:,.0f} meetings/s)")
+    print(f"  legacy full scan   {legacy_s * 1000:>10.1f} ms  (extrapolated from {len(sample)} meetings)")
+    print(f"  speedup            {legacy_s / (build_s + indexed_s):>10.1f}x")
+    print(f"  best-match agree   {agree / max(1, len(sample)):>10.1%}")
+    print(
+        f"  would auto-link    {linked:>10,}  ({link_updates:,} grouped updates of up to "
+        f"{LINK_UPDATE_BATCH_SIZE} meetings)\n"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark batch prospect matching")
+    parser.add_argument("--prospects", type=int, default=10000, help="Prospects in the organization")
+    parser.add_argument("--meetings", type=int, default=1000, help="Meetings to match")
+    parser.add_argument("--legacy-sample", type=int, default=100, help="Meetings to run through the legacy scan")
+    args = parser.parse_args()
+
+    run(args.prospects, args.meetings, args.legacy_sample)
+
+
+if __name__ == "__main__":
+    main()
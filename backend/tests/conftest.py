@@ -0,0 +1,19 @@
+"""
+Shared test setup.
+
+Tests cover pure logic only (no database or provider calls), but importing
+app modules builds clients from the environment, so placeholder settings
+are provided when the real ones are absent.
+"""
+
+import os
+
+for name in (
+    "SUPABASE_URL",
+    "SUPABASE_KEY",
+    "SUPABASE_SERVICE_ROLE_KEY",
+    "SUPABASE_JWT_SECRET",
+    "VOYAGE_API_KEY",
+    "ANTHROPIC_API_KEY",
+):
+    os.environ.setdefault(name, "http://localhost:54321" if name == "SUPABASE_URL" else "test")
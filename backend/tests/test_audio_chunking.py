@@ -0,0 +1,117 @@
+"""Chunk planning and stitching for long recordings (audio_processing, transcription_service)."""
+
+import pytest
+
+from app.services.audio_processing import plan_chunks
+from app.services.transcription_service import (
+    TranscriptionResult,
+    TranscriptionSegment,
+    _stitch_chunks,
+)
+
+
+def _result(segments, confidence=0.9):
+    return TranscriptionResult(
+        full_text=" ".join(text for _, _, _, text in segments),
+        segments=[TranscriptionSegment(speaker=s, start=a, end=b, text=t) for s, a, b, t in segments],
+        speaker_count=len({s for s, _, _, _ in segments}),
+        duration_seconds=max((b for _, _, b, _ in segments), default=0.0),
+        confidence=confidence,
+    )
+
+
+# ==========================================
+# plan_chunks
+# ==========================================
+
+def test_short_recording_is_one_chunk():
+    assert plan_chunks(300.0, [], chunk_seconds=600.0) == [(0.0, 300.0)]
+
+
+def test_chunks_cover_the_recording_without_gaps():
+    chunks = plan_chunks(2500.0, [], chunk_seconds=600.0)
+    
+    assert len(chunks) == 5
+    assert chunks[0][0] == 0.0
+    assert chunks[-1][1] == 2500.0
+    for (_, end), (start, _) in zip(chunks, chunks[1:]):
+        assert end == start
+    assert all(end - start == pytest.approx(500.0) for start, end in chunks)
+
+
+def test_cut_goes_in_the_middle_of_a_nearby_silence():
+    chunks = plan_chunks(1200.0, [(620.0, 624.0)], chunk_seconds=600.0)
+    
+    assert chunks == [(0.0, 622.0), (622.0, 1200.0)]
+
+
+def test_longest_nearby_silence_wins():
+    silences = [(590.0, 591.0), (630.0, 636.0)]
+    
+    chunks = plan_chunks(1200.0, silences, chunk_seconds=600.0)
+    
+    assert chunks[0] == (0.0, 633.0)
+
+
+def test_silence_outside_search_window_is_ignored():
+    chunks = plan_chunks(1200.0, [(700.0, 710.0)], chunk_seconds=600.0, search_seconds=60.0)
+    
+    assert chunks == [(0.0, 600.0), (600.0, 1200.0)]
+
+
+# ==========================================
+# _stitch_chunks
+# ==========================================
+
+def test_stitch_shifts_timestamps_and_drops_the_overlap():
+    first = _result([
+        ("Speaker 1", 0.0, 50.0, "hello"),
+        ("Speaker 2", 50.0, 100.0, "hi there"),
+    ])
+    # Second chunk starts 20s before its cut at 100s: 80-100 was already transcribed
+    second = _result([
+        ("Speaker 1", 0.0, 20.0, "hi there"),
+        ("Speaker 1", 20.0, 40.0, "how are you"),
+    ])
+    
+    stitched = _stitch_chunks([(0.0, 0.0, first), (80.0, 100.0, second)], duration=120.0)
+    
+    assert [(s.start, s.end, s.text) for s in stitched.segments] == [
+        (0.0, 50.0, "hello"),
+        (50.0, 100.0, "hi there"),
+        (100.0, 120.0, "how are you"),
+    ]
+    assert stitched.full_text == "hello hi there how are you"
+    assert stitched.duration_seconds == 120.0
+
+
+def test_stitch_keeps_speaker_labels_consistent_across_chunks():
+    first = _result([
+        ("Speaker 1", 0.0, 50.0, "question"),
+        ("Speaker 2", 50.0, 100.0, "answer"),
+    ])
+    # The chunk's diarization calls the overlapping voice "Speaker 1"; it is
+    # the stitched "Speaker 2"
+    second = _result([
+        ("Speaker 1", 0.0, 40.0, "answer continued"),
+        ("Speaker 2", 40.0, 50.0, "follow-up question"),
+    ])
+    
+    stitched = _stitch_chunks([(0.0, 0.0, first), (80.0, 100.0, second)], duration=130.0)
+    
+    assert [(s.speaker, s.text) for s in stitched.segments] == [
+        ("Speaker 1", "question"),
+        ("Speaker 2", "answer"),
+        ("Speaker 2", "answer continued"),
+        ("Speaker 1", "follow-up question"),
+    ]
+    assert stitched.speaker_count == 2
+
+
+def test_stitch_weights_confidence_by_chunk_length():
+    first = _result([("Speaker 1", 0.0, 90.0, "a")], confidence=1.0)
+    second = _result([("Speaker 1", 0.0, 40.0, "b")], confidence=0.5)
+    
+    stitched = _stitch_chunks([(0.0, 0.0, first), (80.0, 90.0, second)], duration=120.0)
+    
+    assert stitched.confidence == pytest.approx((1.0 * 90 + 0.5 * 30) / 120)
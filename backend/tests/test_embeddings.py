@@ -0,0 +1,139 @@
+"""Batching, retry classification and caching of embeddings (services/embeddings)."""
+
+import asyncio
+
+import pytest
+import voyageai.error
+
+from app.services import embeddings
+from app.services.embeddings import EmbeddingsService, _is_transient_error, content_hash
+from app.utils.cache import TTLCache
+
+
+class FakeEmbedClient:
+    """Voyage client stand-in: returns [len(text)] per text, failing first if told to."""
+    
+    def __init__(self, failures=()):
+        self.failures = list(failures)
+        self.calls = []
+    
+    async def embed(self, texts, model, input_type):
+        self.calls.append(list(texts))
+        if self.failures:
+            raise self.failures.pop(0)
+        return type("Response", (), {"embeddings": [[float(len(t))] for t in texts]})()
+
+
+class HttpError(Exception):
+    def __init__(self, status_code):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+
+
+@pytest.fixture
+def service(monkeypatch):
+    monkeypatch.setattr(embeddings, "_memory_cache", TTLCache(maxsize=100, ttl_seconds=60))
+    monkeypatch.setattr(embeddings, "EMBEDDING_CACHE_DB_ENABLED", False)
+    monkeypatch.setattr(EmbeddingsService, "_backoff_delay", staticmethod(lambda attempt: 0))
+    svc = EmbeddingsService()
+    svc.async_client = FakeEmbedClient()
+    return svc
+
+
+# ==========================================
+# BATCHING
+# ==========================================
+
+def test_batches_are_capped_by_count(monkeypatch):
+    monkeypatch.setattr(embeddings, "EMBED_BATCH_SIZE", 3)
+    
+    batches = EmbeddingsService._make_batches([f"t{i}" for i in range(7)])
+    
+    assert [len(b) for b in batches] == [3, 3, 1]
+    assert [t for b in batches for t in b] == [f"t{i}" for i in range(7)]
+
+
+def test_batches_are_capped_by_estimated_tokens(monkeypatch):
+    monkeypatch.setattr(embeddings, "EMBED_BATCH_MAX_TOKENS", 10)
+    texts = ["x" * 24, "x" * 16, "x" * 16, "x" * 80]  # 6, 4, 4, 20 tokens
+    
+    batches = EmbeddingsService._make_batches(texts)
+    
+    # An oversized text still gets a batch of its own
+    assert batches == [[texts[0], texts[1]], [texts[2]], [texts[3]]]
+
+
+# ==========================================
+# RETRY CLASSIFICATION
+# ==========================================
+
+@pytest.mark.parametrize("error", [
+    voyageai.error.RateLimitError("slow down"),
+    voyageai.error.ServiceUnavailableError("unavailable"),
+    voyageai.error.Timeout("timed out"),
+    asyncio.TimeoutError(),
+    HttpError(429),
+    HttpError(503),
+])
+def test_transient_errors_are_retried(error):
+    assert _is_transient_error(error)
+
+
+@pytest.mark.parametrize("error", [
+    voyageai.error.InvalidRequestError("bad input"),
+    voyageai.error.AuthenticationError("bad key"),
+    HttpError(400),
+    ValueError("boom"),
+])
+def test_client_errors_are_not_retried(error):
+    assert not _is_transient_error(error)
+
+
+def test_transient_batch_failure_is_retried(service):
+    service.async_client = FakeEmbedClient([voyageai.error.RateLimitError("slow down")])
+    
+    vectors = asyncio.run(service.embed_documents(["abc"]))
+    
+    assert vectors == [[3.0]]
+    assert len(service.async_client.calls) == 2
+
+
+def test_client_error_fails_without_retry(service):
+    service.async_client = FakeEmbedClient([voyageai.error.InvalidRequestError("bad input")])
+    
+    with pytest.raises(ValueError, match="bad input"):
+        asyncio.run(service.embed_documents(["abc"]))
+    assert len(service.async_client.calls) == 1
+
+
+# ==========================================
+# CONTENT-HASH CACHE
+# ==========================================
+
+def test_cache_key_depends_on_model_and_input_type():
+    assert content_hash("a", "voyage-2", "document") == content_hash("a", "voyage-2", "document")
+    assert content_hash("a", "voyage-2", "document") != content_hash("a", "voyage-2", "query")
+    assert content_hash("a", "voyage-2", "document") != content_hash("a", "voyage-3", "document")
+
+
+def test_duplicate_texts_are_embedded_once(service):
+    vectors = asyncio.run(service.embed_documents(["ab", "abcd", "ab"]))
+    
+    assert vectors == [[2.0], [4.0], [2.0]]
+    assert service.async_client.calls == [["ab", "abcd"]]
+
+
+def test_repeated_texts_are_served_from_memory_cache(service):
+    asyncio.run(service.embed_documents(["ab", "abcd"]))
+    
+    vectors = asyncio.run(service.embed_documents(["abcd", "new"]))
+    
+    assert vectors == [[4.0], [3.0]]
+    assert service.async_client.calls == [["ab", "abcd"], ["new"]]
+
+
+def test_query_and_document_embeddings_are_cached_apart(service):
+    asyncio.run(service.embed_documents(["ab"], input_type="document"))
+    asyncio.run(service.embed_documents(["ab"], input_type="query"))
+    
+    assert len(service.async_client.calls) == 2
@@ -0,0 +1,192 @@
+"""Local NumPy vector store: writes, filtered search, persistence (services/local_vector_store)."""
+
+import json
+
+import numpy as np
+import pytest
+
+from app.services import local_vector_store
+from app.services.local_vector_store import LocalVectorStore, matches_filter
+
+
+def _vector(i, dim=8):
+    """Distinct unit-ish vector per i (one-hot plus a small shared component)."""
+    values = [0.1] * dim
+    values[i % dim] = 1.0
+    return values
+
+
+def _item(vid, i, organization_id="org-1", **metadata):
+    return {"id": vid, "values": _vector(i), "metadata": {"organization_id": organization_id, **metadata}}
+
+
+@pytest.fixture
+def store(tmp_path):
+    return LocalVectorStore(base_dir=str(tmp_path))
+
+
+# ==========================================
+# UPSERT / QUERY
+# ==========================================
+
+def test_query_returns_nearest_first(store):
+    store.upsert_vectors([_item(f"v{i}", i, file_id="f1") for i in range(5)])
+    
+    matches = store.query_vectors(_vector(2), top_k=3, filter={"organization_id": "org-1"})
+    
+    assert matches[0].id == "v2"
+    assert matches[0].score == pytest.approx(1.0)
+    assert len(matches) == 3
+    assert [m.score for m in matches] == sorted((m.score for m in matches), reverse=True)
+    assert matches[0].metadata == {"organization_id": "org-1", "file_id": "f1"}
+
+
+def test_upsert_replaces_existing_id(store):
+    store.upsert_vectors([_item("v1", 1, file_id="old")])
+    store.upsert_vectors([_item("v1", 4, file_id="new")])
+    
+    matches = store.query_vectors(_vector(4), top_k=5, filter={"organization_id": "org-1"})
+    
+    assert [m.id for m in matches] == ["v1"]
+    assert matches[0].score == pytest.approx(1.0)
+    assert matches[0].metadata["file_id"] == "new"
+    assert store.get_stats()["total_vector_count"] == 1
+
+
+def test_organizations_are_kept_apart(store):
+    store.upsert_vectors([_item("a", 1, "org-1"), _item("b", 1, "org-2")])
+    
+    matches = store.query_vectors(_vector(1), top_k=5, filter={"organization_id": "org-2"})
+    
+    assert [m.id for m in matches] == ["b"]
+    assert store.get_stats()["organizations"].keys() == {"org-1", "org-2"}
+
+
+def test_query_applies_metadata_filters(store):
+    store.upsert_vectors([
+        _item("a", 1, file_id="f1", page=1),
+        _item("b", 1, file_id="f2", page=5),
+        _item("c", 1, file_id="f3", page=9),
+    ])
+    
+    def ids(filter):
+        return sorted(m.id for m in store.query_vectors(_vector(1), top_k=5, filter=filter))
+    
+    assert ids({"organization_id": "org-1", "file_id": "f2"}) == ["b"]
+    assert ids({"organization_id": "org-1", "file_id": {"$in": ["f1", "f3"]}}) == ["a", "c"]
+    assert ids({"organization_id": {"$eq": "org-1"}, "page": {"$gte": 5}}) == ["b", "c"]
+    assert ids({"$and": [{"organization_id": "org-1"}, {"$or": [{"page": 1}, {"page": 9}]}]}) == ["a", "c"]
+    assert ids({"organization_id": "org-1", "file_id": "missing"}) == []
+
+
+@pytest.mark.parametrize("filter, expected", [
+    ({"tags": "b"}, True),
+    ({"tags": {"$in": ["x", "a"]}}, True),
+    ({"kind": {"$ne": "doc"}}, False),
+    ({"kind": {"$nin": ["pdf"]}}, True),
+    ({"missing": {"$exists": False}}, True),
+    ({"size": {"$lt": 10}}, False),
+])
+def test_filter_operators(filter, expected):
+    metadata = {"tags": ["a", "b"], "kind": "doc", "size": 12}
+    
+    assert matches_filter(metadata, filter) is expected
+
+
+def test_unknown_filter_operator_is_rejected():
+    with pytest.raises(ValueError):
+        matches_filter({"a": 1}, {"a": {"$regex": "x"}})
+
+
+# ==========================================
+# DELETES
+# ==========================================
+
+def test_delete_by_file_removes_only_that_file(store):
+    store.upsert_vectors([
+        _item("a", 1, file_id="f1"),
+        _item("b", 2, file_id="f2"),
+        _item("c", 3, "org-2", file_id="f1"),
+    ])
+    
+    store.delete_by_file("f1")
+    
+    remaining = store.query_vectors(_vector(1), top_k=5)
+    assert [m.id for m in remaining] == ["b"]
+
+
+def test_delete_vectors_by_id(store):
+    store.upsert_vectors([_item("a", 1), _item("b", 2)])
+    
+    store.delete_vectors(["a", "unknown"])
+    
+    assert [m.id for m in store.query_vectors(_vector(1), top_k=5)] == ["b"]
+
+
+def test_organization_filter_drops_the_partition(store, tmp_path):
+    store.upsert_vectors([_item("a", 1, "org-1"), _item("b", 2, "org-2")])
+    
+    store.delete_by_filter({"organization_id": "org-1"})
+    
+    assert not (tmp_path / "org-1").exists()
+    assert [m.id for m in store.query_vectors(_vector(1), top_k=5)] == ["b"]
+
+
+# ==========================================
+# PERSISTENCE
+# ==========================================
+
+def test_reload_restores_vectors_metadata_and_deletes(tmp_path):
+    store = LocalVectorStore(base_dir=str(tmp_path))
+    store.upsert_vectors([_item(f"v{i}", i, file_id=f"f{i}") for i in range(4)])
+    store.upsert_vectors([_item("v0", 5, file_id="moved")])
+    store.delete_vectors(["v3"])
+    
+    reloaded = LocalVectorStore(base_dir=str(tmp_path))
+    matches = reloaded.query_vectors(_vector(5), top_k=5, filter={"organization_id": "org-1"})
+    
+    assert sorted(m.id for m in matches) == ["v0", "v1", "v2"]
+    assert matches[0].id == "v0"
+    assert matches[0].metadata["file_id"] == "moved"
+
+
+def test_growth_keeps_existing_rows(store):
+    store.upsert_vectors([_item(f"v{i}", i) for i in range(50)])
+    store.upsert_vectors([_item(f"w{i}", i) for i in range(50)])  # past the initial capacity of 64
+    
+    assert store.get_stats()["total_vector_count"] == 100
+    ids = {m.id for m in store.query_vectors(_vector(3), top_k=100)}
+    assert ids == {f"v{i}" for i in range(50)} | {f"w{i}" for i in range(50)}
+
+
+def test_compaction_packs_rows_and_survives_reload(tmp_path):
+    store = LocalVectorStore(base_dir=str(tmp_path))
+    store.upsert_vectors([_item(f"v{i}", i, file_id="drop" if i % 2 else "keep") for i in range(300)])
+    
+    store.delete_by_file("drop")
+    
+    index = store._index("org-1")
+    assert index.count == 150  # dead rows were packed away
+    log_lines = (tmp_path / "org-1" / "meta.jsonl").read_text().splitlines()
+    assert len(log_lines) == 150
+    assert all(json.loads(line)["op"] == "put" for line in log_lines)
+    
+    reloaded = LocalVectorStore(base_dir=str(tmp_path))
+    matches = reloaded.query_vectors(_vector(0), top_k=300, filter={"organization_id": "org-1"})
+    assert {m.id for m in matches} == {f"v{i}" for i in range(0, 300, 2)}
+    assert matches[0].score == pytest.approx(1.0)
+
+
+def test_ivf_search_finds_exact_match(monkeypatch, store):
+    monkeypatch.setattr(local_vector_store, "LOCAL_VECTOR_IVF_THRESHOLD", 100)
+    rng = np.random.default_rng(0)
+    vectors = rng.normal(size=(500, 16)).astype(np.float32)
+    store.upsert_vectors([
+        {"id": f"v{i}", "values": v.tolist(), "metadata": {"organization_id": "org-1"}}
+        for i, v in enumerate(vectors)
+    ])
+    
+    matches = store.query_vectors(vectors[42].tolist(), top_k=1, filter={"organization_id": "org-1"})
+    
+    assert store.get_stats()["organizations"]["org-1"]["ivf"] is True
+    assert matches[0].id == "v42"
@@ -0,0 +1,107 @@
+"""Trigram search ranking and name resolution (prospect_autocomplete)."""
+
+import asyncio
+
+import pytest
+
+from app.services.prospect_autocomplete import RESOLVE_MIN_SIMILARITY, ProspectAutocomplete, similarity
+
+PROSPECTS = [
+    {"id": "ingram", "company_name": "Ingram Micro", "website": "https://www.ingrammicro.com"},
+    {"id": "ing", "company_name": "ING Bank"},
+    {"id": "acme", "company_name": "Acme Corporation Europe", "website": "acme.eu"},
+    {"id": "shell", "company_name": "Shell Nederland", "contact_email": "jan@shell.com"},
+    {"id": "vandebron", "company_name": "Vandebron Energie"},
+    {"id": "microsoft", "company_name": "Microsoft"},
+]
+CONTACTS = [
+    {"id": "c1", "prospect_id": "vandebron", "name": "Marieke de Vries", "email": "marieke@example.org"},
+]
+
+
+@pytest.fixture
+def autocomplete():
+    """Autocomplete with a ready index for organization "org-1" (no database reads)."""
+    service = ProspectAutocomplete()
+    service._indexes["org-1"] = service._index_from_rows("org-1", PROSPECTS, CONTACTS)
+    return service
+
+
+def _search(service, query, **kwargs):
+    results = asyncio.run(service.search("org-1", query, **kwargs))
+    return [(r["id"], r["matched_on"]) for r in results]
+
+
+def _best_match(service, name):
+    match = asyncio.run(service.best_match("org-1", name))
+    return match and match["id"]
+
+
+# ==========================================
+# search
+# ==========================================
+
+def test_prefix_ranks_first(autocomplete):
+    assert _search(autocomplete, "ingram")[0] == ("ingram", "name")
+    assert _search(autocomplete, "ing")[0] == ("ing", "name")
+
+
+def test_whole_name_prefix_beats_word_prefix(autocomplete):
+    assert [pid for pid, _ in _search(autocomplete, "micro")][:2] == ["microsoft", "ingram"]
+
+
+def test_typos_still_match(autocomplete):
+    assert _search(autocomplete, "ingrm micro")[0] == ("ingram", "name")
+    assert _search(autocomplete, "vandebrn")[0][0] == "vandebron"
+
+
+def test_domain_and_contact_matches_return_the_prospect(autocomplete):
+    assert _search(autocomplete, "shell.com")[0] == ("shell", "domain")
+    assert _search(autocomplete, "marieke")[0] == ("vandebron", "contact")
+
+
+def test_sources_restrict_matches(autocomplete):
+    assert _search(autocomplete, "marieke", sources=("name", "domain")) == []
+
+
+def test_removed_prospect_is_not_returned(autocomplete):
+    autocomplete.remove_prospect("org-1", "ingram")
+    
+    assert "ingram" not in [pid for pid, _ in _search(autocomplete, "ingram micro")]
+
+
+# ==========================================
+# best_match
+# ==========================================
+
+@pytest.mark.parametrize("name, expected", [
+    ("Ingram Micro", "ingram"),
+    ("ingrammicro.com", "ingram"),
+    ("Vandebron Energie B.V.", "vandebron"),
+    # A typo in a long name keeps the whole-name similarity high
+    ("Acme Corporaton Europe", "acme"),
+])
+def test_best_match_resolves_near_identical_names(autocomplete, name, expected):
+    assert _best_match(autocomplete, name) == expected
+
+
+@pytest.mark.parametrize("name", [
+    # Prefixes rank first in search but are not the same company
+    "ING",
+    "Acme",
+    "Shell",
+    # Too different overall for a short name
+    "Micrsoft",
+    "Unknown Company",
+    "",
+])
+def test_best_match_rejects_partial_names(autocomplete, name):
+    assert _best_match(autocomplete, name) is None
+
+
+def test_best_match_score_is_whole_name_similarity(autocomplete):
+    match = asyncio.run(autocomplete.best_match("org-1", "Acme Corporaton Europe"))
+    
+    expected = similarity(autocomplete.normalize("Acme Corporaton Europe"), autocomplete.normalize("Acme Corporation Europe"))
+    assert match["score"] == round(expected, 3)
+    assert match["score"] >= RESOLVE_MIN_SIMILARITY
@@ -0,0 +1,228 @@
+"""Indexed meeting-to-prospect scoring and grouped auto-link writes (services/prospect_matcher)."""
+
+import asyncio
+
+import pytest
+
+from app.services import prospect_matcher
+from app.services.prospect_matcher import MatchResult, ProspectMatch, ProspectMatcher
+from scripts import benchmark_prospect_matcher as benchmark
+
+PROSPECTS = [
+    {"id": "p1", "company_name": "Acme Analytics B.V.", "website": "https://www.acme.io", "contact_email": None},
+    {"id": "p2", "company_name": "Globex Corporation", "website": None, "contact_email": "sales@globex.com"},
+    {"id": "p3", "company_name": "Initech Data Systems", "website": "initech.com", "contact_email": None},
+]
+CONTACTS = [
+    {"id": "c1", "prospect_id": "p2", "name": "Hank Scorpio", "email": "hank@globex.com",
+     "prospects": {"company_name": "Globex Corporation"}},
+]
+
+
+@pytest.fixture
+def matcher():
+    return ProspectMatcher(supabase=None)
+
+
+@pytest.fixture
+def index(matcher):
+    return matcher.build_index_from_rows("org-1", PROSPECTS, matcher.build_contacts_lookup(CONTACTS))
+
+
+def _score(matcher, index, title="", attendees=(), organizer_email=None):
+    return matcher.score_meeting(index, "m1", title, list(attendees), organizer_email)
+
+
+# ==========================================
+# SCORING
+# ==========================================
+
+def test_exact_company_name_in_title(matcher, index):
+    result = _score(matcher, index, title="Acme Analytics - quarterly review")
+    
+    assert result.best_match.prospect_id == "p1"
+    assert result.best_match.confidence == ProspectMatcher.WEIGHT_TITLE_EXACT
+
+
+def test_partial_company_name_in_title(matcher, index):
+    result = _score(matcher, index, title="Initech systems sync")
+    
+    # Two of the three company words appear in the title
+    assert result.best_match.prospect_id == "p3"
+    assert result.best_match.confidence == pytest.approx(ProspectMatcher.WEIGHT_TITLE_PARTIAL * 2 / 3)
+
+
+def test_attendee_domain_matches_prospect_website(matcher, index):
+    result = _score(matcher, index, title="Weekly call", attendees=[{"email": "Jane@Acme.io", "name": "Jane"}])
+    
+    assert result.best_match.prospect_id == "p1"
+    assert result.best_match.confidence == ProspectMatcher.WEIGHT_EMAIL_DOMAIN
+
+
+def test_organizer_email_is_matched_like_an_attendee(matcher, index):
+    result = _score(matcher, index, title="Weekly call", organizer_email="bob@initech.com")
+    
+    assert result.best_match.prospect_id == "p3"
+
+
+def test_known_contact_beats_title_match(matcher, index):
+    result = _score(
+        matcher, index,
+        title="Acme Analytics intro",
+        attendees=[{"email": "hscorpio@gmail.com", "name": "Hank Scorpio"}],
+    )
+    
+    assert [m.prospect_id for m in result.all_matches] == ["p2", "p1"]
+    assert result.best_match.confidence == ProspectMatcher.WEIGHT_CONTACT_NAME_MATCH
+    assert result.best_match.company_name == "Globex Corporation"
+    assert result.matched_contact_ids == ["c1"]
+
+
+def test_unrelated_meeting_has_no_match(matcher, index):
+    result = _score(matcher, index, title="Dentist", attendees=[{"email": "me@example.org", "name": "Me"}])
+    
+    assert result.best_match is None
+    assert result.all_matches == []
+
+
+def test_index_agrees_with_full_scan(matcher):
+    prospects, contacts = benchmark.make_org(300)
+    meetings = benchmark.make_meetings(prospects, 150)
+    contacts_lookup = matcher.build_contacts_lookup(contacts)
+    index = matcher.build_index_from_rows("org-1", prospects, contacts_lookup)
+    
+    results = matcher.match_meetings(index, meetings)
+    
+    for meeting, result in zip(meetings, results):
+        legacy = benchmark.legacy_best_match(matcher, meeting, prospects, contacts_lookup)
+        assert (legacy and legacy.confidence) == (result.best_match and result.best_match.confidence)
+        assert (legacy and legacy.prospect_id) == (result.best_match and result.best_match.prospect_id)
+
+
+# ==========================================
+# GROUPED AUTO-LINKS
+# ==========================================
+
+class FakeUpdate:
+    def __init__(self, db, values):
+        self.db = db
+        self.values = values
+        self.ids = None
+    
+    def in_(self, column, values):
+        self.ids = list(values)
+        return self
+    
+    def is_(self, column, value):
+        assert (column, value) == ("prospect_id", "null")
+        return self
+    
+    def execute(self):
+        self.db.updates.append((self.values, self.ids))
+        # Meetings linked in the meantime are not updated
+        rows = [{"id": i} for i in self.ids if i not in self.db.already_linked]
+        return type("Result", (), {"data": rows})()
+
+
+class FakeSupabase:
+    def __init__(self, already_linked=()):
+        self.already_linked = set(already_linked)
+        self.updates = []
+    
+    def table(self, name):
+        assert name == "calendar_meetings"
+        return self
+    
+    def update(self, values):
+        return FakeUpdate(self, values)
+
+
+def _result(meeting_id, prospect_id, confidence, contact_ids=()):
+    return MatchResult(
+        meeting_id=meeting_id,
+        best_match=ProspectMatch(prospect_id, prospect_id.upper(), confidence, "test"),
+        matched_contact_ids=list(contact_ids),
+    )
+
+
+def test_auto_links_are_grouped_by_identical_values():
+    results = [
+        _result("m1", "p1", 0.9),
+        _result("m2", "p1", 0.9),
+        _result("m3", "p1", 0.9, ["c1"]),
+        _result("m4", "p2", 0.95),
+        _result("m5", "p2", 0.5),  # below the threshold
+        MatchResult(meeting_id="m6"),
+    ]
+    
+    groups = ProspectMatcher.group_auto_links(results)
+    
+    assert {key: [r.meeting_id for r in group] for key, group in groups.items()} == {
+        ("p1", 0.9, ()): ["m1", "m2"],
+        ("p1", 0.9, ("c1",)): ["m3"],
+        ("p2", 0.95, ()): ["m4"],
+    }
+
+
+def test_bulk_link_writes_one_update_per_group():
+    db = FakeSupabase()
+    results = [_result("m1", "p1", 0.9), _result("m2", "p1", 0.9, ["c1", "c2"]), _result("m3", "p1", 0.9)]
+    
+    linked = asyncio.run(ProspectMatcher(db)._bulk_link_meetings(results))
+    
+    assert linked == 3
+    assert all(r.auto_linked for r in results)
+    assert db.updates == [
+        ({"prospect_id": "p1", "match_confidence": 0.9, "prospect_link_type": "auto"}, ["m1", "m3"]),
+        (
+            {
+                "prospect_id": "p1",
+                "match_confidence": 0.9,
+                "prospect_link_type": "auto",
+                "contact_ids": ["c1", "c2"],
+            },
+            ["m2"],
+        ),
+    ]
+
+
+def test_bulk_link_keeps_existing_contacts_when_none_matched():
+    db = FakeSupabase()
+    
+    asyncio.run(ProspectMatcher(db)._bulk_link_meetings([_result("m1", "p1", 0.9)]))
+    
+    values, _ = db.updates[0]
+    assert "contact_ids" not in values
+
+
+def test_bulk_link_splits_large_groups(monkeypatch):
+    monkeypatch.setattr(prospect_matcher, "LINK_UPDATE_BATCH_SIZE", 2)
+    db = FakeSupabase()
+    results = [_result(f"m{i}", "p1", 0.9) for i in range(5)]
+    
+    linked = asyncio.run(ProspectMatcher(db)._bulk_link_meetings(results))
+    
+    assert linked == 5
+    assert [ids for _, ids in db.updates] == [["m0", "m1"], ["m2", "m3"], ["m4"]]
+
+
+def test_meetings_linked_meanwhile_are_not_marked():
+    db = FakeSupabase(already_linked={"m2"})
+    results = [_result("m1", "p1", 0.9), _result("m2", "p1", 0.9)]
+    
+    linked = asyncio.run(ProspectMatcher(db)._bulk_link_meetings(results))
+    
+    assert linked == 1
+    assert [r.auto_linked for r in results] == [True, False]
+
+
+# ==========================================
+# BENCHMARK SCRIPT
+# ==========================================
+
+def test_benchmark_runs(capsys):
+    benchmark.run(n_prospects=200, n_meetings=50, legacy_sample=10)
+    
+    lines = capsys.readouterr().out.splitlines()
+    assert any("grouped updates" in line for line in lines)
+    assert any(line.split()[:2] == ["best-match", "agree"] and line.endswith("100.0%") for line in lines)
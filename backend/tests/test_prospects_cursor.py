@@ -0,0 +1,144 @@
+"""Cursor encoding and filter quoting for prospect list pagination (routers/prospects)."""
+
+import pytest
+from fastapi import HTTPException
+
+from app.routers import prospects
+from app.routers.prospects import _decode_cursor, _encode_cursor, _list_page, _quote
+
+
+def _unquote(value: str) -> str:
+    """Parse a PostgREST double-quoted value back (backslash escapes)."""
+    assert value[0] == value[-1] == '"'
+    out, escaped = [], False
+    for char in value[1:-1]:
+        if escaped:
+            out.append(char)
+            escaped = False
+        elif char == "\\":
+            escaped = True
+        else:
+            assert char != '"', "unescaped quote inside value"
+            out.append(char)
+    assert not escaped
+    return "".join(out)
+
+
+def _split_top_level(expression: str) -> list:
+    """Split a PostgREST logic expression on commas outside quotes and parentheses."""
+    parts, current, depth, quoted, escaped = [], [], 0, False, False
+    for char in expression:
+        if escaped:
+            escaped = False
+        elif quoted and char == "\\":
+            escaped = True
+        elif char == '"':
+            quoted = not quoted
+        elif not quoted and char == "(":
+            depth += 1
+        elif not quoted and char == ")":
+            depth -= 1
+        elif not quoted and depth == 0 and char == ",":
+            parts.append("".join(current))
+            current = []
+            continue
+        current.append(char)
+    parts.append("".join(current))
+    return parts
+
+
+class RecordingQuery:
+    def __init__(self):
+        self.or_filters = []
+        self.orders = []
+    
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: self
+    
+    def or_(self, expression):
+        self.or_filters.append(expression)
+        return self
+    
+    def order(self, column, desc=False):
+        self.orders.append((column, desc))
+        return self
+
+
+class RecordingSupabase:
+    def __init__(self):
+        self.query = RecordingQuery()
+    
+    def table(self, name):
+        return self.query
+
+
+# ==========================================
+# Cursor encoding
+# ==========================================
+
+def test_cursor_round_trip_drops_sort_column():
+    cursor = _encode_cursor(["company_name", "Acme, Inc.", "p-1"])
+    
+    assert "=" not in cursor
+    assert _decode_cursor(cursor, "company_name") == ["Acme, Inc.", "p-1"]
+
+
+def test_cursor_for_other_sort_is_rejected():
+    cursor = _encode_cursor(["company_name", "Acme", "p-1"])
+    
+    with pytest.raises(HTTPException) as error:
+        _decode_cursor(cursor, "created_at")
+    assert error.value.status_code == 400
+
+
+@pytest.mark.parametrize("cursor", ["%%%", _encode_cursor({"a": 1}), _encode_cursor(["created_at", "x"])])
+def test_malformed_cursor_is_rejected(cursor):
+    with pytest.raises(HTTPException) as error:
+        _decode_cursor(cursor, "created_at")
+    assert error.value.status_code == 400
+
+
+# ==========================================
+# Filter quoting
+# ==========================================
+
+@pytest.mark.parametrize("value", [
+    "Acme",
+    "Smith, Jones & Partners",
+    "Foo (Holding) B.V.",
+    'The "Best" Company',
+    "Back\\slash",
+    "2024-05-03T10:00:00+00:00",
+])
+def test_quote_round_trips(value):
+    assert _unquote(_quote(value)) == value
+
+
+def test_keyset_filter_survives_names_with_separators(monkeypatch):
+    db = RecordingSupabase()
+    monkeypatch.setattr(prospects, "supabase", db)
+    name = 'Foo, "Bar" (Holding)'
+    
+    _list_page("org-1", None, None, "company_name", False, [name, "p-9"], 50, 0, False)
+    
+    (expression,) = db.query.or_filters
+    after, tie = _split_top_level(expression)
+    assert after == f"company_name.gt.{_quote(name)}"
+    assert tie.startswith("and(") and tie.endswith(")")
+    tie_key, tie_id = _split_top_level(tie[len("and("):-1])
+    assert _unquote(tie_key[len("company_name.eq."):]) == name
+    assert tie_id == "id.gt.p-9"
+    assert db.query.orders == [("company_name", False), ("id", False)]
+
+
+def test_descending_keyset_uses_lt(monkeypatch):
+    db = RecordingSupabase()
+    monkeypatch.setattr(prospects, "supabase", db)
+    
+    _list_page("org-1", None, None, "created_at", True, ["2024-05-03T10:00:00+00:00", "p-1"], 50, 0, False)
+    
+    (expression,) = db.query.or_filters
+    assert expression == (
+        'created_at.lt."2024-05-03T10:00:00+00:00",'
+        'and(created_at.eq."2024-05-03T10:00:00+00:00",id.lt.p-1)'
+    )
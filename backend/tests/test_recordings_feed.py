@@ -0,0 +1,164 @@
+"""Keyset pagination of the recordings feed (routers/recordings)."""
+
+import re
+
+import pytest
+from fastapi import HTTPException
+
+from app.routers import recordings
+from app.routers.recordings import _decode_cursor, _encode_cursor, _fetch_source_page
+
+_KEYSET = re.compile(r'^(\w+)\.lt\."([^"]*)",and\(\1\.eq\."\2",id\.lt\.(.+)\)$')
+
+
+class FakeQuery:
+    """The subset of the PostgREST query builder _fetch_source_page uses."""
+    
+    def __init__(self, rows):
+        self.rows = list(rows)
+        self.filters = []
+        self.orders = []
+        self.max_rows = None
+    
+    def select(self, columns, count=None):
+        return self
+    
+    def eq(self, column, value):
+        self.filters.append(f"eq:{column}")
+        self.rows = [r for r in self.rows if r.get(column) == value]
+        return self
+    
+    def in_(self, column, values):
+        self.rows = [r for r in self.rows if r.get(column) in values]
+        return self
+    
+    def or_(self, expression):
+        self.filters.append(f"or:{expression}")
+        column, sort_key, row_id = _KEYSET.match(expression).groups()
+        self.rows = [
+            r for r in self.rows
+            if r[column] < sort_key or (r[column] == sort_key and r["id"] < row_id)
+        ]
+        return self
+    
+    def order(self, column, desc=False):
+        self.orders.append((column, desc))
+        return self
+    
+    def limit(self, count):
+        self.max_rows = count
+        return self
+    
+    def execute(self):
+        rows = self.rows
+        for column, desc in reversed(self.orders):
+            rows = sorted(rows, key=lambda r: r[column], reverse=desc)
+        return type("Result", (), {"data": rows[:self.max_rows]})()
+
+
+class FakeSupabase:
+    def __init__(self, tables):
+        self.tables = tables
+        self.queries = []
+    
+    def table(self, name):
+        query = FakeQuery(self.tables.get(name, []))
+        self.queries.append(query)
+        return query
+
+
+def _mobile(row_id, created_at, status="completed", organization_id="org-1"):
+    return {"id": row_id, "created_at": created_at, "status": status, "organization_id": organization_id}
+
+
+@pytest.fixture
+def fake_db(monkeypatch):
+    rows = [
+        _mobile("m1", "2024-05-01T10:00:00+00:00"),
+        _mobile("m2", "2024-05-02T10:00:00+00:00"),
+        # Same sort key: ties are ordered by id
+        _mobile("m3", "2024-05-03T10:00:00+00:00"),
+        _mobile("m4", "2024-05-03T10:00:00+00:00"),
+        _mobile("m5", "2024-05-03T10:00:00+00:00", status="failed"),
+        _mobile("m6", "2024-05-04T10:00:00+00:00"),
+        _mobile("m7", "2024-05-05T10:00:00+00:00"),
+        _mobile("x1", "2024-05-06T10:00:00+00:00", organization_id="org-2"),
+    ]
+    db = FakeSupabase({"mobile_recordings": rows})
+    monkeypatch.setattr(recordings, "supabase", db)
+    return db
+
+
+def _page(position, count, status=None):
+    return _fetch_source_page("mobile", "org-1", position, count, None, status, None)
+
+
+# ==========================================
+# _fetch_source_page
+# ==========================================
+
+def test_first_page_is_newest_first(fake_db):
+    rows, exhausted = _page(None, 3)
+    
+    assert [r["id"] for r in rows] == ["m7", "m6", "m5"]
+    assert not exhausted
+
+
+def test_position_continues_after_the_last_row_including_ties(fake_db):
+    rows, _ = _page(["2024-05-03T10:00:00+00:00", "m5"], 2)
+    
+    assert [r["id"] for r in rows] == ["m4", "m3"]
+    # Timestamps are quoted: their "+" and ":" would otherwise break the filter
+    assert 'created_at.lt."2024-05-03T10:00:00+00:00"' in fake_db.queries[-1].filters[-1]
+
+
+def test_paging_visits_every_row_once(fake_db):
+    seen, position = [], None
+    while True:
+        rows, exhausted = _page(position, 3)
+        seen.extend(r["id"] for r in rows)
+        if exhausted:
+            break
+        position = [rows[-1]["created_at"], rows[-1]["id"]]
+    
+    assert seen == ["m7", "m6", "m5", "m4", "m3", "m2", "m1"]
+
+
+def test_short_page_is_exhausted(fake_db):
+    rows, exhausted = _page(["2024-05-02T10:00:00+00:00", "m2"], 3)
+    
+    assert [r["id"] for r in rows] == ["m1"]
+    assert exhausted
+
+
+def test_status_filter_maps_to_source_values(fake_db):
+    rows, _ = _page(None, 10, status="failed")
+    
+    assert [r["id"] for r in rows] == ["m5"]
+
+
+def test_status_without_values_for_source_matches_nothing(fake_db):
+    rows, exhausted = _fetch_source_page("external", "org-1", None, 10, None, "processing", None)
+    
+    assert rows == []
+    assert exhausted
+
+
+# ==========================================
+# Cursor encoding
+# ==========================================
+
+def test_cursor_round_trip():
+    positions = {"mobile": ["2024-05-03T10:00:00+00:00", "m5"], "external": recordings.CURSOR_DONE}
+    
+    cursor = _encode_cursor(positions)
+    
+    assert "=" not in cursor
+    assert _decode_cursor(cursor) == positions
+
+
+@pytest.mark.parametrize("cursor", ["not-base64!", _encode_cursor({"unknown": 0}), "WzFd"])
+def test_invalid_cursor_is_rejected(cursor):
+    with pytest.raises(HTTPException) as error:
+        _decode_cursor(cursor)
+    assert error.value.status_code == 400
@@ -0,0 +1,140 @@
+"""Token-capped chunking and its streaming variant (services/text_chunker)."""
+
+import random
+import re
+
+import pytest
+
+from app.services import text_chunker
+from app.services.text_chunker import TextChunker
+
+_WORDS = ["pipeline", "renewal", "budget", "champion", "roadmap", "pricing", "security", "rollout", "quarter", "team"]
+
+
+def _document(paragraphs, seed=0):
+    """Deterministic prose: paragraphs of sentences, with a few markdown headings."""
+    rng = random.Random(seed)
+    parts = []
+    for p in range(paragraphs):
+        if p % 7 == 0:
+            parts.append(f"## Section {p // 7 + 1}")
+        sentences = [
+            " ".join(rng.choice(_WORDS) for _ in range(rng.randint(6, 18))).capitalize() + "."
+            for _ in range(rng.randint(2, 8))
+        ]
+        parts.append(" ".join(sentences))
+    return "\n\n".join(parts)
+
+
+class FakeEncoding:
+    """
+    Offline tiktoken stand-in: a token is a run of newlines, or up to 4
+    non-space characters plus the spaces before them (roughly BPE-sized).
+    """
+    
+    _TOKEN_RE = re.compile(r"\n+|[ \t]*[^\s]{1,4}|[ \t]+")
+    
+    def __init__(self):
+        self.pieces = []
+    
+    def encode_ordinary(self, text):
+        ids = []
+        for piece in self._TOKEN_RE.findall(text):
+            ids.append(len(self.pieces))
+            self.pieces.append(piece)
+        return ids
+    
+    def decode_with_offsets(self, tokens):
+        offsets, position = [], 0
+        for token in tokens:
+            offsets.append(position)
+            position += len(self.pieces[token])
+        return "".join(self.pieces[t] for t in tokens), offsets
+
+
+@pytest.fixture
+def chunker(monkeypatch):
+    monkeypatch.setattr(text_chunker, "get_encoding", lambda encoding_name: FakeEncoding())
+    return TextChunker()
+
+
+# ==========================================
+# chunk_text
+# ==========================================
+
+def test_chunks_respect_the_token_cap(chunker):
+    chunks = chunker.chunk_text(_document(120))
+    
+    assert len(chunks) > 5
+    assert all(c["token_count"] <= chunker.chunk_size for c in chunks)
+    assert all(chunker.count_tokens(c["content"]) <= chunker.chunk_size for c in chunks)
+    assert [c["chunk_index"] for c in chunks] == list(range(len(chunks)))
+
+
+def test_text_without_boundaries_is_cut_at_the_cap(chunker):
+    text = "".join(random.Random(1).choice("abcdefgh") for _ in range(20000))
+    
+    chunks = chunker.chunk_text(text)
+    
+    assert len(chunks) > 1
+    assert all(c["token_count"] <= chunker.chunk_size for c in chunks)
+    assert chunks[0]["token_count"] == chunker.chunk_size
+
+
+def test_chunks_end_at_natural_boundaries(chunker):
+    chunks = chunker.chunk_text(_document(60))
+    
+    # Every chunk but the last ends at a sentence end, never mid-sentence
+    assert all(c["content"].endswith(".") for c in chunks[:-1])
+
+
+def test_consecutive_chunks_overlap(chunker):
+    chunks = chunker.chunk_text(_document(60))
+    
+    for previous, current in zip(chunks, chunks[1:]):
+        assert current["content"][:40] in previous["content"]
+
+
+def test_short_and_empty_text(chunker):
+    assert chunker.chunk_text("") == []
+    assert chunker.chunk_text("  \n\n ") == []
+    assert chunker.chunk_text("Just one line.") == [
+        {"content": "Just one line.", "token_count": 4, "chunk_index": 0}
+    ]
+
+
+# ==========================================
+# chunk_stream
+# ==========================================
+
+@pytest.mark.parametrize("paragraphs, per_block", [(200, 1), (200, 9), (300, 40), (3, 1)])
+def test_stream_matches_chunk_text(chunker, paragraphs, per_block):
+    text = _document(paragraphs, seed=paragraphs)
+    paragraph_list = text.split("\n\n")
+    blocks = [
+        "\n\n".join(paragraph_list[i:i + per_block])
+        for i in range(0, len(paragraph_list), per_block)
+    ]
+    
+    assert list(chunker.chunk_stream(blocks)) == chunker.chunk_text("\n\n".join(blocks))
+
+
+def test_stream_skips_empty_blocks(chunker):
+    blocks = ["First page text.", "", "   ", "Second page text."]
+    
+    assert list(chunker.chunk_stream(blocks)) == chunker.chunk_text("First page text.\n\nSecond page text.")
+
+
+def test_stream_is_lazy(chunker):
+    consumed = []
+    
+    def pages():
+        for i, page in enumerate(_document(400).split("\n\n")):
+            consumed.append(i)
+            yield page
+    
+    stream = chunker.chunk_stream(pages())
+    next(stream)
+    
+    # The first chunk is ready long before the last page is read
+    assert len(consumed) < 100
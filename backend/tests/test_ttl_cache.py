@@ -0,0 +1,103 @@
+"""TTLCache behaviour, including use from several threads (utils/cache)."""
+
+import threading
+
+from app.utils import cache as cache_module
+from app.utils.cache import MISSING, TTLCache
+
+
+def test_get_set_and_miss():
+    cache = TTLCache(maxsize=10, ttl_seconds=60)
+    cache.set("a", None)
+    
+    assert cache.get("a") is None
+    assert cache.get("b") is MISSING
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_entries_expire(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(cache_module.time, "monotonic", lambda: now[0])
+    cache = TTLCache(maxsize=10, ttl_seconds=60)
+    cache.set("a", 1)
+    cache.set("b", 2, ttl_seconds=600)
+    
+    now[0] += 61
+    
+    assert cache.get("a") is MISSING
+    assert cache.get("b") == 2
+
+
+def test_least_recently_used_is_evicted():
+    cache = TTLCache(maxsize=2, ttl_seconds=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    
+    assert cache.get("b") is MISSING
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+
+def test_invalidate_where_and_items_where():
+    cache = TTLCache(maxsize=10, ttl_seconds=60)
+    for i in range(6):
+        cache.set(("user", i), {"org": "even" if i % 2 == 0 else "odd"})
+    
+    assert cache.invalidate_where(lambda key: key[1] < 2) == 2
+    assert cache.invalidate_items_where(lambda key, value: value["org"] == "odd") == 2
+    assert sorted(key[1] for key in cache._data) == [2, 4]
+
+
+def test_predicate_may_use_the_cache():
+    # The lock is re-entrant: predicates are caller code and may read the cache
+    cache = TTLCache(maxsize=10, ttl_seconds=60)
+    cache.set("keep", True)
+    cache.set("drop", False)
+    
+    removed = cache.invalidate_where(lambda key: cache.get(key) is False)
+    
+    assert removed == 1
+    assert len(cache) == 1
+
+
+def test_concurrent_invalidation_while_writing():
+    cache = TTLCache(maxsize=500, ttl_seconds=60)
+    errors = []
+    stop = threading.Event()
+    
+    def writer(offset):
+        try:
+            i = 0
+            while not stop.is_set():
+                cache.set((offset, i % 1000), i)
+                cache.get((offset, (i * 7) % 1000))
+                i += 1
+        except Exception as e:  # pragma: no cover - the failure being tested for
+            errors.append(e)
+    
+    def invalidator():
+        try:
+            for n in range(300):
+                cache.invalidate_where(lambda key: key[1] % 3 == n % 3)
+                cache.invalidate_items_where(lambda key, value: value % 5 == 0)
+                cache.invalidate((0, n))
+                cache.stats()
+        except Exception as e:  # pragma: no cover
+            errors.append(e)
+    
+    writers = [threading.Thread(target=writer, args=(offset,)) for offset in range(4)]
+    invalidators = [threading.Thread(target=invalidator) for _ in range(2)]
+    for thread in writers + invalidators:
+        thread.start()
+    for thread in invalidators:
+        thread.join()
+    stop.set()
+    for thread in writers:
+        thread.join()
+    
+    assert errors == []
+    assert len(cache) <= cache.maxsize
+    assert len(cache._data) == len(cache)